@@ -18,11 +18,60 @@ __path__ = __import__("pkgutil").extend_path(__path__, __name__)
 
 __version__ = '1.8.2'
 
-from . import components
-from . import containers
-from . import dsl
-from . import auth
-from ._client import Client
+import sys
+
 from ._config import *
-from ._local_client import LocalClient
-from ._runners import *
+
+# The submodules and the attributes of the submodules, which are imported when
+# they are first accessed: importing kfp, e.g. to run a component with
+# kfp.v2.components.executor, does not import the kubernetes client, the API
+# client and the compiler.
+_LAZY_SUBMODULES = ('auth', 'compiler', 'components', 'containers', 'dsl',
+                    'pipeline_spec', 'v2')
+_LAZY_ATTRIBUTES = {
+    'Client': '._client',
+    'AsyncClient': '._async_client',
+    'LocalClient': '._local_client',
+    'run_pipeline_func_on_cluster': '._runners',
+    'run_pipeline_func_locally': '._runners',
+}
+
+__all__ = [
+    'TYPE_CHECK',
+    'COMPILING_FOR_V2',
+    *_LAZY_SUBMODULES,
+    *_LAZY_ATTRIBUTES,
+]
+
+
+def __getattr__(name):
+    import importlib
+    if name in _LAZY_SUBMODULES:
+        return importlib.import_module('.' + name, __name__)
+    if name in _LAZY_ATTRIBUTES:
+        value = getattr(
+            importlib.import_module(_LAZY_ATTRIBUTES[name], __name__), name)
+        # Later accesses do not call __getattr__.
+        globals()[name] = value
+        return value
+    raise AttributeError('module {!r} has no attribute {!r}'.format(
+        __name__, name))
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
+
+# The module __getattr__ is not supported before python 3.7.
+if sys.version_info < (3, 7):
+    from . import auth
+    from . import compiler
+    from . import components
+    from . import containers
+    from . import dsl
+    from . import pipeline_spec
+    from . import v2
+    from ._client import Client
+    from ._async_client import AsyncClient
+    from ._local_client import LocalClient
+    from ._runners import *
@@ -0,0 +1,888 @@
+# Copyright 2021 The Kubeflow Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""API client of the KFP API server with a fast response deserializer and
+tunable connection pools.
+
+The generated kfp_server_api.ApiClient deserializes the responses
+reflectively: it parses the type names with regular expressions, looks up
+the types of the attributes of the models and constructs every model with
+a new Configuration for each value. FastApiClient compiles a deserializer
+per response type once, which constructs the models directly through their
+property setters, so the setters still validate the values.
+
+PooledRESTClientObject extends the REST client of kfp_server_api with the
+connection pool options of urllib3, a default request timeout and requests
+with streamed bodies, which upload_file uses to upload files without
+reading them in memory.
+
+AsyncApiClient makes the generated API methods return coroutines, which
+send the requests with AsyncRESTClientObject, a REST client on top of
+aiohttp.
+"""
+
+import asyncio
+import contextlib
+import contextvars
+import datetime
+import io
+import json
+import pathlib
+import queue
+import re
+import socket
+import ssl
+import threading
+import uuid
+from typing import (Any, BinaryIO, Callable, Dict, Iterable, Iterator, List,
+                    Optional, Tuple, Union)
+from urllib.parse import quote, urlencode
+
+import urllib3
+
+import kfp_server_api
+from dateutil.parser import parse as _parse_datetime_slow
+from kfp_server_api import rest
+from urllib3.connection import HTTPConnection
+
+_Deserializer = Callable[[Any], Any]
+_Timeout = Union[float, Tuple[float, float]]
+
+# Whether the API methods return the JSON-decoded responses.
+_raw_responses = contextvars.ContextVar('raw_responses', default=False)
+
+# Statuses of the responses of overloaded or restarting API servers.
+_RETRY_STATUSES = (502, 503, 504)
+# Methods which can be retried after the request was sent.
+_IDEMPOTENT_METHODS = frozenset(
+    ['GET', 'HEAD', 'PUT', 'DELETE', 'OPTIONS', 'TRACE'])
+# Size of the chunks of the streamed request bodies.
+_UPLOAD_CHUNK_SIZE = 1024 * 1024
+# Maximum number of chunks buffered by iter_written_chunks.
+_MAX_BUFFERED_CHUNKS = 4
+_CHARSET_PATTERN = re.compile(r'charset=([a-zA-Z\-\d]+)[\s;]?')
+
+_LIST_TYPE_PATTERN = re.compile(r'list\[(.*)\]')
+_DICT_TYPE_PATTERN = re.compile(r'dict\(([^,]*), (.*)\)')
+
+# The time zone dateutil gives to the UTC timestamps, which is tzlocal()
+# when the local time zone is UTC.
+_UTC_TZINFO = _parse_datetime_slow('1970-01-01T00:00:00Z').tzinfo
+_fromisoformat = getattr(datetime.datetime, 'fromisoformat', None)
+
+
+@contextlib.contextmanager
+def raw_responses():
+    """Makes the API methods return the JSON-decoded responses.
+
+    Within the context, the methods of the generated APIs return the
+    responses as dicts and lists, as sent by the API server, instead of
+    model objects.
+    """
+    token = _raw_responses.set(True)
+    try:
+        yield
+    finally:
+        _raw_responses.reset(token)
+
+
+@contextlib.contextmanager
+def model_responses():
+    """Makes the API methods return model objects, within raw_responses.
+
+    The client methods which read the responses of their own API calls
+    deserialize them within this context.
+    """
+    token = _raw_responses.set(False)
+    try:
+        yield
+    finally:
+        _raw_responses.reset(token)
+
+
+def _parse_datetime(string: str) -> datetime.datetime:
+    # The API server sends RFC 3339 timestamps in UTC, e.g.
+    # 2021-06-01T12:34:56Z or 2021-06-01T12:34:56.123456789Z, which are
+    # parsed like dateutil does, truncating to microseconds.
+    if _fromisoformat is not None and string.endswith('Z'):
+        timestamp = string[:-1]
+        dot = timestamp.find('.', 19)
+        if dot >= 0:
+            fraction = timestamp[dot + 1:dot + 7]
+            timestamp = timestamp[:dot + 1] + fraction.ljust(6, '0')
+        try:
+            return _fromisoformat(timestamp).replace(tzinfo=_UTC_TZINFO)
+        except ValueError:
+            pass
+    try:
+        return _parse_datetime_slow(string)
+    except ValueError:
+        raise rest.ApiException(
+            status=0,
+            reason='Failed to parse `{0}` as datetime object'.format(string))
+
+
+def _parse_date(string: str) -> datetime.date:
+    try:
+        return _parse_datetime_slow(string).date()
+    except ValueError:
+        raise rest.ApiException(
+            status=0,
+            reason='Failed to parse `{0}` as date object'.format(string))
+
+
+def create_retry(retries: int, backoff_factor: float) -> urllib3.Retry:
+    """Creates the retry policy of the API requests.
+
+    Connection errors are retried for all the requests. Read errors and
+    the 502, 503 and 504 statuses are only retried for the idempotent
+    requests, so runs are never created twice.
+    """
+    return urllib3.Retry(
+        total=retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=_RETRY_STATUSES,
+        raise_on_status=False)
+
+
+class PooledRESTClientObject(rest.RESTClientObject):
+    """kfp_server_api REST client with tunable connection pools.
+
+    Args:
+      configuration: The configuration of the API client. Its retries and
+        connection_pool_maxsize apply as for the generated REST client.
+      pools_size: Number of connection pools, one per host, to keep.
+      maxsize: Maximum number of connections to keep per host. Defaults to
+        the connection_pool_maxsize of the configuration.
+      block: Whether the requests wait for a free connection when all the
+        connections to a host are in use, instead of opening connections
+        which are discarded afterwards.
+      tcp_keepalive: Whether to enable TCP keep-alive on the connections, so
+        idle connections are not dropped by proxies and load balancers.
+      request_timeout: Default timeout of the requests, in seconds, or a
+        (connect timeout, read timeout) pair.
+    """
+
+    def __init__(self,
+                 configuration,
+                 pools_size: int = 4,
+                 maxsize: Optional[int] = None,
+                 block: bool = False,
+                 tcp_keepalive: bool = False,
+                 request_timeout: Optional[_Timeout] = None):
+        super().__init__(configuration, pools_size=pools_size, maxsize=maxsize)
+        # The pools of the hosts are created with these options.
+        connection_pool_kw = self.pool_manager.connection_pool_kw
+        connection_pool_kw['block'] = block
+        if tcp_keepalive:
+            connection_pool_kw['socket_options'] = (
+                HTTPConnection.default_socket_options +
+                [(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)])
+        if isinstance(request_timeout, (int, float)):
+            request_timeout = (request_timeout, request_timeout)
+        self._default_request_timeout = request_timeout
+
+    def request(self, *args, _request_timeout=None, **kwargs):
+        if _request_timeout is None:
+            _request_timeout = self._default_request_timeout
+        return super().request(
+            *args, _request_timeout=_request_timeout, **kwargs)
+
+    def request_stream(self, method: str, url: str, body: Iterable[bytes],
+                       headers: Dict[str, str]) -> rest.RESTResponse:
+        """Sends a request with a streamed body.
+
+        The body is sent with the chunked transfer encoding, unless the
+        headers have its Content-Length.
+
+        Raises:
+          ApiException: if the response has an error status.
+        """
+        kwargs = {}
+        if self._default_request_timeout is not None:
+            connect_timeout, read_timeout = self._default_request_timeout
+            kwargs['timeout'] = urllib3.Timeout(
+                connect=connect_timeout, read=read_timeout)
+        response = rest.RESTResponse(
+            self.pool_manager.request(
+                method, url, body=body, headers=headers, **kwargs))
+        if not 200 <= response.status <= 299:
+            raise rest.ApiException(http_resp=response)
+        return response
+
+
+def iter_file_chunks(file_path: str,
+                     chunk_size: int = _UPLOAD_CHUNK_SIZE) -> Iterator[bytes]:
+    """Iterates over the content of a file, reading a chunk at a time."""
+    with open(file_path, 'rb') as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                return
+            yield chunk
+
+
+class _QueueWriter(io.RawIOBase):
+    """Binary file putting the written bytes in a queue."""
+
+    def __init__(self, chunks: queue.Queue, cancelled: threading.Event):
+        self._chunks = chunks
+        self._cancelled = cancelled
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        if self._cancelled.is_set():
+            raise BrokenPipeError('The reader of the chunks has stopped.')
+        self._chunks.put(bytes(data))
+        return len(data)
+
+
+# Ends the chunks of iter_written_chunks.
+_END_OF_CHUNKS = object()
+
+
+def iter_written_chunks(
+        write: Callable[[BinaryIO], None],
+        chunk_size: int = _UPLOAD_CHUNK_SIZE) -> Iterator[bytes]:
+    """Iterates over the bytes written by a function, as they are written.
+
+    The function runs in a thread, writing to a buffered binary file, and
+    blocks while a few chunks are waiting to be read, so the bytes are never
+    all in memory. An exception raised by the function is raised by the
+    iterator, after the bytes written before it.
+
+    Args:
+      write: Function writing to the binary file it is passed.
+      chunk_size: Size of the chunks, except for the last one.
+    """
+    chunks = queue.Queue(maxsize=_MAX_BUFFERED_CHUNKS)
+    cancelled = threading.Event()
+
+    def write_chunks():
+        try:
+            with io.BufferedWriter(
+                    _QueueWriter(chunks, cancelled),
+                    buffer_size=chunk_size) as f:
+                write(f)
+        except BaseException as e:
+            chunks.put(e)
+        else:
+            chunks.put(_END_OF_CHUNKS)
+
+    writer_thread = threading.Thread(target=write_chunks, daemon=True)
+    writer_thread.start()
+    try:
+        while True:
+            chunk = chunks.get()
+            if chunk is _END_OF_CHUNKS:
+                return
+            if isinstance(chunk, BaseException):
+                raise chunk
+            yield chunk
+    finally:
+        # Unblocks the writer when the reader stops early.
+        cancelled.set()
+        while writer_thread.is_alive():
+            try:
+                chunks.get(timeout=0.1)
+            except queue.Empty:
+                pass
+
+
+def upload_file(api_client: kfp_server_api.ApiClient,
+                resource_path: str,
+                query_params: List[Tuple[str, Optional[str]]],
+                file_name: str,
+                chunks: Iterable[bytes],
+                size: Optional[int],
+                response_type: str,
+                field_name: str = 'uploadfile') -> Any:
+    """Uploads a file to the API server with a streamed multipart request.
+
+    The generated upload APIs read the whole file in memory to encode their
+    requests.
+
+    Args:
+      api_client: API client, whose REST client is a PooledRESTClientObject.
+      resource_path: Path of the API method, e.g.
+        /apis/v1beta1/pipelines/upload.
+      query_params: Query parameters of the request. The parameters which
+        are None are not sent.
+      file_name: Name of the uploaded file.
+      chunks: Content of the file.
+      size: Size of the file, or None if it is not known upfront, in which
+        case the request is sent with the chunked transfer encoding.
+      response_type: Type of the response, e.g. ApiPipeline.
+      field_name: Name of the form field of the file.
+
+    Returns:
+      The deserialized response.
+
+    Raises:
+      ApiException: if the response has an error status.
+    """
+    boundary = uuid.uuid4().hex
+    head = ('--{0}\r\n'
+            'Content-Disposition: form-data; name="{1}"; filename="{2}"\r\n'
+            'Content-Type: application/octet-stream\r\n\r\n').format(
+                boundary, field_name, file_name).encode('utf-8')
+    tail = '\r\n--{0}--\r\n'.format(boundary).encode('utf-8')
+
+    headers = dict(api_client.default_headers)
+    if api_client.cookie:
+        headers['Cookie'] = api_client.cookie
+    headers['Accept'] = 'application/json'
+    headers['Content-Type'] = 'multipart/form-data; boundary=' + boundary
+    if size is not None:
+        headers['Content-Length'] = str(len(head) + size + len(tail))
+    query_params = [
+        (name, value) for name, value in query_params if value is not None
+    ]
+    api_client.update_params_for_auth(headers, query_params, ['Bearer'])
+    url = api_client.configuration.host + resource_path
+    if query_params:
+        url += '?' + urlencode(query_params)
+
+    def iter_body():
+        yield head
+        # When the chunks raise an exception, the request is aborted before
+        # its end, so the API server does not receive a truncated file.
+        yield from chunks
+        yield tail
+
+    try:
+        response = api_client.rest_client.request_stream(
+            'POST', url, body=iter_body(), headers=headers)
+    except rest.ApiException as e:
+        if isinstance(e.body, bytes):
+            e.body = e.body.decode('utf-8')
+        raise e
+    response.data = response.data.decode('utf-8')
+    return api_client.deserialize(response, response_type)
+
+
+class AsyncRESTResponse(io.IOBase):
+    """Response of AsyncRESTClientObject, read in full."""
+
+    def __init__(self, response, data: bytes):
+        self.aiohttp_response = response
+        self.status = response.status
+        self.reason = response.reason
+        self.data = data
+
+    def getheaders(self):
+        """Returns a dictionary of the response headers."""
+        return self.aiohttp_response.headers
+
+    def getheader(self, name, default=None):
+        """Returns a given response header."""
+        return self.aiohttp_response.headers.get(name, default)
+
+
+class AsyncRESTClientObject(object):
+    """REST client of the API server on top of aiohttp.
+
+    The requests share an aiohttp session, created in the event loop of the
+    first request, and its connection pool, so the client is used by a
+    single event loop.
+
+    Args:
+      configuration: The configuration of the API client. Its proxy and SSL
+        options apply as for the generated REST client.
+      maxsize: Maximum number of connections to a host. The requests wait for
+        a free connection when all of them are in use.
+      retries: Number of retries of the failed requests, with the same
+        policy as create_retry.
+      backoff_factor: Backoff factor of the retries, in seconds. The n-th
+        retry waits backoff_factor * 2 ** (n - 1) seconds.
+      request_timeout: Default timeout of the requests, in seconds, or a
+        (connect timeout, read timeout) pair.
+    """
+
+    def __init__(self,
+                 configuration,
+                 maxsize: int = 100,
+                 retries: int = 0,
+                 backoff_factor: float = 0.5,
+                 request_timeout: Optional[_Timeout] = None):
+        try:
+            import aiohttp
+        except ImportError:
+            raise ImportError(
+                'aiohttp is required by the asyncio API client. Install it '
+                'with `pip install kfp[async]`.')
+        self._aiohttp = aiohttp
+        self._configuration = configuration
+        self._maxsize = maxsize
+        self._retries = retries
+        self._backoff_factor = backoff_factor
+        self._default_timeout = self._create_timeout(request_timeout)
+        self._session = None
+
+    def _create_timeout(self, timeout: Optional[_Timeout]):
+        if timeout is None:
+            return None
+        if isinstance(timeout, (int, float)):
+            return self._aiohttp.ClientTimeout(total=timeout)
+        connect_timeout, read_timeout = timeout
+        return self._aiohttp.ClientTimeout(
+            sock_connect=connect_timeout, sock_read=read_timeout)
+
+    def _get_session(self):
+        if self._session is None:
+            configuration = self._configuration
+            ssl_context = ssl.create_default_context(
+                cafile=configuration.ssl_ca_cert)
+            if configuration.cert_file:
+                ssl_context.load_cert_chain(
+                    configuration.cert_file, keyfile=configuration.key_file)
+            if not configuration.verify_ssl:
+                ssl_context.check_hostname = False
+                ssl_context.verify_mode = ssl.CERT_NONE
+            connector = self._aiohttp.TCPConnector(
+                limit=0, limit_per_host=self._maxsize, ssl=ssl_context)
+            self._session = self._aiohttp.ClientSession(connector=connector)
+        return self._session
+
+    async def close(self):
+        """Closes the connections of the client."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def request(self,
+                      method,
+                      url,
+                      query_params=None,
+                      headers=None,
+                      body=None,
+                      post_params=None,
+                      _preload_content=True,
+                      _request_timeout=None) -> AsyncRESTResponse:
+        """Sends a request, retrying it as configured.
+
+        Raises:
+          ApiException: if the request failed, including network errors,
+            or the response has an error status.
+        """
+        method = method.upper()
+        if post_params and body:
+            raise kfp_server_api.ApiValueError(
+                'body parameter cannot be used with post_params parameter.')
+        headers = dict(headers or {})
+        headers.setdefault('Content-Type', 'application/json')
+        if query_params:
+            url += '?' + urlencode(query_params)
+        request_kwargs = {'headers': headers}
+        form_params = None
+        content_type = headers['Content-Type']
+        if method in ('GET', 'HEAD'):
+            pass
+        elif re.search('json', content_type, re.IGNORECASE):
+            if body is not None:
+                request_kwargs['data'] = json.dumps(body)
+        elif content_type == 'application/x-www-form-urlencoded':
+            request_kwargs['data'] = post_params or []
+        elif content_type == 'multipart/form-data':
+            # The Content-Type, with its boundary, is set by aiohttp.
+            del headers['Content-Type']
+            form_params = post_params or []
+        elif isinstance(body, (str, bytes)):
+            request_kwargs['data'] = body
+        else:
+            raise rest.ApiException(
+                status=0,
+                reason='Cannot prepare a request message for provided '
+                'arguments. Please check that your arguments match declared '
+                'content type.')
+        timeout = self._create_timeout(
+            _request_timeout) or self._default_timeout
+        if timeout is not None:
+            request_kwargs['timeout'] = timeout
+        if self._configuration.proxy:
+            request_kwargs['proxy'] = self._configuration.proxy
+            request_kwargs['proxy_headers'] = (
+                self._configuration.proxy_headers)
+
+        # The URL is already encoded.
+        from yarl import URL
+        url = URL(url, encoded=True)
+        retry = 0
+        while True:
+            files = []
+            try:
+                if form_params is not None:
+                    # A form data, and its files, are consumed by the
+                    # attempt which sends them.
+                    request_kwargs['data'] = await self._create_form_data(
+                        form_params, files)
+                response = await self._request_once(method, url, request_kwargs)
+            except (self._aiohttp.ClientError, asyncio.TimeoutError) as e:
+                # Requests which failed to connect were not sent.
+                if (retry >= self._retries or
+                    (method not in _IDEMPOTENT_METHODS and
+                     not isinstance(e, self._aiohttp.ClientConnectorError))):
+                    raise rest.ApiException(
+                        status=0,
+                        reason='{0}\n{1}'.format(type(e).__name__, str(e)))
+            else:
+                if (response.status not in _RETRY_STATUSES or
+                        method not in _IDEMPOTENT_METHODS or
+                        retry >= self._retries):
+                    break
+            finally:
+                for file in files:
+                    file.close()
+            retry += 1
+            await asyncio.sleep(self._backoff_factor * 2**(retry - 1))
+
+        if not 200 <= response.status <= 299:
+            raise rest.ApiException(http_resp=response)
+        return response
+
+    async def _request_once(self, method, url,
+                            request_kwargs) -> AsyncRESTResponse:
+        async with self._get_session().request(method, url,
+                                               **request_kwargs) as response:
+            return AsyncRESTResponse(response, await response.read())
+
+    async def _create_form_data(self, post_params, files: List[BinaryIO]):
+        """Creates the multipart body of an attempt of a request.
+
+        The file fields are given by their content, or by the path of the
+        file. The files are opened in the default executor of the event loop
+        and appended to files, for the caller to close them.
+        """
+        form_data = self._aiohttp.FormData()
+        for name, value in post_params:
+            if isinstance(value, tuple):
+                file_name, file_data, mime_type = value
+                if isinstance(file_data, pathlib.PurePath):
+                    file_data = await asyncio.get_running_loop(
+                    ).run_in_executor(None, open, file_data, 'rb')
+                    files.append(file_data)
+                form_data.add_field(
+                    name, file_data, filename=file_name, content_type=mime_type)
+            else:
+                form_data.add_field(name, value)
+        return form_data
+
+
+def _create_primitive_deserializer(klass: type) -> _Deserializer:
+
+    def deserialize(data):
+        if type(data) is klass:
+            return data
+        try:
+            return klass(data)
+        except UnicodeEncodeError:
+            return str(data)
+        except TypeError:
+            return data
+
+    return deserialize
+
+
+class FastApiClient(kfp_server_api.ApiClient):
+    """kfp_server_api.ApiClient with compiled response deserializers."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._deserializers = {}
+        # The deserializers being compiled, and their dependencies, which
+        # are published together once complete.
+        self._pending_deserializers = {}
+        self._deserializers_lock = threading.RLock()
+        # The models share the configuration. The generated ApiClient
+        # creates a default configuration for each model instead.
+        self._model_configuration = kfp_server_api.Configuration()
+
+    def deserialize(self, response, response_type):
+        if response_type == 'file':
+            return super().deserialize(response, response_type)
+
+        try:
+            data = json.loads(response.data)
+        except ValueError:
+            data = response.data
+        if _raw_responses.get():
+            return data
+        return self._get_deserializer(response_type)(data)
+
+    def deserialize_data(self, data: Any, response_type: str) -> Any:
+        """Deserializes a JSON-decoded response, e.g. a raw response."""
+        return self._get_deserializer(response_type)(data)
+
+    def _get_deserializer(self, klass) -> _Deserializer:
+        deserializer = self._deserializers.get(klass)
+        if deserializer is None:
+            with self._deserializers_lock:
+                deserializer = (
+                    self._deserializers.get(klass) or
+                    self._pending_deserializers.get(klass))
+                if deserializer is None:
+                    outermost = not self._pending_deserializers
+                    # Placeholder for the recursive models.
+                    self._pending_deserializers[klass] = (
+                        lambda data: self._deserializers[klass](data))
+                    try:
+                        deserializer = self._compile_deserializer(klass)
+                        self._pending_deserializers[klass] = deserializer
+                        if outermost:
+                            self._deserializers.update(
+                                self._pending_deserializers)
+                    finally:
+                        if outermost:
+                            self._pending_deserializers.clear()
+        return deserializer
+
+    def _compile_deserializer(self, klass) -> _Deserializer:
+        if isinstance(klass, str):
+            if klass.startswith('list['):
+                item_deserializer = self._get_deserializer(
+                    _LIST_TYPE_PATTERN.match(klass).group(1))
+                return _none_or(
+                    lambda data: [item_deserializer(item) for item in data])
+            if klass.startswith('dict('):
+                value_deserializer = self._get_deserializer(
+                    _DICT_TYPE_PATTERN.match(klass).group(2))
+                return _none_or(lambda data: {
+                    key: value_deserializer(value)
+                    for key, value in data.items()
+                })
+            if klass in self.NATIVE_TYPES_MAPPING:
+                klass = self.NATIVE_TYPES_MAPPING[klass]
+            else:
+                klass = getattr(kfp_server_api.models, klass)
+
+        if klass in self.PRIMITIVE_TYPES:
+            return _none_or(_create_primitive_deserializer(klass))
+        if klass == object:
+            return lambda data: data
+        if klass == datetime.date:
+            return _none_or(_parse_date)
+        if klass == datetime.datetime:
+            return _none_or(_parse_datetime)
+        return self._compile_model_deserializer(klass)
+
+    def _compile_model_deserializer(self, klass: type) -> _Deserializer:
+        if (hasattr(klass, 'get_real_child_model') and
+                klass.discriminator_value_class_map):
+            # Polymorphic models are left to the generated deserializer.
+            return lambda data: self._ApiClient__deserialize(data, klass)
+        if not klass.openapi_types:
+            return lambda data: data
+
+        fields = []
+        initial_attributes = {'discriminator': None}
+        for attr, attr_type in klass.openapi_types.items():
+            fields.append((klass.attribute_map[attr], getattr(klass, attr).fset,
+                           self._get_deserializer(attr_type)))
+            initial_attributes['_' + attr] = None
+        configuration = self._model_configuration
+
+        def deserialize_model(data: Dict[str, Any]):
+            if data is None:
+                return None
+            if not isinstance(data, dict):
+                return self._ApiClient__deserialize(data, klass)
+            instance = klass.__new__(klass)
+            instance.local_vars_configuration = configuration
+            instance.__dict__.update(initial_attributes)
+            for key, setter, deserialize in fields:
+                value = data.get(key)
+                if value is not None:
+                    value = deserialize(value)
+                    if value is not None:
+                        setter(instance, value)
+            return instance
+
+        return deserialize_model
+
+
+def _none_or(deserializer: _Deserializer) -> _Deserializer:
+
+    def deserialize(data):
+        if data is None:
+            return None
+        return deserializer(data)
+
+    return deserialize
+
+
+class AsyncApiClient(FastApiClient):
+    """API client whose API methods return coroutines.
+
+    The generated API classes, e.g. kfp_server_api.RunServiceApi, return the
+    result of call_api, so with this client their methods are awaited::
+
+      run_detail = await kfp_server_api.RunServiceApi(api_client).get_run(
+          run_id=run_id)
+
+    Args:
+      rest_client: The AsyncRESTClientObject sending the requests.
+      *args, **kwargs: The arguments of kfp_server_api.ApiClient.
+    """
+
+    def __init__(self, rest_client: AsyncRESTClientObject, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.rest_client = rest_client
+
+    def call_api(self,
+                 resource_path,
+                 method,
+                 path_params=None,
+                 query_params=None,
+                 header_params=None,
+                 body=None,
+                 post_params=None,
+                 files=None,
+                 response_type=None,
+                 auth_settings=None,
+                 async_req=None,
+                 _return_http_data_only=None,
+                 collection_formats=None,
+                 _preload_content=True,
+                 _request_timeout=None,
+                 _host=None):
+        # The request is prepared by the caller, like the generated client
+        # does, so the parameters are read in the context of the caller.
+        url, query_params, header_params, body, post_params = (
+            self._prepare_request(resource_path, path_params, query_params,
+                                  header_params, body, post_params, files,
+                                  auth_settings, collection_formats, _host))
+        return self._call_api_async(method, url, query_params, header_params,
+                                    body, post_params, response_type,
+                                    _return_http_data_only, _request_timeout)
+
+    def _prepare_request(self, resource_path, path_params, query_params,
+                         header_params, body, post_params, files, auth_settings,
+                         collection_formats, host):
+        """Prepares the parameters of a request, as
+        kfp_server_api.ApiClient does."""
+        header_params = header_params or {}
+        header_params.update(self.default_headers)
+        if self.cookie:
+            header_params['Cookie'] = self.cookie
+        if header_params:
+            header_params = self.sanitize_for_serialization(header_params)
+            header_params = dict(
+                self.parameters_to_tuples(header_params, collection_formats))
+
+        if path_params:
+            path_params = self.sanitize_for_serialization(path_params)
+            path_params = self.parameters_to_tuples(path_params,
+                                                    collection_formats)
+            for name, value in path_params:
+                resource_path = resource_path.replace(
+                    '{%s}' % name,
+                    quote(
+                        str(value),
+                        safe=self.configuration.safe_chars_for_path_param))
+
+        if query_params:
+            query_params = self.sanitize_for_serialization(query_params)
+            query_params = self.parameters_to_tuples(query_params,
+                                                     collection_formats)
+
+        if post_params or files:
+            post_params = self.sanitize_for_serialization(post_params or [])
+            post_params = self.parameters_to_tuples(post_params,
+                                                    collection_formats)
+            post_params.extend(self.files_parameters(files))
+
+        self.update_params_for_auth(header_params, query_params, auth_settings)
+
+        if body:
+            body = self.sanitize_for_serialization(body)
+
+        url = (host or self.configuration.host) + resource_path
+        return url, query_params, header_params, body, post_params
+
+    async def upload_file(self,
+                          resource_path: str,
+                          query_params: List[Tuple[str, Optional[str]]],
+                          file_path: str,
+                          file_name: str,
+                          response_type: str,
+                          field_name: str = 'uploadfile') -> Any:
+        """Uploads a file to the API server, streaming it from the disk.
+
+        The generated upload APIs read the whole file to encode their
+        requests, which would block the event loop. The file is read by
+        aiohttp in the default executor of the event loop instead.
+
+        Args:
+          resource_path: Path of the API method, e.g.
+            /apis/v1beta1/pipelines/upload.
+          query_params: Query parameters of the request. The parameters which
+            are None are not sent.
+          file_path: Local path of the uploaded file.
+          file_name: Name of the uploaded file.
+          response_type: Type of the response, e.g. ApiPipeline.
+          field_name: Name of the form field of the file.
+
+        Returns:
+          The deserialized response.
+
+        Raises:
+          ApiException: if the response has an error status.
+        """
+        query_params = [
+            (name, value) for name, value in query_params if value is not None
+        ]
+        url, query_params, header_params, _, _ = self._prepare_request(
+            resource_path, None, query_params, {
+                'Accept': 'application/json',
+                'Content-Type': 'multipart/form-data'
+            }, None, None, None, ['Bearer'], None, None)
+        # The file is opened by each attempt of the request.
+        post_params = [(field_name, (file_name, pathlib.Path(file_path),
+                                     'application/octet-stream'))]
+        return await self._call_api_async('POST', url, query_params,
+                                          header_params, None, post_params,
+                                          response_type, True, None)
+
+    async def _call_api_async(self, method, url, query_params, header_params,
+                              body, post_params, response_type,
+                              return_http_data_only, request_timeout):
+        try:
+            response_data = await self.rest_client.request(
+                method,
+                url,
+                query_params=query_params,
+                headers=header_params,
+                body=body,
+                post_params=post_params,
+                _request_timeout=request_timeout)
+        except rest.ApiException as e:
+            if isinstance(e.body, bytes):
+                e.body = e.body.decode('utf-8')
+            raise e
+
+        self.last_response = response_data
+        if response_type not in ['file', 'bytes']:
+            content_type = response_data.getheader('content-type')
+            match = content_type and _CHARSET_PATTERN.search(content_type)
+            encoding = match.group(1) if match else 'utf-8'
+            response_data.data = response_data.data.decode(encoding)
+
+        if response_type:
+            return_data = self.deserialize(response_data, response_type)
+        else:
+            return_data = None
+        if return_http_data_only:
+            return return_data
+        return (return_data, response_data.status, response_data.getheaders())
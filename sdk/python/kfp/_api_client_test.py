@@ -0,0 +1,130 @@
+# Copyright 2021 The Kubeflow Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import unittest
+from collections import namedtuple
+
+import kfp_server_api
+
+from kfp._api_client import FastApiClient, raw_responses
+
+_Response = namedtuple('_Response', ['data'])
+
+_LIST_RUNS_RESPONSE = {
+    'runs': [{
+        'id':
+            'run-1',
+        'name':
+            'Run 1',
+        'created_at':
+            '2021-06-01T12:34:56Z',
+        'scheduled_at':
+            '1970-01-01T00:00:00Z',
+        'finished_at':
+            '2021-06-01T12:40:00.123456789Z',
+        'status':
+            'Succeeded',
+        'pipeline_spec': {
+            'workflow_manifest': json.dumps({'kind': 'Workflow'}),
+            'parameters': [{
+                'name': 'param',
+                'value': 'value'
+            }],
+        },
+        'resource_references': [{
+            'key': {
+                'type': 'EXPERIMENT',
+                'id': 'experiment-1'
+            },
+            'relationship': 'OWNER',
+        }],
+        'metrics': [{
+            'name': 'accuracy',
+            'node_id': 'node-1',
+            'number_value': 0.5,
+            'format': 'PERCENTAGE',
+        }],
+    }, {
+        'id': 'run-2',
+        'created_at': '2021-06-01T12:34:56.5+02:00',
+        'storage_state': 'STORAGESTATE_ARCHIVED',
+    }],
+    'total_size': '2',
+    'next_page_token': 'token',
+}
+
+
+class FastApiClientTest(unittest.TestCase):
+
+    def _deserialize_both(self, obj, response_type):
+        response = _Response(json.dumps(obj))
+        return (kfp_server_api.ApiClient().deserialize(response, response_type),
+                FastApiClient().deserialize(response, response_type))
+
+    def test_deserialize_same_as_generated_client(self):
+        expected, actual = self._deserialize_both(_LIST_RUNS_RESPONSE,
+                                                  'ApiListRunsResponse')
+
+        self.assertIsInstance(actual, kfp_server_api.ApiListRunsResponse)
+        self.assertEqual(expected, actual)
+        self.assertEqual(2, actual.total_size)
+        for expected_run, run in zip(expected.runs, actual.runs):
+            self.assertIsInstance(run, kfp_server_api.ApiRun)
+            # The time zones are the same objects as well.
+            self.assertEqual(
+                repr(expected_run.created_at), repr(run.created_at))
+            self.assertEqual(
+                repr(expected_run.finished_at), repr(run.finished_at))
+        self.assertIsInstance(actual.runs[0].resource_references[0].key,
+                              kfp_server_api.ApiResourceKey)
+
+    def test_deserialize_collections_and_primitives(self):
+        for obj, response_type in [
+            ([{
+                'id': 'run-1'
+            }, None], 'list[ApiRun]'),
+            ({
+                'a': '1',
+                'b': None
+            }, 'dict(str, int)'),
+            ('1.5', 'float'),
+            ({}, 'ApiListRunsResponse'),
+            ({
+                'a': [1]
+            }, 'object'),
+            (None, 'ApiRun'),
+        ]:
+            expected, actual = self._deserialize_both(obj, response_type)
+            self.assertEqual(expected, actual)
+
+    def test_setters_validate_values(self):
+        response = _Response(json.dumps({'value': '!'}))
+        with self.assertRaisesRegex(ValueError, 'Invalid value for `value`'):
+            FastApiClient().deserialize(response, 'ProtobufAny')
+
+    def test_raw_responses(self):
+        response = _Response(json.dumps(_LIST_RUNS_RESPONSE))
+        api_client = FastApiClient()
+        with raw_responses():
+            self.assertEqual(
+                _LIST_RUNS_RESPONSE,
+                api_client.deserialize(response, 'ApiListRunsResponse'))
+        self.assertIsInstance(
+            api_client.deserialize(response, 'ApiListRunsResponse'),
+            kfp_server_api.ApiListRunsResponse)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,726 @@
+# Copyright 2021 The Kubeflow Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Asyncio client of the Kubeflow Pipelines API server."""
+
+import asyncio
+import datetime
+import functools
+import json
+import logging
+import os
+import tempfile
+from typing import (Any, AsyncIterator, Awaitable, Callable, Iterable, Mapping,
+                    Optional)
+
+import kfp_server_api
+
+from kfp import _api_client, dsl
+from kfp._client import (_FILTER_OPERATIONS, _MAX_PAGE_SIZE,
+                         _RUN_COMPLETED_STATUSES, RunPipelineResult,
+                         _ClientBase, _get_response_field, _read_run_detail,
+                         _RunsWaiter)
+from kfp.compiler import compiler
+
+
+async def _aiter_pages(list_page: Callable[[str], Awaitable[Any]],
+                       items_attribute: str) -> AsyncIterator[Any]:
+    """Asyncio variant of kfp._client._iter_pages.
+
+    The next page is fetched by a task while the items of the current page
+    are consumed.
+    """
+    next_response_task = None
+    try:
+        response = await list_page('')
+        while True:
+            if isinstance(response, dict):  # Raw responses
+                page_token = response.get('next_page_token')
+                items = response.get(items_attribute)
+            else:
+                page_token = response.next_page_token
+                items = getattr(response, items_attribute)
+            next_response_task = (
+                asyncio.ensure_future(list_page(page_token))
+                if page_token else None)
+            for item in items or []:
+                yield item
+            if next_response_task is None:
+                return
+            response = await next_response_task
+    finally:
+        # Does not fetch a page the caller no longer needs.
+        if next_response_task is not None:
+            next_response_task.cancel()
+
+
+class AsyncClient(_ClientBase):
+    """Asyncio client of the Kubeflow Pipelines API server.
+
+    The methods of AsyncClient are coroutines, or asynchronous iterators for
+    the iter_* methods, mirroring the methods of Client. The requests are
+    sent with aiohttp, installed with `pip install kfp[async]`, and share the
+    connection pool of the client. The client is used by a single event
+    loop, and is closed with close() or by using it as an asynchronous
+    context manager::
+
+      async with kfp.AsyncClient(host=host) as client:
+        result = await client.create_run_from_pipeline_package(
+            'pipeline.yaml', arguments={})
+        run_detail = await result.wait_for_run_completion(timeout=3600)
+
+    Unlike Client, the constructor does not call the API server, so the
+    namespace of multi-user deployments is not set automatically. Pass the
+    namespace to the methods, or use set_user_namespace.
+
+    Args:
+      host: See Client. The arguments from host to ui_host are the same as
+        those of Client.
+      client_id: See Client.
+      namespace: See Client.
+      other_client_id: See Client.
+      other_client_secret: See Client.
+      existing_token: See Client.
+      cookies: See Client.
+      proxy: See Client.
+      ssl_ca_cert: See Client.
+      kube_context: See Client.
+      credentials: See Client.
+      ui_host: See Client.
+      connection_pool_maxsize: Maximum number of connections to the API
+        server. The requests wait for a free connection when all of them are
+        in use.
+      retries: Number of retries of the failed requests, with exponential
+        backoff. Connection errors are retried for all the requests, read
+        errors and 502, 503 and 504 statuses only for the idempotent ones.
+      retry_backoff_factor: Backoff factor of the retries, in seconds. The
+        n-th retry waits retry_backoff_factor * 2 ** (n - 1) seconds.
+      request_timeout: Timeout of the requests in seconds, or a (connect
+        timeout, read timeout) pair. No timeout by default.
+    """
+
+    def __init__(self,
+                 host=None,
+                 client_id=None,
+                 namespace='kubeflow',
+                 other_client_id=None,
+                 other_client_secret=None,
+                 existing_token=None,
+                 cookies=None,
+                 proxy=None,
+                 ssl_ca_cert=None,
+                 kube_context=None,
+                 credentials=None,
+                 ui_host=None,
+                 connection_pool_maxsize=100,
+                 retries=0,
+                 retry_backoff_factor=0.5,
+                 request_timeout=None):
+        super().__init__(host, client_id, namespace, other_client_id,
+                         other_client_secret, existing_token, cookies, proxy,
+                         ssl_ca_cert, kube_context, credentials, ui_host)
+        rest_client = _api_client.AsyncRESTClientObject(
+            self._existing_config,
+            maxsize=connection_pool_maxsize,
+            retries=retries,
+            backoff_factor=retry_backoff_factor,
+            request_timeout=request_timeout)
+        self._api_client = self._create_api_client(_api_client.AsyncApiClient,
+                                                   rest_client)
+        self._job_api = kfp_server_api.JobServiceApi(self._api_client)
+        self._run_api = kfp_server_api.RunServiceApi(self._api_client)
+        self._experiment_api = kfp_server_api.ExperimentServiceApi(
+            self._api_client)
+        self._pipelines_api = kfp_server_api.PipelineServiceApi(
+            self._api_client)
+        self._healthz_api = kfp_server_api.HealthzServiceApi(self._api_client)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    async def close(self):
+        """Closes the connections of the client."""
+        await self._api_client.rest_client.close()
+
+    async def _run_in_executor(self, function: Callable, *args, **kwargs):
+        """Runs blocking work, e.g. compiling or loading a pipeline, in the
+        default executor of the event loop."""
+        return await asyncio.get_running_loop().run_in_executor(
+            None, functools.partial(function, *args, **kwargs))
+
+    async def get_kfp_healthz(self):
+        """Asyncio variant of Client.get_kfp_healthz."""
+        max_attempts = 5
+        for count in range(1, max_attempts + 1):
+            try:
+                return await self._healthz_api.get_healthz()
+            # ApiException, including network errors, is the only type that may
+            # recover after retry.
+            except kfp_server_api.ApiException:
+                logging.exception(
+                    'Failed to get healthz info attempt {} of {}.'.format(
+                        count, max_attempts))
+                if count < max_attempts:
+                    await asyncio.sleep(5)
+        raise TimeoutError(
+            'Failed getting healthz endpoint after {} attempts.'.format(
+                max_attempts))
+
+    async def create_experiment(self, name, description=None, namespace=None):
+        """Asyncio variant of Client.create_experiment."""
+        namespace = namespace or self.get_user_namespace()
+        try:
+            return await self.get_experiment(
+                experiment_name=name, namespace=namespace)
+        except ValueError as error:
+            # Ignore error if the experiment does not exist.
+            if not str(error).startswith('No experiment is found with name'):
+                raise error
+
+        logging.info('Creating experiment {}.'.format(name))
+        resource_references = []
+        if namespace:
+            key = kfp_server_api.models.ApiResourceKey(
+                id=namespace,
+                type=kfp_server_api.models.ApiResourceType.NAMESPACE)
+            reference = kfp_server_api.models.ApiResourceReference(
+                key=key,
+                relationship=kfp_server_api.models.ApiRelationship.OWNER)
+            resource_references.append(reference)
+        experiment = kfp_server_api.models.ApiExperiment(
+            name=name,
+            description=description,
+            resource_references=resource_references)
+        return await self._experiment_api.create_experiment(body=experiment)
+
+    async def get_experiment(self,
+                             experiment_id=None,
+                             experiment_name=None,
+                             namespace=None):
+        """Asyncio variant of Client.get_experiment."""
+        namespace = namespace or self.get_user_namespace()
+        if experiment_id is None and experiment_name is None:
+            raise ValueError(
+                'Either experiment_id or experiment_name is required')
+        if experiment_id is not None:
+            return await self._experiment_api.get_experiment(id=experiment_id)
+        experiment_filter = json.dumps({
+            "predicates": [{
+                "op": _FILTER_OPERATIONS["EQUALS"],
+                "key": "name",
+                "stringValue": experiment_name,
+            }]
+        })
+        if namespace:
+            result = await self._experiment_api.list_experiment(
+                filter=experiment_filter,
+                resource_reference_key_type=kfp_server_api.models
+                .ApiResourceType.NAMESPACE,
+                resource_reference_key_id=namespace)
+        else:
+            result = await self._experiment_api.list_experiment(
+                filter=experiment_filter)
+        experiments = _get_response_field(result, 'experiments')
+        if not experiments:
+            raise ValueError(
+                'No experiment is found with name {}.'.format(experiment_name))
+        if len(experiments) > 1:
+            raise ValueError(
+                'Multiple experiments is found with name {}.'.format(
+                    experiment_name))
+        return experiments[0]
+
+    async def list_experiments(self,
+                               page_token='',
+                               page_size=10,
+                               sort_by='',
+                               namespace=None,
+                               filter=None):
+        """Asyncio variant of Client.list_experiments."""
+        namespace = namespace or self.get_user_namespace()
+        return await self._experiment_api.list_experiment(
+            page_token=page_token,
+            page_size=page_size,
+            sort_by=sort_by,
+            resource_reference_key_type=kfp_server_api.models.ApiResourceType
+            .NAMESPACE,
+            resource_reference_key_id=namespace,
+            filter=filter)
+
+    def iter_experiments(self,
+                         page_size=_MAX_PAGE_SIZE,
+                         sort_by='',
+                         namespace=None,
+                         filter=None) -> AsyncIterator[Any]:
+        """Asyncio variant of Client.iter_experiments.
+
+        Example::
+
+          async for experiment in client.iter_experiments():
+            print(experiment.id, experiment.name)
+        """
+        return _aiter_pages(
+            lambda page_token: self.list_experiments(
+                page_token=page_token,
+                page_size=page_size,
+                sort_by=sort_by,
+                namespace=namespace,
+                filter=filter), 'experiments')
+
+    async def delete_experiment(self, experiment_id):
+        """Asyncio variant of Client.delete_experiment."""
+        return await self._experiment_api.delete_experiment(id=experiment_id)
+
+    async def get_pipeline_id(self, name):
+        """Asyncio variant of Client.get_pipeline_id."""
+        pipeline_filter = json.dumps({
+            "predicates": [{
+                "op": _FILTER_OPERATIONS["EQUALS"],
+                "key": "name",
+                "stringValue": name,
+            }]
+        })
+        pipelines = _get_response_field(
+            await self._pipelines_api.list_pipelines(filter=pipeline_filter),
+            'pipelines')
+        if pipelines is None:
+            return None
+        if len(pipelines) == 1:
+            return _get_response_field(pipelines[0], 'id')
+        elif len(pipelines) > 1:
+            raise ValueError(
+                "Multiple pipelines with the name: {} found, the name needs to be unique"
+                .format(name))
+        return None
+
+    async def list_pipelines(self,
+                             page_token='',
+                             page_size=10,
+                             sort_by='',
+                             filter=None):
+        """Asyncio variant of Client.list_pipelines."""
+        return await self._pipelines_api.list_pipelines(
+            page_token=page_token,
+            page_size=page_size,
+            sort_by=sort_by,
+            filter=filter)
+
+    def iter_pipelines(self,
+                       page_size=_MAX_PAGE_SIZE,
+                       sort_by='',
+                       filter=None) -> AsyncIterator[Any]:
+        """Asyncio variant of Client.iter_pipelines."""
+        return _aiter_pages(
+            lambda page_token: self.list_pipelines(
+                page_token=page_token,
+                page_size=page_size,
+                sort_by=sort_by,
+                filter=filter), 'pipelines')
+
+    async def get_pipeline(self, pipeline_id):
+        """Asyncio variant of Client.get_pipeline."""
+        return await self._pipelines_api.get_pipeline(id=pipeline_id)
+
+    async def delete_pipeline(self, pipeline_id):
+        """Asyncio variant of Client.delete_pipeline."""
+        return await self._pipelines_api.delete_pipeline(id=pipeline_id)
+
+    async def upload_pipeline(
+        self,
+        pipeline_package_path: str = None,
+        pipeline_name: str = None,
+        description: str = None,
+    ):
+        """Asyncio variant of Client.upload_pipeline.
+
+        The package is streamed from the disk, read in the default executor
+        of the event loop.
+        """
+        return await self._api_client.upload_file(
+            '/apis/v1beta1/pipelines/upload',
+            [('name', pipeline_name or os.path.basename(pipeline_package_path)),
+             ('description', description)],
+            pipeline_package_path,
+            os.path.basename(pipeline_package_path),
+            response_type='ApiPipeline')
+
+    async def upload_pipeline_version(self,
+                                      pipeline_package_path,
+                                      pipeline_version_name: str,
+                                      pipeline_id: Optional[str] = None,
+                                      pipeline_name: Optional[str] = None):
+        """Asyncio variant of Client.upload_pipeline_version.
+
+        The package is streamed from the disk, read in the default executor
+        of the event loop.
+        """
+        if all([pipeline_id, pipeline_name
+               ]) or not any([pipeline_id, pipeline_name]):
+            raise ValueError('Either pipeline_id or pipeline_name is required')
+
+        if pipeline_name:
+            pipeline_id = await self.get_pipeline_id(pipeline_name)
+
+        return await self._api_client.upload_file(
+            '/apis/v1beta1/pipelines/upload_version',
+            [('name', pipeline_version_name or
+              os.path.basename(pipeline_package_path)),
+             ('pipelineid', pipeline_id)],
+            pipeline_package_path,
+            os.path.basename(pipeline_package_path),
+            response_type='ApiPipelineVersion')
+
+    async def list_pipeline_versions(self,
+                                     pipeline_id,
+                                     page_token='',
+                                     page_size=10,
+                                     sort_by='',
+                                     filter=None):
+        """Asyncio variant of Client.list_pipeline_versions."""
+        return await self._pipelines_api.list_pipeline_versions(
+            page_token=page_token,
+            page_size=page_size,
+            sort_by=sort_by,
+            resource_key_type=kfp_server_api.models.ApiResourceType.PIPELINE,
+            resource_key_id=pipeline_id,
+            filter=filter)
+
+    def iter_pipeline_versions(self,
+                               pipeline_id,
+                               page_size=_MAX_PAGE_SIZE,
+                               sort_by='',
+                               filter=None) -> AsyncIterator[Any]:
+        """Asyncio variant of Client.iter_pipeline_versions."""
+        return _aiter_pages(
+            lambda page_token: self.list_pipeline_versions(
+                pipeline_id,
+                page_token=page_token,
+                page_size=page_size,
+                sort_by=sort_by,
+                filter=filter), 'versions')
+
+    async def run_pipeline(
+        self,
+        experiment_id: str,
+        job_name: str,
+        pipeline_package_path: Optional[str] = None,
+        params: Optional[dict] = None,
+        pipeline_id: Optional[str] = None,
+        version_id: Optional[str] = None,
+        pipeline_root: Optional[str] = None,
+        enable_caching: Optional[str] = None,
+        service_account: Optional[str] = None,
+    ):
+        """Asyncio variant of Client.run_pipeline.
+
+        The pipeline package is loaded in the default executor of the event
+        loop.
+        """
+        run_body = await self._run_in_executor(
+            self._create_run_body,
+            experiment_id=experiment_id,
+            job_name=job_name,
+            pipeline_package_path=pipeline_package_path,
+            params=params,
+            pipeline_id=pipeline_id,
+            version_id=version_id,
+            pipeline_root=pipeline_root,
+            enable_caching=enable_caching,
+            service_account=service_account,
+        )
+        response = await self._run_api.create_run(body=run_body)
+        return _get_response_field(response, 'run')
+
+    async def create_recurring_run(
+        self,
+        experiment_id: str,
+        job_name: str,
+        description: Optional[str] = None,
+        start_time: Optional[str] = None,
+        end_time: Optional[str] = None,
+        interval_second: Optional[int] = None,
+        cron_expression: Optional[str] = None,
+        max_concurrency: Optional[int] = 1,
+        no_catchup: Optional[bool] = None,
+        params: Optional[dict] = None,
+        pipeline_package_path: Optional[str] = None,
+        pipeline_id: Optional[str] = None,
+        version_id: Optional[str] = None,
+        enabled: bool = True,
+        enable_caching: Optional[bool] = None,
+        service_account: Optional[str] = None,
+    ):
+        """Asyncio variant of Client.create_recurring_run.
+
+        The pipeline package is loaded in the default executor of the event
+        loop.
+        """
+        job_body = await self._run_in_executor(
+            self._create_job_body,
+            experiment_id=experiment_id,
+            job_name=job_name,
+            description=description,
+            start_time=start_time,
+            end_time=end_time,
+            interval_second=interval_second,
+            cron_expression=cron_expression,
+            max_concurrency=max_concurrency,
+            no_catchup=no_catchup,
+            params=params,
+            pipeline_package_path=pipeline_package_path,
+            pipeline_id=pipeline_id,
+            version_id=version_id,
+            enabled=enabled,
+            enable_caching=enable_caching,
+            service_account=service_account,
+        )
+        return await self._job_api.create_job(body=job_body)
+
+    async def create_run_from_pipeline_func(
+        self,
+        pipeline_func: Callable,
+        arguments: Mapping[str, str],
+        run_name: Optional[str] = None,
+        experiment_name: Optional[str] = None,
+        pipeline_conf: Optional[dsl.PipelineConf] = None,
+        namespace: Optional[str] = None,
+        mode: dsl.PipelineExecutionMode = dsl.PipelineExecutionMode.V1_LEGACY,
+        launcher_image: Optional[str] = None,
+        pipeline_root: Optional[str] = None,
+        enable_caching: Optional[bool] = None,
+        service_account: Optional[str] = None,
+    ):
+        """Asyncio variant of Client.create_run_from_pipeline_func.
+
+        The pipeline is compiled in the default executor of the event loop.
+        """
+        if pipeline_root is not None and mode == dsl.PipelineExecutionMode.V1_LEGACY:
+            raise ValueError('`pipeline_root` should not be used with '
+                             'dsl.PipelineExecutionMode.V1_LEGACY mode.')
+
+        pipeline_name = pipeline_func.__name__
+        run_name = run_name or pipeline_name + ' ' + datetime.datetime.now(
+        ).strftime('%Y-%m-%d %H-%M-%S')
+        with tempfile.TemporaryDirectory() as tmpdir:
+            pipeline_package_path = os.path.join(tmpdir, 'pipeline.yaml')
+            await self._run_in_executor(
+                compiler.Compiler(mode=mode,
+                                  launcher_image=launcher_image).compile,
+                pipeline_func=pipeline_func,
+                package_path=pipeline_package_path,
+                pipeline_conf=pipeline_conf)
+
+            return await self.create_run_from_pipeline_package(
+                pipeline_file=pipeline_package_path,
+                arguments=arguments,
+                run_name=run_name,
+                experiment_name=experiment_name,
+                namespace=namespace,
+                pipeline_root=pipeline_root,
+                enable_caching=enable_caching,
+                service_account=service_account,
+            )
+
+    async def create_run_from_pipeline_package(
+        self,
+        pipeline_file: str,
+        arguments: Mapping[str, str],
+        run_name: Optional[str] = None,
+        experiment_name: Optional[str] = None,
+        namespace: Optional[str] = None,
+        pipeline_root: Optional[str] = None,
+        enable_caching: Optional[bool] = None,
+        service_account: Optional[str] = None,
+    ) -> RunPipelineResult:
+        """Asyncio variant of Client.create_run_from_pipeline_package.
+
+        The wait_for_run_completion method of the result is a coroutine as
+        well.
+        """
+        pipeline_name = os.path.basename(pipeline_file)
+        experiment_name = self._get_experiment_name(experiment_name)
+        run_name = run_name or (
+            pipeline_name + ' ' +
+            datetime.datetime.now().strftime('%Y-%m-%d %H-%M-%S'))
+        # The experiment and the run are read.
+        with _api_client.model_responses():
+            experiment = await self.create_experiment(
+                name=experiment_name, namespace=namespace)
+            run_info = await self.run_pipeline(
+                experiment_id=experiment.id,
+                job_name=run_name,
+                pipeline_package_path=pipeline_file,
+                params=arguments,
+                pipeline_root=pipeline_root,
+                enable_caching=enable_caching,
+                service_account=service_account,
+            )
+        return RunPipelineResult(self, run_info)
+
+    async def list_runs(self,
+                        page_token='',
+                        page_size=10,
+                        sort_by='',
+                        experiment_id=None,
+                        namespace=None,
+                        filter=None):
+        """Asyncio variant of Client.list_runs."""
+        namespace = namespace or self.get_user_namespace()
+        resource_reference_kwargs = {}
+        if experiment_id is not None:
+            resource_reference_kwargs = dict(
+                resource_reference_key_type=kfp_server_api.models
+                .ApiResourceType.EXPERIMENT,
+                resource_reference_key_id=experiment_id)
+        elif namespace:
+            resource_reference_kwargs = dict(
+                resource_reference_key_type=kfp_server_api.models
+                .ApiResourceType.NAMESPACE,
+                resource_reference_key_id=namespace)
+        return await self._run_api.list_runs(
+            page_token=page_token,
+            page_size=page_size,
+            sort_by=sort_by,
+            filter=filter,
+            **resource_reference_kwargs)
+
+    def iter_runs(self,
+                  page_size=_MAX_PAGE_SIZE,
+                  sort_by='',
+                  experiment_id=None,
+                  namespace=None,
+                  filter=None) -> AsyncIterator[Any]:
+        """Asyncio variant of Client.iter_runs.
+
+        Example::
+
+          async for run in client.iter_runs(experiment_id=experiment_id):
+            print(run.id, run.status)
+        """
+        return _aiter_pages(
+            lambda page_token: self.list_runs(
+                page_token=page_token,
+                page_size=page_size,
+                sort_by=sort_by,
+                experiment_id=experiment_id,
+                namespace=namespace,
+                filter=filter), 'runs')
+
+    async def get_run(self, run_id):
+        """Asyncio variant of Client.get_run."""
+        return await self._run_api.get_run(run_id=run_id)
+
+    async def list_recurring_runs(self,
+                                  page_token='',
+                                  page_size=10,
+                                  sort_by='',
+                                  experiment_id=None,
+                                  filter=None):
+        """Asyncio variant of Client.list_recurring_runs."""
+        resource_reference_kwargs = {}
+        if experiment_id is not None:
+            resource_reference_kwargs = dict(
+                resource_reference_key_type=kfp_server_api.models
+                .ApiResourceType.EXPERIMENT,
+                resource_reference_key_id=experiment_id)
+        return await self._job_api.list_jobs(
+            page_token=page_token,
+            page_size=page_size,
+            sort_by=sort_by,
+            filter=filter,
+            **resource_reference_kwargs)
+
+    def iter_recurring_runs(self,
+                            page_size=_MAX_PAGE_SIZE,
+                            sort_by='',
+                            experiment_id=None,
+                            filter=None) -> AsyncIterator[Any]:
+        """Asyncio variant of Client.iter_recurring_runs."""
+        return _aiter_pages(
+            lambda page_token: self.list_recurring_runs(
+                page_token=page_token,
+                page_size=page_size,
+                sort_by=sort_by,
+                experiment_id=experiment_id,
+                filter=filter), 'jobs')
+
+    async def get_recurring_run(self, job_id):
+        """Asyncio variant of Client.get_recurring_run."""
+        return await self._job_api.get_job(id=job_id)
+
+    async def wait_for_run_completion(self, run_id, timeout):
+        """Asyncio variant of Client.wait_for_run_completion.
+
+        The run is polled every 5 seconds, until it completes.
+        """
+        loop = asyncio.get_running_loop()
+        if isinstance(timeout, datetime.timedelta):
+            timeout = timeout.total_seconds()
+        deadline = loop.time() + timeout
+        while True:
+            # The token is refreshed by a command line tool, when needed.
+            await self._run_in_executor(
+                self._refresh_api_client_token_if_expiring)
+            # The polls only read the status of the run, so the responses
+            # are not deserialized.
+            with _api_client.raw_responses():
+                run_detail = await self._run_api.get_run(run_id=run_id)
+            status, _ = _read_run_detail(run_detail)
+            if status is not None and status.lower() in _RUN_COMPLETED_STATUSES:
+                return self._api_client.deserialize_data(
+                    run_detail, 'ApiRunDetail')
+            if loop.time() > deadline:
+                raise TimeoutError('Run timeout')
+            logging.info('Waiting for the job to complete...')
+            await asyncio.sleep(5)
+
+    async def wait_for_runs(self,
+                            run_ids: Iterable[str],
+                            timeout: Optional[float] = None,
+                            namespace: Optional[str] = None,
+                            min_poll_interval: float = 5,
+                            max_poll_interval: float = 60,
+                            batch_size: int = 100) -> AsyncIterator[Any]:
+        """Asyncio variant of Client.wait_for_runs.
+
+        Example::
+
+          async for run in client.wait_for_runs(run_ids, timeout=3600):
+            print(run.id, run.status)
+        """
+        waiter = _RunsWaiter(run_ids, timeout, namespace, min_poll_interval,
+                             max_poll_interval, batch_size)
+        while True:
+            await self._run_in_executor(
+                self._refresh_api_client_token_if_expiring)
+            listed_runs = []
+            for list_runs_kwargs in waiter.get_list_runs_kwargs():
+                listed_runs.extend(
+                    [run async for run in self.iter_runs(**list_runs_kwargs)])
+            # Raises for the runs which do not exist.
+            run_details = await asyncio.gather(*[
+                self.get_run(run_id)
+                for run_id in waiter.get_unlisted_run_ids(listed_runs)
+            ])
+            unlisted_runs = [
+                _get_response_field(run_detail, 'run')
+                for run_detail in run_details
+            ]
+            for run in waiter.add_polled_runs(listed_runs + unlisted_runs):
+                yield run
+            if waiter.done:
+                return
+            await asyncio.sleep(waiter.get_sleep_seconds())
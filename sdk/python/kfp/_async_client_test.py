@@ -0,0 +1,369 @@
+# Copyright 2021 The Kubeflow Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import json
+import os
+import socket
+import tempfile
+import unittest
+from unittest import mock
+
+from kfp import AsyncClient, compiler
+from kfp._api_client import AsyncApiClient, AsyncRESTClientObject
+from kfp._client_test import _echo_pipeline, _FakeApiServerTestCase
+from kfp_server_api.exceptions import ApiException
+
+
+class AsyncClientTest(_FakeApiServerTestCase):
+
+    def _create_client(self, **kwargs) -> AsyncClient:
+        return AsyncClient(
+            host='http://127.0.0.1:{}'.format(self.server.server_address[1]),
+            **kwargs)
+
+    def _run(self, coroutine_function, **client_kwargs):
+        """Runs coroutine_function(client) with a new client."""
+
+        async def run():
+            async with self._create_client(**client_kwargs) as client:
+                return await coroutine_function(client)
+
+        return asyncio.run(run())
+
+    def test_iter_experiments(self):
+        self.server.num_experiments = 5
+
+        async def list_experiment_ids(client):
+            return [
+                experiment.id
+                async for experiment in client.iter_experiments(page_size=2)
+            ]
+
+        self.assertEqual(['experiment-{}'.format(i) for i in range(5)],
+                         self._run(list_experiment_ids))
+        self.assertEqual([None, '2', '4'], [
+            query.get('page_token', [None])[0]
+            for query in self.server.experiment_queries
+        ])
+
+    def test_iter_experiments_raw_responses(self):
+        self.server.num_experiments = 3
+
+        async def list_experiments(client):
+            with client.raw_responses():
+                return [
+                    experiment
+                    async for experiment in client.iter_experiments(page_size=2)
+                ]
+
+        self.assertEqual([{
+            'id': 'experiment-{}'.format(i),
+            'name': 'Experiment {}'.format(i)
+        } for i in range(3)], self._run(list_experiments))
+
+    def test_iter_experiments_stops_fetching_when_closed(self):
+        self.server.num_experiments = 10
+
+        async def get_first_experiment(client):
+            experiments = client.iter_experiments(page_size=2)
+            experiment = await experiments.__anext__()
+            await experiments.aclose()
+            return experiment
+
+        self.assertEqual('experiment-0', self._run(get_first_experiment).id)
+        # Only the next page may have been prefetched.
+        self.assertLessEqual(len(self.server.experiment_queries), 2)
+
+    def test_iter_runs(self):
+        run_ids = ['run-{}'.format(i) for i in range(5)]
+        self.server.polls = {run_id: 1 for run_id in run_ids}
+        run_filter = json.dumps({
+            'predicates': [{
+                'op': 8,
+                'key': 'id',
+                'stringValues': {
+                    'values': run_ids
+                }
+            }]
+        })
+
+        async def list_runs(client):
+            return [
+                run async for run in client.iter_runs(
+                    page_size=2, filter=run_filter)
+            ]
+
+        runs = self._run(list_runs)
+        self.assertEqual(run_ids, [run.id for run in runs])
+        self.assertEqual(['Succeeded'] * 5, [run.status for run in runs])
+
+    def test_create_run_from_pipeline_package(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            package_path = os.path.join(temp_dir, 'pipeline.yaml')
+            compiler.Compiler().compile(_echo_pipeline, package_path)
+
+            async def create_run(client):
+                return await client.create_run_from_pipeline_package(
+                    package_path, {'message': 'hello'}, run_name='echo')
+
+            result = self._run(create_run)
+
+        self.assertEqual('run-1', result.run_id)
+        [run] = self.server.created_runs
+        self.assertEqual('echo', run['name'])
+        self.assertEqual([{
+            'name': 'message',
+            'value': 'hello'
+        }], run['pipeline_spec']['parameters'])
+        self.assertEqual(
+            'Workflow',
+            json.loads(run['pipeline_spec']['workflow_manifest'])['kind'])
+        self.assertIn(
+            {
+                'key': {
+                    'id': 'experiment-new',
+                    'type': 'EXPERIMENT'
+                },
+                'relationship': 'OWNER'
+            }, run['resource_references'])
+
+    def test_experiments_raw_responses(self):
+
+        async def get_experiments(client):
+            with client.raw_responses():
+                created_experiment = await client.create_experiment(
+                    name='Experiment')
+                self.server.num_experiments = 1
+                experiment = await client.get_experiment(
+                    experiment_name='Experiment 0')
+                run_info = await client.run_pipeline(
+                    experiment['id'], 'echo', pipeline_id='pipeline-0')
+                return created_experiment, experiment, run_info
+
+        created_experiment, experiment, run_info = self._run(get_experiments)
+
+        self.assertEqual('experiment-new', created_experiment['id'])
+        self.assertEqual({
+            'id': 'experiment-0',
+            'name': 'Experiment 0'
+        }, experiment)
+        self.assertEqual('run-1', run_info['id'])
+
+    def test_create_run_from_pipeline_package_within_raw_responses(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            package_path = os.path.join(temp_dir, 'pipeline.yaml')
+            compiler.Compiler().compile(_echo_pipeline, package_path)
+
+            async def create_run(client):
+                with client.raw_responses():
+                    return await client.create_run_from_pipeline_package(
+                        package_path, {'message': 'hello'}, run_name='echo')
+
+            result = self._run(create_run)
+
+        self.assertEqual('run-1', result.run_id)
+        self.assertEqual('run-1', result.run_info.id)
+
+    def test_wait_for_run_completion(self):
+        self.server.run_details['run-a'] = {
+            'run': {
+                'id': 'run-a',
+                'status': 'Succeeded'
+            }
+        }
+
+        async def wait(client):
+            return await client.wait_for_run_completion('run-a', timeout=60)
+
+        run_detail = self._run(wait)
+        self.assertEqual('run-a', run_detail.run.id)
+        self.assertEqual('Succeeded', run_detail.run.status)
+
+    def test_wait_for_runs(self):
+        self.server.polls = {'run-a': 2, 'run-b': 1}
+        self.server.run_details['run-c'] = {
+            'run': {
+                'id': 'run-c',
+                'status': 'Running'
+            }
+        }
+
+        async def wait(client):
+            runs = []
+            async for run in client.wait_for_runs(['run-a', 'run-b', 'run-c'],
+                                                  min_poll_interval=0.01):
+                runs.append(run)
+                self.server.run_details['run-c']['run']['status'] = 'Succeeded'
+            return runs
+
+        runs = self._run(wait)
+        self.assertEqual(['run-b', 'run-a', 'run-c'], [run.id for run in runs])
+        self.assertEqual(['Succeeded'] * 3, [run.status for run in runs])
+
+    def test_wait_for_runs_raw_responses(self):
+        self.server.polls = {'run-a': 2, 'run-b': 1}
+
+        async def wait(client):
+            with client.raw_responses():
+                return [
+                    run async for run in client.wait_for_runs(
+                        ['run-a', 'run-b'], min_poll_interval=0.01)
+                ]
+
+        self.assertEqual(['run-b', 'run-a'],
+                         [run['id'] for run in self._run(wait)])
+
+    def test_wait_for_runs_raises_for_missing_runs(self):
+        self.server.polls = {'run-a': 1000}
+
+        async def wait(client):
+            return [
+                run
+                async for run in client.wait_for_runs(['run-a', 'run-missing'],
+                                                      min_poll_interval=0.01)
+            ]
+
+        with self.assertRaises(ApiException) as context:
+            self._run(wait)
+        self.assertEqual(404, context.exception.status)
+
+    def test_upload_pipeline(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            package_path = os.path.join(temp_dir, 'pipeline.yaml')
+            compiler.Compiler().compile(_echo_pipeline, package_path)
+
+            async def upload(client):
+                return await client.upload_pipeline(
+                    package_path, pipeline_name='echo')
+
+            # The package is not read on the event loop.
+            with mock.patch.object(
+                    AsyncApiClient,
+                    'files_parameters',
+                    side_effect=AssertionError('Read the package.')):
+                pipeline = self._run(upload)
+            with open(package_path, 'rb') as f:
+                package = f.read()
+
+        self.assertEqual('pipeline-new', pipeline.id)
+        self.assertIn('name=echo', self.server.uploads[0])
+        self.assertIn(b'filename="pipeline.yaml"', self.server.upload_bodies[0])
+        self.assertIn(package, self.server.upload_bodies[0])
+
+    def test_upload_pipeline_retries(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            package_path = os.path.join(temp_dir, 'pipeline.yaml')
+            compiler.Compiler().compile(_echo_pipeline, package_path)
+            request_once = AsyncRESTClientObject._request_once
+            attempts = []
+
+            async def fail_to_connect_once(rest_client, method, url,
+                                           request_kwargs):
+                attempts.append(url)
+                if len(attempts) == 1:
+                    # Nothing listens on the port of a closed server.
+                    with socket.socket() as closed_socket:
+                        closed_socket.bind(('127.0.0.1', 0))
+                        url = url.with_port(closed_socket.getsockname()[1])
+                return await request_once(rest_client, method, url,
+                                          request_kwargs)
+
+            async def upload(client):
+                return await client.upload_pipeline(
+                    package_path, pipeline_name='echo')
+
+            with mock.patch.object(
+                    AsyncRESTClientObject,
+                    '_request_once',
+                    side_effect=fail_to_connect_once,
+                    autospec=True):
+                pipeline = self._run(upload, retries=1, retry_backoff_factor=0)
+            with open(package_path, 'rb') as f:
+                package = f.read()
+
+        self.assertEqual(2, len(attempts))
+        self.assertEqual('pipeline-new', pipeline.id)
+        self.assertIn(package, self.server.upload_bodies[0])
+
+    def test_upload_pipeline_version(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            package_path = os.path.join(temp_dir, 'pipeline.yaml')
+            compiler.Compiler().compile(_echo_pipeline, package_path)
+
+            async def upload(client):
+                return await client.upload_pipeline_version(
+                    package_path, 'v2', pipeline_id='pipeline-id')
+
+            self._run(upload)
+            with open(package_path, 'rb') as f:
+                package = f.read()
+
+        self.assertIn('/apis/v1beta1/pipelines/upload_version',
+                      self.server.uploads[0])
+        self.assertIn('name=v2', self.server.uploads[0])
+        self.assertIn('pipelineid=pipeline-id', self.server.uploads[0])
+        self.assertIn(package, self.server.upload_bodies[0])
+
+    def test_concurrent_requests_share_connections(self):
+        self.server.run_details['run-a'] = {
+            'run': {
+                'id': 'run-a',
+                'status': 'Running'
+            }
+        }
+
+        async def get_runs(client):
+            return await asyncio.gather(
+                *[client.get_run('run-a') for _ in range(50)])
+
+        run_details = self._run(get_runs, connection_pool_maxsize=4)
+        self.assertEqual(['Running'] * 50,
+                         [run_detail.run.status for run_detail in run_details])
+        self.assertLessEqual(self.server.num_connections, 4)
+
+    def test_errors(self):
+
+        async def get_pipeline(client):
+            return await client.get_pipeline('pipeline-a')
+
+        with self.assertRaises(ApiException) as context:
+            self._run(get_pipeline)
+        self.assertEqual(404, context.exception.status)
+
+    def test_retries(self):
+        self.server.num_experiments = 1
+        self.server.unavailable_responses = 2
+
+        async def list_experiments(client):
+            return await client.list_experiments()
+
+        response = self._run(
+            list_experiments, retries=2, retry_backoff_factor=0)
+        self.assertEqual(['experiment-0'],
+                         [experiment.id for experiment in response.experiments])
+
+        # The requests which are not idempotent are not retried.
+        self.server.unavailable_responses = 1
+
+        async def create_experiment(client):
+            return await client._experiment_api.create_experiment(body={})
+
+        with self.assertRaises(ApiException) as context:
+            self._run(create_experiment, retries=2, retry_backoff_factor=0)
+        self.assertEqual(503, context.exception.status)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -12,19 +12,25 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import concurrent.futures
+import contextvars
 import time
 import logging
 import json
 import os
 import re
+import shutil
 import tarfile
 import tempfile
+import threading
 import warnings
 import yaml
 import zipfile
 import datetime
 import copy
-from typing import Mapping, Callable, Optional
+import random
+from collections import OrderedDict
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, Mapping, NamedTuple, Callable, Optional, Tuple, Union
 
 import kfp_server_api
 
@@ -32,6 +38,7 @@ from kfp import dsl
 from kfp.compiler import compiler
 from kfp.compiler._k8s_helper import sanitize_k8s_name
 
+from kfp import _api_client
 from kfp._auth import get_auth_token, get_gcp_access_token
 
 # TTL of the access token associated with the client. This is needed because
@@ -49,8 +56,279 @@ _FILTER_OPERATIONS = {
     "GREATER_THAN": 3,
     "GREATER_THAN_EQUALS": 5,
     "LESS_THAN": 6,
-    "LESS_THAN_EQUALS": 7
+    "LESS_THAN_EQUALS": 7,
+    "IN": 8,
+    "IS_SUBSTRING": 9,
 }
+# Maximum page size of the list queries of the API server.
+_MAX_PAGE_SIZE = 200
+# Statuses of the runs which have completed.
+_RUN_COMPLETED_STATUSES = ('succeeded', 'failed', 'skipped', 'error')
+# Maximum number of workflow statuses cached by each client.
+_WORKFLOW_STATUS_CACHE_SIZE = 1024
+# The workflows are serialized by the API server with their metadata first,
+# so the uid and resource version are found near the start of the manifest.
+_WORKFLOW_METADATA_PREFIX_LENGTH = 4096
+_WORKFLOW_UID_PATTERN = re.compile(r'"uid":"([^"]*)"')
+_WORKFLOW_RESOURCE_VERSION_PATTERN = re.compile(r'"resourceVersion":"([^"]*)"')
+_JSON_DECODER = json.JSONDecoder()
+
+
+class _WorkflowStatus(NamedTuple):
+    """The phases of an Argo workflow and of its nodes."""
+    phase: Optional[str]
+    node_phases: Dict[str, Optional[str]]
+
+
+def _parse_workflow_status(manifest: str) -> _WorkflowStatus:
+    """Parses the status of a workflow from its JSON manifest.
+
+    The status is the last field of the workflows serialized by the API
+    server, so it is decoded without decoding the spec of the workflow,
+    which makes up most of the manifest. Other manifests are decoded in
+    full.
+    """
+    status = None
+    start = manifest.rfind('"status":{')
+    if start >= 0:
+        try:
+            status, end = _JSON_DECODER.raw_decode(manifest,
+                                                   start + len('"status":'))
+        except ValueError:
+            status = None
+        else:
+            # The status must be the last field of the workflow object.
+            if manifest[end:].strip() != '}':
+                status = None
+    if status is None:
+        status = json.loads(manifest).get('status') or {}
+
+    nodes = status.get('nodes') or {}
+    return _WorkflowStatus(
+        phase=status.get('phase'),
+        node_phases={
+            node_id: node.get('phase') for node_id, node in nodes.items()
+        })
+
+
+def _read_run_detail(run_detail: Any) -> Tuple[Optional[str], Optional[str]]:
+    """Reads the status and the workflow manifest of a run detail, raw or
+    deserialized."""
+    if isinstance(run_detail, dict):
+        run = run_detail.get('run') or {}
+        pipeline_runtime = run_detail.get('pipeline_runtime') or {}
+        return run.get('status'), pipeline_runtime.get('workflow_manifest')
+    # Not a raw response without fast_deserialization.
+    return (run_detail.run.status, run_detail.pipeline_runtime and
+            run_detail.pipeline_runtime.workflow_manifest)
+
+
+def _iter_pages(list_page: Callable[[str], Any],
+                items_attribute: str) -> Iterator[Any]:
+    """Iterates over the items of all the pages of a list query.
+
+    Args:
+      list_page: Function getting the response with the page of the given
+        page token.
+      items_attribute: Attribute of the responses with the items.
+
+    Yields:
+      The items of all the pages. The next page is fetched in the background
+      while the items of the current page are consumed.
+    """
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+    try:
+        response = list_page('')
+        while True:
+            if isinstance(response, dict):  # Raw responses
+                page_token = response.get('next_page_token')
+                items = response.get(items_attribute)
+            else:
+                page_token = response.next_page_token
+                items = getattr(response, items_attribute)
+            # The pages are fetched in the context of the caller, e.g. to
+            # get raw responses.
+            next_response_future = (
+                executor.submit(contextvars.copy_context().run, list_page,
+                                page_token) if page_token else None)
+            for item in items or []:
+                yield item
+            if next_response_future is None:
+                return
+            response = next_response_future.result()
+    finally:
+        # Does not wait for a prefetched page the caller no longer needs.
+        executor.shutdown(wait=False)
+
+
+def _iter_zipped_pipeline_yaml(
+        write_yaml: Callable[[BinaryIO], None]) -> Iterator[bytes]:
+    """Iterates over the chunks of a zip pipeline package, as the yaml spec is
+    written to it and compressed."""
+
+    def write_zip(f: BinaryIO):
+        with zipfile.ZipFile(f, 'w') as package:
+            zipinfo = zipfile.ZipInfo('pipeline.yaml')
+            zipinfo.compress_type = zipfile.ZIP_DEFLATED
+            with package.open(zipinfo, 'w') as yaml_file:
+                write_yaml(yaml_file)
+
+    return _api_client.iter_written_chunks(write_zip)
+
+
+def _read_pipeline_package(
+        pipeline_package_path: str,
+        compress: bool) -> Tuple[str, Iterable[bytes], Optional[int]]:
+    """Gets the file name, the chunks and the size of a pipeline package to
+    upload.
+
+    Args:
+      pipeline_package_path: Local path to the pipeline package.
+      compress: Whether to compress a yaml package into a zip package. The
+        packages which are already compressed are uploaded as is.
+
+    Returns:
+      The file name, the chunks and the size, or None if it is not known
+      upfront, of the uploaded file.
+    """
+    file_name = os.path.basename(pipeline_package_path)
+    # Raises FileNotFoundError before the request is sent.
+    size = os.path.getsize(pipeline_package_path)
+    if not compress or not file_name.endswith(('.yaml', '.yml')):
+        return file_name, _api_client.iter_file_chunks(
+            pipeline_package_path), size
+
+    def write_yaml(yaml_file: BinaryIO):
+        with open(pipeline_package_path, 'rb') as f:
+            shutil.copyfileobj(f, yaml_file, _api_client._UPLOAD_CHUNK_SIZE)
+
+    return file_name + '.zip', _iter_zipped_pipeline_yaml(write_yaml), None
+
+
+class RunPipelineResult:
+
+    def __init__(self, client, run_info):
+        self._client = client
+        self.run_info = run_info
+        self.run_id = run_info.id
+
+    def wait_for_run_completion(self, timeout=None):
+        timeout = timeout or datetime.timedelta.max
+        return self._client.wait_for_run_completion(self.run_id, timeout)
+
+    def __repr__(self):
+        return 'RunPipelineResult(run_id={})'.format(self.run_id)
+
+
+def _get_response_field(response: Any, name: str) -> Any:
+    """Gets a field of a response model, or of a response dict within
+    raw_responses."""
+    if isinstance(response, dict):
+        return response.get(name)
+    return getattr(response, name)
+
+
+class _RunsWaiter(object):
+    """Polling state of Client.wait_for_runs, shared with
+    AsyncClient.wait_for_runs.
+
+    Each poll lists the pending runs with list_runs queries, and gets the
+    pending runs which were not listed, e.g. runs in another namespace, with
+    get_run.
+    """
+
+    def __init__(self, run_ids: Iterable[str], timeout: Optional[float],
+                 namespace: Optional[str], min_poll_interval: float,
+                 max_poll_interval: float, batch_size: int):
+        if isinstance(timeout, datetime.timedelta):
+            timeout = timeout.total_seconds()
+        self._pending_run_ids = list(OrderedDict.fromkeys(run_ids))
+        self._deadline = (
+            time.monotonic() + timeout if timeout is not None else None)
+        self._namespace = namespace
+        self._min_poll_interval = min_poll_interval
+        self._max_poll_interval = max_poll_interval
+        self._poll_interval = min_poll_interval
+        self._batch_size = batch_size
+
+    @property
+    def done(self) -> bool:
+        return not self._pending_run_ids
+
+    def get_list_runs_kwargs(self) -> List[Dict[str, Any]]:
+        """Gets the arguments of the iter_runs queries of a poll, one query
+        per batch of pending runs."""
+        list_runs_kwargs = []
+        for start in range(0, len(self._pending_run_ids), self._batch_size):
+            run_ids = self._pending_run_ids[start:start + self._batch_size]
+            run_filter = json.dumps({
+                "predicates": [{
+                    "op": _FILTER_OPERATIONS["IN"],
+                    "key": "id",
+                    "stringValues": {
+                        "values": run_ids
+                    },
+                }]
+            })
+            list_runs_kwargs.append(
+                dict(
+                    page_size=len(run_ids),
+                    namespace=self._namespace,
+                    filter=run_filter))
+        return list_runs_kwargs
+
+    def get_unlisted_run_ids(self, listed_runs: List[Any]) -> List[str]:
+        """Gets the ids of the pending runs which the queries of a poll did
+        not list."""
+        listed_run_ids = {_get_response_field(run, 'id') for run in listed_runs}
+        return [
+            run_id for run_id in self._pending_run_ids
+            if run_id not in listed_run_ids
+        ]
+
+    def add_polled_runs(self, runs: List[Any]) -> List[Any]:
+        """Gets the runs of a poll which completed.
+
+        Args:
+          runs: The listed runs, and the runs got with get_run.
+        """
+        completed_runs = []
+        for run in runs:
+            status = _get_response_field(run, 'status')
+            if status and status.lower() in _RUN_COMPLETED_STATUSES:
+                completed_runs.append(run)
+        completed_run_ids = {
+            _get_response_field(run, 'id') for run in completed_runs
+        }
+        self._pending_run_ids = [
+            run_id for run_id in self._pending_run_ids
+            if run_id not in completed_run_ids
+        ]
+
+        if completed_runs:
+            self._poll_interval = self._min_poll_interval
+        else:
+            self._poll_interval = min(self._poll_interval * 2,
+                                      self._max_poll_interval)
+        logging.info('Waiting for {} runs to complete...'.format(
+            len(self._pending_run_ids)))
+        return completed_runs
+
+    def get_sleep_seconds(self) -> float:
+        """Gets the time to wait before the next poll.
+
+        Raises:
+          TimeoutError: if the deadline has passed.
+        """
+        # Equal jitter, so that clients started together spread their polls.
+        sleep_seconds = self._poll_interval / 2 + random.uniform(
+            0, self._poll_interval / 2)
+        if self._deadline is not None:
+            remaining_seconds = self._deadline - time.monotonic()
+            if remaining_seconds <= 0:
+                raise TimeoutError('Run timeout')
+            sleep_seconds = min(sleep_seconds, remaining_seconds)
+        return sleep_seconds
 
 
 def _add_generated_apis(target_struct, api_module, api_client):
@@ -99,61 +377,13 @@ KF_PIPELINES_APP_OAUTH2_CLIENT_ID_ENV = 'KF_PIPELINES_APP_OAUTH2_CLIENT_ID'
 KF_PIPELINES_APP_OAUTH2_CLIENT_SECRET_ENV = 'KF_PIPELINES_APP_OAUTH2_CLIENT_SECRET'
 
 
-class Client(object):
-    """API Client for KubeFlow Pipeline.
-
-    Args:
-      host: The host name to use to talk to Kubeflow Pipelines. If not set, the in-cluster
-          service DNS name will be used, which only works if the current environment is a pod
-          in the same cluster (such as a Jupyter instance spawned by Kubeflow's
-          JupyterHub). If you have a different connection to cluster, such as a kubectl
-          proxy connection, then set it to something like "127.0.0.1:8080/pipeline.
-          If you connect to an IAP enabled cluster, set it to
-          https://<your-deployment>.endpoints.<your-project>.cloud.goog/pipeline".
-      client_id: The client ID used by Identity-Aware Proxy.
-      namespace: The namespace where the kubeflow pipeline system is run.
-      other_client_id: The client ID used to obtain the auth codes and refresh tokens.
-          Reference: https://cloud.google.com/iap/docs/authentication-howto#authenticating_from_a_desktop_app.
-      other_client_secret: The client secret used to obtain the auth codes and refresh tokens.
-      existing_token: Pass in token directly, it's used for cases better get token outside of SDK, e.x. GCP Cloud Functions
-          or caller already has a token
-      cookies: CookieJar object containing cookies that will be passed to the pipelines API.
-      proxy: HTTP or HTTPS proxy server
-      ssl_ca_cert: Cert for proxy
-      kube_context: String name of context within kubeconfig to use, defaults to the current-context set within kubeconfig.
-      credentials: A TokenCredentialsBase object which provides the logic to
-          populate the requests with credentials to authenticate against the API
-          server.
-      ui_host: Base url to use to open the Kubeflow Pipelines UI. This is used when running the client from a notebook to generate and
-          print links.
-    """
-
-    # in-cluster DNS name of the pipeline service
-    IN_CLUSTER_DNS_NAME = 'ml-pipeline.{}.svc.cluster.local:8888'
-    KUBE_PROXY_PATH = 'api/v1/namespaces/{}/services/ml-pipeline:http/proxy/'
-
-    # Auto populated path in pods
-    # https://kubernetes.io/docs/tasks/access-application-cluster/access-cluster/#accessing-the-api-from-a-pod
-    # https://kubernetes.io/docs/reference/access-authn-authz/service-accounts-admin/#serviceaccount-admission-controller
-    NAMESPACE_PATH = '/var/run/secrets/kubernetes.io/serviceaccount/namespace'
-
-    LOCAL_KFP_CONTEXT = os.path.expanduser('~/.config/kfp/context.json')
+class _ClientBase(object):
+    """Configuration of the API clients of Client and AsyncClient, and their
+    methods which do not call the API server."""
 
-    # TODO: Wrap the configurations for different authentication methods.
-    def __init__(self,
-                 host=None,
-                 client_id=None,
-                 namespace='kubeflow',
-                 other_client_id=None,
-                 other_client_secret=None,
-                 existing_token=None,
-                 cookies=None,
-                 proxy=None,
-                 ssl_ca_cert=None,
-                 kube_context=None,
-                 credentials=None,
-                 ui_host=None):
-        """Create a new instance of kfp client."""
+    def __init__(self, host, client_id, namespace, other_client_id,
+                 other_client_secret, existing_token, cookies, proxy,
+                 ssl_ca_cert, kube_context, credentials, ui_host):
         host = host or os.environ.get(KF_PIPELINES_ENDPOINT_ENV)
         self._uihost = os.environ.get(KF_PIPELINES_UI_ENDPOINT_ENV, ui_host or
                                       host)
@@ -167,41 +397,26 @@ class Client(object):
         config = self._load_config(host, client_id, namespace, other_client_id,
                                    other_client_secret, existing_token, proxy,
                                    ssl_ca_cert, kube_context, credentials)
+        self._load_context_setting_or_default()
         # Save the loaded API client configuration, as a reference if update is
         # needed.
-        self._load_context_setting_or_default()
         self._existing_config = config
         if cookies is None:
             cookies = self._context_setting.get('client_authentication_cookie')
-        api_client = kfp_server_api.api_client.ApiClient(
-            config,
-            cookie=cookies,
+        self._cookies = cookies
+        self._token_refresh_lock = threading.Lock()
+        self._last_token_refresh_time = datetime.datetime.now()
+
+    def _create_api_client(self, api_client_class, *args):
+        """Creates an API client with the loaded configuration."""
+        return api_client_class(
+            *args,
+            self._existing_config,
+            cookie=self._cookies,
             header_name=self._context_setting.get(
                 'client_authentication_header_name'),
             header_value=self._context_setting.get(
                 'client_authentication_header_value'))
-        _add_generated_apis(self, kfp_server_api, api_client)
-        self._job_api = kfp_server_api.api.job_service_api.JobServiceApi(
-            api_client)
-        self._run_api = kfp_server_api.api.run_service_api.RunServiceApi(
-            api_client)
-        self._experiment_api = kfp_server_api.api.experiment_service_api.ExperimentServiceApi(
-            api_client)
-        self._pipelines_api = kfp_server_api.api.pipeline_service_api.PipelineServiceApi(
-            api_client)
-        self._upload_api = kfp_server_api.api.PipelineUploadServiceApi(
-            api_client)
-        self._healthz_api = kfp_server_api.api.healthz_service_api.HealthzServiceApi(
-            api_client)
-        if not self._context_setting['namespace'] and self.get_kfp_healthz(
-        ).multi_user is True:
-            try:
-                with open(Client.NAMESPACE_PATH, 'r') as f:
-                    current_namespace = f.read()
-                    self.set_user_namespace(current_namespace)
-            except FileNotFoundError:
-                logging.info(
-                    'Failed to automatically set namespace.', exc_info=False)
 
     def _load_config(self, host, client_id, namespace, other_client_id,
                      other_client_secret, existing_token, proxy, ssl_ca_cert,
@@ -309,6 +524,34 @@ class Client(object):
                 '(with ".(pipelines/notebooks).googleusercontent.com")' % host)
         return False
 
+    def raw_responses(self):
+        """Makes the methods of the client return the JSON-decoded responses
+        of the API server.
+
+        Within the context, the API calls return dicts and lists as sent by
+        the API server, instead of kfp_server_api model objects, which skips
+        the deserialization of the models. It only applies to the methods
+        which return the responses of the API server, e.g. get_run, list_runs,
+        iter_runs or get_experiment, and requires fast_deserialization. The
+        methods returning a RunPipelineResult, e.g.
+        create_run_from_pipeline_package or create_runs, deserialize the
+        responses as usual.
+
+        Example::
+
+          with client.raw_responses():
+            for run in client.iter_runs():
+              print(run['id'], run.get('status'))
+
+        Raises:
+          RuntimeError: if the client was created with
+            fast_deserialization=False.
+        """
+        if not isinstance(self._run_api.api_client, _api_client.FastApiClient):
+            raise RuntimeError('raw_responses requires a client created with '
+                               'fast_deserialization=True.')
+        return _api_client.raw_responses()
+
     def _is_ipython(self):
         """Returns whether we are running in notebook."""
         try:
@@ -350,6 +593,26 @@ class Client(object):
         new_token = get_gcp_access_token()
         self._existing_config.api_key['authorization'] = new_token
 
+    def _refresh_api_client_token_if_expiring(self):
+        """Refreshes the access token before it hits the TTL.
+
+        The token is shared by the threads using the client. A single thread
+        refreshes it, while the others keep using the current token instead
+        of waiting for the refresh.
+        """
+        if (datetime.datetime.now() - self._last_token_refresh_time <=
+                _GCP_ACCESS_TOKEN_TIMEOUT):
+            return
+        if not self._token_refresh_lock.acquire(blocking=False):
+            return
+        try:
+            if (datetime.datetime.now() - self._last_token_refresh_time >
+                    _GCP_ACCESS_TOKEN_TIMEOUT):
+                self._refresh_api_client_token()
+                self._last_token_refresh_time = datetime.datetime.now()
+        finally:
+            self._token_refresh_lock.release()
+
     def _get_config_with_default_credentials(self, config):
         """Apply default credentials to the configuration object.
 
@@ -391,32 +654,6 @@ class Client(object):
         with open(Client.LOCAL_KFP_CONTEXT, 'w') as f:
             json.dump(self._context_setting, f)
 
-    def get_kfp_healthz(self):
-        """Gets healthz info of KFP deployment.
-
-        Returns:
-          response: json formatted response from the healtz endpoint.
-        """
-        count = 0
-        response = None
-        max_attempts = 5
-        while not response:
-            count += 1
-            if count > max_attempts:
-                raise TimeoutError(
-                    'Failed getting healthz endpoint after {} attempts.'.format(
-                        max_attempts))
-            try:
-                response = self._healthz_api.get_healthz()
-                return response
-            # ApiException, including network errors, is the only type that may
-            # recover after retry.
-            except kfp_server_api.ApiException:
-                # logging.exception also logs detailed info about the ApiException
-                logging.exception(
-                    'Failed to get healthz info attempt {} of 5.'.format(count))
-                time.sleep(5)
-
     def get_user_namespace(self):
         """Get user namespace in context config.
 
@@ -425,53 +662,439 @@ class Client(object):
         """
         return self._context_setting['namespace']
 
-    def create_experiment(self, name, description=None, namespace=None):
-        """Create a new experiment.
+    def _extract_pipeline_yaml(self, package_file):
 
-        Args:
-          name: The name of the experiment.
-          description: Description of the experiment.
-          namespace: Kubernetes namespace where the experiment should be created.
-            For single user deployment, leave it as None;
-            For multi user, input a namespace where the user is authorized.
+        def _choose_pipeline_yaml_file(file_list) -> str:
+            yaml_files = [file for file in file_list if file.endswith('.yaml')]
+            if len(yaml_files) == 0:
+                raise ValueError(
+                    'Invalid package. Missing pipeline yaml file in the package.'
+                )
 
-        Returns:
-          An Experiment object. Most important field is id.
-        """
-        namespace = namespace or self.get_user_namespace()
-        experiment = None
-        try:
-            experiment = self.get_experiment(
-                experiment_name=name, namespace=namespace)
-        except ValueError as error:
-            # Ignore error if the experiment does not exist.
-            if not str(error).startswith('No experiment is found with name'):
-                raise error
+            if 'pipeline.yaml' in yaml_files:
+                return 'pipeline.yaml'
+            else:
+                if len(yaml_files) == 1:
+                    return yaml_files[0]
+                raise ValueError(
+                    'Invalid package. There is no pipeline.yaml file and there are multiple yaml files.'
+                )
 
-        if not experiment:
-            logging.info('Creating experiment {}.'.format(name))
+        if package_file.endswith('.tar.gz') or package_file.endswith('.tgz'):
+            with tarfile.open(package_file, "r:gz") as tar:
+                file_names = [member.name for member in tar if member.isfile()]
+                pipeline_yaml_file = _choose_pipeline_yaml_file(file_names)
+                with tar.extractfile(tar.getmember(pipeline_yaml_file)) as f:
+                    return yaml.safe_load(f)
+        elif package_file.endswith('.zip'):
+            with zipfile.ZipFile(package_file, 'r') as zip:
+                pipeline_yaml_file = _choose_pipeline_yaml_file(zip.namelist())
+                with zip.open(pipeline_yaml_file) as f:
+                    return yaml.safe_load(f)
+        elif package_file.endswith('.yaml') or package_file.endswith('.yml'):
+            with open(package_file, 'r') as f:
+                return yaml.safe_load(f)
+        else:
+            raise ValueError(
+                'The package_file ' + package_file +
+                ' should end with one of the following formats: [.tar.gz, .tgz, .zip, .yaml, .yml]'
+            )
 
-            resource_references = []
-            if namespace:
-                key = kfp_server_api.models.ApiResourceKey(
-                    id=namespace,
-                    type=kfp_server_api.models.ApiResourceType.NAMESPACE)
-                reference = kfp_server_api.models.ApiResourceReference(
-                    key=key,
-                    relationship=kfp_server_api.models.ApiRelationship.OWNER)
-                resource_references.append(reference)
+    def _override_caching_options(self, workflow: dict, enable_caching: bool):
+        templates = workflow['spec']['templates']
+        for template in templates:
+            if 'metadata' in template \
+               and 'labels' in template['metadata'] \
+               and 'pipelines.kubeflow.org/enable_caching' in template['metadata']['labels']:
+                template['metadata']['labels'][
+                    'pipelines.kubeflow.org/enable_caching'] = str(
+                        enable_caching).lower()
 
-            experiment = kfp_server_api.models.ApiExperiment(
-                name=name,
-                description=description,
-                resource_references=resource_references)
-            experiment = self._experiment_api.create_experiment(body=experiment)
+    def _create_job_config(
+        self,
+        experiment_id: str,
+        params: Optional[dict],
+        pipeline_package_path: Optional[str],
+        pipeline_id: Optional[str],
+        version_id: Optional[str],
+        enable_caching: Optional[bool],
+        workflow_manifest: Optional[str] = None,
+    ):
+        """Create a JobConfig with spec and resource_references.
 
-        if self._is_ipython():
-            import IPython
-            html = \
+        Args:
+          experiment_id: The id of an experiment.
+          pipeline_package_path: Local path of the pipeline package(the filename should end with one of the following .tar.gz, .tgz, .zip, .yaml, .yml).
+          params: A dictionary with key (string) as param name and value (string) as param value.
+          pipeline_id: The id of a pipeline.
+          version_id: The id of a pipeline version.
+            If both pipeline_id and version_id are specified, version_id will take precendence.
+            If only pipeline_id is specified, the default version of this pipeline is used to create the run.
+          enable_caching: Whether or not to enable caching for the run.
+            This setting affects v2 compatible mode and v2 mode only.
+            If not set, defaults to the compile time settings, which are True for all
+            tasks by default, while users may specify different caching options for
+            individual tasks.
+            If set, the setting applies to all tasks in the pipeline -- overrides
+            the compile time settings.
+          workflow_manifest: The JSON-serialized workflow of the pipeline,
+            used instead of loading pipeline_package_path.
+
+        Returns:
+          A JobConfig object with attributes spec and resource_reference.
+        """
+
+        class JobConfig:
+
+            def __init__(self, spec, resource_references):
+                self.spec = spec
+                self.resource_references = resource_references
+
+        params = params or {}
+        pipeline_json_string = workflow_manifest
+        if pipeline_package_path:
+            pipeline_obj = self._extract_pipeline_yaml(pipeline_package_path)
+
+            # Caching option set at submission time overrides the compile time settings.
+            if enable_caching is not None:
+                self._override_caching_options(pipeline_obj, enable_caching)
+
+            pipeline_json_string = json.dumps(pipeline_obj)
+        api_params = [
+            kfp_server_api.ApiParameter(
+                name=sanitize_k8s_name(name=k, allow_capital_underscore=True),
+                value=str(v) if type(v) not in (list, dict) else json.dumps(v))
+            for k, v in params.items()
+        ]
+        resource_references = []
+        key = kfp_server_api.models.ApiResourceKey(
+            id=experiment_id,
+            type=kfp_server_api.models.ApiResourceType.EXPERIMENT)
+        reference = kfp_server_api.models.ApiResourceReference(
+            key=key, relationship=kfp_server_api.models.ApiRelationship.OWNER)
+        resource_references.append(reference)
+
+        if version_id:
+            key = kfp_server_api.models.ApiResourceKey(
+                id=version_id,
+                type=kfp_server_api.models.ApiResourceType.PIPELINE_VERSION)
+            reference = kfp_server_api.models.ApiResourceReference(
+                key=key,
+                relationship=kfp_server_api.models.ApiRelationship.CREATOR)
+            resource_references.append(reference)
+
+        spec = kfp_server_api.models.ApiPipelineSpec(
+            pipeline_id=pipeline_id,
+            workflow_manifest=pipeline_json_string,
+            parameters=api_params)
+        return JobConfig(spec=spec, resource_references=resource_references)
+
+    def _create_run_body(
+        self,
+        experiment_id: str,
+        job_name: str,
+        pipeline_package_path: Optional[str],
+        params: Optional[dict],
+        pipeline_id: Optional[str],
+        version_id: Optional[str],
+        pipeline_root: Optional[str],
+        enable_caching: Optional[bool],
+        service_account: Optional[str],
+    ):
+        """Creates the run of a create_run request. See
+        Client.run_pipeline."""
+        if params is None:
+            params = {}
+
+        if pipeline_root is not None:
+            params[dsl.ROOT_PARAMETER_NAME] = pipeline_root
+
+        job_config = self._create_job_config(
+            experiment_id=experiment_id,
+            params=params,
+            pipeline_package_path=pipeline_package_path,
+            pipeline_id=pipeline_id,
+            version_id=version_id,
+            enable_caching=enable_caching,
+        )
+        return kfp_server_api.models.ApiRun(
+            pipeline_spec=job_config.spec,
+            resource_references=job_config.resource_references,
+            name=job_name,
+            service_account=service_account)
+
+    def _create_job_body(
+        self,
+        experiment_id: str,
+        job_name: str,
+        description: Optional[str],
+        start_time: Optional[str],
+        end_time: Optional[str],
+        interval_second: Optional[int],
+        cron_expression: Optional[str],
+        max_concurrency: Optional[int],
+        no_catchup: Optional[bool],
+        params: Optional[dict],
+        pipeline_package_path: Optional[str],
+        pipeline_id: Optional[str],
+        version_id: Optional[str],
+        enabled: bool,
+        enable_caching: Optional[bool],
+        service_account: Optional[str],
+    ):
+        """Creates the job of a create_job request. See
+        Client.create_recurring_run."""
+        job_config = self._create_job_config(
+            experiment_id=experiment_id,
+            params=params,
+            pipeline_package_path=pipeline_package_path,
+            pipeline_id=pipeline_id,
+            version_id=version_id,
+            enable_caching=enable_caching,
+        )
+
+        if all([interval_second, cron_expression
+               ]) or not any([interval_second, cron_expression]):
+            raise ValueError(
+                'Either interval_second or cron_expression is required')
+        if interval_second is not None:
+            trigger = kfp_server_api.models.ApiTrigger(
+                periodic_schedule=kfp_server_api.models.ApiPeriodicSchedule(
+                    start_time=start_time,
+                    end_time=end_time,
+                    interval_second=interval_second))
+        if cron_expression is not None:
+            trigger = kfp_server_api.models.ApiTrigger(
+                cron_schedule=kfp_server_api.models.ApiCronSchedule(
+                    start_time=start_time,
+                    end_time=end_time,
+                    cron=cron_expression))
+
+        return kfp_server_api.models.ApiJob(
+            enabled=enabled,
+            pipeline_spec=job_config.spec,
+            resource_references=job_config.resource_references,
+            name=job_name,
+            description=description,
+            no_catchup=no_catchup,
+            trigger=trigger,
+            max_concurrency=max_concurrency,
+            service_account=service_account)
+
+    def _get_experiment_name(self, experiment_name: Optional[str]) -> str:
+        experiment_name = experiment_name or os.environ.get(
+            KF_PIPELINES_DEFAULT_EXPERIMENT_NAME, None)
+        overridden_experiment_name = os.environ.get(
+            KF_PIPELINES_OVERRIDE_EXPERIMENT_NAME, experiment_name)
+        if overridden_experiment_name != experiment_name:
+            import warnings
+            warnings.warn('Changing experiment name from "{}" to "{}".'.format(
+                experiment_name, overridden_experiment_name))
+        return overridden_experiment_name or 'Default'
+
+
+class Client(_ClientBase):
+    """API Client for KubeFlow Pipeline.
+
+    Args:
+      host: The host name to use to talk to Kubeflow Pipelines. If not set, the in-cluster
+          service DNS name will be used, which only works if the current environment is a pod
+          in the same cluster (such as a Jupyter instance spawned by Kubeflow's
+          JupyterHub). If you have a different connection to cluster, such as a kubectl
+          proxy connection, then set it to something like "127.0.0.1:8080/pipeline.
+          If you connect to an IAP enabled cluster, set it to
+          https://<your-deployment>.endpoints.<your-project>.cloud.goog/pipeline".
+      client_id: The client ID used by Identity-Aware Proxy.
+      namespace: The namespace where the kubeflow pipeline system is run.
+      other_client_id: The client ID used to obtain the auth codes and refresh tokens.
+          Reference: https://cloud.google.com/iap/docs/authentication-howto#authenticating_from_a_desktop_app.
+      other_client_secret: The client secret used to obtain the auth codes and refresh tokens.
+      existing_token: Pass in token directly, it's used for cases better get token outside of SDK, e.x. GCP Cloud Functions
+          or caller already has a token
+      cookies: CookieJar object containing cookies that will be passed to the pipelines API.
+      proxy: HTTP or HTTPS proxy server
+      ssl_ca_cert: Cert for proxy
+      kube_context: String name of context within kubeconfig to use, defaults to the current-context set within kubeconfig.
+      credentials: A TokenCredentialsBase object which provides the logic to
+          populate the requests with credentials to authenticate against the API
+          server.
+      ui_host: Base url to use to open the Kubeflow Pipelines UI. This is used when running the client from a notebook to generate and
+          print links.
+      fast_deserialization: Whether to deserialize the API responses with
+          compiled per-type deserializers instead of the reflective
+          deserializer of kfp_server_api. Both return the same objects.
+      num_connection_pools: Number of connection pools, one per host, kept by
+          the client.
+      connection_pool_maxsize: Maximum number of connections kept per host.
+          Defaults to 5 times the number of CPUs. Set it to the number of
+          threads sharing the client.
+      connection_pool_block: Whether the requests wait for a free connection
+          when connection_pool_maxsize connections to the host are in use,
+          instead of opening connections which are discarded afterwards.
+      tcp_keepalive: Whether to enable TCP keep-alive on the connections.
+      retries: Number of retries of the failed requests, with exponential
+          backoff. Connection errors are retried for all the requests, read
+          errors and 502, 503 and 504 statuses only for the idempotent ones.
+      retry_backoff_factor: Backoff factor of the retries, in seconds. The
+          n-th retry waits retry_backoff_factor * 2 ** (n - 1) seconds.
+      request_timeout: Timeout of the requests in seconds, or a (connect
+          timeout, read timeout) pair. No timeout by default.
+
+    The client can be shared by threads.
+    """
+
+    # in-cluster DNS name of the pipeline service
+    IN_CLUSTER_DNS_NAME = 'ml-pipeline.{}.svc.cluster.local:8888'
+    KUBE_PROXY_PATH = 'api/v1/namespaces/{}/services/ml-pipeline:http/proxy/'
+
+    # Auto populated path in pods
+    # https://kubernetes.io/docs/tasks/access-application-cluster/access-cluster/#accessing-the-api-from-a-pod
+    # https://kubernetes.io/docs/reference/access-authn-authz/service-accounts-admin/#serviceaccount-admission-controller
+    NAMESPACE_PATH = '/var/run/secrets/kubernetes.io/serviceaccount/namespace'
+
+    LOCAL_KFP_CONTEXT = os.path.expanduser('~/.config/kfp/context.json')
+
+    # TODO: Wrap the configurations for different authentication methods.
+    def __init__(self,
+                 host=None,
+                 client_id=None,
+                 namespace='kubeflow',
+                 other_client_id=None,
+                 other_client_secret=None,
+                 existing_token=None,
+                 cookies=None,
+                 proxy=None,
+                 ssl_ca_cert=None,
+                 kube_context=None,
+                 credentials=None,
+                 ui_host=None,
+                 fast_deserialization=True,
+                 num_connection_pools=4,
+                 connection_pool_maxsize=None,
+                 connection_pool_block=False,
+                 tcp_keepalive=False,
+                 retries=None,
+                 retry_backoff_factor=0.5,
+                 request_timeout=None):
+        """Create a new instance of kfp client."""
+        super().__init__(host, client_id, namespace, other_client_id,
+                         other_client_secret, existing_token, cookies, proxy,
+                         ssl_ca_cert, kube_context, credentials, ui_host)
+        config = self._existing_config
+        if connection_pool_maxsize is not None:
+            config.connection_pool_maxsize = connection_pool_maxsize
+        if retries is not None:
+            config.retries = _api_client.create_retry(retries,
+                                                      retry_backoff_factor)
+        if fast_deserialization:
+            api_client_class = _api_client.FastApiClient
+        else:
+            api_client_class = kfp_server_api.api_client.ApiClient
+        api_client = self._create_api_client(api_client_class)
+        api_client.rest_client = _api_client.PooledRESTClientObject(
+            config,
+            pools_size=num_connection_pools,
+            block=connection_pool_block,
+            tcp_keepalive=tcp_keepalive,
+            request_timeout=request_timeout)
+        _add_generated_apis(self, kfp_server_api, api_client)
+        self._job_api = kfp_server_api.api.job_service_api.JobServiceApi(
+            api_client)
+        self._run_api = kfp_server_api.api.run_service_api.RunServiceApi(
+            api_client)
+        self._experiment_api = kfp_server_api.api.experiment_service_api.ExperimentServiceApi(
+            api_client)
+        self._pipelines_api = kfp_server_api.api.pipeline_service_api.PipelineServiceApi(
+            api_client)
+        self._upload_api = kfp_server_api.api.PipelineUploadServiceApi(
+            api_client)
+        self._healthz_api = kfp_server_api.api.healthz_service_api.HealthzServiceApi(
+            api_client)
+        self._workflow_statuses = OrderedDict()
+        self._workflow_statuses_lock = threading.Lock()
+        if not self._context_setting['namespace'] and self.get_kfp_healthz(
+        ).multi_user is True:
+            try:
+                with open(Client.NAMESPACE_PATH, 'r') as f:
+                    current_namespace = f.read()
+                    self.set_user_namespace(current_namespace)
+            except FileNotFoundError:
+                logging.info(
+                    'Failed to automatically set namespace.', exc_info=False)
+
+    def get_kfp_healthz(self):
+        """Gets healthz info of KFP deployment.
+
+        Returns:
+          response: json formatted response from the healtz endpoint.
+        """
+        count = 0
+        response = None
+        max_attempts = 5
+        while not response:
+            count += 1
+            if count > max_attempts:
+                raise TimeoutError(
+                    'Failed getting healthz endpoint after {} attempts.'.format(
+                        max_attempts))
+            try:
+                response = self._healthz_api.get_healthz()
+                return response
+            # ApiException, including network errors, is the only type that may
+            # recover after retry.
+            except kfp_server_api.ApiException:
+                # logging.exception also logs detailed info about the ApiException
+                logging.exception(
+                    'Failed to get healthz info attempt {} of 5.'.format(count))
+                time.sleep(5)
+
+    def create_experiment(self, name, description=None, namespace=None):
+        """Create a new experiment.
+
+        Args:
+          name: The name of the experiment.
+          description: Description of the experiment.
+          namespace: Kubernetes namespace where the experiment should be created.
+            For single user deployment, leave it as None;
+            For multi user, input a namespace where the user is authorized.
+
+        Returns:
+          An Experiment object. Most important field is id.
+        """
+        namespace = namespace or self.get_user_namespace()
+        experiment = None
+        try:
+            experiment = self.get_experiment(
+                experiment_name=name, namespace=namespace)
+        except ValueError as error:
+            # Ignore error if the experiment does not exist.
+            if not str(error).startswith('No experiment is found with name'):
+                raise error
+
+        if not experiment:
+            logging.info('Creating experiment {}.'.format(name))
+
+            resource_references = []
+            if namespace:
+                key = kfp_server_api.models.ApiResourceKey(
+                    id=namespace,
+                    type=kfp_server_api.models.ApiResourceType.NAMESPACE)
+                reference = kfp_server_api.models.ApiResourceReference(
+                    key=key,
+                    relationship=kfp_server_api.models.ApiRelationship.OWNER)
+                resource_references.append(reference)
+
+            experiment = kfp_server_api.models.ApiExperiment(
+                name=name,
+                description=description,
+                resource_references=resource_references)
+            experiment = self._experiment_api.create_experiment(body=experiment)
+
+        if self._is_ipython():
+            import IPython
+            html = \
                 ('<a href="%s/#/experiments/details/%s" target="_blank" >Experiment details</a>.'
-                % (self._get_url_prefix(), experiment.id))
+                % (self._get_url_prefix(), _get_response_field(experiment, 'id')))
             IPython.display.display(IPython.display.HTML(html))
         return experiment
 
@@ -492,11 +1115,12 @@ class Client(object):
             }]
         })
         result = self._pipelines_api.list_pipelines(filter=pipeline_filter)
-        if result.pipelines is None:
+        pipelines = _get_response_field(result, 'pipelines')
+        if pipelines is None:
             return None
-        if len(result.pipelines) == 1:
-            return result.pipelines[0].id
-        elif len(result.pipelines) > 1:
+        if len(pipelines) == 1:
+            return _get_response_field(pipelines[0], 'id')
+        elif len(pipelines) > 1:
             raise ValueError(
                 "Multiple pipelines with the name: {} found, the name needs to be unique"
                 .format(name))
@@ -506,7 +1130,8 @@ class Client(object):
                          page_token='',
                          page_size=10,
                          sort_by='',
-                         namespace=None):
+                         namespace=None,
+                         filter=None):
         """List experiments.
 
         Args:
@@ -516,6 +1141,8 @@ class Client(object):
           namespace: Kubernetes namespace where the experiment was created.
             For single user deployment, leave it as None;
             For multi user, input a namespace where the user is authorized.
+          filter: A url-encoded, JSON-serialized Filter protocol buffer
+            (see [filter.proto](https://github.com/kubeflow/pipelines/blob/master/backend/api/filter.proto)).
 
         Returns:
           A response object including a list of experiments and next page token.
@@ -527,9 +1154,31 @@ class Client(object):
             sort_by=sort_by,
             resource_reference_key_type=kfp_server_api.models.api_resource_type
             .ApiResourceType.NAMESPACE,
-            resource_reference_key_id=namespace)
+            resource_reference_key_id=namespace,
+            filter=filter)
         return response
 
+    def iter_experiments(self,
+                         page_size=_MAX_PAGE_SIZE,
+                         sort_by='',
+                         namespace=None,
+                         filter=None) -> Iterator[Any]:
+        """Iterates over all the experiments, fetching the pages as needed.
+
+        The next page is fetched in the background while the current one is
+        consumed. See list_experiments for the arguments.
+
+        Yields:
+          The experiment objects.
+        """
+        return _iter_pages(
+            lambda page_token: self.list_experiments(
+                page_token=page_token,
+                page_size=page_size,
+                sort_by=sort_by,
+                namespace=namespace,
+                filter=filter), 'experiments')
+
     def get_experiment(self,
                        experiment_id=None,
                        experiment_name=None,
@@ -573,14 +1222,15 @@ class Client(object):
         else:
             result = self._experiment_api.list_experiment(
                 filter=experiment_filter)
-        if not result.experiments:
+        experiments = _get_response_field(result, 'experiments')
+        if not experiments:
             raise ValueError(
                 'No experiment is found with name {}.'.format(experiment_name))
-        if len(result.experiments) > 1:
+        if len(experiments) > 1:
             raise ValueError(
                 'Multiple experiments is found with name {}.'.format(
                     experiment_name))
-        return result.experiments[0]
+        return experiments[0]
 
     def delete_experiment(self, experiment_id):
         """Delete experiment.
@@ -596,67 +1246,47 @@ class Client(object):
         """
         return self._experiment_api.delete_experiment(id=experiment_id)
 
-    def _extract_pipeline_yaml(self, package_file):
-
-        def _choose_pipeline_yaml_file(file_list) -> str:
-            yaml_files = [file for file in file_list if file.endswith('.yaml')]
-            if len(yaml_files) == 0:
-                raise ValueError(
-                    'Invalid package. Missing pipeline yaml file in the package.'
-                )
-
-            if 'pipeline.yaml' in yaml_files:
-                return 'pipeline.yaml'
-            else:
-                if len(yaml_files) == 1:
-                    return yaml_files[0]
-                raise ValueError(
-                    'Invalid package. There is no pipeline.yaml file and there are multiple yaml files.'
-                )
-
-        if package_file.endswith('.tar.gz') or package_file.endswith('.tgz'):
-            with tarfile.open(package_file, "r:gz") as tar:
-                file_names = [member.name for member in tar if member.isfile()]
-                pipeline_yaml_file = _choose_pipeline_yaml_file(file_names)
-                with tar.extractfile(tar.getmember(pipeline_yaml_file)) as f:
-                    return yaml.safe_load(f)
-        elif package_file.endswith('.zip'):
-            with zipfile.ZipFile(package_file, 'r') as zip:
-                pipeline_yaml_file = _choose_pipeline_yaml_file(zip.namelist())
-                with zip.open(pipeline_yaml_file) as f:
-                    return yaml.safe_load(f)
-        elif package_file.endswith('.yaml') or package_file.endswith('.yml'):
-            with open(package_file, 'r') as f:
-                return yaml.safe_load(f)
-        else:
-            raise ValueError(
-                'The package_file ' + package_file +
-                ' should end with one of the following formats: [.tar.gz, .tgz, .zip, .yaml, .yml]'
-            )
-
-    def _override_caching_options(self, workflow: dict, enable_caching: bool):
-        templates = workflow['spec']['templates']
-        for template in templates:
-            if 'metadata' in template \
-               and 'labels' in template['metadata'] \
-               and 'pipelines.kubeflow.org/enable_caching' in template['metadata']['labels']:
-                template['metadata']['labels'][
-                    'pipelines.kubeflow.org/enable_caching'] = str(
-                        enable_caching).lower()
-
-    def list_pipelines(self, page_token='', page_size=10, sort_by=''):
+    def list_pipelines(self,
+                       page_token='',
+                       page_size=10,
+                       sort_by='',
+                       filter=None):
         """List pipelines.
 
         Args:
           page_token: Token for starting of the page.
           page_size: Size of the page.
           sort_by: one of 'field_name', 'field_name desc'. For example, 'name desc'.
+          filter: A url-encoded, JSON-serialized Filter protocol buffer
+            (see [filter.proto](https://github.com/kubeflow/pipelines/blob/master/backend/api/filter.proto)).
 
         Returns:
           A response object including a list of pipelines and next page token.
         """
         return self._pipelines_api.list_pipelines(
-            page_token=page_token, page_size=page_size, sort_by=sort_by)
+            page_token=page_token,
+            page_size=page_size,
+            sort_by=sort_by,
+            filter=filter)
+
+    def iter_pipelines(self,
+                       page_size=_MAX_PAGE_SIZE,
+                       sort_by='',
+                       filter=None) -> Iterator[Any]:
+        """Iterates over all the pipelines, fetching the pages as needed.
+
+        The next page is fetched in the background while the current one is
+        consumed. See list_pipelines for the arguments.
+
+        Yields:
+          The pipeline objects.
+        """
+        return _iter_pages(
+            lambda page_token: self.list_pipelines(
+                page_token=page_token,
+                page_size=page_size,
+                sort_by=sort_by,
+                filter=filter), 'pipelines')
 
     # TODO: provide default namespace, similar to kubectl default namespaces.
     def run_pipeline(
@@ -697,37 +1327,30 @@ class Client(object):
             run uses.
 
         Returns:
-          A run object. Most important field is id.
-        """
-        if params is None:
-            params = {}
-
-        if pipeline_root is not None:
-            params[dsl.ROOT_PARAMETER_NAME] = pipeline_root
-
-        job_config = self._create_job_config(
+          A run object. Most important field is id.
+        """
+        run_body = self._create_run_body(
             experiment_id=experiment_id,
-            params=params,
+            job_name=job_name,
             pipeline_package_path=pipeline_package_path,
+            params=params,
             pipeline_id=pipeline_id,
             version_id=version_id,
+            pipeline_root=pipeline_root,
             enable_caching=enable_caching,
+            service_account=service_account,
         )
-        run_body = kfp_server_api.models.ApiRun(
-            pipeline_spec=job_config.spec,
-            resource_references=job_config.resource_references,
-            name=job_name,
-            service_account=service_account)
 
-        response = self._run_api.create_run(body=run_body)
+        run = _get_response_field(
+            self._run_api.create_run(body=run_body), 'run')
 
         if self._is_ipython():
             import IPython
             html = (
                 '<a href="%s/#/runs/details/%s" target="_blank" >Run details</a>.'
-                % (self._get_url_prefix(), response.run.id))
+                % (self._get_url_prefix(), _get_response_field(run, 'id')))
             IPython.display.display(IPython.display.HTML(html))
-        return response.run
+        return run
 
     def create_recurring_run(
         self,
@@ -787,120 +1410,26 @@ class Client(object):
         Returns:
           A Job object. Most important field is id.
         """
-        job_config = self._create_job_config(
+        job_body = self._create_job_body(
             experiment_id=experiment_id,
+            job_name=job_name,
+            description=description,
+            start_time=start_time,
+            end_time=end_time,
+            interval_second=interval_second,
+            cron_expression=cron_expression,
+            max_concurrency=max_concurrency,
+            no_catchup=no_catchup,
             params=params,
             pipeline_package_path=pipeline_package_path,
             pipeline_id=pipeline_id,
             version_id=version_id,
+            enabled=enabled,
             enable_caching=enable_caching,
+            service_account=service_account,
         )
-
-        if all([interval_second, cron_expression
-               ]) or not any([interval_second, cron_expression]):
-            raise ValueError(
-                'Either interval_second or cron_expression is required')
-        if interval_second is not None:
-            trigger = kfp_server_api.models.ApiTrigger(
-                periodic_schedule=kfp_server_api.models.ApiPeriodicSchedule(
-                    start_time=start_time,
-                    end_time=end_time,
-                    interval_second=interval_second))
-        if cron_expression is not None:
-            trigger = kfp_server_api.models.ApiTrigger(
-                cron_schedule=kfp_server_api.models.ApiCronSchedule(
-                    start_time=start_time,
-                    end_time=end_time,
-                    cron=cron_expression))
-
-        job_body = kfp_server_api.models.ApiJob(
-            enabled=enabled,
-            pipeline_spec=job_config.spec,
-            resource_references=job_config.resource_references,
-            name=job_name,
-            description=description,
-            no_catchup=no_catchup,
-            trigger=trigger,
-            max_concurrency=max_concurrency,
-            service_account=service_account)
         return self._job_api.create_job(body=job_body)
 
-    def _create_job_config(
-        self,
-        experiment_id: str,
-        params: Optional[dict],
-        pipeline_package_path: Optional[str],
-        pipeline_id: Optional[str],
-        version_id: Optional[str],
-        enable_caching: Optional[bool],
-    ):
-        """Create a JobConfig with spec and resource_references.
-
-        Args:
-          experiment_id: The id of an experiment.
-          pipeline_package_path: Local path of the pipeline package(the filename should end with one of the following .tar.gz, .tgz, .zip, .yaml, .yml).
-          params: A dictionary with key (string) as param name and value (string) as param value.
-          pipeline_id: The id of a pipeline.
-          version_id: The id of a pipeline version.
-            If both pipeline_id and version_id are specified, version_id will take precendence.
-            If only pipeline_id is specified, the default version of this pipeline is used to create the run.
-          enable_caching: Whether or not to enable caching for the run.
-            This setting affects v2 compatible mode and v2 mode only.
-            If not set, defaults to the compile time settings, which are True for all
-            tasks by default, while users may specify different caching options for
-            individual tasks.
-            If set, the setting applies to all tasks in the pipeline -- overrides
-            the compile time settings.
-
-        Returns:
-          A JobConfig object with attributes spec and resource_reference.
-        """
-
-        class JobConfig:
-
-            def __init__(self, spec, resource_references):
-                self.spec = spec
-                self.resource_references = resource_references
-
-        params = params or {}
-        pipeline_json_string = None
-        if pipeline_package_path:
-            pipeline_obj = self._extract_pipeline_yaml(pipeline_package_path)
-
-            # Caching option set at submission time overrides the compile time settings.
-            if enable_caching is not None:
-                self._override_caching_options(pipeline_obj, enable_caching)
-
-            pipeline_json_string = json.dumps(pipeline_obj)
-        api_params = [
-            kfp_server_api.ApiParameter(
-                name=sanitize_k8s_name(name=k, allow_capital_underscore=True),
-                value=str(v) if type(v) not in (list, dict) else json.dumps(v))
-            for k, v in params.items()
-        ]
-        resource_references = []
-        key = kfp_server_api.models.ApiResourceKey(
-            id=experiment_id,
-            type=kfp_server_api.models.ApiResourceType.EXPERIMENT)
-        reference = kfp_server_api.models.ApiResourceReference(
-            key=key, relationship=kfp_server_api.models.ApiRelationship.OWNER)
-        resource_references.append(reference)
-
-        if version_id:
-            key = kfp_server_api.models.ApiResourceKey(
-                id=version_id,
-                type=kfp_server_api.models.ApiResourceType.PIPELINE_VERSION)
-            reference = kfp_server_api.models.ApiResourceReference(
-                key=key,
-                relationship=kfp_server_api.models.ApiRelationship.CREATOR)
-            resource_references.append(reference)
-
-        spec = kfp_server_api.models.ApiPipelineSpec(
-            pipeline_id=pipeline_id,
-            workflow_manifest=pipeline_json_string,
-            parameters=api_params)
-        return JobConfig(spec=spec, resource_references=resource_references)
-
     def create_run_from_pipeline_func(
         self,
         pipeline_func: Callable,
@@ -975,6 +1504,8 @@ class Client(object):
                 service_account=service_account,
             )
 
+    # The experiment and the runs are read.
+    @_api_client.model_responses()
     def create_run_from_pipeline_package(
         self,
         pipeline_file: str,
@@ -1014,32 +1545,9 @@ class Client(object):
             run uses.
         """
 
-        class RunPipelineResult:
-
-            def __init__(self, client, run_info):
-                self._client = client
-                self.run_info = run_info
-                self.run_id = run_info.id
-
-            def wait_for_run_completion(self, timeout=None):
-                timeout = timeout or datetime.timedelta.max
-                return self._client.wait_for_run_completion(
-                    self.run_id, timeout)
-
-            def __repr__(self):
-                return 'RunPipelineResult(run_id={})'.format(self.run_id)
-
         #TODO: Check arguments against the pipeline function
         pipeline_name = os.path.basename(pipeline_file)
-        experiment_name = experiment_name or os.environ.get(
-            KF_PIPELINES_DEFAULT_EXPERIMENT_NAME, None)
-        overridden_experiment_name = os.environ.get(
-            KF_PIPELINES_OVERRIDE_EXPERIMENT_NAME, experiment_name)
-        if overridden_experiment_name != experiment_name:
-            import warnings
-            warnings.warn('Changing experiment name from "{}" to "{}".'.format(
-                experiment_name, overridden_experiment_name))
-        experiment_name = overridden_experiment_name or 'Default'
+        experiment_name = self._get_experiment_name(experiment_name)
         run_name = run_name or (
             pipeline_name + ' ' +
             datetime.datetime.now().strftime('%Y-%m-%d %H-%M-%S'))
@@ -1056,12 +1564,170 @@ class Client(object):
         )
         return RunPipelineResult(self, run_info)
 
+    # The experiment and the runs are read.
+    @_api_client.model_responses()
+    def create_runs(
+        self,
+        pipeline: Union[Callable, str],
+        list_of_arguments: Iterable[Mapping[str, Any]],
+        run_name_prefix: Optional[str] = None,
+        experiment_name: Optional[str] = None,
+        pipeline_conf: Optional[dsl.PipelineConf] = None,
+        namespace: Optional[str] = None,
+        mode: dsl.PipelineExecutionMode = dsl.PipelineExecutionMode.V1_LEGACY,
+        launcher_image: Optional[str] = None,
+        pipeline_root: Optional[str] = None,
+        enable_caching: Optional[bool] = None,
+        service_account: Optional[str] = None,
+        max_concurrency: int = 8,
+        upload_pipeline_name: Optional[str] = None,
+    ) -> List[Union['RunPipelineResult', Exception]]:
+        """Runs a pipeline with each of several sets of arguments.
+
+        The pipeline is compiled and loaded once, and the runs are submitted
+        concurrently through the connection pool of the client.
+
+        Example::
+
+          results = client.create_runs(
+              my_pipeline,
+              [{'learning_rate': rate} for rate in [0.1, 0.01, 0.001]])
+          failed = [r for r in results if isinstance(r, Exception)]
+
+        Args:
+          pipeline: A pipeline function, or a compiled pipeline package file.
+          list_of_arguments: Arguments to the pipeline function of each run,
+            provided as dicts.
+          run_name_prefix: Optional. Prefix of the names of the runs, which are
+            suffixed with the index of their arguments.
+          experiment_name: Optional. Name of the experiment to add the runs to.
+          pipeline_conf: Optional. Pipeline configuration ops that will be applied
+            to all the ops in the pipeline func.
+          namespace: Kubernetes namespace where the pipeline runs are created.
+            For single user deployment, leave it as None;
+            For multi user, input a namespace where the user is authorized
+          mode: The PipelineExecutionMode to use when compiling the pipeline
+            function.
+          launcher_image: The launcher image to use if the mode is specified as
+            PipelineExecutionMode.V2_COMPATIBLE.
+          pipeline_root: The root path of the pipeline outputs. See
+            create_run_from_pipeline_func.
+          enable_caching: Optional. Whether or not to enable caching for the runs.
+            See create_run_from_pipeline_func.
+          service_account: Optional. Specifies which Kubernetes service account the
+            runs use.
+          max_concurrency: Maximum number of runs submitted at once. Values
+            above the connection pool size of the client do not speed up the
+            submission.
+          upload_pipeline_name: Optional. If specified, the pipeline is uploaded
+            once with this name, and the runs reference it instead of sending
+            the workflow manifest with every run. The uploaded pipeline has
+            the caching option of enable_caching, if specified.
+
+        Returns:
+          A list with, for each set of arguments, either the RunPipelineResult
+          of its run or the exception raised when submitting it.
+        """
+        if (pipeline_root is not None and callable(pipeline) and
+                mode == dsl.PipelineExecutionMode.V1_LEGACY):
+            raise ValueError('`pipeline_root` should not be used with '
+                             'dsl.PipelineExecutionMode.V1_LEGACY mode.')
+
+        list_of_arguments = list(list_of_arguments)
+        run_name_prefix = run_name_prefix or (
+            (pipeline.__name__
+             if callable(pipeline) else os.path.basename(pipeline)) + ' ' +
+            datetime.datetime.now().strftime('%Y-%m-%d %H-%M-%S'))
+
+        version_id = None
+        workflow_manifest = None
+        if (callable(pipeline) and upload_pipeline_name is not None and
+                enable_caching is None):
+            # Streams the package to the cluster while it is compiled.
+            version_id = self.upload_pipeline_from_func(
+                pipeline,
+                pipeline_name=upload_pipeline_name,
+                pipeline_conf=pipeline_conf,
+                mode=mode,
+                launcher_image=launcher_image).default_version.id
+        else:
+            with tempfile.TemporaryDirectory() as tmpdir:
+                if callable(pipeline):
+                    pipeline_package_path = os.path.join(
+                        tmpdir, 'pipeline.yaml')
+                    compiler.Compiler(
+                        mode=mode, launcher_image=launcher_image).compile(
+                            pipeline_func=pipeline,
+                            package_path=pipeline_package_path,
+                            pipeline_conf=pipeline_conf)
+                else:
+                    pipeline_package_path = pipeline
+
+                workflow = None
+                if enable_caching is not None:
+                    workflow = self._extract_pipeline_yaml(
+                        pipeline_package_path)
+                    # Caching option set at submission time overrides the compile time settings.
+                    self._override_caching_options(workflow, enable_caching)
+
+                if upload_pipeline_name is not None:
+                    if workflow is not None:
+                        # Uploads the overridden workflow in the format of the
+                        # original package.
+                        pipeline_package_path = os.path.join(
+                            tmpdir, os.path.basename(pipeline_package_path))
+                        compiler.Compiler._write_workflow(
+                            workflow, pipeline_package_path)
+                    version_id = self.upload_pipeline(
+                        pipeline_package_path,
+                        pipeline_name=upload_pipeline_name).default_version.id
+                else:
+                    if workflow is None:
+                        workflow = self._extract_pipeline_yaml(
+                            pipeline_package_path)
+                    workflow_manifest = json.dumps(workflow)
+
+        experiment = self.create_experiment(
+            name=self._get_experiment_name(experiment_name),
+            namespace=namespace)
+
+        def create_run(index: int, arguments: Mapping[str, Any]):
+            params = dict(arguments)
+            if pipeline_root is not None:
+                params[dsl.ROOT_PARAMETER_NAME] = pipeline_root
+            job_config = self._create_job_config(
+                experiment_id=experiment.id,
+                params=params,
+                pipeline_package_path=None,
+                pipeline_id=None,
+                version_id=version_id,
+                enable_caching=enable_caching,
+                workflow_manifest=workflow_manifest,
+            )
+            run_body = kfp_server_api.models.ApiRun(
+                pipeline_spec=job_config.spec,
+                resource_references=job_config.resource_references,
+                name='{} {}'.format(run_name_prefix, index),
+                service_account=service_account)
+            return RunPipelineResult(
+                self,
+                self._run_api.create_run(body=run_body).run)
+
+        with concurrent.futures.ThreadPoolExecutor(
+                max_workers=max_concurrency) as executor:
+            futures = [
+                executor.submit(create_run, index, arguments)
+                for index, arguments in enumerate(list_of_arguments)
+            ]
+        return [future.exception() or future.result() for future in futures]
+
     def list_runs(self,
                   page_token='',
                   page_size=10,
                   sort_by='',
                   experiment_id=None,
-                  namespace=None):
+                  namespace=None,
+                  filter=None):
         """List runs, optionally can be filtered by experiment or namespace.
 
         Args:
@@ -1072,6 +1738,8 @@ class Client(object):
           namespace: Kubernetes namespace to filter upon.
             For single user deployment, leave it as None;
             For multi user, input a namespace where the user is authorized.
+          filter: A url-encoded, JSON-serialized Filter protocol buffer
+            (see [filter.proto](https://github.com/kubeflow/pipelines/blob/master/backend/api/filter.proto)).
 
         Returns:
           A response object including a list of experiments and next page token.
@@ -1084,7 +1752,8 @@ class Client(object):
                 sort_by=sort_by,
                 resource_reference_key_type=kfp_server_api.models
                 .api_resource_type.ApiResourceType.EXPERIMENT,
-                resource_reference_key_id=experiment_id)
+                resource_reference_key_id=experiment_id,
+                filter=filter)
         elif namespace:
             response = self._run_api.list_runs(
                 page_token=page_token,
@@ -1092,17 +1761,58 @@ class Client(object):
                 sort_by=sort_by,
                 resource_reference_key_type=kfp_server_api.models
                 .api_resource_type.ApiResourceType.NAMESPACE,
-                resource_reference_key_id=namespace)
+                resource_reference_key_id=namespace,
+                filter=filter)
         else:
             response = self._run_api.list_runs(
-                page_token=page_token, page_size=page_size, sort_by=sort_by)
+                page_token=page_token,
+                page_size=page_size,
+                sort_by=sort_by,
+                filter=filter)
         return response
 
+    def iter_runs(self,
+                  page_size=_MAX_PAGE_SIZE,
+                  sort_by='',
+                  experiment_id=None,
+                  namespace=None,
+                  filter=None) -> Iterator[Any]:
+        """Iterates over all the runs, fetching the pages as needed.
+
+        The next page is fetched in the background while the current one is
+        consumed.
+
+        Example::
+
+          for run in client.iter_runs(experiment_id=experiment_id):
+            print(run.id, run.status)
+
+        Args:
+          page_size: Size of the pages.
+          sort_by: One of 'field_name', 'field_name desc'. For example, 'name desc'.
+          experiment_id: Experiment id to filter upon
+          namespace: Kubernetes namespace to filter upon. See list_runs.
+          filter: A url-encoded, JSON-serialized Filter protocol buffer.
+            See list_runs.
+
+        Yields:
+          The run objects.
+        """
+        return _iter_pages(
+            lambda page_token: self.list_runs(
+                page_token=page_token,
+                page_size=page_size,
+                sort_by=sort_by,
+                experiment_id=experiment_id,
+                namespace=namespace,
+                filter=filter), 'runs')
+
     def list_recurring_runs(self,
                             page_token='',
                             page_size=10,
                             sort_by='',
-                            experiment_id=None):
+                            experiment_id=None,
+                            filter=None):
         """List recurring runs.
 
         Args:
@@ -1110,6 +1820,8 @@ class Client(object):
           page_size: Size of the page.
           sort_by: One of 'field_name', 'field_name desc'. For example, 'name desc'.
           experiment_id: Experiment id to filter upon.
+          filter: A url-encoded, JSON-serialized Filter protocol buffer
+            (see [filter.proto](https://github.com/kubeflow/pipelines/blob/master/backend/api/filter.proto)).
 
         Returns:
           A response object including a list of recurring_runs and next page token.
@@ -1121,12 +1833,37 @@ class Client(object):
                 sort_by=sort_by,
                 resource_reference_key_type=kfp_server_api.models
                 .api_resource_type.ApiResourceType.EXPERIMENT,
-                resource_reference_key_id=experiment_id)
+                resource_reference_key_id=experiment_id,
+                filter=filter)
         else:
             response = self._job_api.list_jobs(
-                page_token=page_token, page_size=page_size, sort_by=sort_by)
+                page_token=page_token,
+                page_size=page_size,
+                sort_by=sort_by,
+                filter=filter)
         return response
 
+    def iter_recurring_runs(self,
+                            page_size=_MAX_PAGE_SIZE,
+                            sort_by='',
+                            experiment_id=None,
+                            filter=None) -> Iterator[Any]:
+        """Iterates over all the recurring runs, fetching the pages as needed.
+
+        The next page is fetched in the background while the current one is
+        consumed. See list_recurring_runs for the arguments.
+
+        Yields:
+          The recurring run (job) objects.
+        """
+        return _iter_pages(
+            lambda page_token: self.list_recurring_runs(
+                page_token=page_token,
+                page_size=page_size,
+                sort_by=sort_by,
+                experiment_id=experiment_id,
+                filter=filter), 'jobs')
+
     def get_recurring_run(self, job_id):
         """Get recurring_run details.
 
@@ -1170,26 +1907,155 @@ class Client(object):
         """
         status = 'Running:'
         start_time = datetime.datetime.now()
-        last_token_refresh_time = datetime.datetime.now()
         if isinstance(timeout, datetime.timedelta):
             timeout = timeout.total_seconds()
         while (status is None or status.lower()
                not in ['succeeded', 'failed', 'skipped', 'error']):
-            # Refreshes the access token before it hits the TTL.
-            if (datetime.datetime.now() - last_token_refresh_time >
-                    _GCP_ACCESS_TOKEN_TIMEOUT):
-                self._refresh_api_client_token()
-                last_token_refresh_time = datetime.datetime.now()
-
-            get_run_response = self._run_api.get_run(run_id=run_id)
-            status = get_run_response.run.status
+            self._refresh_api_client_token_if_expiring()
+            # The polls only read the status of the run, so the responses
+            # are not deserialized.
+            with _api_client.raw_responses():
+                get_run_response = self._run_api.get_run(run_id=run_id)
+            status, _ = _read_run_detail(get_run_response)
             elapsed_time = (datetime.datetime.now() -
                             start_time).total_seconds()
             logging.info('Waiting for the job to complete...')
             if elapsed_time > timeout:
                 raise TimeoutError('Run timeout')
             time.sleep(5)
-        return get_run_response
+        return self._deserialize_raw_response(get_run_response, 'ApiRunDetail')
+
+    def _deserialize_raw_response(self, response: Any, response_type: str):
+        if isinstance(response, dict):
+            return self._run_api.api_client.deserialize_data(
+                response, response_type)
+        # Not a raw response without fast_deserialization.
+        return response
+
+    def _get_raw_run_detail(self,
+                            run_id: str) -> Tuple[Optional[str], Optional[str]]:
+        """Gets the status and the workflow manifest of a run."""
+        with _api_client.raw_responses():
+            return _read_run_detail(self._run_api.get_run(run_id=run_id))
+
+    def _get_workflow_status(
+            self,
+            run_id: str) -> Tuple[Optional[str], Optional[_WorkflowStatus]]:
+        """Gets the status of a run and the status of its workflow."""
+        run_status, manifest = self._get_raw_run_detail(run_id)
+        if not manifest:
+            return run_status, None
+
+        # The statuses are cached by the resource version of the workflow,
+        # which changes with every update of the workflow.
+        uid = _WORKFLOW_UID_PATTERN.search(manifest, 0,
+                                           _WORKFLOW_METADATA_PREFIX_LENGTH)
+        resource_version = _WORKFLOW_RESOURCE_VERSION_PATTERN.search(
+            manifest, 0, _WORKFLOW_METADATA_PREFIX_LENGTH)
+        if uid is None or resource_version is None:
+            return run_status, _parse_workflow_status(manifest)
+        key = (uid.group(1), resource_version.group(1))
+        with self._workflow_statuses_lock:
+            workflow_status = self._workflow_statuses.get(key)
+            if workflow_status is not None:
+                self._workflow_statuses.move_to_end(key)
+                return run_status, workflow_status
+
+        workflow_status = _parse_workflow_status(manifest)
+        with self._workflow_statuses_lock:
+            self._workflow_statuses[key] = workflow_status
+            while len(self._workflow_statuses) > _WORKFLOW_STATUS_CACHE_SIZE:
+                self._workflow_statuses.popitem(last=False)
+        return run_status, workflow_status
+
+    def get_run_status(self, run_id: str) -> Optional[str]:
+        """Gets the phase of the workflow of a run.
+
+        Only the status of the workflow manifest is parsed, and the statuses
+        are cached by the resource version of the workflows, so polling
+        unchanged runs is cheap.
+
+        Args:
+          run_id: Run id, returned from run_pipeline.
+
+        Returns:
+          The phase of the workflow, e.g. 'Running' or 'Succeeded', or the
+          status of the run if it has no workflow yet.
+        """
+        run_status, workflow_status = self._get_workflow_status(run_id)
+        if workflow_status is None or workflow_status.phase is None:
+            return run_status
+        return workflow_status.phase
+
+    def get_node_statuses(self, run_id: str) -> Dict[str, Optional[str]]:
+        """Gets the phases of the nodes of the workflow of a run.
+
+        See get_run_status.
+
+        Args:
+          run_id: Run id, returned from run_pipeline.
+
+        Returns:
+          A dict from the ids of the workflow nodes (the keys of
+          status.nodes) to their phase. Empty if the run has no workflow yet.
+        """
+        _, workflow_status = self._get_workflow_status(run_id)
+        if workflow_status is None:
+            return {}
+        return dict(workflow_status.node_phases)
+
+    def wait_for_runs(self,
+                      run_ids: Iterable[str],
+                      timeout: Optional[float] = None,
+                      namespace: Optional[str] = None,
+                      min_poll_interval: float = 5,
+                      max_poll_interval: float = 60,
+                      batch_size: int = 100) -> Iterator[Any]:
+        """Waits for several runs to complete, yielding them as they complete.
+
+        All the runs are polled together with batched list_runs queries,
+        which do not return the workflow manifests of the runs. The polling
+        interval starts at min_poll_interval and doubles, with jitter, after
+        every poll where none of the runs completed, up to max_poll_interval.
+
+        Example::
+
+          for run in client.wait_for_runs(run_ids, timeout=3600):
+            print(run.id, run.status)
+
+        Args:
+          run_ids: Run ids, returned from run_pipeline.
+          timeout: Timeout in seconds. Waits forever if not specified.
+          namespace: Kubernetes namespace of the runs. See list_runs.
+          min_poll_interval: Minimum time between two polls, in seconds.
+          max_poll_interval: Maximum time between two polls, in seconds.
+          batch_size: Maximum number of runs queried at once.
+
+        Yields:
+          The run objects, as returned by list_runs, of the runs which
+          completed, in the order of completion.
+
+        Raises:
+          TimeoutError: if some of the runs failed to finish before the specified timeout.
+          ApiException: if some of the runs do not exist.
+        """
+        waiter = _RunsWaiter(run_ids, timeout, namespace, min_poll_interval,
+                             max_poll_interval, batch_size)
+        while True:
+            self._refresh_api_client_token_if_expiring()
+            listed_runs = []
+            for list_runs_kwargs in waiter.get_list_runs_kwargs():
+                listed_runs.extend(self.iter_runs(**list_runs_kwargs))
+            # Raises for the runs which do not exist.
+            unlisted_runs = [
+                _get_response_field(self.get_run(run_id), 'run')
+                for run_id in waiter.get_unlisted_run_ids(listed_runs)
+            ]
+            for run in waiter.add_polled_runs(listed_runs + unlisted_runs):
+                yield run
+            if waiter.done:
+                return
+            time.sleep(waiter.get_sleep_seconds())
 
     def _get_workflow_json(self, run_id):
         """Get the workflow json.
@@ -1200,8 +2066,7 @@ class Client(object):
         Returns:
           workflow: Json workflow
         """
-        get_run_response = self._run_api.get_run(run_id=run_id)
-        workflow = get_run_response.pipeline_runtime.workflow_manifest
+        _, workflow = self._get_raw_run_detail(run_id)
         workflow_json = json.loads(workflow)
         return workflow_json
 
@@ -1210,24 +2075,103 @@ class Client(object):
         pipeline_package_path: str = None,
         pipeline_name: str = None,
         description: str = None,
+        compress: bool = False,
     ):
         """Uploads the pipeline to the Kubeflow Pipelines cluster.
 
+        The package is streamed from the disk, a chunk at a time.
+
         Args:
           pipeline_package_path: Local path to the pipeline package.
           pipeline_name: Optional. Name of the pipeline to be shown in the UI.
           description: Optional. Description of the pipeline to be shown in the UI.
+          compress: Optional. Whether to compress a yaml package into a zip
+            package while it is uploaded.
 
         Returns:
           Server response object containing pipleine id and other information.
         """
+        file_name, chunks, size = _read_pipeline_package(
+            pipeline_package_path, compress)
+        response = _api_client.upload_file(
+            self._upload_api.api_client,
+            '/apis/v1beta1/pipelines/upload',
+            [('name', pipeline_name or os.path.basename(pipeline_package_path)),
+             ('description', description)],
+            file_name,
+            chunks,
+            size,
+            response_type='ApiPipeline')
+        if self._is_ipython():
+            import IPython
+            html = '<a href=%s/#/pipelines/details/%s>Pipeline details</a>.' % (
+                self._get_url_prefix(), _get_response_field(response, 'id'))
+            IPython.display.display(IPython.display.HTML(html))
+        return response
+
+    def upload_pipeline_from_func(
+        self,
+        pipeline_func: Callable,
+        pipeline_name: Optional[str] = None,
+        description: Optional[str] = None,
+        pipeline_conf: Optional[dsl.PipelineConf] = None,
+        mode: dsl.PipelineExecutionMode = dsl.PipelineExecutionMode.V1_LEGACY,
+        launcher_image: Optional[str] = None,
+        compress: bool = False,
+    ):
+        """Compiles a pipeline function and uploads it to the Kubeflow
+        Pipelines cluster.
+
+        The pipeline package is streamed to the cluster while it is written
+        by the compiler, without a local package file.
+
+        Args:
+          pipeline_func: A function that describes a pipeline by calling
+            components and composing them into execution graph.
+          pipeline_name: Optional. Name of the pipeline to be shown in the UI.
+            Defaults to the name of the pipeline function.
+          description: Optional. Description of the pipeline to be shown in the UI.
+          pipeline_conf: Optional. Pipeline configuration ops that will be applied
+            to all the ops in the pipeline func.
+          mode: The PipelineExecutionMode to use when compiling the pipeline
+            function.
+          launcher_image: The launcher image to use if the mode is specified as
+            PipelineExecutionMode.V2_COMPATIBLE.
+          compress: Optional. Whether to upload a zip package instead of the
+            yaml spec.
 
-        response = self._upload_api.upload_pipeline(
-            pipeline_package_path, name=pipeline_name, description=description)
+        Returns:
+          Server response object containing pipleine id and other information.
+        """
+        pipeline_compiler = compiler.Compiler(
+            mode=mode, launcher_image=launcher_image)
+
+        def write_yaml(yaml_file: BinaryIO):
+            pipeline_compiler.compile(
+                pipeline_func,
+                package_path=yaml_file,
+                pipeline_conf=pipeline_conf)
+
+        if compress:
+            file_name = 'pipeline.zip'
+            chunks = _iter_zipped_pipeline_yaml(write_yaml)
+        else:
+            file_name = 'pipeline.yaml'
+            chunks = _api_client.iter_written_chunks(write_yaml)
+        response = _api_client.upload_file(
+            self._upload_api.api_client,
+            '/apis/v1beta1/pipelines/upload',
+            [('name', pipeline_name or
+              getattr(pipeline_func, '_component_human_name', None) or
+              pipeline_func.__name__), ('description', description)],
+            file_name,
+            chunks,
+            size=None,
+            response_type='ApiPipeline')
         if self._is_ipython():
             import IPython
             html = '<a href=%s/#/pipelines/details/%s>Pipeline details</a>.' % (
-                self._get_url_prefix(), response.id)
+                self._get_url_prefix(), _get_response_field(response, 'id'))
             IPython.display.display(IPython.display.HTML(html))
         return response
 
@@ -1235,15 +2179,20 @@ class Client(object):
                                 pipeline_package_path,
                                 pipeline_version_name: str,
                                 pipeline_id: Optional[str] = None,
-                                pipeline_name: Optional[str] = None):
+                                pipeline_name: Optional[str] = None,
+                                compress: bool = False):
         """Uploads a new version of the pipeline to the Kubeflow Pipelines
         cluster.
 
+        The package is streamed from the disk, a chunk at a time.
+
         Args:
           pipeline_package_path: Local path to the pipeline package.
           pipeline_version_name:  Name of the pipeline version to be shown in the UI.
           pipeline_id: Optional. Id of the pipeline.
           pipeline_name: Optional. Name of the pipeline.
+          compress: Optional. Whether to compress a yaml package into a zip
+            package while it is uploaded.
         Returns:
           Server response object containing pipleine id and other information.
         Throws:
@@ -1258,15 +2207,23 @@ class Client(object):
         if pipeline_name:
             pipeline_id = self.get_pipeline_id(pipeline_name)
 
-        response = self._upload_api.upload_pipeline_version(
-            pipeline_package_path,
-            name=pipeline_version_name,
-            pipelineid=pipeline_id)
+        file_name, chunks, size = _read_pipeline_package(
+            pipeline_package_path, compress)
+        response = _api_client.upload_file(
+            self._upload_api.api_client,
+            '/apis/v1beta1/pipelines/upload_version',
+            [('name', pipeline_version_name or
+              os.path.basename(pipeline_package_path)),
+             ('pipelineid', pipeline_id)],
+            file_name,
+            chunks,
+            size,
+            response_type='ApiPipelineVersion')
 
         if self._is_ipython():
             import IPython
             html = '<a href=%s/#/pipelines/details/%s>Pipeline details</a>.' % (
-                self._get_url_prefix(), response.id)
+                self._get_url_prefix(), _get_response_field(response, 'id'))
             IPython.display.display(IPython.display.HTML(html))
         return response
 
@@ -1302,7 +2259,8 @@ class Client(object):
                                pipeline_id,
                                page_token='',
                                page_size=10,
-                               sort_by=''):
+                               sort_by='',
+                               filter=None):
         """Lists pipeline versions.
 
         Args:
@@ -1310,6 +2268,8 @@ class Client(object):
           page_token: Token for starting of the page.
           page_size: Size of the page.
           sort_by: One of 'field_name', 'field_name desc'. For example, 'name desc'.
+          filter: A url-encoded, JSON-serialized Filter protocol buffer
+            (see [filter.proto](https://github.com/kubeflow/pipelines/blob/master/backend/api/filter.proto)).
 
         Returns:
           A response object including a list of versions and next page token.
@@ -1321,4 +2281,27 @@ class Client(object):
             sort_by=sort_by,
             resource_key_type=kfp_server_api.models.api_resource_type
             .ApiResourceType.PIPELINE,
-            resource_key_id=pipeline_id)
+            resource_key_id=pipeline_id,
+            filter=filter)
+
+    def iter_pipeline_versions(self,
+                               pipeline_id,
+                               page_size=_MAX_PAGE_SIZE,
+                               sort_by='',
+                               filter=None) -> Iterator[Any]:
+        """Iterates over all the versions of a pipeline, fetching the pages
+        as needed.
+
+        The next page is fetched in the background while the current one is
+        consumed. See list_pipeline_versions for the arguments.
+
+        Yields:
+          The pipeline version objects.
+        """
+        return _iter_pages(
+            lambda page_token: self.list_pipeline_versions(
+                pipeline_id,
+                page_token=page_token,
+                page_size=page_size,
+                sort_by=sort_by,
+                filter=filter), 'versions')
@@ -0,0 +1,782 @@
+# Copyright 2021 The Kubeflow Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import concurrent.futures
+import datetime
+import http.server
+import io
+import json
+import os
+import socket
+import tempfile
+import threading
+import time
+import unittest
+import urllib.parse
+import zipfile
+from unittest import mock
+
+import yaml
+from kfp import Client, compiler, dsl
+from kfp import _api_client
+from kfp._client import _parse_workflow_status
+from kfp_server_api.exceptions import ApiException
+
+
+class _FakeRunServiceHandler(http.server.BaseHTTPRequestHandler):
+    """Serves the healthz, experiment, run and upload endpoints of the API
+    server.
+
+    Each run completes after it has been listed a given number of times.
+    The runs which are not polled are only served by get_run, from
+    server.run_details.
+    Run creations fail for runs with a 'fail' parameter. The first requests
+    fail with a 503 status, as many as server.unavailable_responses.
+    """
+    # Keeps the connections alive.
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.num_connections += 1
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, obj):
+        body = json.dumps(obj).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_unavailable(self) -> bool:
+        with self.server.lock:
+            if self.server.unavailable_responses <= 0:
+                return False
+            self.server.unavailable_responses -= 1
+        self.send_error(503)
+        return True
+
+    def do_GET(self):
+        if self._send_unavailable():
+            return
+        url = urllib.parse.urlparse(self.path)
+        if url.path == '/apis/v1beta1/healthz':
+            self._send_json({'multi_user': False})
+            return
+        query = urllib.parse.parse_qs(url.query)
+        if url.path == '/apis/v1beta1/experiments':
+            self._list_experiments(query)
+            return
+        if url.path.startswith('/apis/v1beta1/runs/'):
+            run_id = url.path[len('/apis/v1beta1/runs/'):]
+            if run_id not in self.server.run_details:
+                self.send_error(404)
+                return
+            self._send_json(self.server.run_details[run_id])
+            return
+        if url.path != '/apis/v1beta1/runs':
+            self.send_error(404)
+            return
+
+        run_filter = json.loads(query['filter'][0])
+        [predicate] = run_filter['predicates']
+        assert predicate['op'] == 8 and predicate['key'] == 'id'
+        run_ids = predicate['stringValues']['values']
+        page_size = int(query['page_size'][0])
+        start = int(query.get('page_token', ['0'])[0] or '0')
+
+        server = self.server
+        server.list_requests.append(run_ids)
+        runs = []
+        for run_id in run_ids[start:start + page_size]:
+            # Only the runs in server.polls are listed.
+            if run_id not in server.polls:
+                continue
+            server.list_counts[run_id] = server.list_counts.get(run_id, 0) + 1
+            completed = server.list_counts[run_id] >= server.polls[run_id]
+            runs.append({
+                'id': run_id,
+                'status': 'Succeeded' if completed else 'Running',
+            })
+        response = {'runs': runs, 'total_size': len(run_ids)}
+        if start + page_size < len(run_ids):
+            response['next_page_token'] = str(start + page_size)
+        self._send_json(response)
+
+    def _read_body(self) -> bytes:
+        if self.headers.get('Transfer-Encoding') != 'chunked':
+            return self.rfile.read(int(self.headers['Content-Length']))
+        chunks = []
+        while True:
+            size = int(self.rfile.readline().split(b';')[0], 16)
+            chunks.append(self.rfile.read(size))
+            self.rfile.readline()
+            if not size:
+                return b''.join(chunks)
+
+    def do_POST(self):
+        body = self._read_body()
+        if self._send_unavailable():
+            return
+        server = self.server
+        if self.path == '/apis/v1beta1/experiments':
+            self._send_json(dict(json.loads(body), id='experiment-new'))
+        elif self.path == '/apis/v1beta1/runs':
+            run = json.loads(body)
+            parameters = run['pipeline_spec'].get('parameters', [])
+            if any(parameter['name'] == 'fail' for parameter in parameters):
+                self.send_error(400)
+                return
+            with server.lock:
+                server.created_runs.append(run)
+                run_id = 'run-{}'.format(len(server.created_runs))
+            self._send_json({'run': dict(run, id=run_id)})
+        elif self.path.startswith('/apis/v1beta1/pipelines/upload'):
+            server.uploads.append(self.path)
+            server.upload_bodies.append(body)
+            server.upload_headers.append(self.headers)
+            self._send_json({
+                'id': 'pipeline-new',
+                'default_version': {
+                    'id': 'version-new'
+                }
+            })
+        else:
+            self.send_error(404)
+
+    def _list_experiments(self, query):
+        server = self.server
+        server.experiment_queries.append(query)
+        page_size = int(query.get('page_size', ['20'])[0])
+        start = int(query.get('page_token', ['0'])[0] or '0')
+        experiments = [{
+            'id': 'experiment-{}'.format(i),
+            'name': 'Experiment {}'.format(i)
+        } for i in range(start, min(start + page_size, server.num_experiments))]
+        response = {
+            'experiments': experiments,
+            'total_size': server.num_experiments
+        }
+        if start + page_size < server.num_experiments:
+            response['next_page_token'] = str(start + page_size)
+        self._send_json(response)
+
+
+class _FakeApiServerTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.server = http.server.ThreadingHTTPServer(('127.0.0.1', 0),
+                                                      _FakeRunServiceHandler)
+        self.server.num_experiments = 0
+        self.server.experiment_queries = []
+        self.server.polls = {}
+        self.server.lock = threading.Lock()
+        self.server.num_connections = 0
+        self.server.created_runs = []
+        self.server.uploads = []
+        self.server.upload_bodies = []
+        self.server.upload_headers = []
+        self.server.unavailable_responses = 0
+        self.server.list_counts = {}
+        self.server.list_requests = []
+        self.server.run_details = {}
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        patcher = mock.patch.object(Client, 'LOCAL_KFP_CONTEXT',
+                                    os.path.join(temp_dir.name, 'context.json'))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.client = self._create_client()
+
+    def _create_client(self, **kwargs) -> Client:
+        return Client(
+            host='http://127.0.0.1:{}'.format(self.server.server_address[1]),
+            **kwargs)
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class IterPagesTest(_FakeApiServerTestCase):
+
+    def test_iter_experiments(self):
+        self.server.num_experiments = 5
+        experiment_filter = json.dumps({
+            'predicates': [{
+                'op': 9,
+                'key': 'name',
+                'stringValue': 'Experiment'
+            }]
+        })
+
+        experiments = list(
+            self.client.iter_experiments(page_size=2, filter=experiment_filter))
+
+        self.assertEqual(['experiment-{}'.format(i) for i in range(5)],
+                         [experiment.id for experiment in experiments])
+        self.assertEqual([None, '2', '4'], [
+            query.get('page_token', [None])[0]
+            for query in self.server.experiment_queries
+        ])
+        for query in self.server.experiment_queries:
+            self.assertEqual([experiment_filter], query['filter'])
+
+    def test_iter_experiments_raw_responses(self):
+        self.server.num_experiments = 3
+        with self.client.raw_responses():
+            experiments = list(self.client.iter_experiments(page_size=2))
+        self.assertEqual([{
+            'id': 'experiment-{}'.format(i),
+            'name': 'Experiment {}'.format(i)
+        } for i in range(3)], experiments)
+
+    def test_raw_responses_requires_fast_deserialization(self):
+        client = self._create_client(fast_deserialization=False)
+        with self.assertRaisesRegex(RuntimeError, 'fast_deserialization'):
+            with client.raw_responses():
+                pass
+
+    def test_experiments_raw_responses(self):
+        with self.client.raw_responses():
+            created_experiment = self.client.create_experiment('Experiment')
+            self.server.num_experiments = 1
+            experiment = self.client.get_experiment(
+                experiment_name='Experiment 0')
+            existing_experiment = self.client.create_experiment('Experiment 0')
+        self.assertEqual('experiment-new', created_experiment['id'])
+        self.assertEqual({
+            'id': 'experiment-0',
+            'name': 'Experiment 0'
+        }, experiment)
+        self.assertEqual(experiment, existing_experiment)
+
+    def test_create_runs_within_raw_responses(self):
+        with self.client.raw_responses():
+            [result] = self.client.create_runs(_echo_pipeline, [{
+                'message': 'hello'
+            }])
+        self.assertEqual('run-1', result.run_id)
+        self.assertEqual('run-1', result.run_info.id)
+
+    def test_iter_experiments_empty(self):
+        self.assertEqual([], list(self.client.iter_experiments()))
+        self.assertEqual(['200'],
+                         self.server.experiment_queries[0]['page_size'])
+
+    def test_iter_experiments_stops_fetching_when_closed(self):
+        self.server.num_experiments = 10
+        experiments = self.client.iter_experiments(page_size=2)
+        self.assertEqual('experiment-0', next(experiments).id)
+        experiments.close()
+        # Only the next page may have been prefetched.
+        self.assertLessEqual(len(self.server.experiment_queries), 2)
+
+
+def _echo_pipeline(message: str):
+    dsl.ContainerOp(name='echo', image='busybox', command=['echo', message])
+
+
+class CreateRunsTest(_FakeApiServerTestCase):
+
+    def test_create_runs(self):
+        results = self.client.create_runs(
+            _echo_pipeline, [{
+                'message': 'message-{}'.format(i)
+            } for i in range(10)] + [{
+                'fail': 'true'
+            }],
+            run_name_prefix='sweep',
+            max_concurrency=4)
+
+        self.assertEqual(11, len(results))
+        self.assertIsInstance(results[-1], ApiException)
+        created_runs = {run['name']: run for run in self.server.created_runs}
+        self.assertEqual({'sweep {}'.format(i) for i in range(10)},
+                         set(created_runs))
+        for i, result in enumerate(results[:-1]):
+            run = created_runs['sweep {}'.format(i)]
+            self.assertEqual(result.run_id, result.run_info.id)
+            self.assertEqual(run['name'], result.run_info.name)
+            self.assertEqual([{
+                'name': 'message',
+                'value': 'message-{}'.format(i)
+            }], run['pipeline_spec']['parameters'])
+        # The workflow manifest is the same for all the runs.
+        manifests = {
+            run['pipeline_spec']['workflow_manifest']
+            for run in self.server.created_runs
+        }
+        self.assertEqual(1, len(manifests))
+        self.assertEqual('Workflow', json.loads(manifests.pop())['kind'])
+
+    def test_create_runs_with_uploaded_pipeline(self):
+        results = self.client.create_runs(
+            _echo_pipeline, [{
+                'message': 'a'
+            }, {
+                'message': 'b'
+            }],
+            upload_pipeline_name='echo')
+
+        self.assertEqual(['run-1', 'run-2'],
+                         sorted(result.run_id for result in results))
+        self.assertEqual(1, len(self.server.uploads))
+        for run in self.server.created_runs:
+            self.assertNotIn('workflow_manifest', run['pipeline_spec'])
+            self.assertIn(
+                {
+                    'key': {
+                        'id': 'version-new',
+                        'type': 'PIPELINE_VERSION'
+                    },
+                    'relationship': 'CREATOR'
+                }, run['resource_references'])
+
+    def test_create_runs_with_uploaded_pipeline_overrides_caching(self):
+        self.client.create_runs(
+            _echo_pipeline, [{
+                'message': 'a'
+            }],
+            enable_caching=False,
+            upload_pipeline_name='echo')
+
+        self.assertEqual(1, len(self.server.uploads))
+        self.assertIn(b'pipelines.kubeflow.org/enable_caching: "false"',
+                      self.server.upload_bodies[0])
+        self.assertNotIn(b'pipelines.kubeflow.org/enable_caching: "true"',
+                         self.server.upload_bodies[0])
+
+    def test_create_runs_from_package_overrides_caching(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            package_path = os.path.join(temp_dir, 'echo.tar.gz')
+            compiler.Compiler().compile(_echo_pipeline, package_path)
+
+            self.client.create_runs(
+                package_path, [{
+                    'message': 'a'
+                }],
+                enable_caching=False,
+                upload_pipeline_name='echo')
+
+            # The package itself is left untouched.
+            self.assertEqual(
+                'true',
+                self.client._extract_pipeline_yaml(
+                    package_path)['spec']['templates'][0]['metadata']['labels']
+                ['pipelines.kubeflow.org/enable_caching'])
+        self.assertIn(b'filename="echo.tar.gz"', self.server.upload_bodies[0])
+
+
+class UploadPipelineTest(_FakeApiServerTestCase):
+
+    def _get_uploaded_file(self, index: int = 0) -> bytes:
+        """Gets the file of an upload request from its multipart body."""
+        content_type = self.server.upload_headers[index]['Content-Type']
+        boundary = content_type.split('boundary=')[1].encode('utf-8')
+        body = self.server.upload_bodies[index]
+        self.assertTrue(body.endswith(b'\r\n--' + boundary + b'--\r\n'))
+        head, content = body.split(b'\r\n\r\n', 1)
+        self.assertIn(b'name="uploadfile"', head)
+        return content[:-len(boundary) - 8]
+
+    def test_upload_pipeline(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            package_path = os.path.join(temp_dir, 'echo.yaml')
+            compiler.Compiler().compile(_echo_pipeline, package_path)
+            with open(package_path, 'rb') as f:
+                package = f.read()
+
+            pipeline = self.client.upload_pipeline(package_path)
+
+        self.assertEqual('pipeline-new', pipeline.id)
+        self.assertIn('name=echo.yaml', self.server.uploads[0])
+        self.assertIn(b'filename="echo.yaml"', self.server.upload_bodies[0])
+        self.assertEqual(package, self._get_uploaded_file())
+        self.assertIn('Content-Length', self.server.upload_headers[0])
+
+    def test_upload_pipeline_compressed(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            package_path = os.path.join(temp_dir, 'echo.yaml')
+            compiler.Compiler().compile(_echo_pipeline, package_path)
+            with open(package_path, 'rb') as f:
+                package = f.read()
+
+            self.client.upload_pipeline_version(
+                package_path,
+                pipeline_version_name='v1',
+                pipeline_id='pipeline-a',
+                compress=True)
+
+        self.assertIn('/upload_version?name=v1&pipelineid=pipeline-a',
+                      self.server.uploads[0])
+        self.assertEqual('chunked',
+                         self.server.upload_headers[0]['Transfer-Encoding'])
+        self.assertIn(b'filename="echo.yaml.zip"', self.server.upload_bodies[0])
+        with zipfile.ZipFile(io.BytesIO(self._get_uploaded_file())) as f:
+            self.assertEqual(package, f.read('pipeline.yaml'))
+
+    def test_upload_pipeline_from_func(self):
+        self.client.upload_pipeline_from_func(
+            _echo_pipeline, description='Echoes')
+
+        self.assertIn('name=_echo_pipeline&description=Echoes',
+                      self.server.uploads[0])
+        self.assertEqual('chunked',
+                         self.server.upload_headers[0]['Transfer-Encoding'])
+        workflow = yaml.safe_load(self._get_uploaded_file())
+        self.assertEqual('Workflow', workflow['kind'])
+        self.assertEqual(
+            compiler.Compiler()._create_workflow(_echo_pipeline)['spec'],
+            workflow['spec'])
+
+    def test_upload_pipeline_from_func_compile_error(self):
+
+        @dsl.pipeline(name='failing')
+        def failing_pipeline():
+            raise ValueError('Invalid pipeline.')
+
+        with self.assertRaisesRegex(ValueError, 'Invalid pipeline.'):
+            self.client.upload_pipeline_from_func(failing_pipeline)
+        self.assertEqual([], self.server.uploads)
+
+
+class IterWrittenChunksTest(unittest.TestCase):
+
+    def test_iter_written_chunks(self):
+
+        def write(f):
+            for i in range(10):
+                f.write(bytes([i]) * 3)
+
+        chunks = list(_api_client.iter_written_chunks(write, chunk_size=4))
+        self.assertEqual(b''.join(bytes([i]) * 3 for i in range(10)),
+                         b''.join(chunks))
+        self.assertGreater(len(chunks), 1)
+
+    def test_iter_written_chunks_raises_writer_errors(self):
+
+        def write(f):
+            f.write(b'data')
+            raise RuntimeError('Writer failed.')
+
+        chunks = _api_client.iter_written_chunks(write, chunk_size=4)
+        self.assertEqual(b'data', next(chunks))
+        with self.assertRaisesRegex(RuntimeError, 'Writer failed.'):
+            next(chunks)
+
+    def test_iter_written_chunks_stops_writer(self):
+        stopped = threading.Event()
+
+        def write(f):
+            try:
+                while True:
+                    f.write(b'data')
+            finally:
+                stopped.set()
+
+        chunks = _api_client.iter_written_chunks(write, chunk_size=4)
+        next(chunks)
+        chunks.close()
+        self.assertTrue(stopped.wait(10))
+
+
+class WaitForRunsTest(_FakeApiServerTestCase):
+
+    def test_wait_for_runs_yields_runs_in_completion_order(self):
+        self.server.polls = {'run-a': 3, 'run-b': 1, 'run-c': 2}
+
+        runs = list(
+            self.client.wait_for_runs(['run-a', 'run-b', 'run-c'],
+                                      min_poll_interval=0.01,
+                                      max_poll_interval=0.02))
+
+        self.assertEqual(['run-b', 'run-c', 'run-a'], [run.id for run in runs])
+        self.assertEqual(['Succeeded'] * 3, [run.status for run in runs])
+        # Completed runs are no longer polled.
+        self.assertEqual(
+            [['run-a', 'run-b', 'run-c'], ['run-a', 'run-c'], ['run-a']],
+            self.server.list_requests)
+
+    def test_wait_for_runs_in_batches(self):
+        run_ids = ['run-{}'.format(i) for i in range(5)]
+        self.server.polls = {run_id: 1 for run_id in run_ids}
+
+        runs = list(
+            self.client.wait_for_runs(
+                run_ids, min_poll_interval=0.01, batch_size=2))
+
+        self.assertEqual(run_ids, [run.id for run in runs])
+        self.assertEqual([['run-0', 'run-1'], ['run-2', 'run-3'], ['run-4']],
+                         self.server.list_requests)
+
+    def test_wait_for_runs_timeout(self):
+        self.server.polls = {'run-a': 1, 'run-b': 1000}
+
+        completed_run_ids = []
+        with self.assertRaisesRegex(TimeoutError, 'Run timeout'):
+            for run in self.client.wait_for_runs(['run-a', 'run-b'],
+                                                 timeout=0.2,
+                                                 min_poll_interval=0.01,
+                                                 max_poll_interval=0.05):
+                completed_run_ids.append(run.id)
+        self.assertEqual(['run-a'], completed_run_ids)
+
+    def test_wait_for_runs_raw_responses(self):
+        self.server.polls = {'run-a': 2, 'run-b': 1}
+
+        with self.client.raw_responses():
+            runs = list(
+                self.client.wait_for_runs(['run-a', 'run-b'],
+                                          min_poll_interval=0.01))
+
+        self.assertEqual(['run-b', 'run-a'], [run['id'] for run in runs])
+        self.assertEqual(['Succeeded'] * 2, [run['status'] for run in runs])
+
+    def test_wait_for_runs_gets_unlisted_runs(self):
+        self.server.polls = {'run-a': 2}
+        # Not listed, e.g. a run in another namespace.
+        self.server.run_details['run-b'] = {
+            'run': {
+                'id': 'run-b',
+                'status': 'Failed'
+            }
+        }
+
+        runs = list(
+            self.client.wait_for_runs(['run-a', 'run-b'],
+                                      min_poll_interval=0.01))
+
+        self.assertEqual(['run-b', 'run-a'], [run.id for run in runs])
+        self.assertEqual(['Failed', 'Succeeded'], [run.status for run in runs])
+
+    def test_wait_for_runs_raises_for_missing_runs(self):
+        self.server.polls = {'run-a': 1000}
+
+        with self.assertRaises(ApiException) as context:
+            list(
+                self.client.wait_for_runs(['run-a', 'run-missing'],
+                                          min_poll_interval=0.01))
+        self.assertEqual(404, context.exception.status)
+        self.assertEqual([['run-a', 'run-missing']], self.server.list_requests)
+
+
+def _make_workflow_manifest(resource_version, phase, node_phases, indent=None):
+    return json.dumps(
+        {
+            'kind': 'Workflow',
+            'metadata': {
+                'name': 'workflow',
+                'uid': 'workflow-uid',
+                'resourceVersion': resource_version,
+            },
+            'spec': {
+                'volumeClaimTemplates': [{
+                    'metadata': {
+                        'name': 'volume'
+                    },
+                    'status': {}
+                }]
+            },
+            'status': {
+                'phase': phase,
+                'conditions': [{
+                    'type': 'Completed',
+                    'status': 'True'
+                }],
+                'nodes': {
+                    node_id: {
+                        'id': node_id,
+                        'phase': node_phase
+                    } for node_id, node_phase in node_phases.items()
+                },
+            },
+        },
+        separators=(',', ':') if indent is None else None,
+        indent=indent)
+
+
+class ParseWorkflowStatusTest(unittest.TestCase):
+
+    def test_parse_workflow_status(self):
+        for indent in [None, 2]:
+            manifest = _make_workflow_manifest(
+                '1',
+                'Running', {
+                    'workflow': 'Running',
+                    'workflow-1': 'Succeeded'
+                },
+                indent=indent)
+            workflow_status = _parse_workflow_status(manifest)
+            self.assertEqual('Running', workflow_status.phase)
+            self.assertEqual({
+                'workflow': 'Running',
+                'workflow-1': 'Succeeded'
+            }, workflow_status.node_phases)
+
+    def test_parse_workflow_status_not_last(self):
+        manifest = json.dumps(
+            {
+                'status': {
+                    'phase': 'Failed'
+                },
+                'spec': {
+                    'volumeClaimTemplates': [{
+                        'status': {}
+                    }]
+                },
+            },
+            separators=(',', ':'))
+        self.assertEqual('Failed', _parse_workflow_status(manifest).phase)
+        self.assertEqual({}, _parse_workflow_status('{}').node_phases)
+
+
+class RunStatusTest(_FakeApiServerTestCase):
+
+    def _set_run(self, run_id, run_status, manifest=None):
+        run_detail = {'run': {'id': run_id, 'status': run_status}}
+        if manifest is not None:
+            run_detail['pipeline_runtime'] = {'workflow_manifest': manifest}
+        self.server.run_details[run_id] = run_detail
+
+    def test_get_run_status(self):
+        self._set_run('run-a', None)
+        self.assertIsNone(self.client.get_run_status('run-a'))
+        self.assertEqual({}, self.client.get_node_statuses('run-a'))
+
+        self._set_run(
+            'run-a', 'Running',
+            _make_workflow_manifest('1', 'Running', {'workflow': 'Running'}))
+        self.assertEqual('Running', self.client.get_run_status('run-a'))
+        self.assertEqual({'workflow': 'Running'},
+                         self.client.get_node_statuses('run-a'))
+
+    def test_get_run_status_caches_statuses_by_resource_version(self):
+        with mock.patch(
+                'kfp._client._parse_workflow_status',
+                wraps=_parse_workflow_status) as parse_workflow_status:
+            self._set_run(
+                'run-a', 'Running',
+                _make_workflow_manifest('1', 'Running',
+                                        {'workflow': 'Running'}))
+            self.assertEqual('Running', self.client.get_run_status('run-a'))
+            self.assertEqual({'workflow': 'Running'},
+                             self.client.get_node_statuses('run-a'))
+            self.assertEqual(1, parse_workflow_status.call_count)
+
+            self._set_run(
+                'run-a', 'Succeeded',
+                _make_workflow_manifest('2', 'Succeeded',
+                                        {'workflow': 'Succeeded'}))
+            self.assertEqual('Succeeded', self.client.get_run_status('run-a'))
+            self.assertEqual(2, parse_workflow_status.call_count)
+
+    def test_wait_for_run_completion(self):
+        self._set_run('run-a', 'Succeeded',
+                      _make_workflow_manifest('1', 'Succeeded', {}))
+        with mock.patch('time.sleep'):
+            run_detail = self.client.wait_for_run_completion('run-a', 60)
+        self.assertEqual('Succeeded', run_detail.run.status)
+        self.assertEqual(
+            'Workflow',
+            json.loads(run_detail.pipeline_runtime.workflow_manifest)['kind'])
+
+
+class ConnectionPoolTest(_FakeApiServerTestCase):
+
+    def test_connection_pool_options(self):
+        client = self._create_client(
+            connection_pool_maxsize=3,
+            connection_pool_block=True,
+            tcp_keepalive=True,
+            retries=2,
+            request_timeout=7)
+
+        rest_client = client._run_api.api_client.rest_client
+        connection_pool_kw = rest_client.pool_manager.connection_pool_kw
+        self.assertEqual(3, connection_pool_kw['maxsize'])
+        self.assertTrue(connection_pool_kw['block'])
+        self.assertIn((socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1),
+                      connection_pool_kw['socket_options'])
+        self.assertEqual(2, connection_pool_kw['retries'].total)
+
+        self._set_runs()
+        with mock.patch.object(
+                rest_client.pool_manager,
+                'request',
+                wraps=rest_client.pool_manager.request) as request:
+            self.assertEqual('Running', client.get_run_status('run-a'))
+        timeout = request.call_args[1]['timeout']
+        self.assertEqual((7, 7),
+                         (timeout.connect_timeout, timeout.read_timeout))
+
+    def test_concurrent_requests_share_connections(self):
+        self._set_runs()
+        client = self._create_client(
+            connection_pool_maxsize=4, connection_pool_block=True)
+        num_connections = self.server.num_connections
+
+        def get_statuses():
+            return [client.get_run_status('run-a') for _ in range(10)]
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=16) as executor:
+            statuses = list(executor.map(lambda _: get_statuses(), range(16)))
+
+        self.assertEqual([['Running'] * 10] * 16, statuses)
+        self.assertLessEqual(self.server.num_connections - num_connections, 4)
+
+    def test_token_refresh_is_shared(self):
+        refreshed = threading.Event()
+
+        def get_gcp_access_token():
+            refreshed.wait(5)
+            return 'new-token'
+
+        self.client._last_token_refresh_time = datetime.datetime.min
+        with mock.patch(
+                'kfp._client.get_gcp_access_token',
+                side_effect=get_gcp_access_token) as get_token:
+            refreshing_thread = threading.Thread(
+                target=self.client._refresh_api_client_token_if_expiring)
+            refreshing_thread.start()
+            while not get_token.called:
+                time.sleep(0.01)
+            # The other threads do not wait for the refresh.
+            self.client._refresh_api_client_token_if_expiring()
+            refreshed.set()
+            refreshing_thread.join()
+            self.client._refresh_api_client_token_if_expiring()
+
+        self.assertEqual(1, get_token.call_count)
+        self.assertEqual('new-token',
+                         self.client._existing_config.api_key['authorization'])
+
+    def _set_runs(self):
+        self.server.run_details['run-a'] = {
+            'run': {
+                'id': 'run-a',
+                'status': 'Running'
+            }
+        }
+
+
+if __name__ == '__main__':
+    unittest.main()
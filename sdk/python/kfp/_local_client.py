@@ -12,19 +12,27 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import concurrent.futures
 import datetime
+import hashlib
 import json
 import logging
 import os
 import re
+import shutil
 import subprocess
 import tempfile
+import threading
 import warnings
 from collections import deque
-from typing import Any, Callable, Dict, List, Mapping, Optional, Union, cast
+from typing import (Any, Callable, Dict, Iterable, List, Mapping, Optional,
+                    Union, cast)
 
 from . import dsl
 from .compiler.compiler import sanitize_k8s_name
+from .containers._cache import (calculate_file_hash,
+                                calculate_recursive_dir_hash)
+from .dsl._for_loop import LoopArguments, LoopArgumentVariable
 
 
 class _Dag:
@@ -128,6 +136,245 @@ def _get_subgroup(groups: List[dsl.OpsGroup],
     return next(filter(lambda g: g.name == group_name, groups), None)
 
 
+def _serialize_loop_item(item: Any) -> str:
+    """Serialize a loop item the way it is passed to a command line."""
+    if isinstance(item, str):
+        return item
+    return json.dumps(item)
+
+
+def _get_loop_item_arguments(loop_args: LoopArguments,
+                             item: Any) -> Dict[str, str]:
+    """Map the placeholders of a loop item, and of its subvariables when the
+    item is a dict, to their values for one iteration."""
+    arguments = {loop_args.pattern: _serialize_loop_item(item)}
+    if isinstance(item, dict):
+        for subvar_name, subvar_value in item.items():
+            subvar = LoopArgumentVariable(
+                loop_args.name,
+                subvar_name,
+                loop_args_op_name=loop_args.op_name)
+            arguments[subvar.pattern] = _serialize_loop_item(subvar_value)
+    return arguments
+
+
+def _stream_output(pipe, log_func: Callable, op_name: str) -> None:
+    """Forward the lines of a task output stream to the log as they arrive."""
+    with pipe:
+        for line in iter(pipe.readline, ""):
+            log_func("%s: %s", op_name, line.rstrip("\n"))
+
+
+_LOCAL_CACHE_DIR_NAME = ".kfp_local_cache"
+
+_DURATION_REGEX = re.compile(
+    r"^P(?:(?P<weeks>\d+)W)?(?:(?P<days>\d+)D)?"
+    r"(?:T(?:(?P<hours>\d+)H)?(?:(?P<minutes>\d+)M)?(?:(?P<seconds>\d+)S)?)?$")
+
+
+def _parse_duration(duration: str) -> Optional[datetime.timedelta]:
+    """Parse an RFC3339 duration such as `P30DT1H22M3S`.
+
+    Only weeks, days, hours, minutes and seconds are supported, since
+    years and months don't have a fixed length.
+
+    Returns:
+        The duration, or None if it is not supported.
+    """
+    match = _DURATION_REGEX.match(duration)
+    if match is None:
+        return None
+    return datetime.timedelta(**{
+        unit: int(value) for unit, value in match.groupdict().items() if value
+    })
+
+
+def _remove_path(path: str) -> None:
+    """Remove a file or directory tree if it exists."""
+    if os.path.isdir(path):
+        shutil.rmtree(path)
+    elif os.path.exists(path):
+        os.remove(path)
+
+
+def _link_or_copy(src: str, dst: str) -> None:
+    """Hard-link a file or directory tree, falling back to copying when the
+    paths are on different file systems."""
+    if os.path.isdir(src):
+        shutil.copytree(src, dst, copy_function=_link_or_copy)
+        return
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
+
+def _is_under(path: str, root: str) -> bool:
+    """Whether an absolute path is the root directory or inside it."""
+    if not os.path.isabs(path):
+        return False
+    root = os.path.normpath(root)
+    return os.path.commonpath([os.path.normpath(path), root]) == root
+
+
+class _StepCache:
+    """Content-addressed cache of op outputs for the local runner.
+
+    An op is identified by a fingerprint of its image, of its command line
+    after placeholder resolution, and of the contents of its input files:
+    the input artifacts under the pipeline root and the local files passed
+    as pipeline arguments. The outputs of a successful op are hard-linked
+    into the cache entry of its fingerprint, and linked back into the output
+    tree of any later run executing an op with the same fingerprint.
+    """
+
+    _MANIFEST_FILE_NAME = "outputs.json"
+
+    def __init__(self, cache_root: str,
+                 input_files: Iterable[str] = ()) -> None:
+        """
+        Args:
+            cache_root: Directory of the cache entries.
+            input_files: Local files passed to the pipeline, which are
+                fingerprinted by content as well.
+        """
+        self._cache_root = cache_root
+        self._input_files = frozenset(input_files)
+
+    def get_key(self, image: str, cmd: List[str], input_root: str,
+                output_files: Dict[str, str]) -> str:
+        """Compute the fingerprint of an op.
+
+        Args:
+            image: The image of the op.
+            cmd: The resolved command line of the op.
+            input_root: Command line items under this directory are input
+                artifacts, which are fingerprinted by content instead of path.
+                The local input files of the cache are fingerprinted by both
+                path and content. Any other item is an opaque string.
+            output_files: Map from output name to resolved output file path.
+        """
+        output_names = {path: name for name, path in output_files.items()}
+        normalized_cmd = []
+        for cmd_item in cmd:
+            if cmd_item in output_names:
+                cmd_item = "{{outputPath:%s}}" % output_names[cmd_item]
+            elif _is_under(cmd_item, input_root) and os.path.exists(cmd_item):
+                if os.path.isdir(cmd_item):
+                    file_hash = calculate_recursive_dir_hash(cmd_item)
+                else:
+                    file_hash = calculate_file_hash(cmd_item)
+                cmd_item = "{{inputHash:%s}}" % file_hash
+            elif cmd_item in self._input_files and os.path.isfile(cmd_item):
+                file_hash = calculate_file_hash(cmd_item)
+                cmd_item = "{{fileHash:%s:%s}}" % (cmd_item, file_hash)
+            normalized_cmd.append(cmd_item)
+        fingerprint = json.dumps({"image": image, "command": normalized_cmd})
+        return hashlib.sha256(fingerprint.encode("utf-8")).hexdigest()
+
+    def load(self, key: str, output_files: Dict[str, str],
+             max_cache_staleness: Optional[datetime.timedelta]) -> bool:
+        """Link the cached outputs of `key` to the output files.
+
+        Returns:
+            True if a fresh enough cache entry was found.
+        """
+        entry_dir = os.path.join(self._cache_root, key)
+        manifest_file = os.path.join(entry_dir, self._MANIFEST_FILE_NAME)
+        if not os.path.exists(manifest_file):
+            return False
+        if max_cache_staleness is not None:
+            age = datetime.datetime.now() - datetime.datetime.fromtimestamp(
+                os.path.getmtime(manifest_file))
+            if age >= max_cache_staleness:
+                return False
+        with open(manifest_file, "r") as f:
+            manifest = json.load(f)
+        if set(manifest) != set(output_files):
+            return False
+
+        for output_name, output_file in output_files.items():
+            os.makedirs(os.path.dirname(output_file), exist_ok=True)
+            _remove_path(output_file)
+            _link_or_copy(
+                os.path.join(entry_dir, manifest[output_name]), output_file)
+        return True
+
+    def save(self, key: str, output_files: Dict[str, str]) -> None:
+        """Store the outputs of a successful op under `key`."""
+        if not all(os.path.exists(path) for path in output_files.values()):
+            return
+        os.makedirs(self._cache_root, exist_ok=True)
+        staging_dir = tempfile.mkdtemp(dir=self._cache_root)
+        manifest = {}
+        for index, (output_name,
+                    output_file) in enumerate(sorted(output_files.items())):
+            manifest[output_name] = str(index)
+            _link_or_copy(output_file, os.path.join(staging_dir, str(index)))
+        with open(os.path.join(staging_dir, self._MANIFEST_FILE_NAME),
+                  "w") as f:
+            json.dump(manifest, f)
+
+        entry_dir = os.path.join(self._cache_root, key)
+        if os.path.exists(entry_dir):
+            shutil.rmtree(entry_dir, ignore_errors=True)
+        try:
+            os.rename(staging_dir, entry_dir)
+        except OSError:
+            # Another op with the same fingerprint stored it concurrently.
+            shutil.rmtree(staging_dir, ignore_errors=True)
+
+
+class _RunContext:
+    """State shared by all the groups of a single local run.
+
+    It bounds the number of ops executed at the same time and tracks the
+    failure of any branch, so that no new op is started after the first
+    failure.
+    """
+
+    def __init__(self,
+                 max_parallelism: int,
+                 terminate_on_failure: bool,
+                 cache: Optional[_StepCache] = None) -> None:
+        self._slots = threading.BoundedSemaphore(max_parallelism)
+        self._cache = cache
+        self._terminate_on_failure = terminate_on_failure
+        self._failed = threading.Event()
+        self._processes_lock = threading.Lock()
+        self._processes = set()
+
+    @property
+    def failed(self) -> bool:
+        return self._failed.is_set()
+
+    @property
+    def slots(self) -> threading.BoundedSemaphore:
+        return self._slots
+
+    @property
+    def cache(self) -> Optional[_StepCache]:
+        return self._cache
+
+    def mark_failed(self) -> None:
+        """Stop scheduling new ops, and optionally terminate running ones."""
+        self._failed.set()
+        if self._terminate_on_failure:
+            with self._processes_lock:
+                for process in self._processes:
+                    process.terminate()
+
+    def register(self, process: subprocess.Popen) -> None:
+        with self._processes_lock:
+            self._processes.add(process)
+        if self.failed and self._terminate_on_failure:
+            process.terminate()
+
+    def unregister(self, process: subprocess.Popen) -> None:
+        with self._processes_lock:
+            self._processes.discard(process)
+
+
 class LocalClient:
 
     class ExecutionMode:
@@ -143,6 +390,8 @@ class LocalClient:
             images_to_exclude: List[str] = [],
             ops_to_exclude: List[str] = [],
             docker_options: List[str] = [],
+            max_parallelism: int = 1,
+            terminate_on_failure: bool = False,
         ) -> None:
             """Constructor.
 
@@ -154,14 +403,25 @@ class LocalClient:
                     executed in the mode different from default_mode.
                 docker_options: Docker options used in docker mode,
                     e.g. docker_options=["-e", "foo=bar"].
+                max_parallelism: The maximum number of ops executed at the same
+                    time. Every op whose dependencies have finished is started
+                    as soon as a slot is available. Default 1.
+                terminate_on_failure: If True, the ops still running when
+                    another op fails are terminated. Otherwise they are left to
+                    finish. In both cases no new op is started after a failure.
             """
             if mode not in [self.DOCKER, self.LOCAL]:
                 raise Exception(
                     "Invalid execution mode, must be docker of local")
+            if max_parallelism < 1:
+                raise ValueError(
+                    "Invalid max_parallelism, must be a positive integer")
             self._mode = mode
             self._images_to_exclude = images_to_exclude
             self._ops_to_exclude = ops_to_exclude
             self._docker_options = docker_options
+            self._max_parallelism = max_parallelism
+            self._terminate_on_failure = terminate_on_failure
 
         @property
         def mode(self) -> str:
@@ -179,6 +439,14 @@ class LocalClient:
         def docker_options(self) -> List[str]:
             return self._docker_options
 
+        @property
+        def max_parallelism(self) -> int:
+            return self._max_parallelism
+
+        @property
+        def terminate_on_failure(self) -> bool:
+            return self._terminate_on_failure
+
     def __init__(self, pipeline_root: Optional[str] = None) -> None:
         """Construct the instance of LocalClient.
 
@@ -346,13 +614,12 @@ class LocalClient:
         return cmd
 
     def _generate_cmd_for_docker_execution(
-        self,
-        run_name: str,
-        pipeline: dsl.Pipeline,
-        op: dsl.ContainerOp,
-        stack: Dict[str, Any],
-        docker_options: List[str] = []
-    ) -> List[str]:
+            self,
+            run_name: str,
+            pipeline: dsl.Pipeline,
+            op: dsl.ContainerOp,
+            stack: Dict[str, Any],
+            docker_options: List[str] = []) -> List[str]:
         """Generate the command to run the op in docker locally."""
         cmd = self._generate_cmd_for_subprocess_execution(
             run_name, pipeline, op, stack)
@@ -368,6 +635,97 @@ class LocalClient:
         ] + cmd
         return docker_cmd
 
+    def _run_op(
+        self,
+        run_name: str,
+        pipeline: dsl.Pipeline,
+        op: dsl.ContainerOp,
+        stack: Dict[str, Any],
+        execution_mode: ExecutionMode,
+        run_context: _RunContext,
+    ) -> bool:
+        """Run a single op, streaming its stdout and stderr to the log.
+
+        When caching is enabled, the outputs of a previous execution of the
+        same op on the same inputs are reused instead.
+
+        Returns:
+            True if the op succeeded.
+        """
+        can_run_locally = execution_mode.mode == LocalClient.ExecutionMode.LOCAL
+        exclude = (
+            op.image in execution_mode.images_to_exclude or
+            op.name in execution_mode.ops_to_exclude)
+        if exclude:
+            can_run_locally = not can_run_locally
+
+        if can_run_locally:
+            cmd = self._generate_cmd_for_subprocess_execution(
+                run_name, pipeline, op, stack)
+        else:
+            cmd = self._generate_cmd_for_docker_execution(
+                run_name, pipeline, op, stack, execution_mode.docker_options)
+
+        cache_key = None
+        if run_context.cache is not None:
+            output_files = {
+                output_name:
+                self._make_output_file_path_unique(run_name, op.name,
+                                                   output_file)
+                for output_name, output_file in op.file_outputs.items()
+            }
+            cache_key = run_context.cache.get_key(
+                op.image, cmd, "{}/".format(self._pipeline_root), output_files)
+            max_cache_staleness = None
+            reuse_outputs = True
+            duration = op.execution_options.caching_strategy.max_cache_staleness
+            if duration:
+                max_cache_staleness = _parse_duration(duration)
+                if max_cache_staleness is None:
+                    logging.warning(
+                        "Unsupported max_cache_staleness %s of task %s, "
+                        "not reusing cached outputs.", duration, op.name)
+                    reuse_outputs = False
+            if reuse_outputs and run_context.cache.load(cache_key, output_files,
+                                                        max_cache_staleness):
+                logging.info("reuse cached outputs of task：%s", op.name)
+                return True
+            # Outputs left at the same path may be hard-linked into the cache,
+            # so they must not be overwritten in place.
+            for output_file in output_files.values():
+                _remove_path(output_file)
+
+        with run_context.slots:
+            if run_context.failed:
+                return False
+            process = subprocess.Popen(
+                cmd,
+                shell=False,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                universal_newlines=True,
+            )
+            run_context.register(process)
+            logging.info("start task：%s", op.name)
+            stderr_thread = threading.Thread(
+                target=_stream_output,
+                args=(process.stderr, logging.error, op.name),
+                daemon=True)
+            stderr_thread.start()
+            try:
+                _stream_output(process.stdout, logging.info, op.name)
+                stderr_thread.join()
+                process.wait()
+            finally:
+                run_context.unregister(process)
+
+        if process.returncode != 0:
+            logging.error(cmd)
+            return False
+        if cache_key is not None:
+            run_context.cache.save(cache_key, output_files)
+        return True
+
     def _run_group_dag(
         self,
         run_name: str,
@@ -376,8 +734,16 @@ class LocalClient:
         current_group: dsl.OpsGroup,
         stack: Dict[str, Any],
         execution_mode: ExecutionMode,
+        run_context: _RunContext,
     ) -> bool:
-        """Run ops in current group in topological order.
+        """Run ops in current group, each one as soon as its dependencies have
+        finished.
+
+        Nodes of the group DAG whose dependencies have all succeeded are
+        scheduled concurrently, the number of ops actually running at the
+        same time is bounded by `execution_mode.max_parallelism`. After the
+        first failure, including an exception raised when running a node, no
+        new node is scheduled.
 
         Args:
             pipeline: kfp.dsl.Pipeline
@@ -386,54 +752,80 @@ class LocalClient:
             stack: stack to trace `LoopArguments`
             execution_mode: Configuration to decide whether the client executes
                 component in docker or in local process.
+            run_context: State shared by all the groups of the run.
         Returns:
             True if succeed to run the group dag.
         """
         group_dag = self._create_group_dag(pipeline_dag, current_group)
 
-        for node in group_dag.topological_sort():
-            subgroup = _get_subgroup(current_group.groups, node)
-            if subgroup is not None:  # Node of DAG is subgroup
-                success = self._run_group(run_name, pipeline, pipeline_dag, subgroup,
-                                stack, execution_mode)
-                if not success:
-                    return False
-            else:  # Node of DAG is op
-                op = _get_op(current_group.ops, node)
-
-                execution_mode = (
-                    execution_mode
-                    if execution_mode else LocalClient.ExecutionMode())
-                can_run_locally = execution_mode.mode == LocalClient.ExecutionMode.LOCAL
-                exclude = (
-                    op.image in execution_mode.images_to_exclude or
-                    op.name in execution_mode.ops_to_exclude)
-                if exclude:
-                    can_run_locally = not can_run_locally
-
-                if can_run_locally:
-                    cmd = self._generate_cmd_for_subprocess_execution(
-                        run_name, pipeline, op, stack)
-                else:
-                    cmd = self._generate_cmd_for_docker_execution(
-                        run_name, pipeline, op, stack, execution_mode.docker_options)
-                process = subprocess.Popen(
-                    cmd,
-                    shell=False,
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.PIPE,
-                    universal_newlines=True,
-                )
-                # TODO support async process
-                logging.info("start task：%s", op.name)
-                stdout, stderr = process.communicate()
-                if stdout:
-                    logging.info(stdout)
-                if stderr:
-                    logging.error(stderr)
-                if process.returncode != 0:
-                    logging.error(cmd)
-                    return False
+        in_degree = {
+            node: len(group_dag.get_dependencies(node))
+            for node in group_dag.graph
+        }
+        ready = deque(node for node, degree in in_degree.items() if degree == 0)
+        running = {}
+        success = True
+
+        with concurrent.futures.ThreadPoolExecutor(
+                max_workers=max(len(in_degree), 1)) as executor:
+            while ready or running:
+                while ready and success and not run_context.failed:
+                    node = ready.popleft()
+                    subgroup = _get_subgroup(current_group.groups, node)
+                    if subgroup is not None:  # Node of DAG is subgroup
+                        future = executor.submit(self._run_group, run_name,
+                                                 pipeline, pipeline_dag,
+                                                 subgroup, stack,
+                                                 execution_mode, run_context)
+                    else:  # Node of DAG is op
+                        future = executor.submit(
+                            self._run_op, run_name, pipeline,
+                            _get_op(current_group.ops, node), stack,
+                            execution_mode, run_context)
+                    running[future] = node
+                if not running:
+                    break
+
+                done, _ = concurrent.futures.wait(
+                    running, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    node = running.pop(future)
+                    try:
+                        node_success = future.result()
+                    except BaseException:
+                        # e.g. docker could not be started. The other
+                        # branches are not scheduled further either.
+                        run_context.mark_failed()
+                        raise
+                    if not node_success:
+                        success = False
+                        run_context.mark_failed()
+                        continue
+                    for follow in group_dag.get_follows(node):
+                        in_degree[follow] -= 1
+                        if in_degree[follow] == 0:
+                            ready.append(follow)
+
+        return success and not run_context.failed
+
+    def _get_loop_items(self, run_name: str, pipeline: dsl.Pipeline,
+                        loop_group: dsl.ParallelFor) -> List[Any]:
+        """Get the items a ParallelFor group iterates over.
+
+        The items are either a literal list, or the JSON list written by
+        the upstream op to its output file.
+        """
+        loop_args = loop_group.loop_args
+        if not loop_group.items_is_pipeline_param:
+            return loop_args.to_list_for_task_yaml()
+
+        param_name = loop_args.name[:-len(loop_args.LOOP_ITEM_NAME_BASE) - 1]
+        op_dependency = pipeline.ops[loop_args.op_name]
+        list_file = op_dependency.file_outputs[param_name]
+        altered_list_file = self._make_output_file_path_unique(
+            run_name, loop_args.op_name, list_file)
+        with open(altered_list_file, "r") as f:
+            return json.load(f)
 
     def _run_group(
         self,
@@ -443,6 +835,7 @@ class LocalClient:
         current_group: dsl.OpsGroup,
         stack: Dict[str, Any],
         execution_mode: ExecutionMode,
+        run_context: _RunContext,
     ) -> bool:
         """Run all ops in current group.
 
@@ -454,52 +847,52 @@ class LocalClient:
             stack: stack to trace `LoopArguments`
             execution_mode: Configuration to decide whether the client executes
                 component in docker or in local process.
+            run_context: State shared by all the groups of the run.
         Returns:
             True if succeed to run the group.
         """
         if current_group.type == dsl.ParallelFor.TYPE_NAME:
             current_group = cast(dsl.ParallelFor, current_group)
-
-            if current_group.items_is_pipeline_param:
-                _loop_args = current_group.loop_args
-                _param_name = _loop_args.name[:-len(_loop_args
-                                                    .LOOP_ITEM_NAME_BASE) - 1]
-
-                _op_dependency = pipeline.ops[_loop_args.op_name]
-                _list_file = _op_dependency.file_outputs[_param_name]
-                _altered_list_file = self._make_output_file_path_unique(
-                    run_name, _loop_args.op_name, _list_file)
-                with open(_altered_list_file, "r") as f:
-                    _param_values = json.load(f)
-                for index, _param_value in enumerate(_param_values):
-                    if isinstance(_param_values, object):
-                        _param_value = json.dumps(_param_value)
-                    stack[_loop_args.pattern] = _param_value
-                    loop_run_name = "{run_name}/{loop_index}".format(
-                        run_name=run_name, loop_index=index)
-                    success = self._run_group_dag(
-                        loop_run_name,
-                        pipeline,
-                        pipeline_dag,
-                        current_group,
-                        stack,
-                        execution_mode,
-                    )
-                    del stack[_loop_args.pattern]
-                    if not success:
-                        return False
+            _loop_args = current_group.loop_args
+            _items = self._get_loop_items(run_name, pipeline, current_group)
+            if not _items:
                 return True
-            else:
-                raise Exception("Not implemented")
+
+            def _run_iteration(index: int, item: Any) -> bool:
+                # Each iteration gets its own stack and its own output tree
+                # so that concurrent iterations never share state or files.
+                loop_stack = dict(stack)
+                loop_stack.update(_get_loop_item_arguments(_loop_args, item))
+                loop_run_name = "{run_name}/{loop_index}".format(
+                    run_name=run_name, loop_index=index)
+                return self._run_group_dag(
+                    loop_run_name,
+                    pipeline,
+                    pipeline_dag,
+                    current_group,
+                    loop_stack,
+                    execution_mode,
+                    run_context,
+                )
+
+            max_workers = min(
+                current_group.parallelism or len(_items), len(_items))
+            with concurrent.futures.ThreadPoolExecutor(
+                    max_workers=max_workers) as executor:
+                results = list(
+                    executor.map(_run_iteration, range(len(_items)), _items))
+            return all(results)
         else:
-            return self._run_group_dag(run_name, pipeline, pipeline_dag, current_group,
-                                stack, execution_mode)
+            return self._run_group_dag(run_name, pipeline, pipeline_dag,
+                                       current_group, stack, execution_mode,
+                                       run_context)
 
     def create_run_from_pipeline_func(
-            self,
-            pipeline_func: Callable,
-            arguments: Mapping[str, str],
-            execution_mode: ExecutionMode = ExecutionMode(),
+        self,
+        pipeline_func: Callable,
+        arguments: Mapping[str, str],
+        execution_mode: ExecutionMode = ExecutionMode(),
+        enable_caching: bool = False,
     ):
         """Runs a pipeline locally, either using Docker or in a local process.
 
@@ -509,6 +902,11 @@ class LocalClient:
               to `kfp.client.create_run_from_pipeline_func`
           execution_mode: Configuration to decide whether the client executes component
               in docker or in local process.
+          enable_caching: Whether or not to reuse the outputs of previous runs for
+              ops with the same image, command line and input file contents. The
+              input files are the input artifacts and the local files passed as
+              pipeline arguments. The `max_cache_staleness` of an op's caching
+              strategy is honoured.
         """
 
         class RunPipelineResult:
@@ -539,8 +937,22 @@ class LocalClient:
         run_version = datetime.datetime.now().strftime("%Y%m%d%H%M%S")
         run_name = pipeline.name.replace(" ", "_").lower() + "_" + run_version
 
+        execution_mode = execution_mode or LocalClient.ExecutionMode()
         pipeline_dag = self._create_op_dag(pipeline)
-        success = self._run_group(run_name, pipeline, pipeline_dag, pipeline.groups[0],
-                        {}, execution_mode)
+        cache = None
+        if enable_caching:
+            # Local files passed to the pipeline are fingerprinted by content,
+            # so that editing them in place invalidates the cached outputs.
+            cache = _StepCache(
+                "{}/{}".format(self._pipeline_root, _LOCAL_CACHE_DIR_NAME),
+                input_files=[
+                    value for value in arguments.values()
+                    if isinstance(value, str) and os.path.isfile(value)
+                ])
+        run_context = _RunContext(execution_mode.max_parallelism,
+                                  execution_mode.terminate_on_failure, cache)
+        success = self._run_group(run_name, pipeline, pipeline_dag,
+                                  pipeline.groups[0], {}, execution_mode,
+                                  run_context)
 
         return RunPipelineResult(self, pipeline, run_name, success=success)
@@ -57,11 +57,12 @@ def run_pipeline_func_on_cluster(
 
 
 def run_pipeline_func_locally(
-        pipeline_func: Callable,
-        arguments: Mapping[str, str],
-        local_client: Optional[LocalClient] = None,
-        pipeline_root: Optional[str] = None,
-        execution_mode: LocalClient.ExecutionMode = LocalClient.ExecutionMode(),
+    pipeline_func: Callable,
+    arguments: Mapping[str, str],
+    local_client: Optional[LocalClient] = None,
+    pipeline_root: Optional[str] = None,
+    execution_mode: LocalClient.ExecutionMode = LocalClient.ExecutionMode(),
+    enable_caching: bool = False,
 ):
     """Runs a pipeline locally, either using Docker or in a local process.
 
@@ -77,7 +78,6 @@ def run_pipeline_func_locally(
       * ContainerOp with environment variables, init containers, sidecars, pvolumes
       * ResourceOp
       * VolumeOp
-      * Caching
 
     Args:
       pipeline_func: A function that describes a pipeline by calling components
@@ -89,7 +89,12 @@ def run_pipeline_func_locally(
         will be saved.
       execution_mode: Configuration to decide whether the client executes component
         in docker or in local process.
+      enable_caching: Optional. Whether or not to reuse the outputs of previous
+        local runs for ops whose image, command line and inputs are unchanged.
     """
     local_client = local_client or LocalClient(pipeline_root)
     return local_client.create_run_from_pipeline_func(
-        pipeline_func, arguments, execution_mode=execution_mode)
+        pipeline_func,
+        arguments,
+        execution_mode=execution_mode,
+        enable_caching=enable_caching)
@@ -15,7 +15,6 @@
 import click
 import logging
 import sys
-from kfp._client import Client
 from kfp.cli.run import run
 from kfp.cli.pipeline import pipeline
 from kfp.cli.diagnose_me_cli import diagnose_me
@@ -55,6 +54,9 @@ def cli(ctx, endpoint, iap_client_id, namespace, other_client_id,
     if ctx.invoked_subcommand == 'diagnose_me':
         # Do not create a client for diagnose_me
         return
+    # Imported here, so that the commands which do not use a client, e.g.
+    # --help, do not import it.
+    from kfp._client import Client
     ctx.obj['client'] = Client(endpoint, iap_client_id, namespace,
                                other_client_id, other_client_secret)
     ctx.obj['namespace'] = namespace
@@ -13,4 +13,4 @@
 # limitations under the License.
 
 from .compiler import Compiler
-from ..containers._component_builder import build_python_component, build_docker_image, VersionedDependency
+from ..containers._component_builder import build_python_component, build_docker_image, build_dependency_image, VersionedDependency
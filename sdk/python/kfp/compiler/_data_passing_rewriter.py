@@ -1,5 +1,4 @@
 import copy
-import json
 import os
 import re
 from typing import Any, Dict, List, Optional, Set, Tuple
@@ -8,10 +7,12 @@ from kfp.dsl import _component_bridge
 from kfp import dsl
 
 
-def fix_big_data_passing(workflow: dict) -> dict:
+def fix_big_data_passing(workflow: dict, inplace: bool = False) -> dict:
     '''fix_big_data_passing converts a workflow where some artifact data is passed as parameters and converts it to a workflow where this data is passed as artifacts.
     Args:
         workflow: The workflow to fix
+        inplace: Whether to modify the workflow in place instead of a copy of it.
+            The compiler owns the workflows it creates, so it skips the copy.
     Returns:
         The fixed workflow
 
@@ -30,7 +31,8 @@ def fix_big_data_passing(workflow: dict) -> dict:
     3. Propagate the consumption information upstream to all inputs/outputs all the way up to the data producers.
     4. Convert the inputs, outputs and arguments based on how they're consumed downstream.
     '''
-    workflow = copy.deepcopy(workflow)
+    if not inplace:
+        workflow = copy.deepcopy(workflow)
 
     container_templates = [
         template for template in workflow['spec']['templates']
@@ -459,14 +461,31 @@ def clean_up_empty_workflow_structures(workflow: dict):
                     del task['arguments']
 
 
+_PLACEHOLDER_REGEX = re.compile('{{([-._a-zA-Z0-9]+)}}')
+_INPUT_PARAMETER_PLACEHOLDER_REGEX = re.compile(
+    '{{inputs.parameters.([-_a-zA-Z0-9]+)}}')
+
+
 def extract_all_placeholders(template: dict) -> Set[str]:
-    template_str = json.dumps(template)
-    placeholders = set(re.findall('{{([-._a-zA-Z0-9]+)}}', template_str))
+    # Only the strings which have placeholders are scanned, which skips most
+    # of the content of big templates (e.g. inline program sources).
+    placeholders = set()
+    to_visit = [template]
+    while to_visit:
+        obj = to_visit.pop()
+        if isinstance(obj, str):
+            if '{{' in obj:
+                placeholders.update(_PLACEHOLDER_REGEX.findall(obj))
+        elif isinstance(obj, dict):
+            to_visit.extend(obj.keys())
+            to_visit.extend(obj.values())
+        elif isinstance(obj, (list, tuple)):
+            to_visit.extend(obj)
     return placeholders
 
 
 def extract_input_parameter_name(s: str) -> Optional[str]:
-    match = re.fullmatch('{{inputs.parameters.([-_a-zA-Z0-9]+)}}', s)
+    match = _INPUT_PARAMETER_PLACEHOLDER_REGEX.fullmatch(s)
     if not match:
         return None
     (input_name,) = match.groups()
@@ -474,6 +493,6 @@ def extract_input_parameter_name(s: str) -> Optional[str]:
 
 
 def deconstruct_single_placeholder(s: str) -> List[str]:
-    if not re.fullmatch('{{[-._a-zA-Z0-9]+}}', s):
+    if not _PLACEHOLDER_REGEX.fullmatch(s):
         return None
     return s.lstrip('{').rstrip('}').split('.')
@@ -0,0 +1,219 @@
+# Copyright 2021 The Kubeflow Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Index of the group tree of a pipeline.
+
+Each pipeline has a root group. Each group has a list of ops (leaves) and
+groups. Recursive opsgroups are leaves as well, since their content is
+compiled through the opsgroup they refer to.
+
+The compilers need the ancestors shared by (or unique to) two nodes of
+the tree for every data or control dependency of a pipeline. The index
+stores the depth and the parent pointers of every node once, so these
+queries take a time logarithmic in the depth of the tree instead of
+walking the full chains of ancestors.
+"""
+
+from typing import Iterator, List, Optional, Tuple
+
+from kfp import dsl
+
+
+class GroupTree(object):
+    """Ancestor and lowest common ancestor queries on a pipeline group tree.
+
+    Nodes are referred to by name. Names of ops and recursive opsgroups take
+    precedence over the names of the opsgroups, since a recursive opsgroup
+    shares its name with the opsgroup it refers to.
+
+    Args:
+      root_group: The root group of the pipeline.
+    """
+
+    def __init__(self, root_group: dsl.OpsGroup):
+        self._names = []
+        self._parents = []
+        self._depths = []
+        self._leaf_ids = {}
+        self._group_ids = {}
+
+        self._add_node(root_group.name, -1, is_leaf=False)
+        to_visit = [(root_group, 0)]
+        while to_visit:
+            group, group_id = to_visit.pop()
+            for g in group.groups:
+                if g.recursive_ref:
+                    self._add_node(g.name, group_id, is_leaf=True)
+                else:
+                    to_visit.append(
+                        (g, self._add_node(g.name, group_id, is_leaf=False)))
+            for op in group.ops:
+                self._add_node(op.name, group_id, is_leaf=True)
+
+        # Binary lifting table. self._jumps[k][node] is the ancestor
+        # 2^k levels above the node, or the root if there is none.
+        self._jumps = [[max(parent, 0) for parent in self._parents]]
+        for _ in range(1, max(self._depths).bit_length()):
+            previous = self._jumps[-1]
+            self._jumps.append([previous[ancestor] for ancestor in previous])
+
+    def _add_node(self, name: str, parent: int, is_leaf: bool) -> int:
+        node = len(self._names)
+        self._names.append(name)
+        self._parents.append(parent)
+        self._depths.append(self._depths[parent] + 1 if parent >= 0 else 0)
+        (self._leaf_ids if is_leaf else self._group_ids)[name] = node
+        return node
+
+    def _get_node(self, name: str) -> int:
+        node = self._leaf_ids.get(name)
+        if node is None:
+            node = self._group_ids.get(name)
+            if node is None:
+                raise ValueError(name + ' does not exist.')
+        return node
+
+    def _lift(self, node: int, levels: int) -> int:
+        k = 0
+        while levels:
+            if levels & 1:
+                node = self._jumps[k][node]
+            levels >>= 1
+            k += 1
+        return node
+
+    def _get_common_depth(self, node1: int, node2: int) -> int:
+        depth1 = self._depths[node1]
+        depth2 = self._depths[node2]
+        node1 = self._lift(node1, max(depth1 - depth2, 0))
+        node2 = self._lift(node2, max(depth2 - depth1, 0))
+        if node1 == node2:
+            return self._depths[node1]
+        for jump in reversed(self._jumps):
+            if jump[node1] != jump[node2]:
+                node1 = jump[node1]
+                node2 = jump[node2]
+        return self._depths[node1] - 1
+
+    def _get_first_uncommon_nodes(self, name1: str,
+                                  name2: str) -> Tuple[int, int]:
+        node1 = self._get_node(name1)
+        node2 = self._get_node(name2)
+        depth1 = self._depths[node1]
+        depth2 = self._depths[node2]
+        common_depth = self._get_common_depth(node1, node2)
+        if common_depth in (depth1, depth2):
+            raise ValueError('{} is an ancestor of {}.'.format(
+                *((name1, name2) if depth1 < depth2 else (name2, name1))))
+        return (self._lift(node1, depth1 - common_depth - 1),
+                self._lift(node2, depth2 - common_depth - 1))
+
+    def get_depth(self, name: str) -> int:
+        """Gets the number of ancestors of a node."""
+        return self._depths[self._get_node(name)]
+
+    def get_parent(self, name: str) -> Optional[str]:
+        """Gets the name of the parent group of a node.
+
+        Returns None for the root group.
+        """
+        parent = self._parents[self._get_node(name)]
+        return self._names[parent] if parent >= 0 else None
+
+    def get_ancestor(self, name: str, depth: int) -> str:
+        """Gets the ancestor of a node at the given depth.
+
+        The ancestor at the depth of the node is the node itself.
+        """
+        node = self._get_node(name)
+        if not 0 <= depth <= self._depths[node]:
+            raise ValueError('{} has no ancestor at depth {}.'.format(
+                name, depth))
+        return self._names[self._lift(node, self._depths[node] - depth)]
+
+    def iter_ancestors(self,
+                       name: str,
+                       start_depth: Optional[int] = None,
+                       stop_depth: int = 0) -> Iterator[str]:
+        """Iterates over the ancestors of a node, from the lowest one.
+
+        Args:
+          name: The name of the node.
+          start_depth: The depth of the first ancestor to yield. Defaults to
+            the depth of the node, which yields the node itself first.
+          stop_depth: The depth of the last ancestor to yield.
+
+        Yields:
+          The names of the ancestors between the two depths, both included.
+        """
+        node = self._get_node(name)
+        depth = self._depths[node]
+        if start_depth is not None and start_depth < depth:
+            node = self._lift(node, depth - start_depth)
+            depth = start_depth
+        while depth >= stop_depth:
+            yield self._names[node]
+            node = self._parents[node]
+            depth -= 1
+
+    def get_ancestors(self, name: str) -> List[str]:
+        """Gets the ancestor groups of a node.
+
+        Returns:
+          A list of names, sorted in a way that the root group is the first
+          and the node itself is the last.
+        """
+        node = self._get_node(name)
+        ancestors = []
+        while node >= 0:
+            ancestors.append(self._names[node])
+            node = self._parents[node]
+        ancestors.reverse()
+        return ancestors
+
+    def get_common_ancestor_depth(self, name1: str, name2: str) -> int:
+        """Gets the depth of the lowest common ancestor of two nodes."""
+        return self._get_common_depth(
+            self._get_node(name1), self._get_node(name2))
+
+    def get_first_uncommon_ancestors(self, name1: str,
+                                     name2: str) -> Tuple[str, str]:
+        """Gets the topmost ancestors which are unique to each of two nodes.
+
+        For example, if the ancestors of op1 are [root, G1, G2, G3, op1]
+        and the ancestors of op2 are [root, G1, G4, op2], it returns
+        (G2, G4). These are siblings, children of the lowest common
+        ancestor of the two nodes.
+        """
+        node1, node2 = self._get_first_uncommon_nodes(name1, name2)
+        return self._names[node1], self._names[node2]
+
+    def get_uncommon_ancestors(self, name1: str,
+                               name2: str) -> Tuple[List[str], List[str]]:
+        """Gets the ancestors which are unique to each of two nodes.
+
+        For example, if the ancestors of op1 are [root, G1, G2, G3, op1]
+        and the ancestors of op2 are [root, G1, G4, op2], it returns
+        ([G2, G3, op1], [G4, op2]).
+        """
+        node1, node2 = self._get_first_uncommon_nodes(name1, name2)
+        return (self._get_path(self._get_node(name1), node1),
+                self._get_path(self._get_node(name2), node2))
+
+    def _get_path(self, node: int, top_node: int) -> List[str]:
+        path = [self._names[node]]
+        while node != top_node:
+            node = self._parents[node]
+            path.append(self._names[node])
+        path.reverse()
+        return path
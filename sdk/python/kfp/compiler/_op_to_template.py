@@ -23,6 +23,7 @@ from typing import Union, List, Any, Callable, TypeVar, Dict
 from kfp.compiler._k8s_helper import convert_k8s_obj_to_json
 from kfp import dsl
 from kfp.dsl._container_op import BaseOp
+from kfp.dsl._pipeline_param import replace_serialized_pipelineparams
 
 # generics
 T = TypeVar('T')
@@ -40,14 +41,8 @@ def _process_obj(obj: Any, map_to_tmpl_var: dict):
     """
     # serialized str might be unsanitized
     if isinstance(obj, str):
-        # get signature
-        param_tuples = dsl.match_serialized_pipelineparam(obj)
-        if not param_tuples:
-            return obj
         # replace all unsanitized signature with template var
-        for param_tuple in param_tuples:
-            obj = re.sub(param_tuple.pattern,
-                         map_to_tmpl_var[param_tuple.pattern], obj)
+        return replace_serialized_pipelineparams(obj, map_to_tmpl_var)
 
     # list
     if isinstance(obj, list):
@@ -319,9 +314,9 @@ def _op_to_template(op: BaseOp):
                     and re.match('^{{inputs.parameters.*}}$', str(param)):
                     if not 'containers' in podSpecPatch:
                         podSpecPatch['containers'] = [{
-                                'name': 'main',
-                                'resources': {}
-                            }]
+                            'name': 'main',
+                            'resources': {}
+                        }]
                     if setting not in podSpecPatch['containers'][0][
                             'resources']:
                         podSpecPatch['containers'][0]['resources'][setting] = {
@@ -0,0 +1,142 @@
+# Copyright 2021 The Kubeflow Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Cache of the Argo templates generated for ops.
+
+Pipelines compiled together with `Compiler.compile_many` often share most
+of their components. The template of an op only depends on the op's own state, so
+ops which are structurally identical to an op already compiled reuse its
+template instead of going through `_op_to_template` again.
+"""
+
+import copy
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List
+
+from google.protobuf import message
+from kfp.dsl._container_op import BaseOp, _MultipleOutputsError
+
+_DEFAULT_MAX_SIZE = 4096
+
+_OpToTemplates = Callable[[BaseOp], List[Dict[str, Any]]]
+
+
+def _to_hashable_struct(obj: Any, visiting: set) -> Any:
+    """Convert an object graph into a JSON-serializable structure.
+
+    Objects are represented by their type and attributes, so two objects
+    with the same state get the same representation.
+    """
+    obj_type = type(obj)
+    if obj is None or obj_type in (str, int, float, bool):
+        return obj
+    if obj_type is _MultipleOutputsError:
+        # Raises on any attribute access.
+        return '<multiple outputs>'
+    if isinstance(obj, (str, int, float, bool)):
+        # e.g. enums deriving from str
+        return [obj_type.__qualname__, repr(obj)]
+
+    obj_id = id(obj)
+    if obj_id in visiting:
+        return '<cycle>'
+    visiting.add(obj_id)
+    try:
+        if isinstance(obj, (list, tuple)):
+            items = [_to_hashable_struct(item, visiting) for item in obj]
+            return [type(obj).__name__] + items
+        if isinstance(obj, (set, frozenset)):
+            return ['set'] + sorted(
+                json.dumps(_to_hashable_struct(item, visiting)) for item in obj)
+        if isinstance(obj, dict):
+            return ['dict'] + [[
+                _to_hashable_struct(key, visiting),
+                _to_hashable_struct(value, visiting)
+            ] for key, value in obj.items()]
+        type_name = '{}.{}'.format(obj_type.__module__, obj_type.__qualname__)
+        if callable(obj):
+            # Methods bound to the op are behavior, not state.
+            return type_name
+        if hasattr(obj, 'attribute_map') and isinstance(obj.attribute_map,
+                                                        dict):
+            # k8s objects (generated from swaggercodegen) also hold their
+            # client configuration, which is not part of their state.
+            return [type_name] + [
+                _to_hashable_struct(getattr(obj, key), visiting)
+                for key in obj.attribute_map
+            ]
+        if isinstance(obj, message.Message):
+            # The IR protos attached to ops are only consumed by the v2
+            # compiler, they don't contribute to the Argo template.
+            return type_name
+        if hasattr(obj, '__dict__'):
+            return [type_name, _to_hashable_struct(vars(obj), visiting)]
+        return [type_name, repr(obj)]
+    finally:
+        visiting.discard(obj_id)
+
+
+def get_op_structural_hash(op: BaseOp) -> str:
+    """Computes a hash of all the state of an op.
+
+    Two ops with the same hash produce the same template.
+    """
+    struct = _to_hashable_struct(op, set())
+    return hashlib.sha256(json.dumps(struct).encode('utf-8')).hexdigest()
+
+
+class TemplateCache(object):
+    """Bounded LRU cache of op templates keyed by op structural hash."""
+
+    def __init__(self, max_size: int = _DEFAULT_MAX_SIZE):
+        self._max_size = max_size
+        self._templates = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_templates(self, op: BaseOp,
+                      op_to_templates: _OpToTemplates) -> List[Dict[str, Any]]:
+        """Gets the templates of an op, generating them on cache miss.
+
+        Args:
+          op: The op to get the templates for.
+          op_to_templates: Function converting an op into its templates.
+
+        Returns:
+          A copy of the templates, which the caller is free to modify.
+        """
+        key = get_op_structural_hash(op)
+        with self._lock:
+            templates = self._templates.get(key)
+            if templates is not None:
+                self._templates.move_to_end(key)
+                self.hits += 1
+                return copy.deepcopy(templates)
+            self.misses += 1
+
+        templates = op_to_templates(op)
+        with self._lock:
+            self._templates[key] = copy.deepcopy(templates)
+            while len(self._templates) > self._max_size:
+                self._templates.popitem(last=False)
+        return templates
+
+    def clear(self) -> None:
+        with self._lock:
+            self._templates.clear()
+            self.hits = 0
+            self.misses = 0
@@ -11,25 +11,33 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import concurrent.futures
+import contextlib
 import datetime
+import functools
 import json
 from collections import defaultdict, OrderedDict
 from deprecated import deprecated
 import inspect
+import io
 import re
 import tarfile
+import tempfile
+import time
 import uuid
 import warnings
 import zipfile
-from typing import Callable, Set, List, Text, Dict, Tuple, Any, Union, Optional
+from typing import BinaryIO, Callable, Set, List, Text, Dict, Tuple, Any, Union, Optional, Iterable
 
 import kfp
 from kfp.dsl import _for_loop
 from kfp.compiler import _data_passing_rewriter, v2_compat
 
 from kfp import dsl
+from kfp.compiler._group_tree import GroupTree
 from kfp.compiler._k8s_helper import convert_k8s_obj_to_json, sanitize_k8s_name
 from kfp.compiler._op_to_template import _op_to_template, _process_obj
+from kfp.compiler._template_cache import TemplateCache
 from kfp.compiler._default_transformers import add_pod_env, add_pod_labels
 
 from kfp.components.structures import InputSpec
@@ -62,7 +70,9 @@ class Compiler(object):
     def __init__(self,
                  mode: dsl.PipelineExecutionMode = kfp.dsl.PipelineExecutionMode
                  .V1_LEGACY,
-                 launcher_image: Optional[str] = None):
+                 launcher_image: Optional[str] = None,
+                 argo_lint: bool = True,
+                 use_libyaml: bool = False):
         """Creates a KFP compiler for compiling pipeline functions for
         execution.
 
@@ -71,6 +81,12 @@ class Compiler(object):
           launcher_image: Configurable image for KFP launcher to use. Only applies
             when `mode == dsl.PipelineExecutionMode.V2_COMPATIBLE`. Should only be
             needed for tests or custom deployments right now.
+          argo_lint: Whether to validate the compiled workflows with `argo lint`
+            when the argo CLI is found in PATH, defaults to True.
+          use_libyaml: Whether to write the workflows with the libyaml emitter,
+            when PyYAML was built with it, defaults to False. It is faster,
+            but folds long double-quoted strings differently, so the packages
+            are not byte-identical to those of the default emitter.
         """
         if mode == dsl.PipelineExecutionMode.V2_ENGINE:
             raise ValueError('V2_ENGINE execution mode is not supported yet.')
@@ -80,72 +96,28 @@ class Compiler(object):
                           ' Some pipeline features may not work as expected.')
         self._mode = mode
         self._launcher_image = launcher_image
+        self._argo_lint = argo_lint
+        self._use_libyaml = use_libyaml
         self._pipeline_name_param: Optional[dsl.PipelineParam] = None
         self._pipeline_root_param: Optional[dsl.PipelineParam] = None
-
-    def _get_groups_for_ops(self, root_group):
-        """Helper function to get belonging groups for each op.
-
-        Each pipeline has a root group. Each group has a list of operators (leaf) and groups.
-        This function traverse the tree and get all ancestor groups for all operators.
-
-        Returns:
-          A dict. Key is the operator's name. Value is a list of ancestor groups including the
-                  op itself. The list of a given operator is sorted in a way that the farthest
-                  group is the first and operator itself is the last.
-        """
-
-        def _get_op_groups_helper(current_groups, ops_to_groups):
-            root_group = current_groups[-1]
-            for g in root_group.groups:
-                # Add recursive opsgroup in the ops_to_groups
-                # such that the i/o dependency can be propagated to the ancester opsgroups
-                if g.recursive_ref:
-                    ops_to_groups[g.name] = [x.name for x in current_groups
-                                            ] + [g.name]
-                    continue
-                current_groups.append(g)
-                _get_op_groups_helper(current_groups, ops_to_groups)
-                del current_groups[-1]
-            for op in root_group.ops:
-                ops_to_groups[op.name] = [x.name for x in current_groups
-                                         ] + [op.name]
-
-        ops_to_groups = {}
-        current_groups = [root_group]
-        _get_op_groups_helper(current_groups, ops_to_groups)
-        return ops_to_groups
-
-    #TODO: combine with the _get_groups_for_ops
-    def _get_groups_for_opsgroups(self, root_group):
-        """Helper function to get belonging groups for each opsgroup.
-
-        Each pipeline has a root group. Each group has a list of operators (leaf) and groups.
-        This function traverse the tree and get all ancestor groups for all opsgroups.
-
-        Returns:
-          A dict. Key is the opsgroup's name. Value is a list of ancestor groups including the
-                  opsgroup itself. The list of a given opsgroup is sorted in a way that the farthest
-                  group is the first and opsgroup itself is the last.
-        """
-
-        def _get_opsgroup_groups_helper(current_groups, opsgroups_to_groups):
-            root_group = current_groups[-1]
-            for g in root_group.groups:
-                # Add recursive opsgroup in the ops_to_groups
-                # such that the i/o dependency can be propagated to the ancester opsgroups
-                if g.recursive_ref:
-                    continue
-                opsgroups_to_groups[g.name] = [x.name for x in current_groups
-                                              ] + [g.name]
-                current_groups.append(g)
-                _get_opsgroup_groups_helper(current_groups, opsgroups_to_groups)
-                del current_groups[-1]
-
-        opsgroups_to_groups = {}
-        current_groups = [root_group]
-        _get_opsgroup_groups_helper(current_groups, opsgroups_to_groups)
-        return opsgroups_to_groups
+        self._phase_timings: Optional[Dict[Text, float]] = None
+        # Lints running in the background while compiling other pipelines.
+        self._background_lints: Optional[List[concurrent.futures.Future]] = None
+        self._lint_executor: Optional[concurrent.futures.Executor] = None
+        # Templates shared by the pipelines of a compile_many call.
+        self._template_cache: Optional[TemplateCache] = None
+
+    @contextlib.contextmanager
+    def _timed_phase(self, phase: Text):
+        """Accumulates the time spent in a compilation phase, when timings
+        are being collected."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            if self._phase_timings is not None:
+                self._phase_timings[phase] = self._phase_timings.get(
+                    phase, 0.0) + time.perf_counter() - start
 
     def _get_groups(self, root_group):
         """Helper function to get all groups (not including ops) in a
@@ -162,35 +134,6 @@ class Compiler(object):
 
         return _get_groups_helper(root_group)
 
-    def _get_uncommon_ancestors(self, op_groups, opsgroup_groups, op1, op2):
-        """Helper function to get unique ancestors between two ops.
-
-        For example, op1's ancestor groups are [root, G1, G2, G3, op1],
-        op2's ancestor groups are [root, G1, G4, op2], then it returns a
-        tuple ([G2, G3, op1], [G4, op2]).
-        """
-        #TODO: extract a function for the following two code module
-        if op1.name in op_groups:
-            op1_groups = op_groups[op1.name]
-        elif op1.name in opsgroup_groups:
-            op1_groups = opsgroup_groups[op1.name]
-        else:
-            raise ValueError(op1.name + ' does not exist.')
-
-        if op2.name in op_groups:
-            op2_groups = op_groups[op2.name]
-        elif op2.name in opsgroup_groups:
-            op2_groups = opsgroup_groups[op2.name]
-        else:
-            raise ValueError(op2.name + ' does not exist.')
-
-        both_groups = [op1_groups, op2_groups]
-        common_groups_len = sum(
-            1 for x in zip(*both_groups) if x == (x[0],) * len(x))
-        group1 = op1_groups[common_groups_len:]
-        group2 = op2_groups[common_groups_len:]
-        return (group1, group2)
-
     def _get_condition_params_for_ops(self, root_group):
         """Get parameters referenced in conditions of ops."""
         conditions = defaultdict(set)
@@ -260,8 +203,7 @@ class Compiler(object):
         self,
         pipeline,
         root_group,
-        op_groups,
-        opsgroup_groups,
+        group_tree: GroupTree,
         condition_params,
         op_name_to_for_loop_op: Dict[Text, dsl.ParallelFor],
     ):
@@ -276,6 +218,13 @@ class Compiler(object):
         """
         inputs = defaultdict(set)
         outputs = defaultdict(set)
+        # Params are passed along chains of ancestor groups. Once a param is
+        # known to be passed through a group, the rest of the chain above the
+        # group is known as well, so each chain is only walked once.
+        #   passed_down: (op_name, param_name, group_name) already given the param
+        #   passed_up_depths: (op_name, param_name) -> depth the output reached
+        passed_down = set()
+        passed_up_depths = {}
 
         for op in pipeline.ops.values():
             # op's inputs and all params used in conditions for that op are both considered.
@@ -285,30 +234,57 @@ class Compiler(object):
                 if param.value:
                     continue
                 if param.op_name:
+                    if (param.op_name, param.full_name,
+                            group_tree.get_parent(op.name)) in passed_down:
+                        # Already passed down to the parent group, e.g. a param of
+                        # a condition shared by all the ops in it.
+                        inputs[op.name].add((param.full_name, None))
+                        continue
                     upstream_op = pipeline.ops[param.op_name]
-                    upstream_groups, downstream_groups = \
-                      self._get_uncommon_ancestors(op_groups, opsgroup_groups, upstream_op, op)
-                    for i, group_name in enumerate(downstream_groups):
-                        if i == 0:
-                            # If it is the first uncommon downstream group, then the input comes from
-                            # the first uncommon upstream group.
-                            inputs[group_name].add(
-                                (param.full_name, upstream_groups[0]))
-                        else:
-                            # If not the first downstream group, then the input is passed down from
-                            # its ancestor groups so the upstream group is None.
-                            inputs[group_name].add((param.full_name, None))
-                    for i, group_name in enumerate(upstream_groups):
-                        if i == len(upstream_groups) - 1:
-                            # If last upstream group, it is an operator and output comes from container.
-                            outputs[group_name].add((param.full_name, None))
-                        else:
-                            # If not last upstream group, output value comes from one of its child.
+                    common_depth = group_tree.get_common_ancestor_depth(
+                        upstream_op.name, op.name)
+                    first_upstream_group = group_tree.get_ancestor(
+                        upstream_op.name, common_depth + 1)
+                    # The first uncommon downstream group gets the input from the first
+                    # uncommon upstream group. The groups below it get the input passed
+                    # down from their ancestor groups so the upstream group is None.
+                    first_downstream_group = group_tree.get_ancestor(
+                        op.name, common_depth + 1)
+                    inputs[first_downstream_group].add(
+                        (param.full_name, first_upstream_group))
+                    for group_name in group_tree.iter_ancestors(
+                            op.name, stop_depth=common_depth + 2):
+                        key = (param.op_name, param.full_name, group_name)
+                        if key in passed_down:
+                            break
+                        passed_down.add(key)
+                        inputs[group_name].add((param.full_name, None))
+
+                    # The operator output comes from the container. The output of the
+                    # upstream groups above it comes from one of their children.
+                    key = (param.op_name, param.full_name)
+                    depth = passed_up_depths.get(key)
+                    if depth is None:
+                        outputs[upstream_op.name].add((param.full_name, None))
+                        depth = group_tree.get_depth(upstream_op.name)
+                    if depth > common_depth + 1:
+                        upstream_groups = list(
+                            group_tree.iter_ancestors(
+                                upstream_op.name,
+                                start_depth=depth,
+                                stop_depth=common_depth + 1))
+                        for child_name, group_name in zip(
+                                upstream_groups, upstream_groups[1:]):
                             outputs[group_name].add(
-                                (param.full_name, upstream_groups[i + 1]))
+                                (param.full_name, child_name))
+                        passed_up_depths[key] = common_depth + 1
                 else:
                     if not op.is_exit_handler:
-                        for group_name in op_groups[op.name][::-1]:
+                        for group_name in group_tree.iter_ancestors(op.name):
+                            key = (None, param.full_name, group_name)
+                            if key in passed_down:
+                                break
+                            passed_down.add(key)
                             # if group is for loop group and param is that loop's param, then the param
                             # is created by that for loop ops_group and it shouldn't be an input to
                             # any of its parent groups.
@@ -336,7 +312,7 @@ class Compiler(object):
                     if param.op_name:
                         upstream_op = pipeline.ops[param.op_name]
                         upstream_groups, downstream_groups = \
-                          self._get_uncommon_ancestors(op_groups, opsgroup_groups, upstream_op, group)
+                          group_tree.get_uncommon_ancestors(upstream_op.name, group.name)
                         for i, g in enumerate(downstream_groups):
                             if i == 0:
                                 inputs[g].add((full_name, upstream_groups[0]))
@@ -354,7 +330,7 @@ class Compiler(object):
                                 outputs[g].add(
                                     (full_name, upstream_groups[i + 1]))
                     elif not is_condition_param:
-                        for g in op_groups[group.name]:
+                        for g in group_tree.get_ancestors(group.name):
                             inputs[g].add((full_name, None))
             for subgroup in group.groups:
                 _get_inputs_outputs_recursive_opsgroup(subgroup)
@@ -362,25 +338,20 @@ class Compiler(object):
         _get_inputs_outputs_recursive_opsgroup(root_group)
 
         # Generate the input for SubGraph along with parallelfor
-        for sub_graph in opsgroup_groups:
-            if sub_graph in op_name_to_for_loop_op:
-                # The opsgroup list is sorted with the farthest group as the first and
-                # the opsgroup itself as the last. To get the latest opsgroup which is
-                # not the opsgroup itself -2 is used.
-                parent = opsgroup_groups[sub_graph][-2]
-                if parent and parent.startswith('subgraph'):
-                    # propagate only op's pipeline param from subgraph to parallelfor
-                    loop_op = op_name_to_for_loop_op[sub_graph]
-                    pipeline_param = loop_op.loop_args.items_or_pipeline_param
-                    if loop_op.items_is_pipeline_param and pipeline_param.op_name:
-                        param_name = '%s-%s' % (sanitize_k8s_name(
-                            pipeline_param.op_name), pipeline_param.name)
-                        inputs[parent].add((param_name, pipeline_param.op_name))
+        for sub_graph, loop_op in op_name_to_for_loop_op.items():
+            parent = group_tree.get_parent(sub_graph)
+            if parent and parent.startswith('subgraph'):
+                # propagate only op's pipeline param from subgraph to parallelfor
+                pipeline_param = loop_op.loop_args.items_or_pipeline_param
+                if loop_op.items_is_pipeline_param and pipeline_param.op_name:
+                    param_name = '%s-%s' % (sanitize_k8s_name(
+                        pipeline_param.op_name), pipeline_param.name)
+                    inputs[parent].add((param_name, pipeline_param.op_name))
 
         return inputs, outputs
 
-    def _get_dependencies(self, pipeline, root_group, op_groups,
-                          opsgroups_groups, opsgroups, condition_params):
+    def _get_dependencies(self, pipeline, root_group, group_tree: GroupTree,
+                          opsgroups, condition_params):
         """Get dependent groups and ops for all ops and groups.
 
         Returns:
@@ -391,6 +362,9 @@ class Compiler(object):
           ancesters in their ancesters chain. Only sibling groups/ops can have dependencies.
         """
         dependencies = defaultdict(set)
+        # (upstream_op_name, parent_group_name) -> the first uncommon ancestors,
+        # when they are the same for all the ops in the parent group.
+        sibling_dependencies = {}
         for op in pipeline.ops.values():
             upstream_op_names = set()
             for param in op.inputs + list(condition_params[op.name]):
@@ -400,17 +374,20 @@ class Compiler(object):
 
             for upstream_op_name in upstream_op_names:
                 # the dependent op could be either a BaseOp or an opsgroup
-                if upstream_op_name in pipeline.ops:
-                    upstream_op = pipeline.ops[upstream_op_name]
-                elif upstream_op_name in opsgroups:
-                    upstream_op = opsgroups[upstream_op_name]
-                else:
+                if upstream_op_name not in pipeline.ops and upstream_op_name not in opsgroups:
                     raise ValueError('compiler cannot find the ' +
                                      upstream_op_name)
 
-                upstream_groups, downstream_groups = self._get_uncommon_ancestors(
-                    op_groups, opsgroups_groups, upstream_op, op)
-                dependencies[downstream_groups[0]].add(upstream_groups[0])
+                key = (upstream_op_name, group_tree.get_parent(op.name))
+                if key in sibling_dependencies:
+                    upstream_group, downstream_group = sibling_dependencies[key]
+                else:
+                    upstream_group, downstream_group = group_tree.get_first_uncommon_ancestors(
+                        upstream_op_name, op.name)
+                    if downstream_group != op.name:
+                        sibling_dependencies[key] = (upstream_group,
+                                                     downstream_group)
+                dependencies[downstream_group].add(upstream_group)
 
         # Generate dependencies based on the recursive opsgroups
         #TODO: refactor the following codes with the above
@@ -423,15 +400,11 @@ class Compiler(object):
                         upstream_op_names.add(param.op_name)
 
             for op_name in upstream_op_names:
-                if op_name in pipeline.ops:
-                    upstream_op = pipeline.ops[op_name]
-                elif op_name in opsgroups:
-                    upstream_op = opsgroups[op_name]
-                else:
+                if op_name not in pipeline.ops and op_name not in opsgroups:
                     raise ValueError('compiler cannot find the ' + op_name)
-                upstream_groups, downstream_groups = \
-                  self._get_uncommon_ancestors(op_groups, opsgroups_groups, upstream_op, group)
-                dependencies[downstream_groups[0]].add(upstream_groups[0])
+                upstream_group, downstream_group = \
+                  group_tree.get_first_uncommon_ancestors(op_name, group.name)
+                dependencies[downstream_group].add(upstream_group)
 
             for subgroup in group.groups:
                 _get_dependency_opsgroup(subgroup, dependencies)
@@ -690,9 +663,17 @@ class Compiler(object):
           pipeline: Pipeline context object to get all the pipeline data from.
           op_transformers: A list of functions that are applied to all ContainerOp instances that are being processed.
           op_to_templates_handler: Handler which converts a base op into a list of argo templates.
+            When not specified and compiling with `compile_many`, the templates of ops are looked
+            up in the template cache of the call, so that ops identical to already compiled ones
+            are not converted again.
         """
-        op_to_templates_handler = op_to_templates_handler or (
-            lambda op: [_op_to_template(op)])
+        if op_to_templates_handler is None:
+            if self._template_cache is not None:
+                op_to_templates_handler = functools.partial(
+                    self._template_cache.get_templates,
+                    op_to_templates=lambda op: [_op_to_template(op)])
+            else:
+                op_to_templates_handler = lambda op: [_op_to_template(op)]
         root_group = pipeline.groups[0]
 
         # Call the transformation functions before determining the inputs/outputs, otherwise
@@ -703,34 +684,30 @@ class Compiler(object):
                 transformer(op)
 
         # Generate core data structures to prepare for argo yaml generation
-        #   op_name_to_parent_groups: op name -> list of ancestor groups including the current op
+        #   group_tree: index of the ancestor groups of the ops and groups
         #   opsgroups: a dictionary of ospgroup.name -> opsgroup
         #   inputs, outputs: group/op names -> list of tuples (full_param_name, producing_op_name)
         #   condition_params: recursive_group/op names -> list of pipelineparam
         #   dependencies: group/op name -> list of dependent groups/ops.
         # Special Handling for the recursive opsgroup
-        #   op_name_to_parent_groups also contains the recursive opsgroups
+        #   group_tree also contains the recursive opsgroups
         #   condition_params from _get_condition_params_for_ops also contains the recursive opsgroups
         #   groups does not include the recursive opsgroups
         opsgroups = self._get_groups(root_group)
-        op_name_to_parent_groups = self._get_groups_for_ops(root_group)
-        opgroup_name_to_parent_groups = self._get_groups_for_opsgroups(
-            root_group)
+        group_tree = GroupTree(root_group)
         condition_params = self._get_condition_params_for_ops(root_group)
         op_name_to_for_loop_op = self._get_for_loop_ops(root_group)
         inputs, outputs = self._get_inputs_outputs(
             pipeline,
             root_group,
-            op_name_to_parent_groups,
-            opgroup_name_to_parent_groups,
+            group_tree,
             condition_params,
             op_name_to_for_loop_op,
         )
         dependencies = self._get_dependencies(
             pipeline,
             root_group,
-            op_name_to_parent_groups,
-            opgroup_name_to_parent_groups,
+            group_tree,
             opsgroups,
             condition_params,
         )
@@ -744,8 +721,7 @@ class Compiler(object):
         for op in pipeline.ops.values():
             if hasattr(op, 'importer_spec'):
                 raise ValueError(
-                    'dsl.importer is not supported with v1 compiler.'
-                )
+                    'dsl.importer is not supported with v1 compiler.')
 
             if self._mode == dsl.PipelineExecutionMode.V2_COMPATIBLE:
                 v2_compat.update_op(
@@ -1002,7 +978,8 @@ class Compiler(object):
             else:
                 args_list.append(param)
 
-        with dsl.Pipeline(pipeline_name) as dsl_pipeline:
+        with self._timed_phase('trace'), dsl.Pipeline(
+                pipeline_name) as dsl_pipeline:
             pipeline_func(*args_list, **kwargs_dict)
 
         pipeline_conf = pipeline_conf or dsl_pipeline.conf  # Configuration passed to the compiler is overriding. Unfortunately, it's not trivial to detect whether the dsl_pipeline.conf was ever modified.
@@ -1056,18 +1033,20 @@ class Compiler(object):
                 if insert_pipeline_root_param:
                     op.inputs.append(self._pipeline_root_param)
 
-        workflow = self._create_pipeline_workflow(
-            args_list_with_defaults,
-            dsl_pipeline,
-            op_transformers,
-            pipeline_conf,
-        )
+        with self._timed_phase('templates'):
+            workflow = self._create_pipeline_workflow(
+                args_list_with_defaults,
+                dsl_pipeline,
+                op_transformers,
+                pipeline_conf,
+            )
 
         from ._data_passing_rewriter import fix_big_data_passing
-        workflow = fix_big_data_passing(workflow)
+        with self._timed_phase('data_passing'):
+            workflow = fix_big_data_passing(workflow, inplace=True)
 
-        if pipeline_conf and pipeline_conf.data_passing_method != None:
-            workflow = pipeline_conf.data_passing_method(workflow)
+            if pipeline_conf and pipeline_conf.data_passing_method != None:
+                workflow = pipeline_conf.data_passing_method(workflow)
 
         metadata = workflow.setdefault('metadata', {})
         annotations = metadata.setdefault('annotations', {})
@@ -1137,12 +1116,15 @@ class Compiler(object):
         Args:
           pipeline_func: Pipeline functions with @dsl.pipeline decorator.
           package_path: The output workflow tar.gz file path. for example,
-            "~/a.tar.gz"
+            "~/a.tar.gz", or a binary file object, e.g. a socket file, the
+            workflow yaml is written to.
           type_check: Whether to enable the type check or not, default: True.
           pipeline_conf: PipelineConf instance. Can specify op transforms, image
             pull secrets and other pipeline-level configuration options. Overrides
             any configuration that may be set by the pipeline.
         """
+        self._pipeline_root_param = None
+        self._pipeline_name_param = None
         pipeline_root_dir = getattr(pipeline_func, 'pipeline_root', None)
         if (pipeline_root_dir is not None or
                 self._mode == dsl.PipelineExecutionMode.V2_COMPATIBLE):
@@ -1181,79 +1163,195 @@ class Compiler(object):
             kfp.TYPE_CHECK = type_check_old_value
             kfp.COMPILING_FOR_V2 = compiling_for_v2_old_value
 
+    def compile_many(
+        self,
+        pipelines: Iterable[Tuple[Callable, Text]],
+        type_check: bool = True,
+        pipeline_conf: Optional[dsl.PipelineConf] = None,
+        template_cache: Optional[TemplateCache] = None
+    ) -> List[Dict[Text, float]]:
+        """Compile several pipeline functions into workflow yaml.
+
+        The templates of identical ops are generated once for all the
+        pipelines. The ops reusing the template of an identical op are not
+        processed by the compiler, e.g. their pipeline parameters are not
+        substituted in place.
+
+        Args:
+          pipelines: Pairs of pipeline function and output package path, see
+            `compile` for the supported package formats.
+          type_check: Whether to enable the type check or not, default: True.
+          pipeline_conf: PipelineConf instance applied to all the pipelines.
+          template_cache: Cache of the op templates. Defaults to a cache
+            discarded at the end of the call.
+
+        Returns:
+          For each pipeline, a dict mapping each compilation phase (trace,
+          templates, data_passing, write, validate and total) to the time
+          spent in seconds. The workflows are linted in the background while
+          compiling the next pipelines, which is not part of the timings.
+        """
+        all_timings = []
+        self._background_lints = []
+        self._template_cache = template_cache or TemplateCache()
+        with concurrent.futures.ThreadPoolExecutor(
+                max_workers=1) as lint_executor:
+            self._lint_executor = lint_executor
+            try:
+                for pipeline_func, package_path in pipelines:
+                    self._phase_timings = {}
+                    with self._timed_phase('total'):
+                        self.compile(
+                            pipeline_func,
+                            package_path,
+                            type_check=type_check,
+                            pipeline_conf=pipeline_conf)
+                    all_timings.append(self._phase_timings)
+            finally:
+                self._phase_timings = None
+                background_lints = self._background_lints
+                self._background_lints = None
+                self._lint_executor = None
+                self._template_cache = None
+        for lint in background_lints:
+            lint.result()
+        return all_timings
+
     @staticmethod
-    def _write_workflow(workflow: Dict[Text, Any], package_path: Text = None):
+    def _write_workflow(workflow: Dict[Text, Any],
+                        package_path: Union[Text, BinaryIO] = None,
+                        use_libyaml: bool = False):
         """Dump pipeline workflow into yaml spec and write out in the format
         specified by the user.
 
+        The yaml spec is streamed to the package. For the tar.gz format, which
+        needs the size of the spec upfront, it is streamed to a temporary
+        file first.
+
         Args:
           workflow: Workflow spec of the pipline, dict.
-          package_path: file path to be written. If not specified, a yaml_text string will be returned.
+          package_path: file path to be written, or a binary file object the
+            yaml spec is written to. If not specified, a yaml_text string will
+            be returned.
+          use_libyaml: Whether to use the libyaml emitter, see `dump_yaml`.
         """
-        yaml_text = dump_yaml(workflow)
-
         if package_path is None:
-            return yaml_text
-
-        if package_path.endswith('.tar.gz') or package_path.endswith('.tgz'):
-            from contextlib import closing
-            from io import BytesIO
-            with tarfile.open(package_path, "w:gz") as tar:
-                with closing(BytesIO(yaml_text.encode())) as yaml_file:
+            return dump_yaml(workflow, use_libyaml=use_libyaml)
+
+        if not isinstance(package_path, str):
+            yaml_file = io.TextIOWrapper(package_path, encoding='utf-8')
+            dump_yaml(workflow, yaml_file, use_libyaml=use_libyaml)
+            # Flushes the yaml spec, leaving the file object open.
+            yaml_file.detach()
+        elif package_path.endswith('.tar.gz') or package_path.endswith('.tgz'):
+            with tempfile.TemporaryFile() as yaml_file:
+                with io.TextIOWrapper(yaml_file, encoding='utf-8') as yaml_text:
+                    dump_yaml(workflow, yaml_text, use_libyaml=use_libyaml)
+                    yaml_text.flush()
                     tarinfo = tarfile.TarInfo('pipeline.yaml')
-                    tarinfo.size = len(yaml_file.getvalue())
-                    tar.addfile(tarinfo, fileobj=yaml_file)
+                    tarinfo.size = yaml_file.tell()
+                    yaml_file.seek(0)
+                    with tarfile.open(package_path, "w:gz") as tar:
+                        tar.addfile(tarinfo, fileobj=yaml_file)
         elif package_path.endswith('.zip'):
             with zipfile.ZipFile(package_path, "w") as zip:
                 zipinfo = zipfile.ZipInfo('pipeline.yaml')
                 zipinfo.compress_type = zipfile.ZIP_DEFLATED
-                zip.writestr(zipinfo, yaml_text)
+                with io.TextIOWrapper(
+                        zip.open(zipinfo, 'w'), encoding='utf-8') as yaml_file:
+                    dump_yaml(workflow, yaml_file, use_libyaml=use_libyaml)
         elif package_path.endswith('.yaml') or package_path.endswith('.yml'):
             with open(package_path, 'w') as yaml_file:
-                yaml_file.write(yaml_text)
+                dump_yaml(workflow, yaml_file, use_libyaml=use_libyaml)
         else:
             raise ValueError('The output path ' + package_path +
                              ' should ends with one of the following formats: '
                              '[.tar.gz, .tgz, .zip, .yaml, .yml]')
 
-    def _create_and_write_workflow(self,
-                                   pipeline_func: Callable,
-                                   pipeline_name: Text = None,
-                                   pipeline_description: Text = None,
-                                   params_list: List[dsl.PipelineParam] = None,
-                                   pipeline_conf: dsl.PipelineConf = None,
-                                   package_path: Text = None) -> None:
+    def _create_and_write_workflow(
+            self,
+            pipeline_func: Callable,
+            pipeline_name: Text = None,
+            pipeline_description: Text = None,
+            params_list: List[dsl.PipelineParam] = None,
+            pipeline_conf: dsl.PipelineConf = None,
+            package_path: Union[Text, BinaryIO] = None) -> None:
         """Compile the given pipeline function and dump it to specified file
         format."""
         workflow = self._create_workflow(pipeline_func, pipeline_name,
                                          pipeline_description, params_list,
                                          pipeline_conf)
-        self._write_workflow(workflow, package_path)
-        _validate_workflow(workflow)
-
-
-def _validate_workflow(workflow: dict):
-    workflow = workflow.copy()
-    # Working around Argo lint issue
-    for argument in workflow['spec'].get('arguments', {}).get('parameters', []):
-        if 'value' not in argument:
-            argument['value'] = ''
-
-    yaml_text = dump_yaml(workflow)
-    if '{{pipelineparam' in yaml_text:
+        with self._timed_phase('write'):
+            self._write_workflow(workflow, package_path, self._use_libyaml)
+        with self._timed_phase('validate'):
+            _validate_workflow(
+                workflow,
+                argo_lint=self._argo_lint and self._background_lints is None,
+                use_libyaml=self._use_libyaml)
+        if self._argo_lint and self._background_lints is not None:
+            self._background_lints.append(
+                self._lint_executor.submit(_lint_workflow, workflow,
+                                           self._use_libyaml))
+
+
+def _validate_workflow(workflow: dict,
+                       argo_lint: bool = True,
+                       use_libyaml: bool = False):
+    if _has_unresolved_pipelineparams(workflow):
         raise RuntimeError(
             '''Internal compiler error: Found unresolved PipelineParam.
 Please create a new issue at https://github.com/kubeflow/pipelines/issues attaching the pipeline code and the pipeline package.'''
         )
 
-    # Running Argo lint if available
+    if argo_lint:
+        _lint_workflow(workflow, use_libyaml)
+
+
+def _has_unresolved_pipelineparams(workflow: dict) -> bool:
+    to_visit = [workflow]
+    while to_visit:
+        obj = to_visit.pop()
+        if isinstance(obj, str):
+            if '{{pipelineparam' in obj:
+                return True
+        elif isinstance(obj, dict):
+            to_visit.extend(obj.keys())
+            to_visit.extend(obj.values())
+        elif isinstance(obj, (list, tuple)):
+            to_visit.extend(obj)
+    return False
+
+
+def _lint_workflow(workflow: dict, use_libyaml: bool = False):
+    """Runs argo lint on the workflow, if argo is available."""
+    if not _has_working_argo_lint():
+        return
+
+    # Working around Argo lint issue
+    spec = workflow['spec']
+    parameters = spec.get('arguments', {}).get('parameters', [])
+    if any('value' not in argument for argument in parameters):
+        parameters = [
+            argument if 'value' in argument else dict(argument, value='')
+            for argument in parameters
+        ]
+        workflow = dict(
+            workflow,
+            spec=dict(
+                spec, arguments=dict(spec['arguments'], parameters=parameters)))
+
+    _run_argo_lint(dump_yaml(workflow, use_libyaml=use_libyaml))
+
+
+@functools.lru_cache(maxsize=None)
+def _has_working_argo_lint() -> bool:
+    """Checks once per process whether a usable argo CLI is in PATH."""
     import shutil
-    import subprocess
     argo_path = shutil.which('argo')
-    if argo_path:
-        has_working_argo_lint = False
-        try:
-            has_working_argo_lint = _run_argo_lint("""
+    if not argo_path:
+        return False
+    try:
+        return _run_argo_lint("""
         apiVersion: argoproj.io/v1alpha1
         kind: Workflow
         metadata:
@@ -1264,13 +1362,11 @@ Please create a new issue at https://github.com/kubeflow/pipelines/issues attach
           - name: whalesay
             container:
               image: docker/whalesay:latest""")
-        except:
-            warnings.warn(
-                "Cannot validate the compiled workflow. Found the argo program in PATH, but it's not usable. argo CLI v3.1.1+ should work."
-            )
-
-        if has_working_argo_lint:
-            _run_argo_lint(yaml_text)
+    except:
+        warnings.warn(
+            "Cannot validate the compiled workflow. Found the argo program in PATH, but it's not usable. argo CLI v3.1.1+ should work."
+        )
+        return False
 
 
 def _run_argo_lint(yaml_text: str):
@@ -12,8 +12,32 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import sys
+
+from . import _airflow_op
+from . import _components
+from . import _python_op
+from . import _python_to_graph_component
 from ._airflow_op import *
 from ._components import *
 from ._python_op import *
 from ._python_to_graph_component import *
-from ._component_store import *
+
+# ComponentStore, which imports requests, is imported when it is first
+# accessed.
+__all__ = (
+    _airflow_op.__all__ + _components.__all__ + _python_op.__all__ +
+    _python_to_graph_component.__all__ + ['ComponentStore'])
+
+
+def __getattr__(name):
+    if name == 'ComponentStore':
+        from ._component_store import ComponentStore
+        return ComponentStore
+    raise AttributeError('module {!r} has no attribute {!r}'.format(
+        __name__, name))
+
+
+# The module __getattr__ is not supported before python 3.7.
+if sys.version_info < (3, 7):
+    from ._component_store import *
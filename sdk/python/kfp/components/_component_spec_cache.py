@@ -0,0 +1,189 @@
+# Copyright 2021 The Kubeflow Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Cache of the parsed component specs, keyed by the digest of their text.
+
+Pipelines load the same components over and over, in the same process
+and across processes. The structures of the component specs which have
+already been parsed and validated are kept in memory, and optionally on
+disk, so loading them again skips YAML parsing and validation.
+
+The cache also remembers the ETags of the component URLs, so that URL
+loads can be revalidated without transferring the component again.
+"""
+
+import json
+import os
+import pickle
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, NamedTuple, Optional
+
+from ._key_value_store import KeyValueStore
+from ._structures import ComponentSpec
+
+# Directory of the on-disk cache. The cache is in-memory only by default.
+COMPONENT_SPEC_CACHE_DIR_ENV = 'KFP_COMPONENT_SPEC_CACHE_DIR'
+
+_DEFAULT_MAX_SIZE = 256
+
+
+class UrlCacheInfo(NamedTuple):
+    """The ETag of a URL and the digest of the component it served."""
+    etag: str
+    digest: str
+
+
+class ComponentSpecCache(object):
+    """Bounded LRU cache of component spec structures keyed by digest.
+
+    Args:
+      max_size: Maximum number of component specs kept in memory.
+      cache_dir: Directory of the on-disk cache, which is shared by
+        processes. Disabled if not specified.
+    """
+
+    def __init__(self,
+                 max_size: int = _DEFAULT_MAX_SIZE,
+                 cache_dir: Optional[str] = None):
+        self._max_size = max_size
+        # The structures are pickled, so the specs never share mutable
+        # objects with the cache.
+        self._structs = OrderedDict()
+        self._url_infos = {}
+        self._lock = threading.Lock()
+        self._struct_db = None
+        self._url_info_db = None
+        if cache_dir:
+            self._struct_db = KeyValueStore(
+                cache_dir=os.path.join(cache_dir, 'digest_to_struct'))
+            self._url_info_db = KeyValueStore(
+                cache_dir=os.path.join(cache_dir, 'url_to_info'))
+        self.hits = 0
+        self.misses = 0
+
+    def get_component_spec(self, digest: str,
+                           load_struct: Callable[[], Any]) -> ComponentSpec:
+        """Gets the component spec with the digest, parsing it on cache miss.
+
+        Args:
+          digest: The digest of the component text.
+          load_struct: Function loading the structure of the component spec
+            from its text.
+
+        Returns:
+          A new component spec object, which the caller is free to modify.
+        """
+        component_spec = self.try_get_component_spec(digest)
+        if component_spec is not None:
+            return component_spec
+
+        struct = load_struct()
+        # Only valid component specs are cached.
+        component_spec = ComponentSpec.from_dict(struct)
+        self._store_struct(digest, struct)
+        return component_spec
+
+    def try_get_component_spec(self, digest: str) -> Optional[ComponentSpec]:
+        """Gets the component spec with the digest, if it is cached."""
+        struct = self._try_get_struct(digest)
+        if struct is None:
+            return None
+        return ComponentSpec.from_dict(struct, validate=False)
+
+    def has_component_spec(self, digest: str) -> bool:
+        with self._lock:
+            if digest in self._structs:
+                return True
+        return self._struct_db is not None and self._struct_db.exists(digest)
+
+    def _try_get_struct(self, digest: str) -> Any:
+        with self._lock:
+            data = self._structs.get(digest)
+            if data is not None:
+                self._structs.move_to_end(digest)
+                self.hits += 1
+                return pickle.loads(data)
+
+        struct = None
+        if self._struct_db is not None:
+            text = self._struct_db.try_get_value_text(digest)
+            if text is not None:
+                try:
+                    struct = json.loads(text, object_pairs_hook=OrderedDict)
+                except ValueError:  # Written concurrently by another process
+                    pass
+        with self._lock:
+            if struct is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._put_struct_in_memory(digest, struct)
+        return struct
+
+    def _store_struct(self, digest: str, struct: Any) -> None:
+        with self._lock:
+            self._put_struct_in_memory(digest, struct)
+        if self._struct_db is not None:
+            try:
+                text = json.dumps(struct)
+            except (TypeError, ValueError):
+                return
+            # YAML values like dates and non-string keys cannot be stored
+            # as JSON.
+            if json.loads(text) == struct:
+                self._struct_db.store_value_text(digest, text)
+
+    def _put_struct_in_memory(self, digest: str, struct: Any) -> None:
+        self._structs[digest] = pickle.dumps(struct)
+        self._structs.move_to_end(digest)
+        while len(self._structs) > self._max_size:
+            self._structs.popitem(last=False)
+
+    def try_get_url_info(self, url: str) -> Optional[UrlCacheInfo]:
+        """Gets the ETag of a URL and the digest of the component it served.
+
+        Returns None if unknown or if the component is no longer cached.
+        """
+        with self._lock:
+            url_info = self._url_infos.get(url)
+        if url_info is None and self._url_info_db is not None:
+            text = self._url_info_db.try_get_value_text(url)
+            if text is not None:
+                try:
+                    url_info = UrlCacheInfo(**json.loads(text))
+                except (TypeError, ValueError):
+                    pass
+        if url_info is None or not self.has_component_spec(url_info.digest):
+            return None
+        return url_info
+
+    def store_url_info(self, url: str, etag: str, digest: str) -> None:
+        url_info = UrlCacheInfo(etag=etag, digest=digest)
+        with self._lock:
+            self._url_infos[url] = url_info
+        if self._url_info_db is not None:
+            self._url_info_db.store_value_text(url,
+                                               json.dumps(url_info._asdict()))
+
+    def clear(self) -> None:
+        """Clears the in-memory cache. The on-disk cache is kept."""
+        with self._lock:
+            self._structs.clear()
+            self._url_infos.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+component_spec_cache = ComponentSpecCache(
+    cache_dir=os.environ.get(COMPONENT_SPEC_CACHE_DIR_ENV))
@@ -3,18 +3,22 @@ __all__ = [
 ]
 
 from pathlib import Path
+import concurrent.futures
 import copy
 import hashlib
 import json
 import logging
 import requests
 import tempfile
-from typing import Callable, Iterable
+import threading
+from typing import Callable, Iterable, List, Optional, Tuple
 from . import _components as comp
 from .structures import ComponentReference
 from ._key_value_store import KeyValueStore
 
 _COMPONENT_FILENAME = 'component.yaml'
+_DEFAULT_MAX_WORKERS = 8
+_DEFAULT_REQUEST_TIMEOUT = 30
 
 
 class ComponentStore:
@@ -22,11 +26,30 @@ class ComponentStore:
     def __init__(self,
                  local_search_paths=None,
                  url_search_prefixes=None,
-                 auth=None):
-        """Instantiates a ComponentStore."""
+                 auth=None,
+                 max_workers: int = _DEFAULT_MAX_WORKERS,
+                 request_timeout: float = _DEFAULT_REQUEST_TIMEOUT):
+        """Instantiates a ComponentStore.
+
+        Args:
+            local_search_paths: Local directories to search for components.
+            url_search_prefixes: URL prefixes to search for components.
+            auth: Auth object for the requests library.
+            max_workers: Maximum number of concurrent downloads.
+            request_timeout: Timeout of the HTTP requests, in seconds.
+        """
         self.local_search_paths = local_search_paths or ['.']
         self.url_search_prefixes = url_search_prefixes or []
         self._auth = auth
+        self._max_workers = max_workers
+        self._request_timeout = request_timeout
+        # Pooled connections, shared by the download threads. Created on the
+        # first fetch.
+        self._session = None
+        self._session_lock = threading.Lock()
+        self._executor = None
+        self._executor_lock = threading.Lock()
+        self._prefetched_component_refs = {}
 
         self._component_file_name = 'component.yaml'
         self._digests_subpath = 'versions/sha256'
@@ -113,6 +136,11 @@ class ComponentStore:
         if component_ref.spec:
             return component_ref
 
+        prefetched_ref = self._prefetched_component_refs.get(
+            (component_ref.name, component_ref.digest, component_ref.tag))
+        if prefetched_ref is not None and not component_ref.url:
+            return copy.copy(prefetched_ref)
+
         component_ref = copy.copy(component_ref)
         if component_ref.url:
             component_ref.spec = comp._load_component_spec_from_url(
@@ -148,34 +176,171 @@ class ComponentStore:
             component_path = Path(local_search_path, path_suffix)
             tried_locations.append(str(component_path))
             if component_path.is_file():
-                # TODO: Verify that the content matches the digest (if specified).
+                component_data = component_path.read_bytes()
+                if not _has_digest(component_data, digest):
+                    logging.warning(
+                        'Skipping "{}" since its digest does not match.'.format(
+                            component_path))
+                    continue
                 component_ref._local_path = str(component_path)
-                component_ref.spec = comp._load_component_spec_from_file(
-                    str(component_path))
+                component_ref.spec = comp._load_component_spec_from_yaml_or_zip_bytes(
+                    component_data)
                 return component_ref
 
         #Trying URL prefixes
-        for url_search_prefix in self.url_search_prefixes:
-            url = url_search_prefix + path_suffix
-            tried_locations.append(url)
-            try:
-                response = requests.get(
-                    url, auth=self._auth
-                )  #Does not throw exceptions on bad status, but throws on dead domains and malformed URLs. Should we log those cases?
-                response.raise_for_status()
-            except:
-                continue
-            if response.content:
-                # TODO: Verify that the content matches the digest (if specified).
-                component_ref.url = url
-                component_ref.spec = comp._load_component_spec_from_yaml_or_zip_bytes(
-                    response.content)
-                return component_ref
+        urls = [
+            url_search_prefix + path_suffix
+            for url_search_prefix in self.url_search_prefixes
+        ]
+        tried_locations.extend(urls)
+        url, component_data = self._fetch_first_available(urls, digest)
+        if url is not None:
+            component_ref.url = url
+            component_ref.spec = comp._load_component_spec_from_yaml_or_zip_bytes(
+                component_data)
+            self._store_component_data(url, component_data, component_ref.spec)
+            return component_ref
 
         raise RuntimeError(
             'Component {} was not found. Tried the following locations:\n{}'
             .format(name, '\n'.join(tried_locations)))
 
+    def _get_session(self) -> requests.Session:
+        with self._session_lock:
+            if self._session is None:
+                self._session = _get_request_session(
+                    pool_maxsize=self._max_workers)
+            return self._session
+
+    def _get_executor(self) -> concurrent.futures.Executor:
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=self._max_workers,
+                    thread_name_prefix='ComponentStore')
+            return self._executor
+
+    def _fetch_first_available(
+            self, urls: List[str],
+            digest: Optional[str]) -> Tuple[Optional[str], Optional[bytes]]:
+        """Fetches the URLs concurrently and returns the data of the first
+        one, in the order of the URLs, which has the component.
+
+        Returns (None, None) if none of the URLs has the component.
+        """
+        if digest is not None:
+            # Specific component versions never change, so they can be
+            # taken from the cache.
+            for url in urls:
+                component_data = self._try_get_cached_component_data(
+                    url, digest)
+                if component_data is not None:
+                    return url, component_data
+
+        if not urls:
+            return None, None
+        if len(urls) == 1:
+            component_data = self._try_fetch_component_data(urls[0], digest)
+            return (urls[0], component_data) if component_data else (None, None)
+
+        executor = self._get_executor()
+        futures = [
+            executor.submit(self._try_fetch_component_data, url, digest)
+            for url in urls
+        ]
+        try:
+            for url, future in zip(urls, futures):
+                component_data = future.result()
+                if component_data:
+                    return url, component_data
+        finally:
+            for future in futures:
+                future.cancel()
+        return None, None
+
+    def _try_fetch_component_data(self, url: str,
+                                  digest: Optional[str]) -> Optional[bytes]:
+        try:
+            response = self._get_session().get(
+                url, auth=self._auth, timeout=self._request_timeout)
+            response.raise_for_status()
+        except requests.exceptions.RequestException as e:
+            # Bad status, dead domain or malformed URL
+            logging.debug('Failed to fetch "{}": {}'.format(url, e))
+            return None
+        component_data = response.content
+        if component_data and not _has_digest(component_data, digest):
+            logging.warning(
+                'Skipping "{}" since its digest does not match.'.format(url))
+            return None
+        return component_data
+
+    def _try_get_cached_component_data(self, url: str,
+                                       digest: str) -> Optional[bytes]:
+        component_info_data = self._url_to_info_db.try_get_value_bytes(url)
+        if component_info_data is None:
+            return None
+        component_info = json.loads(component_info_data)
+        if component_info.get('digest') != digest:
+            return None
+        component_data = self._git_blob_hash_to_data_db.try_get_value_bytes(
+            component_info['git_blob_hash'])
+        if component_data is None or not _has_digest(component_data, digest):
+            return None
+        return component_data
+
+    def _store_component_data(self, url: str, component_data: bytes,
+                              component_spec) -> None:
+        blob_hash = _calculate_git_blob_hash(component_data)
+        self._git_blob_hash_to_data_db.store_value_bytes(
+            blob_hash, component_data)
+        self._url_to_info_db.store_value_text(
+            url,
+            json.dumps(
+                dict(
+                    name=component_spec.name,
+                    url=url,
+                    git_blob_hash=blob_hash,
+                    digest=_calculate_component_digest(component_data),
+                )))
+
+    def prefetch(self, names: Iterable[str]) -> None:
+        """Loads several components concurrently.
+
+        The components are later loaded by load_component without searching
+        for them again.
+
+        Args:
+            names: Names of the components to load, like for load_component.
+
+        Raises:
+            RuntimeError: If some of the components were not found.
+        """
+        component_refs = [ComponentReference(name=name) for name in names]
+        # The searches use the executor of the store for fetching the URLs,
+        # so they run in a separate pool.
+        with concurrent.futures.ThreadPoolExecutor(
+                max_workers=self._max_workers) as executor:
+            futures = [
+                executor.submit(self._load_component_spec_in_component_ref,
+                                component_ref)
+                for component_ref in component_refs
+            ]
+            errors = []
+            for future in futures:
+                try:
+                    component_ref = future.result()
+                except Exception as e:
+                    errors.append(str(e))
+                    continue
+                self._prefetched_component_refs[(component_ref.name,
+                                                 component_ref.digest,
+                                                 component_ref.tag)] = (
+                                                     component_ref)
+        if errors:
+            raise RuntimeError('Failed to prefetch some components:\n' +
+                               '\n'.join(errors))
+
     def _load_component_from_ref(self,
                                  component_ref: ComponentReference) -> Callable:
         component_ref = self._load_component_spec_in_component_ref(
@@ -199,6 +364,9 @@ class ComponentStore:
         """
         self._refresh_component_cache()
         for url in self._url_to_info_db.keys():
+            if not url.endswith(_COMPONENT_FILENAME):
+                # Specific component versions, cached when loaded by digest
+                continue
             component_info = json.loads(
                 self._url_to_info_db.try_get_value_bytes(url))
             component_name = component_info['name']
@@ -217,78 +385,101 @@ class ComponentStore:
                     'https://raw.githubusercontent.com/'):
                 logging.info('Searching for components in "{}"'.format(
                     url_search_prefix))
+                new_candidates = []
                 for candidate in _list_candidate_component_uris_from_github_repo(
-                        url_search_prefix, auth=self._auth):
+                        url_search_prefix,
+                        auth=self._auth,
+                        session=self._get_session()):
                     component_url = candidate['url']
                     if self._url_to_info_db.exists(component_url):
                         continue
 
                     logging.debug(
                         'Found new component URL: "{}"'.format(component_url))
-
-                    blob_hash = candidate['git_blob_hash']
-                    if not self._git_blob_hash_to_data_db.exists(blob_hash):
-                        logging.debug(
-                            'Downloading component spec from "{}"'.format(
-                                component_url))
-                        response = _get_request_session().get(
-                            component_url, auth=self._auth)
-                        response.raise_for_status()
-                        component_data = response.content
-
-                        # Verifying the hash
-                        received_data_hash = _calculate_git_blob_hash(
-                            component_data)
-                        if received_data_hash.lower() != blob_hash.lower():
-                            raise RuntimeError(
-                                'The downloaded component ({}) has incorrect hash: "{}" != "{}"'
-                                .format(
-                                    component_url,
-                                    received_data_hash,
-                                    blob_hash,
-                                ))
-
-                        # Verifying that the component is loadable
-                        try:
-                            component_spec = comp._load_component_spec_from_component_text(
-                                component_data)
-                        except:
-                            continue
-                        self._git_blob_hash_to_data_db.store_value_bytes(
-                            blob_hash, component_data)
-                    else:
-                        component_data = self._git_blob_hash_to_data_db.try_get_value_bytes(
-                            blob_hash)
-                        component_spec = comp._load_component_spec_from_component_text(
-                            component_data)
-
-                    component_name = component_spec.name
-                    self._url_to_info_db.store_value_text(
+                    new_candidates.append(candidate)
+
+                executor = self._get_executor()
+                for future in [
+                        executor.submit(self._cache_candidate_component,
+                                        candidate)
+                        for candidate in new_candidates
+                ]:
+                    future.result()
+
+    def _cache_candidate_component(self, candidate: dict) -> None:
+        component_url = candidate['url']
+        blob_hash = candidate['git_blob_hash']
+        if not self._git_blob_hash_to_data_db.exists(blob_hash):
+            logging.debug(
+                'Downloading component spec from "{}"'.format(component_url))
+            response = self._get_session().get(
+                component_url, auth=self._auth, timeout=self._request_timeout)
+            response.raise_for_status()
+            component_data = response.content
+
+            # Verifying the hash
+            received_data_hash = _calculate_git_blob_hash(component_data)
+            if received_data_hash.lower() != blob_hash.lower():
+                raise RuntimeError(
+                    'The downloaded component ({}) has incorrect hash: "{}" != "{}"'
+                    .format(
                         component_url,
-                        json.dumps(
-                            dict(
-                                name=component_name,
-                                url=component_url,
-                                git_blob_hash=blob_hash,
-                                digest=_calculate_component_digest(
-                                    component_data),
-                            )))
+                        received_data_hash,
+                        blob_hash,
+                    ))
 
-
-def _get_request_session(max_retries: int = 3):
+            # Verifying that the component is loadable
+            try:
+                component_spec = comp._load_component_spec_from_component_text(
+                    component_data)
+            except:
+                return
+            self._git_blob_hash_to_data_db.store_value_bytes(
+                blob_hash, component_data)
+        else:
+            component_data = self._git_blob_hash_to_data_db.try_get_value_bytes(
+                blob_hash)
+            component_spec = comp._load_component_spec_from_component_text(
+                component_data)
+
+        component_name = component_spec.name
+        self._url_to_info_db.store_value_text(
+            component_url,
+            json.dumps(
+                dict(
+                    name=component_name,
+                    url=component_url,
+                    git_blob_hash=blob_hash,
+                    digest=_calculate_component_digest(component_data),
+                )))
+
+
+def _get_request_session(
+        max_retries: int = 3,
+        pool_maxsize: int = requests.adapters.DEFAULT_POOLSIZE):
     session = requests.Session()
 
-    retry_strategy = requests.packages.urllib3.util.retry.Retry(
+    retry_kwargs = dict(
         total=max_retries,
         backoff_factor=0.1,
         status_forcelist=[413, 429, 500, 502, 503, 504],
-        method_whitelist=frozenset(['GET', 'POST']),
     )
-
-    session.mount('https://',
-                  requests.adapters.HTTPAdapter(max_retries=retry_strategy))
-    session.mount('http://',
-                  requests.adapters.HTTPAdapter(max_retries=retry_strategy))
+    try:
+        retry_strategy = requests.packages.urllib3.util.retry.Retry(
+            allowed_methods=frozenset(['GET', 'POST']), **retry_kwargs)
+    except TypeError:
+        # urllib3 < 1.26
+        retry_strategy = requests.packages.urllib3.util.retry.Retry(
+            method_whitelist=frozenset(['GET', 'POST']), **retry_kwargs)
+
+    session.mount(
+        'https://',
+        requests.adapters.HTTPAdapter(
+            max_retries=retry_strategy, pool_maxsize=pool_maxsize))
+    session.mount(
+        'http://',
+        requests.adapters.HTTPAdapter(
+            max_retries=retry_strategy, pool_maxsize=pool_maxsize))
 
     return session
 
@@ -302,15 +493,24 @@ def _calculate_component_digest(data: bytes) -> str:
     return hashlib.sha256(data.replace(b'\r\n', b'\n')).hexdigest()
 
 
-def _list_candidate_component_uris_from_github_repo(url_search_prefix: str,
-                                                    auth=None) -> Iterable[str]:
+def _has_digest(data: bytes, digest: Optional[str]) -> bool:
+    return digest is None or _calculate_component_digest(
+        data).lower() == digest.lower()
+
+
+def _list_candidate_component_uris_from_github_repo(
+        url_search_prefix: str,
+        auth=None,
+        session: Optional[requests.Session] = None) -> Iterable[str]:
     (schema, _, host, org, repo, ref,
      path_prefix) = url_search_prefix.split('/', 6)
+    session = session or _get_request_session()
     for page in range(1, 999):
         search_url = (
             'https://api.github.com/search/code?q=filename:{}+repo:{}/{}&page={}&per_page=1000'
         ).format(_COMPONENT_FILENAME, org, repo, page)
-        response = _get_request_session().get(search_url, auth=auth)
+        response = session.get(
+            search_url, auth=auth, timeout=_DEFAULT_REQUEST_TIMEOUT)
         response.raise_for_status()
         result = response.json()
         items = result['items']
@@ -27,6 +27,7 @@ import warnings
 
 from ._naming import _sanitize_file_name, _sanitize_python_function_name, generate_unique_name_conversion_table
 from ._yaml_utils import load_yaml
+from ._component_spec_cache import component_spec_cache
 from .structures import *
 from ._data_passing import serialize_value, get_canonical_type_for_type_name
 
@@ -141,9 +142,27 @@ def _load_component_spec_from_url(url: str, auth=None):
     url = _fix_component_uri(url)
 
     import requests
-    resp = requests.get(url, auth=auth)
+    # Revalidating the component cached for the URL, if any.
+    url_info = component_spec_cache.try_get_url_info(url)
+    if url_info is not None:
+        resp = requests.get(
+            url, auth=auth, headers={'If-None-Match': url_info.etag})
+        if resp.status_code == requests.codes.not_modified:
+            component_spec = component_spec_cache.try_get_component_spec(
+                url_info.digest)
+            if component_spec is not None:
+                return _post_process_loaded_component_spec(
+                    component_spec, url_info.digest)
+            # Evicted from the cache in the meantime
+            resp = requests.get(url, auth=auth)
+    else:
+        resp = requests.get(url, auth=auth)
     resp.raise_for_status()
-    return _load_component_spec_from_yaml_or_zip_bytes(resp.content)
+    component_spec = _load_component_spec_from_yaml_or_zip_bytes(resp.content)
+    etag = resp.headers.get('ETag')
+    if etag:
+        component_spec_cache.store_url_info(url, etag, component_spec._digest)
+    return component_spec
 
 
 _COMPONENT_FILE_NAME_IN_ARCHIVE = 'component.yaml'
@@ -166,9 +185,19 @@ def _load_component_spec_from_yaml_or_zip_bytes(data: bytes):
 
 
 def _load_component_spec_from_component_text(text) -> ComponentSpec:
-    component_dict = load_yaml(text)
-    component_spec = ComponentSpec.from_dict(component_dict)
+    # Calculating hash digest for the component
+    import hashlib
+    data = text if isinstance(text, bytes) else text.encode('utf-8')
+    data = data.replace(b'\r\n', b'\n')  # Normalizing line endings
+    digest = hashlib.sha256(data).hexdigest()
+
+    component_spec = component_spec_cache.get_component_spec(
+        digest, lambda: load_yaml(text))
+    return _post_process_loaded_component_spec(component_spec, digest)
 
+
+def _post_process_loaded_component_spec(component_spec: ComponentSpec,
+                                        digest: str) -> ComponentSpec:
     if isinstance(component_spec.implementation, ContainerImplementation) and (
             component_spec.implementation.container.command is None):
         warnings.warn(
@@ -179,13 +208,7 @@ def _load_component_spec_from_component_text(text) -> ComponentSpec:
             category=FutureWarning,
         )
 
-    # Calculating hash digest for the component
-    import hashlib
-    data = text if isinstance(text, bytes) else text.encode('utf-8')
-    data = data.replace(b'\r\n', b'\n')  # Normalizing line endings
-    digest = hashlib.sha256(data).hexdigest()
     component_spec._digest = digest
-
     return component_spec
 
 
@@ -17,6 +17,7 @@ __all__ = [
     'get_canonical_type_for_type_name',
     'get_deserializer_code_for_type_name',
     'get_serializer_func_for_type_name',
+    'is_file_type_name',
 ]
 
 import inspect
@@ -33,6 +34,19 @@ Converter = NamedTuple('Converter', [
     ('definitions', str),
 ])
 
+# Converter of the large values, which are written to and read from files
+# instead of being serialized to strings. The serializer writes a value to
+# the path it is passed and the deserializer reads the value from a path.
+# The types are given by their qualified names, since they can belong to
+# optional packages.
+FileConverter = NamedTuple('FileConverter', [
+    ('type_qualnames', Sequence[str]),
+    ('type_names', Sequence[str]),
+    ('serializer', Callable[[Any, str], None]),
+    ('deserializer_code', str),
+    ('definitions', str),
+])
+
 
 def _serialize_str(str_value: str) -> str:
     if not isinstance(str_value, str):
@@ -111,6 +125,48 @@ _deserialize_base64_pickle_definitions = inspect.getsource(
     _deserialize_base64_pickle)
 _deserialize_base64_pickle_code = _deserialize_base64_pickle.__name__
 
+
+def _serialize_bytes_to_file(bytes_value, path: str) -> None:
+    if not isinstance(bytes_value, (bytes, bytearray, memoryview)):
+        raise TypeError('Value "{}" has type "{}" instead of bytes.'.format(
+            str(bytes_value)[:100], str(type(bytes_value))))
+    with open(path, 'wb') as f:
+        f.write(bytes_value)
+
+
+def _deserialize_bytes_from_file(path: str) -> bytes:
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def _serialize_numpy_array_to_file(array, path: str) -> None:
+    import numpy
+    # Writes the .npy format to the opened file, since numpy.save adds the
+    # .npy extension to the paths. Contiguous arrays are written without
+    # copying their data.
+    with open(path, 'wb') as f:
+        numpy.save(f, numpy.asanyarray(array), allow_pickle=False)
+
+
+def _deserialize_numpy_array_from_file(path: str):
+    import numpy
+    return numpy.load(path, allow_pickle=False)
+
+
+def _serialize_pandas_data_frame_to_file(data_frame, path: str) -> None:
+    data_frame.to_parquet(path)
+
+
+def _deserialize_pandas_data_frame_from_file(path: str):
+    import pandas
+    return pandas.read_parquet(path)
+
+
+def _get_file_converter(type_qualnames, type_names, serializer, deserializer):
+    return FileConverter(type_qualnames, type_names, serializer,
+                         deserializer.__name__, inspect.getsource(deserializer))
+
+
 _converters = [
     Converter([str], ['String', 'str'], _serialize_str, 'str', None),
     Converter([int], ['Integer', 'int'], _serialize_int, 'int', None),
@@ -131,6 +187,18 @@ _converters = [
               _deserialize_base64_pickle_definitions),
 ]
 
+_file_converters = [
+    _get_file_converter(['builtins.bytes'], ['Bytes', 'bytes'],
+                        _serialize_bytes_to_file, _deserialize_bytes_from_file),
+    _get_file_converter(['numpy.ndarray'], ['NumpyArray', 'ndarray'],
+                        _serialize_numpy_array_to_file,
+                        _deserialize_numpy_array_from_file),
+    _get_file_converter(['pandas.core.frame.DataFrame'],
+                        ['ApacheParquet', 'DataFrame'],
+                        _serialize_pandas_data_frame_to_file,
+                        _deserialize_pandas_data_frame_from_file),
+]
+
 type_to_type_name = {
     typ: converter.type_names[0] for converter in _converters
     for typ in converter.types
@@ -152,6 +220,18 @@ type_name_to_serializer = {
     type_name: converter.serializer for converter in _converters
     for type_name in converter.type_names
 }
+type_qualname_to_type_name = {
+    type_qualname: converter.type_names[0] for converter in _file_converters
+    for type_qualname in converter.type_qualnames
+}
+type_name_to_file_deserializer = {
+    type_name: (converter.deserializer_code, converter.definitions)
+    for converter in _file_converters for type_name in converter.type_names
+}
+type_name_to_file_serializer = {
+    type_name: converter.serializer for converter in _file_converters
+    for type_name in converter.type_names
+}
 
 
 def get_canonical_type_name_for_type(typ: Type) -> str:
@@ -164,9 +244,13 @@ def get_canonical_type_name_for_type(typ: Type) -> str:
         The canonical name of the type found.
     """
     try:
-        return type_to_type_name.get(typ, None)
+        type_name = type_to_type_name.get(typ, None)
     except:
         return None
+    if type_name is None and isinstance(typ, type):
+        type_name = type_qualname_to_type_name.get('{}.{}'.format(
+            typ.__module__, typ.__qualname__))
+    return type_name
 
 
 def get_canonical_type_for_type_name(type_name: str) -> Optional[Type]:
@@ -191,11 +275,15 @@ def get_deserializer_code_for_type_name(type_name: str) -> Optional[str]:
         type_name: The type name to search for.
 
     Returns:
-        The deserializer code needed to deserialize the type.
+        The deserializer code needed to deserialize the type. For the file
+        types, see is_file_type_name, the code reads a value from the path it
+        is passed.
     """
     try:
+        short_type_name = type_annotation_utils.get_short_type_name(type_name)
         return type_name_to_deserializer.get(
-            type_annotation_utils.get_short_type_name(type_name), None)
+            short_type_name, None) or type_name_to_file_deserializer.get(
+                short_type_name, None)
     except:
         return None
 
@@ -207,15 +295,39 @@ def get_serializer_func_for_type_name(type_name: str) -> Optional[Callable]:
         type_name: The type name to search for.
 
     Returns:
-        The serializer func needed to serialize the type.
+        The serializer func needed to serialize the type. For the file types,
+        see is_file_type_name, the func writes a value to the path it is
+        passed instead of returning a string.
     """
     try:
+        short_type_name = type_annotation_utils.get_short_type_name(type_name)
         return type_name_to_serializer.get(
-            type_annotation_utils.get_short_type_name(type_name), None)
+            short_type_name, None) or type_name_to_file_serializer.get(
+                short_type_name, None)
     except:
         return None
 
 
+def is_file_type_name(type_name: str) -> bool:
+    """Checks whether the values of a type are passed as files.
+
+    The values of the file types, e.g. bytes, numpy arrays and pandas data
+    frames, are written to and read from files in a binary format, without
+    serializing them to strings.
+
+    Args:
+        type_name: The type name to check.
+
+    Returns:
+        Whether the type is a file type.
+    """
+    try:
+        return type_annotation_utils.get_short_type_name(
+            type_name) in type_name_to_file_serializer
+    except:
+        return False
+
+
 def serialize_value(value, type_name: str) -> str:
     """serialize_value converts the passed value to string based on the
     serializer associated with the passed type_name."""
@@ -248,5 +360,10 @@ def serialize_value(value, type_name: str) -> str:
                     str(e),
                 ))
 
+    if is_file_type_name(type_name):
+        raise TypeError(
+            'The values of type "{}" are passed as files and cannot be '
+            'serialized to strings.'.format(str(type_name)))
+
     raise TypeError('There are no registered serializers for type "{}".'.format(
         str(type_name),))
@@ -30,7 +30,7 @@ __all__ = [
 
 from ._yaml_utils import dump_yaml
 from ._components import _create_task_factory_from_component_spec
-from ._data_passing import serialize_value, get_deserializer_code_for_type_name, get_serializer_func_for_type_name, get_canonical_type_name_for_type
+from ._data_passing import serialize_value, get_deserializer_code_for_type_name, get_serializer_func_for_type_name, get_canonical_type_name_for_type, is_file_type_name
 from ._naming import _make_name_unique_by_adding_index
 from .structures import *
 from . import _structures as structures
@@ -142,6 +142,26 @@ def _make_parent_dirs_and_return_path(file_path: str):
     return file_path
 
 
+def _write_output_items(items, output_file: str, serializer) -> None:
+    """Writes the items of an iterator output as they are produced.
+
+    The bytes items are written as is, and the other items serialized one
+    per line. The file is flushed at least every second, so that the
+    consumers reading it can start before the last items are produced.
+    """
+    import time
+    with open(output_file, 'wb') as f:
+        last_flush_time = time.monotonic()
+        for item in items:
+            if serializer is None:
+                f.write(item)
+            else:
+                f.write(serializer(item).encode('utf-8') + b'\n')
+            if time.monotonic() - last_flush_time >= 1:
+                f.flush()
+                last_flush_time = time.monotonic()
+
+
 def _parent_dirs_maker_that_returns_open_file(mode: str, encoding: str = None):
 
     def make_parent_dirs_and_return_path(file_path: str):
@@ -364,6 +384,27 @@ def _extract_component_interface(func: Callable) -> ComponentSpec:
             return type_struct
         return type_name
 
+    def make_output_spec(name: str, annotation) -> OutputSpec:
+        item_annotation = type_annotation_utils.get_iterator_item_annotation(
+            annotation)
+        if item_annotation is None:
+            return OutputSpec(
+                name=name, type=annotation_to_type_struct(annotation))
+        # The items of iterator outputs are streamed to the output files: the
+        # bytes are concatenated, and the other items written one per line.
+        item_type_struct = annotation_to_type_struct(item_annotation)
+        if item_type_struct not in ('Bytes', 'String'):
+            item_serializer = get_serializer_func_for_type_name(
+                item_type_struct)
+            if item_serializer is None or is_file_type_name(item_type_struct):
+                item_type_struct = 'Json'
+        output_spec = OutputSpec(
+            name=name,
+            type=item_type_struct
+            if item_type_struct in ('Bytes', 'String') else 'JsonLines')
+        output_spec._streamed_item_type = item_type_struct
+        return output_spec
+
     input_names = set()
     output_names = set()
     for parameter in parameters:
@@ -446,18 +487,14 @@ def _extract_component_interface(func: Callable) -> ComponentSpec:
                                     '__annotations__', None) or getattr(
                                         return_ann, '_field_types', None)
         for field_name in return_ann._fields:
-            type_struct = None
+            field_annotation = None
             if field_annotations:
-                type_struct = annotation_to_type_struct(
-                    field_annotations.get(field_name, None))
+                field_annotation = field_annotations.get(field_name, None)
 
             output_name = _make_name_unique_by_adding_index(
                 field_name, output_names, '_')
             output_names.add(output_name)
-            output_spec = OutputSpec(
-                name=output_name,
-                type=type_struct,
-            )
+            output_spec = make_output_spec(output_name, field_annotation)
             output_spec._passing_style = None
             output_spec._return_tuple_field_name = field_name
             outputs.append(output_spec)
@@ -480,11 +517,7 @@ def _extract_component_interface(func: Callable) -> ComponentSpec:
             single_output_name_const, output_names, '_'
         )  # Fixes exotic, but possible collision: `def func(output_path: OutputPath()) -> str: ...`
         output_names.add(output_name)
-        type_struct = annotation_to_type_struct(signature.return_annotation)
-        output_spec = OutputSpec(
-            name=output_name,
-            type=type_struct,
-        )
+        output_spec = make_output_spec(output_name, signature.return_annotation)
         output_spec._passing_style = None
         outputs.append(output_spec)
 
@@ -650,7 +683,8 @@ def _func_to_component_spec(func,
 
         if input._passing_style in [
                 InputPath, InputTextFile, InputBinaryFile, InputArtifact
-        ]:
+        ] or (input._passing_style is None and is_file_type_name(input.type)):
+            # The deserializers of the file types read the values from paths.
             arguments_for_input = [param_flag, InputPathPlaceholder(input.name)]
         elif input._passing_style in [
                 OutputPath, OutputTextFile, OutputBinaryFile, OutputArtifact
@@ -689,8 +723,17 @@ def _func_to_component_spec(func,
 
     output_serialization_expression_strings = []
     for output in outputs_passed_through_func_return_tuple:
-        serializer_call_str = get_serializer_and_register_definitions(
-            output.type)
+        if not hasattr(output, '_streamed_item_type'):
+            serializer_call_str = get_serializer_and_register_definitions(
+                output.type)
+        elif output._streamed_item_type == 'Bytes':
+            # The bytes are written as is.
+            serializer_call_str = 'None'
+        else:
+            serializer_call_str = get_serializer_and_register_definitions(
+                output._streamed_item_type)
+        if hasattr(output, '_streamed_item_type'):
+            definitions.add(inspect.getsource(_write_output_items))
         output_serialization_expression_strings.append(serializer_call_str)
 
     pre_func_code = '\n'.join(list(pre_func_definitions))
@@ -715,25 +758,58 @@ def _func_to_component_spec(func,
     output_serialization_code = ''.join(
         '    {},\n'.format(s) for s in output_serialization_expression_strings)
 
+    # The items of the iterator outputs are written as they are produced.
+    streamed_output_indices = [
+        idx
+        for idx, output in enumerate(outputs_passed_through_func_return_tuple)
+        if hasattr(output, '_streamed_item_type')
+    ]
+    # The serializers of the file types write the values to the output files.
+    file_output_indices = [
+        idx
+        for idx, output in enumerate(outputs_passed_through_func_return_tuple)
+        if is_file_type_name(output.type) and idx not in streamed_output_indices
+    ]
+    file_output_indices_code = ''
+    file_output_handling_code = ''
+    if streamed_output_indices:
+        file_output_indices_code += '''
+_streamed_output_indices = {{{}}}'''.format(', '.join(
+            str(idx) for idx in streamed_output_indices))
+        file_output_handling_code += '''
+    if idx in _streamed_output_indices:
+        {}(_outputs[idx], output_file, _output_serializers[idx])
+        continue'''.format(_write_output_items.__name__)
+    if file_output_indices:
+        file_output_indices_code += '''
+_file_output_indices = {{{}}}'''.format(', '.join(
+            str(idx) for idx in file_output_indices))
+        file_output_handling_code += '''
+    if idx in _file_output_indices:
+        _output_serializers[idx](_outputs[idx], output_file)
+        continue'''
+
     full_output_handling_code = '''
 
 {outputs_to_list_code}
 
 _output_serializers = [
 {output_serialization_code}
-]
+]{file_output_indices_code}
 
 import os
 for idx, output_file in enumerate(_output_files):
     try:
         os.makedirs(os.path.dirname(output_file))
     except OSError:
-        pass
+        pass{file_output_handling_code}
     with open(output_file, 'w') as f:
         f.write(_output_serializers[idx](_outputs[idx]))
 '''.format(
         output_serialization_code=output_serialization_code,
         outputs_to_list_code=outputs_to_list_code,
+        file_output_indices_code=file_output_indices_code,
+        file_output_handling_code=file_output_handling_code,
     )
 
     full_source = \
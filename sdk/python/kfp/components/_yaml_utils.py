@@ -15,57 +15,84 @@ import yaml
 from collections import OrderedDict
 
 
-def load_yaml(stream):
-    #!!! Yaml should only be loaded using this function. Otherwise the dict ordering may be broken in Python versions prior to 3.6
+def _create_ordered_loader(loader_class):
     #See https://stackoverflow.com/questions/5121931/in-python-how-can-you-load-yaml-mappings-as-ordereddicts/21912744#21912744
 
-    def ordered_load(stream,
-                     Loader=yaml.SafeLoader,
-                     object_pairs_hook=OrderedDict):
-
-        class OrderedLoader(Loader):
-            pass
+    class OrderedLoader(loader_class):
+        pass
 
-        def construct_mapping(loader, node):
-            loader.flatten_mapping(node)
-            return object_pairs_hook(loader.construct_pairs(node))
+    def construct_mapping(loader, node):
+        loader.flatten_mapping(node)
+        return OrderedDict(loader.construct_pairs(node))
 
-        OrderedLoader.add_constructor(
-            yaml.resolver.BaseResolver.DEFAULT_MAPPING_TAG, construct_mapping)
-        return yaml.load(stream, OrderedLoader)
+    OrderedLoader.add_constructor(
+        yaml.resolver.BaseResolver.DEFAULT_MAPPING_TAG, construct_mapping)
+    return OrderedLoader
 
-    return ordered_load(stream)
-
-
-def dump_yaml(data):
-    #See https://stackoverflow.com/questions/5121931/in-python-how-can-you-load-yaml-mappings-as-ordereddicts/21912744#21912744
 
-    def ordered_dump(data, stream=None, Dumper=yaml.Dumper, **kwds):
+# The libyaml based loader is used when PyYAML was built with it.
+_OrderedLoader = _create_ordered_loader(
+    yaml.CSafeLoader if getattr(yaml, '__with_libyaml__', False) else yaml
+    .SafeLoader)
 
-        class OrderedDumper(Dumper):
-            pass
 
-        def _dict_representer(dumper, data):
-            return dumper.represent_mapping(
-                yaml.resolver.BaseResolver.DEFAULT_MAPPING_TAG, data.items())
-
-        OrderedDumper.add_representer(OrderedDict, _dict_representer)
-        OrderedDumper.add_representer(dict, _dict_representer)
-
-        #Hack to force the code (multi-line string) to be output using the '|' style.
-        def represent_str_or_text(self, data):
-            style = None
-            if data.find('\n') >= 0:  #Multiple lines
-                #print('Switching style for multiline text:' + data)
-                style = '|'
-            if data.lower() in [
-                    'y', 'n', 'yes', 'no', 'true', 'false', 'on', 'off'
-            ]:
-                style = '"'
-            return self.represent_scalar(u'tag:yaml.org,2002:str', data, style)
+def load_yaml(stream):
+    #!!! Yaml should only be loaded using this function. Otherwise the dict ordering may be broken in Python versions prior to 3.6
+    return yaml.load(stream, _OrderedLoader)
 
-        OrderedDumper.add_representer(str, represent_str_or_text)
 
-        return yaml.dump(data, stream, OrderedDumper, **kwds)
+def _create_ordered_dumper(dumper_class):
+    #See https://stackoverflow.com/questions/5121931/in-python-how-can-you-load-yaml-mappings-as-ordereddicts/21912744#21912744
 
-    return ordered_dump(data, default_flow_style=None)
+    class OrderedDumper(dumper_class):
+        pass
+
+    def _dict_representer(dumper, data):
+        return dumper.represent_mapping(
+            yaml.resolver.BaseResolver.DEFAULT_MAPPING_TAG, data.items())
+
+    OrderedDumper.add_representer(OrderedDict, _dict_representer)
+    OrderedDumper.add_representer(dict, _dict_representer)
+
+    #Hack to force the code (multi-line string) to be output using the '|' style.
+    def represent_str_or_text(self, data):
+        style = None
+        if data.find('\n') >= 0:  #Multiple lines
+            #print('Switching style for multiline text:' + data)
+            style = '|'
+        if data.lower() in [
+                'y', 'n', 'yes', 'no', 'true', 'false', 'on', 'off'
+        ]:
+            style = '"'
+        return self.represent_scalar(u'tag:yaml.org,2002:str', data, style)
+
+    OrderedDumper.add_representer(str, represent_str_or_text)
+    return OrderedDumper
+
+
+_OrderedDumper = _create_ordered_dumper(yaml.Dumper)
+# The libyaml emitter is only available when PyYAML was built with it.
+_OrderedCDumper = (
+    _create_ordered_dumper(yaml.CDumper)
+    if getattr(yaml, '__with_libyaml__', False) else None)
+
+
+def dump_yaml(data, stream=None, use_libyaml: bool = False):
+    """Dumps data to YAML, keeping the order of the dicts.
+
+    Args:
+      data: The data to dump.
+      stream: The text stream to write the YAML to. If not specified, the
+        YAML text is returned.
+      use_libyaml: Whether to use the libyaml emitter, which is faster.
+        Ignored when PyYAML was built without libyaml. The output loads to the
+        same data, and is byte-identical for the plain, quoted and block
+        strings of the compiled workflows. Long double-quoted strings, i.e.
+        strings with special characters, are folded differently: the pure
+        Python emitter escapes the space at each line break, libyaml does
+        not.
+    """
+    dumper = _OrderedDumper
+    if use_libyaml and _OrderedCDumper is not None:
+        dumper = _OrderedCDumper
+    return yaml.dump(data, stream, dumper, default_flow_style=None)
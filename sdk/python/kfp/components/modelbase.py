@@ -17,6 +17,7 @@ __all__ = [
 ]
 
 import inspect
+import threading
 from collections import abc, OrderedDict
 from typing import Any, Callable, Dict, List, Mapping, MutableMapping, MutableSequence, Optional, Sequence, Tuple, Type, TypeVar, Union, cast, get_type_hints
 
@@ -255,9 +256,9 @@ def convert_object_to_struct(obj, serialized_names: Mapping[str, str] = {}):
     type of some property is a class that has .to_dict class method,
     that method is used for conversion. Used by the ModelBase class.
     """
-    signature = inspect.signature(obj.__init__)  #Needed for default values
+    parameters = _get_init_parameters(obj)  #Needed for default values
     result = {}
-    for python_name in signature.parameters:  #TODO: Make it possible to specify the field ordering regardless of the presence of default values
+    for python_name in parameters:  #TODO: Make it possible to specify the field ordering regardless of the presence of default values
         value = getattr(obj, python_name)
         if python_name.startswith('_'):
             continue
@@ -274,7 +275,7 @@ def convert_object_to_struct(obj, serialized_names: Mapping[str, str] = {}):
                 for k, v in value.items()
             }
         else:
-            param = signature.parameters.get(python_name, None)
+            param = parameters.get(python_name, None)
             if param is None or param.default == inspect.Parameter.empty or value != param.default:
                 result[attr_name] = value
 
@@ -320,6 +321,299 @@ def parse_object_from_struct_based_on_class_init(
     return cls(**args)
 
 
+# Sentinel returned by the compiled parsers when a structure does not match a
+# type. Parsing errors are reported by parse_object_from_struct_based_on_type,
+# which is slower but builds detailed messages.
+_NO_MATCH = object()
+
+_SEQUENCE_TYPES = [
+    list, List, abc.Sequence, abc.MutableSequence, Sequence, MutableSequence
+]
+_MAPPING_TYPES = [
+    dict, Dict, abc.Mapping, abc.MutableMapping, Mapping, MutableMapping,
+    OrderedDict
+]
+
+_init_parameters_cache = {}
+_class_schemas = {}
+_type_checks = {}
+_struct_parsers = {}
+
+# Structures parsed with validate=False skip the type verification of the
+# ModelBase constructor.
+_validation_state = threading.local()
+
+
+def _get_init_parameters(obj) -> Mapping[str, inspect.Parameter]:
+    cls = type(obj)
+    parameters = _init_parameters_cache.get(cls)
+    if parameters is None:
+        parameters = inspect.signature(obj.__init__).parameters
+        _init_parameters_cache[cls] = parameters
+    return parameters
+
+
+def _get_generic_type_args(typ) -> tuple:
+    # In Python 3.9 typ.__args__ does not exist when the generic type does not have subscripts
+    args = getattr(typ, '__args__', None)
+    return args if args is not None else (Any, Any)
+
+
+def _memoize_by_type(cache: dict, key, build: Callable):
+    try:
+        value = cache.get(key)
+    except TypeError:  # Unhashable type annotation
+        return build()
+    if value is None:
+        value = build()
+        cache[key] = value
+    return value
+
+
+def _get_type_check(typ) -> Callable[[Any], bool]:
+    """Gets a function returning whether verify_object_against_type accepts
+    an object for the specified type."""
+    return _memoize_by_type(_type_checks, typ, lambda: _compile_type_check(typ))
+
+
+def _compile_type_check(typ) -> Callable[[Any], bool]:
+    if typ is type(None):
+        return lambda x: x is None
+
+    if typ is Any or type(typ) is TypeVar:
+        return lambda x: True
+
+    try:  #isinstance can fail for generics
+        isinstance(None, typ)
+
+        def check_instance(x):
+            try:
+                return isinstance(x, typ)
+            except:
+                return False
+    except:
+        check_instance = lambda x: False
+
+    if not hasattr(typ, '__origin__'):
+        return check_instance
+
+    if typ.__origin__ is Union:
+        possible_types = typ.__args__
+        # Resolving the checks lazily, since recursive types are possible.
+        checks = []
+
+        def check_union(x):
+            if not checks:
+                checks.extend(
+                    _get_type_check(possible_type)
+                    for possible_type in possible_types)
+            return any(check(x) for check in checks)
+
+        return check_union
+
+    generic_type = typ.__origin__ or getattr(typ, '__extra__', None)
+    if generic_type in _SEQUENCE_TYPES:
+        inner_type = _get_generic_type_args(typ)[0]
+
+        def check_sequence(x):
+            if check_instance(x):
+                return True
+            if x is None or type(x) is str or not isinstance(x, generic_type):
+                return False
+            check = _get_type_check(inner_type)
+            return all(check(item) for item in x)
+
+        return check_sequence
+
+    if generic_type in _MAPPING_TYPES:
+        inner_key_type, inner_value_type = _get_generic_type_args(typ)[:2]
+
+        def check_mapping(x):
+            if check_instance(x):
+                return True
+            if x is None or not isinstance(x, generic_type):
+                return False
+            check_key = _get_type_check(inner_key_type)
+            check_value = _get_type_check(inner_value_type)
+            return all(check_key(k) and check_value(v) for k, v in x.items())
+
+        return check_mapping
+
+    return check_instance
+
+
+def _get_struct_parser(typ, validate: bool) -> Callable[[Any], Any]:
+    """Gets a function constructing an object from structure based on type,
+    like parse_object_from_struct_based_on_type.
+
+    The function returns _NO_MATCH when the structure is incompatible with
+    the type. Without validation, the first type of a Union which the
+    structure can be parsed to is used, instead of checking that the
+    structure is not ambiguous.
+    """
+    return _memoize_by_type(_struct_parsers, (typ, validate),
+                            lambda: _compile_struct_parser(typ, validate))
+
+
+def _compile_struct_parser(typ, validate: bool) -> Callable[[Any], Any]:
+    if typ is type(None):
+        return lambda struct: None if struct is None else _NO_MATCH
+
+    if typ is Any or type(typ) is TypeVar:
+        return lambda struct: struct
+
+    if hasattr(typ, 'from_dict'):
+        if isinstance(typ, type) and issubclass(
+                typ, ModelBase) and typ.from_dict.__func__ is _from_dict:
+
+            def parse_model(struct):
+                if type(struct) is typ:
+                    return struct
+                return _parse_model_from_struct(typ, struct, validate)
+
+            return parse_model
+
+        def parse_with_from_dict(struct):
+            if type(struct) is typ:
+                return struct
+            try:
+                return typ.from_dict(struct)
+            except Exception:
+                return _NO_MATCH
+
+        return parse_with_from_dict
+
+    if not hasattr(typ, '__origin__'):
+        return lambda struct: struct if type(struct) is typ else _NO_MATCH
+
+    if typ.__origin__ is Union:
+        possible_types = list(getattr(typ, '__args__', [Any]))
+        if int in possible_types:
+            possible_types = possible_types + [bool]
+        # Same type parsed once, like the results of the slow parser.
+        possible_types = list(OrderedDict.fromkeys(possible_types))
+        parsers = []
+
+        def parse_union(struct):
+            if not parsers:
+                parsers.extend(
+                    _get_struct_parser(possible_type, validate)
+                    for possible_type in possible_types)
+            result = _NO_MATCH
+            for parser in parsers:
+                obj = parser(struct)
+                if obj is not _NO_MATCH:
+                    if not validate:
+                        return obj
+                    if result is not _NO_MATCH:  # Ambiguous structure
+                        return _NO_MATCH
+                    result = obj
+            return result
+
+        return parse_union
+
+    generic_type = typ.__origin__ or getattr(typ, '__extra__', None)
+    if generic_type in _SEQUENCE_TYPES:
+        inner_type = _get_generic_type_args(typ)[0]
+
+        def parse_sequence(struct):
+            if struct is None or type(struct) is str or not isinstance(
+                    struct, generic_type):
+                return _NO_MATCH
+            parse_item = _get_struct_parser(inner_type, validate)
+            result = []
+            for item in struct:
+                obj = parse_item(item)
+                if obj is _NO_MATCH:
+                    return _NO_MATCH
+                result.append(obj)
+            return result
+
+        return parse_sequence
+
+    if generic_type in _MAPPING_TYPES:
+        inner_key_type, inner_value_type = _get_generic_type_args(typ)[:2]
+
+        def parse_mapping(struct):
+            if struct is None or not isinstance(struct, generic_type):
+                return _NO_MATCH
+            parse_key = _get_struct_parser(inner_key_type, validate)
+            parse_value = _get_struct_parser(inner_value_type, validate)
+            result = {}
+            for k, v in struct.items():
+                key = parse_key(k)
+                value = parse_value(v)
+                if key is _NO_MATCH or value is _NO_MATCH:
+                    return _NO_MATCH
+                result[key] = value
+            return result
+
+        return parse_mapping
+
+    return lambda struct: struct if type(struct) is typ else _NO_MATCH
+
+
+class _ClassSchema:
+    """Type hints and field names of a ModelBase class, resolved once."""
+
+    def __init__(self, cls: type):
+        self.parameter_types = get_type_hints(
+            cls.__init__)  #Properlty resolves forward references
+        self.parameter_checks = {
+            name: _get_type_check(parameter_type)
+            for name, parameter_type in self.parameter_types.items()
+        }
+        parameters = list(inspect.signature(cls.__init__).parameters.values())
+        # The first parameter is self.
+        self.field_names = {parameter.name for parameter in parameters[1:]}
+        self.accepts_any_argument = any(
+            parameter.kind == inspect.Parameter.VAR_KEYWORD
+            for parameter in parameters)
+
+        serialized_names = cls._serialized_names
+        self.serialized_names_to_pythonic = {
+            v: k for k, v in serialized_names.items()
+        }
+        self.forbidden_struct_keys = set(
+            self.serialized_names_to_pythonic.values()).difference(
+                self.serialized_names_to_pythonic.keys())
+
+
+def _get_class_schema(cls: type) -> _ClassSchema:
+    schema = _class_schemas.get(cls)
+    if schema is None:
+        schema = _ClassSchema(cls)
+        _class_schemas[cls] = schema
+    return schema
+
+
+def _parse_model_from_struct(cls: type, struct: Any, validate: bool) -> Any:
+    """Fast version of parse_object_from_struct_based_on_class_init, which
+    returns _NO_MATCH instead of raising errors."""
+    if not isinstance(struct, abc.Mapping):
+        return _NO_MATCH
+    schema = _get_class_schema(cls)
+    args = {}
+    for original_name, value in struct.items():
+        if original_name in schema.forbidden_struct_keys:
+            return _NO_MATCH
+        python_name = schema.serialized_names_to_pythonic.get(
+            original_name, original_name)
+        if python_name not in schema.field_names and not schema.accepts_any_argument:
+            return _NO_MATCH
+        param_type = schema.parameter_types.get(python_name, None)
+        if param_type is not None:
+            value = _get_struct_parser(param_type, validate)(value)
+            if value is _NO_MATCH:
+                return _NO_MATCH
+        args[python_name] = value
+
+    try:
+        return cls(**args)
+    except Exception:
+        return _NO_MATCH
+
+
 class ModelBase:
     """Base class for types that can be converted to JSON-like dict structures
     or constructed from such structures. The object fields, their types and
@@ -350,34 +644,57 @@ class ModelBase:
     _serialized_names = {}
 
     def __init__(self, args):
-        parameter_types = get_type_hints(self.__class__.__init__)
         field_values = {
             k: v
             for k, v in args.items()
             if k != 'self' and not k.startswith('_')
         }
-        for k, v in field_values.items():
-            parameter_type = parameter_types.get(k, None)
-            if parameter_type is not None:
-                try:
-                    verify_object_against_type(v, parameter_type)
-                except Exception as e:
-                    raise TypeError(
-                        'Argument for {} is not compatible with type "{}". Exception: {}'
-                        .format(k, parameter_type, e))
+        if not getattr(_validation_state, 'disabled', False):
+            schema = _get_class_schema(self.__class__)
+            for k, v in field_values.items():
+                check = schema.parameter_checks.get(k, None)
+                if check is not None and not check(v):
+                    parameter_type = schema.parameter_types[k]
+                    try:
+                        verify_object_against_type(v, parameter_type)
+                    except Exception as e:
+                        raise TypeError(
+                            'Argument for {} is not compatible with type "{}". Exception: {}'
+                            .format(k, parameter_type, e))
         self.__dict__.update(field_values)
 
     @classmethod
-    def from_dict(cls: Type[T], struct: Mapping) -> T:
-        return parse_object_from_struct_based_on_class_init(
-            cls, struct, serialized_names=cls._serialized_names)
+    def from_dict(cls: Type[T], struct: Mapping, validate: bool = True) -> T:
+        """Constructs an object from structure.
+
+        Args:
+          struct: The structure, usually loaded from JSON or YAML.
+          validate: Whether to verify the types of the objects constructed
+            from the structure and check that it is not ambiguous. Can be
+            disabled for trusted structures which have already been
+            validated, e.g. produced by to_dict.
+        """
+        if validate:
+            obj = _parse_model_from_struct(cls, struct, validate=True)
+        else:
+            previously_disabled = getattr(_validation_state, 'disabled', False)
+            _validation_state.disabled = True
+            try:
+                obj = _parse_model_from_struct(cls, struct, validate=False)
+            finally:
+                _validation_state.disabled = previously_disabled
+        if obj is _NO_MATCH:
+            # Reports the error
+            obj = parse_object_from_struct_based_on_class_init(
+                cls, struct, serialized_names=cls._serialized_names)
+        return obj
 
     def to_dict(self) -> Mapping:
         return convert_object_to_struct(
             self, serialized_names=self._serialized_names)
 
     def _get_field_names(self):
-        return list(inspect.signature(self.__init__).parameters)
+        return list(_get_init_parameters(self))
 
     def __repr__(self):
         return self.__class__.__name__ + '(' + ', '.join(
@@ -394,3 +711,6 @@ class ModelBase:
 
     def __hash__(self):
         return hash(repr(self))
+
+
+_from_dict = ModelBase.from_dict.__func__
@@ -13,11 +13,23 @@
 # limitations under the License.
 """Utilities for handling Python type annotation."""
 
+import collections.abc
 import re
-from typing import TypeVar, Union
+import typing
+from typing import Any, Optional, TypeVar, Union
 
 T = TypeVar('T')
 
+_ITERATOR_ORIGINS = (
+    collections.abc.Iterator,
+    collections.abc.Iterable,
+    collections.abc.Generator,
+    # The origins of the annotations in python 3.6.
+    typing.Iterator,
+    typing.Iterable,
+    typing.Generator,
+)
+
 
 def maybe_strip_optional_from_annotation(annotation: T) -> T:
     """Strips 'Optional' from 'Optional[<type>]' if applicable.
@@ -40,6 +52,31 @@ def maybe_strip_optional_from_annotation(annotation: T) -> T:
     return annotation
 
 
+def get_iterator_item_annotation(annotation: Any) -> Optional[Any]:
+    """Gets the type of the items of an iterator type annotation.
+
+    For example::
+      Iterator[str] -> str
+      Iterable[Dict[str, int]] -> Dict[str, int]
+      Generator[bytes, None, None] -> bytes
+      Iterator -> Any
+      List[str] -> None
+
+    Args:
+      annotation: The type annotation.
+
+    Returns:
+      The type of the items if the annotation is Iterator, Iterable or
+      Generator, otherwise None.
+    """
+    if getattr(annotation, '__origin__', None) not in _ITERATOR_ORIGINS:
+        return None
+    args = getattr(annotation, '__args__', None)
+    if not args or isinstance(args[0], TypeVar):
+        return Any
+    return args[0]
+
+
 def get_short_type_name(type_name: str) -> str:
     """Extracts the short form type name.
 
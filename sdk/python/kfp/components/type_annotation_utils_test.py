@@ -15,7 +15,7 @@
 
 import unittest
 from absl.testing import parameterized
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Generator, Iterable, Iterator, List, Optional
 
 from kfp.components import type_annotation_utils
 
@@ -55,6 +55,38 @@ class TypeAnnotationUtilsTest(parameterized.TestCase):
             type_annotation_utils.maybe_strip_optional_from_annotation(
                 original_annotation))
 
+    @parameterized.parameters(
+        {
+            'annotation': Iterator[str],
+            'expected_item_annotation': str,
+        },
+        {
+            'annotation': Iterable[Dict[str, int]],
+            'expected_item_annotation': Dict[str, int],
+        },
+        {
+            'annotation': Generator[bytes, None, None],
+            'expected_item_annotation': bytes,
+        },
+        {
+            'annotation': Iterator,
+            'expected_item_annotation': Any,
+        },
+        {
+            'annotation': List[str],
+            'expected_item_annotation': None,
+        },
+        {
+            'annotation': str,
+            'expected_item_annotation': None,
+        },
+    )
+    def test_get_iterator_item_annotation(self, annotation,
+                                          expected_item_annotation):
+        self.assertEqual(
+            expected_item_annotation,
+            type_annotation_utils.get_iterator_item_annotation(annotation))
+
     @parameterized.parameters(
         {
             'original_type_name': 'str',
@@ -0,0 +1,150 @@
+# Copyright 2021 The Kubeflow Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import functools
+import http.server
+import tempfile
+import textwrap
+import threading
+import unittest
+import warnings
+from pathlib import Path
+from unittest import mock
+
+from ..components import ComponentStore
+from ..components._component_store import _calculate_component_digest
+
+
+def _make_component_text(name: str) -> bytes:
+    return textwrap.dedent('''\
+        name: {}
+        implementation:
+          container:
+            image: busybox
+            command: [echo, {}]
+        ''').format(name, name).encode('utf-8')
+
+
+class _RecordingRequestHandler(http.server.SimpleHTTPRequestHandler):
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self.server.requested_paths.append(self.path)
+        super().do_GET()
+
+
+class ComponentStoreTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self._temp_dir = tempfile.TemporaryDirectory()
+        temp_dir = Path(self._temp_dir.name)
+        # The store caches the components in the temporary directory.
+        patcher = mock.patch('tempfile.gettempdir', return_value=str(temp_dir))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.served_dir = temp_dir / 'served'
+        self.served_dir.mkdir()
+        self.server = http.server.ThreadingHTTPServer(
+            ('127.0.0.1', 0),
+            functools.partial(
+                _RecordingRequestHandler, directory=str(self.served_dir)))
+        self.server.requested_paths = []
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url_prefix = 'http://127.0.0.1:{}/'.format(
+            self.server.server_address[1])
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self._temp_dir.cleanup()
+
+    def _serve_component(self, path: str, data: bytes):
+        component_path = self.served_dir / path
+        component_path.parent.mkdir(parents=True, exist_ok=True)
+        component_path.write_bytes(data)
+
+    def _create_store(self) -> ComponentStore:
+        return ComponentStore(
+            local_search_paths=[],
+            url_search_prefixes=[
+                self.url_prefix + 'missing/',
+                self.url_prefix + 'first/',
+                self.url_prefix + 'second/',
+            ])
+
+    def test_load_component_from_first_prefix_with_component(self):
+        self._serve_component('first/group/a/component.yaml',
+                              _make_component_text('A1'))
+        self._serve_component('second/group/a/component.yaml',
+                              _make_component_text('A2'))
+
+        task_factory = self._create_store().load_component('group/a')
+
+        self.assertEqual('A1', task_factory.component_spec.name)
+        self.assertEqual(self.url_prefix + 'first/group/a/component.yaml',
+                         task_factory().component_ref.url)
+
+    def test_load_component_verifies_digest(self):
+        data = _make_component_text('B')
+        digest = _calculate_component_digest(data)
+        self._serve_component('first/b/versions/sha256/' + digest,
+                              _make_component_text('Tampered B'))
+        self._serve_component('second/b/versions/sha256/' + digest, data)
+        store = self._create_store()
+
+        task_factory = store.load_component('b', digest=digest)
+        self.assertEqual('B', task_factory.component_spec.name)
+
+        # Specific versions are then loaded from the cache.
+        self.server.requested_paths.clear()
+        task_factory = self._create_store().load_component('b', digest=digest)
+        self.assertEqual('B', task_factory.component_spec.name)
+        self.assertEqual([], self.server.requested_paths)
+
+    def test_load_component_not_found(self):
+        with self.assertRaisesRegex(RuntimeError, 'missing/c/component.yaml'):
+            self._create_store().load_component('c')
+
+    def test_prefetch(self):
+        names = ['group/d{}'.format(i) for i in range(5)]
+        for name in names:
+            self._serve_component('second/{}/component.yaml'.format(name),
+                                  _make_component_text(name))
+        store = self._create_store()
+
+        store.prefetch(names)
+        self.server.requested_paths.clear()
+        for name in names:
+            self.assertEqual(name,
+                             store.load_component(name).component_spec.name)
+        self.assertEqual([], self.server.requested_paths)
+
+        with self.assertRaisesRegex(RuntimeError, 'group/e'):
+            store.prefetch(['group/e'])
+
+    def test_session_is_created_on_first_fetch(self):
+        with warnings.catch_warnings():
+            warnings.simplefilter('error')
+            store = self._create_store()
+            self.assertIsNone(store._session)
+
+            store._get_session()
+        self.assertIsNotNone(store._session)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -15,12 +15,13 @@
 import requests
 import textwrap
 import unittest
+import yaml
 from pathlib import Path
 from unittest import mock
 
 from .. import components as comp
 from ..components._components import _resolve_command_line_and_paths
-from ..components._yaml_utils import load_yaml
+from ..components._yaml_utils import dump_yaml, load_yaml
 from ..components.structures import ComponentSpec
 
 
@@ -91,6 +92,77 @@ class LoadComponentTestCase(unittest.TestCase):
         self.assertEqual(resolved_cmd.args[0], str(arg1))
         self.assertEqual(resolved_cmd.args[1], str(arg2))
 
+    def test_load_component_from_url_revalidates_etag(self):
+        from ..components._component_spec_cache import component_spec_cache
+        component_path = Path(
+            __file__).parent / 'test_data' / 'python_add.component.yaml'
+        component_url = 'https://example.com/etag/python_add/component.yaml'
+        component_bytes = component_path.read_bytes()
+        requests_headers = []
+
+        def mock_response_factory(url, params=None, headers=None, **kwargs):
+            requests_headers.append(headers)
+            response = requests.Response()
+            response.url = url
+            response.headers['ETag'] = '"v1"'
+            if (headers or {}).get('If-None-Match') == '"v1"':
+                response.status_code = 304
+            else:
+                response.status_code = 200
+                response._content = component_bytes
+            return response
+
+        component_spec_cache.clear()
+        with mock.patch('requests.get', mock_response_factory):
+            task_factory1 = comp.load_component_from_url(component_url)
+            task_factory2 = comp.load_component_from_url(component_url)
+
+        self.assertEqual([None, {'If-None-Match': '"v1"'}], requests_headers)
+        self.assertEqual(task_factory1.component_spec,
+                         task_factory2.component_spec)
+        self.assertEqual(task_factory1.component_spec._digest,
+                         task_factory2.component_spec._digest)
+
+        # The component is downloaded again if it was evicted.
+        component_spec_cache.clear()
+        requests_headers.clear()
+        with mock.patch('requests.get', mock_response_factory):
+            comp.load_component_from_url(component_url)
+        self.assertEqual([None], requests_headers)
+
+    def test_load_component_spec_cache(self):
+        import tempfile
+        from ..components._component_spec_cache import ComponentSpecCache
+        component_text = textwrap.dedent('''\
+            name: Cached component
+            inputs:
+            - {name: data, type: {GCSPath: {data_type: CSV}}}
+            implementation:
+              container:
+                image: busybox
+                command: [echo, {inputValue: data}]
+            ''')
+        with tempfile.TemporaryDirectory() as cache_dir, mock.patch(
+                'kfp.components._components.component_spec_cache',
+                ComponentSpecCache(cache_dir=cache_dir)) as cache:
+            task_factory1 = comp.load_component_from_text(component_text)
+            spec1 = task_factory1.component_spec
+            # The specs do not share mutable objects with the cache.
+            spec1.inputs[0].type['GCSPath']['data_type'] = 'TSV'
+
+            spec2 = comp.load_component_from_text(component_text).component_spec
+            self.assertEqual((1, 1), (cache.hits, cache.misses))
+            self.assertEqual({'GCSPath': {
+                'data_type': 'CSV'
+            }}, spec2.inputs[0].type)
+            self.assertEqual(spec1._digest, spec2._digest)
+
+            # Another process reads the specs cached on disk.
+            cache2 = ComponentSpecCache(cache_dir=cache_dir)
+            spec3 = cache2.get_component_spec(spec1._digest, None)
+            self.assertEqual((1, 0), (cache2.hits, cache2.misses))
+            self.assertEqual(spec2, spec3)
+
     def test_loading_minimal_component(self):
         component_text = '''\
 implementation:
@@ -1110,5 +1182,29 @@ implementation:
             task_factory_a = comp.load_component_from_text(component_a)
 
 
+class DumpYamlTestCase(unittest.TestCase):
+
+    @unittest.skipUnless(
+        getattr(yaml, '__with_libyaml__', False), 'Requires libyaml.')
+    def test_dump_yaml_with_libyaml(self):
+        data = {
+            'name': 'echo',
+            'command': ['sh', '-c', 'echo "$0"\n' * 3, 'yes'],
+            'labels': {
+                'long': 'word ' * 40,
+            },
+        }
+        self.assertEqual(dump_yaml(data), dump_yaml(data, use_libyaml=True))
+
+        # Long double-quoted strings are folded differently.
+        data = {'value': '\t' + 'word ' * 40}
+        python_yaml = dump_yaml(data)
+        libyaml_yaml = dump_yaml(data, use_libyaml=True)
+        self.assertNotEqual(python_yaml, libyaml_yaml)
+        self.assertIn('\\\n    \\ word', python_yaml)
+        self.assertEqual(data, load_yaml(python_yaml))
+        self.assertEqual(data, load_yaml(libyaml_yaml))
+
+
 if __name__ == '__main__':
     unittest.main()
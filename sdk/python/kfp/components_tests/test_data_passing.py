@@ -12,6 +12,9 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import importlib.util
+import os
+import tempfile
 import unittest
 
 from ..components import _data_passing
@@ -29,6 +32,44 @@ class DataPassingTest(unittest.TestCase):
             '[4, 5, 6]',
             _data_passing.serialize_value(value=[4, 5, 6], type_name='List'))
 
+    def test_serialize_file_type_value(self):
+        with self.assertRaisesRegex(TypeError, 'are passed as files'):
+            _data_passing.serialize_value(value=b'data', type_name='Bytes')
+
+    def _write_and_read_file(self, value, type_name: str):
+        """Writes a value with the serializer of a file type and reads it with
+        the deserializer code."""
+        self.assertTrue(_data_passing.is_file_type_name(type_name))
+        serializer = _data_passing.get_serializer_func_for_type_name(type_name)
+        deserializer_code, definitions = (
+            _data_passing.get_deserializer_code_for_type_name(type_name))
+        namespace = {}
+        exec(definitions, namespace)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, 'value')
+            serializer(value, path)
+            return eval(deserializer_code, namespace)(path)
+
+    def test_bytes_file_type(self):
+        self.assertEqual('Bytes',
+                         _data_passing.get_canonical_type_name_for_type(bytes))
+        self.assertEqual(b'\x00data',
+                         self._write_and_read_file(b'\x00data', 'Bytes'))
+        self.assertEqual(
+            b'data', self._write_and_read_file(memoryview(b'data'), 'bytes'))
+        self.assertFalse(_data_passing.is_file_type_name('String'))
+
+    @unittest.skipUnless(
+        importlib.util.find_spec('numpy'), 'numpy is not installed.')
+    def test_numpy_array_file_type(self):
+        import numpy
+        self.assertEqual(
+            'NumpyArray',
+            _data_passing.get_canonical_type_name_for_type(numpy.ndarray))
+        array = numpy.arange(12, dtype=numpy.float32).reshape(3, 4)
+        numpy.testing.assert_array_equal(
+            array, self._write_and_read_file(array, 'NumpyArray'))
+
 
 if __name__ == '__main__':
     unittest.main()
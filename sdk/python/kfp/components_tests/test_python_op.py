@@ -18,7 +18,7 @@ import tempfile
 import unittest
 from contextlib import contextmanager
 from pathlib import Path
-from typing import Callable, NamedTuple, Sequence
+from typing import Callable, Iterator, NamedTuple, Sequence
 
 from .. import components as comp
 from ..components import (InputBinaryFile, InputPath, InputTextFile,
@@ -881,6 +881,73 @@ class PythonOpTestCase(unittest.TestCase):
             arguments={'number': "42"},
             expected_output_values={'Output': '42'})
 
+    def test_bytes_are_passed_as_files(self):
+
+        def repeat(
+            data: bytes, times: int
+        ) -> NamedTuple('Outputs', [('data', bytes), ('size', int)]):
+            assert isinstance(data, bytes)
+            return (data * times, len(data) * times)
+
+        task_factory = comp.func_to_container_op(repeat)
+
+        self.assertEqual(task_factory.component_spec.inputs[0].type, 'Bytes')
+        self.assertEqual(task_factory.component_spec.outputs[0].type, 'Bytes')
+
+        self.helper_test_component_using_local_call(
+            task_factory,
+            arguments={
+                'data': 'ab',
+                'times': 3
+            },
+            expected_output_values={
+                'data': 'ababab',
+                'size': '6'
+            })
+
+    def test_iterator_outputs_are_streamed(self):
+
+        def produce_rows(
+            count: int
+        ) -> NamedTuple('Outputs',
+                        [('rows', Iterator[dict]), ('lines', Iterator[str]),
+                         ('chunks', Iterator[bytes]), ('count', int)]):
+            rows = ({'index': i} for i in range(count))
+            lines = ('line {}'.format(i) for i in range(count))
+            chunks = (b'chunk' for i in range(count))
+            return rows, lines, chunks, count
+
+        task_factory = comp.func_to_container_op(produce_rows)
+
+        self.assertEqual(
+            ['JsonLines', 'String', 'Bytes', 'Integer'],
+            [output.type for output in task_factory.component_spec.outputs])
+
+        self.helper_test_component_using_local_call(
+            task_factory,
+            arguments={'count': 3},
+            expected_output_values={
+                'rows': '{"index": 0}\n{"index": 1}\n{"index": 2}\n',
+                'lines': 'line 0\nline 1\nline 2\n',
+                'chunks': 'chunkchunkchunk',
+                'count': '3',
+            })
+
+    def test_generator_output_is_streamed(self):
+
+        def produce_lines(count: int) -> Iterator[str]:
+            for i in range(count):
+                yield 'a,{}'.format(i)
+
+        task_factory = comp.func_to_container_op(produce_lines)
+
+        self.assertEqual('String', task_factory.component_spec.outputs[0].type)
+
+        self.helper_test_component_using_local_call(
+            task_factory,
+            arguments={'count': 2},
+            expected_output_values={'Output': 'a,0\na,1\n'})
+
     def test_output_path(self):
 
         def write_to_file_path(number_file_path: OutputPath(int)):
@@ -43,6 +43,18 @@ class TestModel1(ModelBase):
         super().__init__(locals())
 
 
+class TestModel2(ModelBase):
+    _serialized_names = {'prop_1': 'prop1'}
+
+    def __init__(
+        self,
+        prop_0: Union[int, str, bool],
+        prop_1: Optional[Dict[str, 'TestModel2']] = None,
+        prop_2: Optional[List[Union[str, 'TestModel2']]] = None,
+    ):
+        super().__init__(locals())
+
+
 class StructureModelBaseTestCase(unittest.TestCase):
 
     def test_handle_type_check_for_simple_builtin(self):
@@ -284,6 +296,32 @@ class StructureModelBaseTestCase(unittest.TestCase):
         with self.assertRaises(TypeError):
             TestModel1.from_dict({'prop_0': '', 'prop_6': 64})
 
+    def test_handle_from_dict_without_validation(self):
+        struct = {
+            'prop_0': True,
+            'prop1': {
+                'key': {
+                    'prop_0': 1
+                }
+            },
+            'prop_2': ['value', {
+                'prop_0': 'value'
+            }],
+        }
+        obj = TestModel2.from_dict(struct, validate=False)
+        self.assertEqual(TestModel2.from_dict(struct), obj)
+        self.assertIs(obj.prop_0, True)
+        self.assertEqual(TestModel2(prop_0='value'), obj.prop_2[1])
+        self.assertDictEqual(obj.to_dict(), struct)
+
+        # Structures which cannot be parsed are still reported.
+        with self.assertRaises(TypeError):
+            TestModel2.from_dict({'prop_0': 1, 'prop1': 1}, validate=False)
+
+        # Objects constructed afterwards are validated.
+        with self.assertRaises(TypeError):
+            TestModel2(prop_0=None)
+
     def test_handle_comparisons(self):
 
         class A(ModelBase):
@@ -48,14 +48,14 @@ def calculate_recursive_dir_hash(root_dir_path: str):
 
 
 def try_read_value_from_cache(cache_type: str, key: str) -> str:
-    cache_file_path = Path(tempfile.tempdir) / cache_type / key
+    cache_file_path = Path(tempfile.gettempdir()) / cache_type / key
     if cache_file_path.exists():
         return cache_file_path.read_text()
     return None
 
 
 def write_value_to_cache(cache_type: str, key: str, value: str):
-    cache_file_path = Path(tempfile.tempdir) / cache_type / key
+    cache_file_path = Path(tempfile.gettempdir()) / cache_type / key
     if cache_file_path.exists():
         old_value = cache_file_path.read_text()
         if value != old_value:
@@ -67,7 +67,13 @@ def write_value_to_cache(cache_type: str, key: str, value: str):
     cache_file_path.write_text(value)
 
 
+def delete_value_from_cache(cache_type: str, key: str):
+    cache_file_path = Path(tempfile.gettempdir()) / cache_type / key
+    if cache_file_path.exists():
+        cache_file_path.unlink()
+
+
 def clear_cache(cache_type: str):
-    cache_file_path = Path(tempfile.tempdir) / cache_type
+    cache_file_path = Path(tempfile.gettempdir()) / cache_type
     if cache_file_path.exists():
         shutil.rmtree(cache_file_path)
@@ -12,6 +12,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import hashlib
+import json
 import os
 import sys
 import tempfile
@@ -24,6 +26,9 @@ from deprecated.sphinx import deprecated
 
 from ..components._components import _create_task_factory_from_component_spec
 from ..components._python_op import _func_to_component_spec
+from ._cache import (delete_value_from_cache, try_read_value_from_cache,
+                     write_value_to_cache)
+from . import _container_builder
 from ._container_builder import ContainerBuilder
 from kfp import components
 from kfp import dsl
@@ -104,18 +109,25 @@ class DependencyHelper(object):
             return
         self.python_packages[dependency.name] = dependency
 
+    def get_pip_requirements(self) -> List[str]:
+        """Returns the pip requirements of the python packages, in the order
+        of which the packages are added."""
+        requirements = []
+        for name, version in self.python_packages.items():
+            version_str = ''
+            if version.has_min_version():
+                version_str += ' >= ' + version.min_version + ','
+            if version.has_max_version():
+                version_str += ' <= ' + version.max_version + ','
+            requirements.append(name + version_str.rstrip(','))
+        return requirements
+
     def generate_pip_requirements(self, target_file):
         """write the python packages to a requirement file the generated file
         follows the order of which the packages are added."""
         with open(target_file, 'w') as f:
-            for name, version in self.python_packages.items():
-                version = self.python_packages[name]
-                version_str = ''
-                if version.has_min_version():
-                    version_str += ' >= ' + version.min_version + ','
-                if version.has_max_version():
-                    version_str += ' <= ' + version.max_version + ','
-                f.write(name + version_str.rstrip(',') + '\n')
+            for requirement in self.get_pip_requirements():
+                f.write(requirement + '\n')
 
 
 def _dependency_to_requirements(dependency=[], filename='requirements.txt'):
@@ -134,7 +146,8 @@ def _dependency_to_requirements(dependency=[], filename='requirements.txt'):
 def _generate_dockerfile(filename: str,
                          base_image: str,
                          requirement_filename: Optional[str] = None,
-                         add_files: Optional[Dict[str, str]] = None):
+                         add_files: Optional[Dict[str, str]] = None,
+                         install_python: bool = True):
     """
     generates dockerfiles
     Args:
@@ -142,12 +155,15 @@ def _generate_dockerfile(filename: str,
       base_image (str): the base image name.
       requirement_filename (str): requirement file name
       add_files (Dict[str, str]): Map containing the files thats should be added to the container. add_files maps the build context relative source paths to the container destination paths.
+      install_python (bool): Whether to install python3 and pip with apt-get.
+        Not needed when the base image is a dependency image.
   """
     with open(filename, 'w') as f:
         f.write('FROM ' + base_image + '\n')
-        f.write(
-            'RUN apt-get update -y && apt-get install --no-install-recommends -y -q python3 python3-pip python3-setuptools\n'
-        )
+        if install_python:
+            f.write(
+                'RUN apt-get update -y && apt-get install --no-install-recommends -y -q python3 python3-pip python3-setuptools\n'
+            )
         if requirement_filename is not None:
             f.write('ADD ' + requirement_filename + ' /ml/requirements.txt\n')
             f.write('RUN python3 -m pip install -r /ml/requirements.txt\n')
@@ -156,6 +172,136 @@ def _generate_dockerfile(filename: str,
             f.write('ADD ' + src_path + ' ' + dst_path + '\n')
 
 
+def _get_image_repository(image: str) -> str:
+    """Returns the repository of an image, without its tag or digest."""
+    registry, slash, name = image.rpartition('/')
+    return registry + slash + name.partition('@')[0].partition(':')[0]
+
+
+def _get_dependency_image_cache_key(base_image: str, requirements: List[str],
+                                    target_image: str) -> str:
+    # The image is only reused in the same repository, as the images of
+    # other registries may not be pullable where the target image is.
+    key_doc = json.dumps(
+        {
+            'base_image': base_image,
+            'requirements': requirements,
+            'target_repository': _get_image_repository(target_image),
+        },
+        sort_keys=True)
+    return hashlib.sha256(key_doc.encode('utf-8')).hexdigest()
+
+
+def _get_dependency_image_name(target_image: str) -> str:
+    """Returns the name of the dependency image of a component image.
+
+    For example, gcr.io/my-project/my-image:tag ->
+    gcr.io/my-project/my-image-dependencies
+    """
+    return _get_image_repository(target_image) + '-dependencies'
+
+
+def _check_image_exists(builder, image_name: str) -> bool:
+    """Checks that an image exists with the builder, or in its registry for
+    the builders which cannot check it."""
+    if hasattr(builder, '_check_image_exists'):
+        return builder._check_image_exists(image_name)
+    try:
+        return _container_builder._image_exists_in_registry(image_name)
+    except Exception as e:
+        logging.warning('Failed to check that the image {} exists: {}'.format(
+            image_name, e))
+        return False
+
+
+def build_dependency_image(packages_to_install: List[str],
+                           base_image: Optional[str] = None,
+                           target_image: Optional[str] = None,
+                           timeout: int = 600,
+                           builder: Optional[ContainerBuilder] = None) -> str:
+    """Builds an image with the python packages installed on a base image.
+
+    Lightweight components using the image as their base image do not need to
+    install their packages when their pods start::
+
+        image = build_dependency_image(['pandas==1.2.4'])
+        op = kfp.components.create_component_from_func(func, base_image=image)
+
+    The packages are resolved once: the image is cached on the requirement
+    set, the base image and the repository of the target image, so building
+    the image again for the same packages, in any order, returns the image
+    built first, as long as it still exists in its registry.
+
+    Args:
+      packages_to_install: The python packages to install, as pip
+        requirements. For v2 components, include the kfp package and pass
+        `install_kfp_package=False` to the component.
+      base_image: The image to install the packages on. Defaults to the base
+        image of the lightweight components.
+      target_image: The image name to push the image to. Defaults to the
+        default image name of the builder.
+      timeout: The timeout for the image build in seconds.
+      builder: The ContainerBuilder, or a compatible class, building the
+        image. Defaults to `kfp.containers.default_image_builder`. Builders
+        without a default image name need a `target_image`.
+
+    Returns:
+      The image name with its digest, or the base image when there are no
+      packages to install.
+    """
+    if base_image is None:
+        from ..components._python_op import default_base_image_or_builder
+        base_image = default_base_image_or_builder
+        if isinstance(base_image, Callable):
+            base_image = base_image()
+
+    requirements = sorted(
+        set(str(package).strip() for package in packages_to_install) - {''})
+    if not requirements:
+        return base_image
+
+    if builder is None:
+        from ._build_image_api import default_image_builder
+        builder = default_image_builder
+    if not target_image:
+        if not hasattr(builder, '_get_default_image_name'):
+            raise ValueError(
+                'Please provide the target_image: the builder {} has no '
+                'default image name.'.format(builder))
+        target_image = builder._get_default_image_name()
+
+    cache_name = 'build_dependency_image'
+    cache_key = _get_dependency_image_cache_key(base_image, requirements,
+                                                target_image)
+    cached_image_name = try_read_value_from_cache(cache_name, cache_key)
+    if cached_image_name:
+        if _check_image_exists(builder, cached_image_name):
+            logging.info(
+                'Reusing the dependency image {}.'.format(cached_image_name))
+            return cached_image_name
+        # The image was deleted from its registry.
+        delete_value_from_cache(cache_name, cache_key)
+
+    with tempfile.TemporaryDirectory() as local_build_dir:
+        requirement_filename = 'requirements.txt'
+        with open(os.path.join(local_build_dir, requirement_filename),
+                  'w') as f:
+            f.write(''.join(requirement + '\n' for requirement in requirements))
+        _generate_dockerfile(
+            os.path.join(local_build_dir, 'Dockerfile'), base_image,
+            requirement_filename)
+
+        logging.info('Building and pushing the dependency image.')
+        image_name = builder.build(
+            local_dir=local_build_dir,
+            target_image=target_image,
+            timeout=timeout,
+        )
+    if image_name:
+        write_value_to_cache(cache_name, cache_key, image_name)
+    return image_name
+
+
 def _configure_logger(logger):
     """_configure_logger configures the logger such that the info level logs go
     to the stdout and the error(or above) level logs go to the stderr.
@@ -241,7 +387,8 @@ def build_python_component(
         timeout: int = 600,
         namespace: Optional[str] = None,
         target_component_file: Optional[str] = None,
-        is_v2: bool = False):
+        is_v2: bool = False,
+        prebuild_dependencies: bool = False):
     """build_component automatically builds a container image for the
     component_func based on the base_image and pushes to the target_image.
 
@@ -263,6 +410,11 @@ def build_python_component(
         spec.
       is_v2: Whether or not generating a v2 KFP component, default
         is false.
+      prebuild_dependencies: Whether to install the dependencies in a separate
+        image, cached on the dependencies and the base image (see
+        `build_dependency_image`), and to build the component image on it.
+        Components with the same dependencies then share the dependency
+        image, which is built once. Default is false.
 
     Raises:
       ValueError: The function is not decorated with python_component decorator or
@@ -364,22 +516,38 @@ def build_python_component(
             dependency.append(
                 VersionedDependency(name='kfp', min_version='1.4.0'))
 
-        _dependency_to_requirements(dependency, local_requirement_filepath)
+        container_builder = ContainerBuilder(staging_gcs_path, target_image,
+                                             namespace)
 
         # Generate Dockerfile in the context directory
         local_docker_filepath = os.path.join(local_build_dir,
                                              arc_docker_filename)
         add_files = {program_path: '/' + program_path}
 
-        _generate_dockerfile(
-            local_docker_filepath,
-            base_image,
-            arc_requirement_filename,
-            add_files=add_files)
+        if prebuild_dependencies and dependency:
+            dependency_helper = DependencyHelper()
+            for version in dependency:
+                dependency_helper.add_python_package(version)
+            dependency_image = build_dependency_image(
+                dependency_helper.get_pip_requirements(),
+                base_image=base_image,
+                target_image=_get_dependency_image_name(target_image),
+                timeout=timeout,
+                builder=container_builder)
+            _generate_dockerfile(
+                local_docker_filepath,
+                dependency_image,
+                add_files=add_files,
+                install_python=False)
+        else:
+            _dependency_to_requirements(dependency, local_requirement_filepath)
+            _generate_dockerfile(
+                local_docker_filepath,
+                base_image,
+                arc_requirement_filename,
+                add_files=add_files)
 
         logging.info('Building and pushing container image.')
-        container_builder = ContainerBuilder(staging_gcs_path, target_image,
-                                             namespace)
         image_name_with_digest = container_builder.build(
             local_build_dir, arc_docker_filename, target_image, timeout)
 
@@ -14,18 +14,36 @@
 
 __all__ = [
     'ContainerBuilder',
+    'ContextStore',
+    'GcsContextStore',
+    'LocalContextStore',
 ]
 
+import abc
+import gzip
+import hashlib
+import json
 import logging
+import shutil
 import tarfile
 import tempfile
 import os
-import uuid
+import re
+from typing import Callable, Optional
+
+from ._cache import calculate_file_hash
 
 SERVICEACCOUNT_NAMESPACE = '/var/run/secrets/kubernetes.io/serviceaccount/namespace'
 GCS_STAGING_BLOB_DEFAULT_PREFIX = 'kfp_container_build_staging'
 GCR_DEFAULT_IMAGE_SUFFIX = 'kfp_container'
 KANIKO_EXECUTOR_IMAGE_DEFAULT = 'gcr.io/kaniko-project/executor@sha256:78d44ec4e9cb5545d7f85c1924695c89503ded86a59f92c7ae658afa3cff5400'
+_REGISTRY_REQUEST_TIMEOUT = 30
+_MANIFEST_MEDIA_TYPES = ', '.join([
+    'application/vnd.docker.distribution.manifest.v2+json',
+    'application/vnd.docker.distribution.manifest.list.v2+json',
+    'application/vnd.oci.image.manifest.v1+json',
+    'application/vnd.oci.image.index.v1+json',
+])
 
 
 def _get_project_id():
@@ -50,8 +68,131 @@ def _get_instance_id():
     return r.text
 
 
+def _get_registry_token(registry: str, challenge: str) -> Optional[str]:
+    """Gets a token of a registry for the Bearer challenge of its API."""
+    import requests
+    scheme, _, params = challenge.partition(' ')
+    if scheme.lower() != 'bearer':
+        return None
+    params = dict(re.findall(r'(\w+)="([^"]*)"', params))
+    realm = params.pop('realm', None)
+    if not realm:
+        return None
+    auth = None
+    if registry.endswith('gcr.io') or registry.endswith('-docker.pkg.dev'):
+        from kfp._auth import get_gcp_access_token
+        access_token = get_gcp_access_token()
+        if access_token:
+            auth = ('oauth2accesstoken', access_token)
+    r = requests.get(
+        realm, params=params, auth=auth, timeout=_REGISTRY_REQUEST_TIMEOUT)
+    r.raise_for_status()
+    token_response = r.json()
+    return token_response.get('token') or token_response.get('access_token')
+
+
+def _image_exists_in_registry(image_name: str) -> bool:
+    """Checks that an image name with digest exists in its registry, with
+    the Docker Registry HTTP API V2.
+
+    The Google Cloud registries are authenticated with the application
+    default credentials.
+    """
+    import requests
+    repository, _, digest = image_name.partition('@')
+    registry, _, path = repository.partition('/')
+    url = 'https://{}/v2/{}/manifests/{}'.format(registry, path, digest)
+    headers = {'Accept': _MANIFEST_MEDIA_TYPES}
+    r = requests.head(url, headers=headers, timeout=_REGISTRY_REQUEST_TIMEOUT)
+    if r.status_code == 401:
+        token = _get_registry_token(registry,
+                                    r.headers.get('WWW-Authenticate', ''))
+        if token:
+            headers['Authorization'] = 'Bearer ' + token
+            r = requests.head(
+                url, headers=headers, timeout=_REGISTRY_REQUEST_TIMEOUT)
+    if r.status_code == 404:
+        return False
+    r.raise_for_status()
+    return True
+
+
+class ContextStore(abc.ABC):
+    """Storage of the build contexts and of the images built from them."""
+
+    @abc.abstractmethod
+    def exists(self, uri: str) -> bool:
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    def upload_file(self, local_path: str, uri: str) -> None:
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    def read_text(self, uri: str) -> Optional[str]:
+        """Returns the content of a text file, or None if it does not
+        exist."""
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    def write_text(self, uri: str, text: str) -> None:
+        raise NotImplementedError()
+
+
+class GcsContextStore(ContextStore):
+    """Stores the build contexts in Google Cloud Storage."""
+
+    def exists(self, uri: str) -> bool:
+        from ._gcs_helper import GCSHelper
+        return GCSHelper.get_blob_from_gcs_uri(uri).exists()
+
+    def upload_file(self, local_path: str, uri: str) -> None:
+        from ._gcs_helper import GCSHelper
+        GCSHelper.upload_gcs_file(local_path, uri)
+
+    def read_text(self, uri: str) -> Optional[str]:
+        from ._gcs_helper import GCSHelper
+        if not self.exists(uri):
+            return None
+        return GCSHelper.read_from_gcs_path(uri)
+
+    def write_text(self, uri: str, text: str) -> None:
+        from ._gcs_helper import GCSHelper
+        GCSHelper.write_to_gcs_path(uri, text)
+
+
+class LocalContextStore(ContextStore):
+    """Stores the build contexts in a local directory, for tests and local
+    Kaniko runs."""
+
+    def exists(self, uri: str) -> bool:
+        return os.path.exists(uri)
+
+    def upload_file(self, local_path: str, uri: str) -> None:
+        os.makedirs(os.path.dirname(uri), exist_ok=True)
+        shutil.copyfile(local_path, uri)
+
+    def read_text(self, uri: str) -> Optional[str]:
+        if not os.path.exists(uri):
+            return None
+        with open(uri, 'r') as f:
+            return f.read()
+
+    def write_text(self, uri: str, text: str) -> None:
+        os.makedirs(os.path.dirname(uri), exist_ok=True)
+        with open(uri, 'w') as f:
+            f.write(text)
+
+
 class ContainerBuilder(object):
-    """ContainerBuilder helps build a container image."""
+    """ContainerBuilder helps build a container image.
+
+    The build contexts are content-addressed: a build context is uploaded
+    once to the staging location, and an image built from a context is
+    recorded there, so building it again to the same target image returns
+    the recorded image without running Kaniko, as long as the image still
+    exists in its registry.
+    """
 
     def __init__(self,
                  gcs_staging=None,
@@ -59,7 +200,12 @@ class ContainerBuilder(object):
                  namespace=None,
                  service_account='kubeflow-pipelines-container-builder',
                  kaniko_executor_image=KANIKO_EXECUTOR_IMAGE_DEFAULT,
-                 k8s_client_configuration=None):
+                 k8s_client_configuration=None,
+                 context_store: Optional[ContextStore] = None,
+                 job_runner=None,
+                 cache_repo: Optional[str] = None,
+                 cache_ttl: Optional[str] = None,
+                 image_exists: Optional[Callable[[str], bool]] = None):
         """
     Args:
       gcs_staging (str): GCS bucket/blob that can store temporary build files,
@@ -76,6 +222,11 @@ class ContainerBuilder(object):
       kaniko_executor_image (str): Docker image used to run kaniko executor. Defaults to gcr.io/kaniko-project/executor:v0.10.0.
       k8s_client_configuration (kubernetes.Configuration): Kubernetes client configuration object to be used when talking with Kubernetes API.
         This is optional. If not specified, it will use the default configuration. This can be used to personalize the client used to talk to the Kubernetes server and change authentication parameters.
+      context_store (ContextStore): Storage of the build contexts. Defaults to GCS. With another store, gcs_staging is the staging location in that store.
+      job_runner: Runs the Kaniko pods, with a `run_job(pod_spec, timeout)` method returning the completed pod. Defaults to a K8sJobHelper.
+      cache_repo (str): Repository Kaniko caches the image layers in. Kaniko defaults to the cache subrepository of the target image.
+      cache_ttl (str): How long the cached layers are used, for example "168h". Kaniko defaults to two weeks.
+      image_exists: Checks that an image name with digest still exists before it is reused. Defaults to querying its registry with the Docker Registry HTTP API V2.
     """
         self._gcs_staging = gcs_staging
         self._gcs_staging_checked = False
@@ -84,6 +235,34 @@ class ContainerBuilder(object):
         self._service_account = service_account
         self._kaniko_image = kaniko_executor_image
         self._k8s_client_configuration = k8s_client_configuration
+        self._context_store = context_store
+        self._job_runner = job_runner
+        self._cache_repo = cache_repo
+        self._cache_ttl = cache_ttl
+        self._image_exists = image_exists or _image_exists_in_registry
+
+    def _get_context_store(self) -> ContextStore:
+        if self._context_store is None:
+            self._context_store = GcsContextStore()
+        return self._context_store
+
+    def _get_job_runner(self):
+        if self._job_runner is None:
+            from ._k8s_job_helper import K8sJobHelper
+            self._job_runner = K8sJobHelper(self._k8s_client_configuration)
+        return self._job_runner
+
+    def _check_image_exists(self, image_name: str) -> bool:
+        try:
+            if self._image_exists(image_name):
+                return True
+        except Exception as e:
+            logging.warning(
+                'Failed to check that the image {} exists: {}'.format(
+                    image_name, e))
+            return False
+        logging.info('The image {} no longer exists.'.format(image_name))
+        return False
 
     def _get_namespace(self):
         if self._namespace is None:
@@ -98,6 +277,14 @@ class ContainerBuilder(object):
     def _get_staging_location(self):
         if self._gcs_staging_checked:
             return self._gcs_staging
+        if self._context_store is not None and not isinstance(
+                self._context_store, GcsContextStore):
+            if self._gcs_staging is None:
+                raise ValueError(
+                    'Please specify the staging location of the build contexts in gcs_staging.'
+                )
+            self._gcs_staging_checked = True
+            return self._gcs_staging
 
         # Configure the GCS staging bucket
         if self._gcs_staging is None:
@@ -136,6 +323,11 @@ class ContainerBuilder(object):
     def _generate_kaniko_spec(self, context, docker_filename, target_image):
         """_generate_kaniko_yaml generates kaniko job yaml based on a template
         yaml."""
+        cache_args = []
+        if self._cache_repo:
+            cache_args.append('--cache-repo=' + self._cache_repo)
+        if self._cache_ttl:
+            cache_args.append('--cache-ttl=' + self._cache_ttl)
         content = {
             'apiVersion': 'v1',
             'metadata': {
@@ -149,15 +341,18 @@ class ContainerBuilder(object):
             'spec': {
                 'restartPolicy': 'Never',
                 'containers': [{
-                    'name': 'kaniko',
+                    'name':
+                        'kaniko',
                     'args': [
                         '--cache=true',
+                    ] + cache_args + [
                         '--dockerfile=' + docker_filename,
                         '--context=' + context,
                         '--destination=' + target_image,
                         '--digest-file=/dev/termination-log',  # This is suggested by the Kaniko devs as a way to return the image digest from Kaniko Pod. See https://github.com/GoogleContainerTools/kaniko#--digest-file
                     ],
-                    'image': self._kaniko_image,
+                    'image':
+                        self._kaniko_image,
                 }],
                 'serviceAccountName': self._service_account
             }
@@ -166,11 +361,37 @@ class ContainerBuilder(object):
 
     def _wrap_dir_in_tarball(self, tarball_path, dir_name):
         """_wrap_files_in_tarball creates a tarball for all the files in the
-        directory."""
+        directory.
+
+        The tarball is reproducible: its entries are sorted, and their
+        modification times, owners and permissions (other than the executable
+        bit) are reset, so the same files always give the same tarball.
+        """
         if not tarball_path.endswith('.tar.gz'):
             raise ValueError('the tarball path should end with .tar.gz')
-        with tarfile.open(tarball_path, 'w:gz') as tarball:
-            tarball.add(dir_name, arcname='')
+        paths = []
+        for dirpath, dirnames, filenames in os.walk(dir_name):
+            for name in dirnames + filenames:
+                path = os.path.join(dirpath, name)
+                arcname = os.path.relpath(path, dir_name).replace(os.sep, '/')
+                paths.append((arcname, path))
+        with open(tarball_path, 'wb') as f, gzip.GzipFile(
+                filename='', mode='wb', fileobj=f,
+                mtime=0) as compressed, tarfile.open(
+                    fileobj=compressed, mode='w',
+                    format=tarfile.GNU_FORMAT) as tarball:
+            for arcname, path in sorted(paths):
+                tarinfo = tarball.gettarinfo(path, arcname=arcname)
+                tarinfo.mtime = 0
+                tarinfo.uid = tarinfo.gid = 0
+                tarinfo.uname = tarinfo.gname = ''
+                executable = tarinfo.isdir() or tarinfo.mode & 0o100
+                tarinfo.mode = 0o755 if executable else 0o644
+                if tarinfo.isreg():
+                    with open(path, 'rb') as file_obj:
+                        tarball.addfile(tarinfo, file_obj)
+                else:
+                    tarball.addfile(tarinfo)
 
     def build(self,
               local_dir,
@@ -183,19 +404,45 @@ class ContainerBuilder(object):
       docker_filename (str): the path of the Dockerfile relative to the local_dir
       target_image (str): The container image name where the data will be pushed. Can include tag. If not specified, the function will use the default_image_name specified when creating ContainerBuilder.
       timeout (int): time out in seconds. Default: 1000
+
+    The build contexts and the records of the images built from them are
+    kept in the staging location, so that later builds reuse them, and are
+    never deleted by the builder. Use a dedicated staging location and
+    expire its objects, for example with an Object Lifecycle Management rule
+    of the GCS bucket. A recorded image is only reused if it still exists in
+    its registry, otherwise the context is built again.
     """
         target_image = target_image or self._get_default_image_name()
+        context_store = self._get_context_store()
         # Prepare build context
         with tempfile.TemporaryDirectory() as local_build_dir:
-            from ._gcs_helper import GCSHelper
             logging.info('Generate build files.')
             local_tarball_path = os.path.join(local_build_dir,
                                               'docker.tmp.tar.gz')
             self._wrap_dir_in_tarball(local_tarball_path, local_dir)
-            # Upload to the context
-            context = os.path.join(self._get_staging_location(),
-                                   str(uuid.uuid4()) + '.tar.gz')
-            GCSHelper.upload_gcs_file(local_tarball_path, context)
+            context_hash = calculate_file_hash(local_tarball_path)
+            staging_location = self._get_staging_location()
+
+            # Skip the build if the same context was already built to the
+            # target image
+            build_key = hashlib.sha256(
+                json.dumps([context_hash, docker_filename,
+                            target_image]).encode('utf-8')).hexdigest()
+            image_record = os.path.join(staging_location, 'images', build_key)
+            built_image_name = context_store.read_text(image_record)
+            if built_image_name and self._check_image_exists(built_image_name):
+                logging.info(
+                    'Found image {} built from the same context.'.format(
+                        built_image_name))
+                return built_image_name
+
+            # Upload to the context unless it is already there
+            context = os.path.join(staging_location, context_hash + '.tar.gz')
+            if context_store.exists(context):
+                logging.info(
+                    'Build context {} already uploaded.'.format(context))
+            else:
+                context_store.upload_file(local_tarball_path, context)
 
             # Run kaniko job
             kaniko_spec = self._generate_kaniko_spec(
@@ -203,14 +450,10 @@ class ContainerBuilder(object):
                 docker_filename=docker_filename,
                 target_image=target_image)
             logging.info('Start a kaniko job for build.')
-            from ._k8s_job_helper import K8sJobHelper
-            k8s_helper = K8sJobHelper(self._k8s_client_configuration)
-            result_pod_obj = k8s_helper.run_job(kaniko_spec, timeout)
+            result_pod_obj = self._get_job_runner().run_job(
+                kaniko_spec, timeout)
             logging.info('Kaniko job complete.')
 
-            # Clean up
-            GCSHelper.remove_gcs_blob(context)
-
             # Returning image name with digest
             (image_repo, _, image_tag) = target_image.partition(':')
             # When Kaniko build completes successfully, the termination message is the hash digest of the newly built image. Otherwise it's empty. See https://github.com/GoogleContainerTools/kaniko#--digest-file https://kubernetes.io/docs/tasks/debug-application-cluster/determine-reason-pod-failure/#customizing-the-termination-message
@@ -227,4 +470,5 @@ class ContainerBuilder(object):
             strict_image_name = image_repo + '@' + image_digest
             logging.info(
                 'Built and pushed image: {}.'.format(strict_image_name))
+            context_store.write_text(image_record, strict_image_name)
             return strict_image_name
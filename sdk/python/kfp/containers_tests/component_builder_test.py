@@ -16,6 +16,7 @@ import os
 import shutil
 import tempfile
 import unittest
+import warnings
 from unittest import mock
 
 from kfp.containers import _component_builder
@@ -64,3 +65,204 @@ class ComponentBuilderTest(unittest.TestCase):
             actual_component_yaml = f.read()
 
         self.assertEquals(actual_component_yaml, self._expected_component_yaml)
+
+    def _record_builds(self):
+        """Records the Dockerfile and requirements of the images built.
+
+        The images built are found in their registries.
+        """
+        builds = []
+
+        def build(builder,
+                  local_dir,
+                  docker_filename='Dockerfile',
+                  target_image=None,
+                  timeout=1000):
+            files = {}
+            for file_name in [docker_filename, 'requirements.txt']:
+                path = os.path.join(local_dir, file_name)
+                if os.path.exists(path):
+                    with open(path, 'r') as f:
+                        files[file_name] = f.read()
+            builds.append((target_image, files))
+            return '{}@sha256:{}'.format(target_image, len(builds))
+
+        patcher = mock.patch.object(
+            _container_builder.ContainerBuilder,
+            'build',
+            side_effect=build,
+            autospec=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = mock.patch.object(
+            _container_builder, '_image_exists_in_registry', return_value=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        return builds
+
+    def testBuildDependencyImageIsCached(self):
+        from kfp.containers._cache import clear_cache
+        clear_cache('build_dependency_image')
+        builds = self._record_builds()
+        builder = _container_builder.ContainerBuilder(
+            default_image_name=_TEST_TARGET_IMAGE)
+
+        image = _component_builder.build_dependency_image(
+            ['pandas==1.2.4', 'numpy'],
+            base_image='python:3.7',
+            target_image=_TEST_TARGET_IMAGE,
+            builder=builder)
+
+        self.assertEqual(_TEST_TARGET_IMAGE + '@sha256:1', image)
+        self.assertEqual([(_TEST_TARGET_IMAGE, {
+            'Dockerfile':
+                'FROM python:3.7\n'
+                'RUN apt-get update -y && apt-get install '
+                '--no-install-recommends -y -q python3 python3-pip '
+                'python3-setuptools\n'
+                'ADD requirements.txt /ml/requirements.txt\n'
+                'RUN python3 -m pip install -r /ml/requirements.txt\n',
+            'requirements.txt': 'numpy\npandas==1.2.4\n',
+        })], builds)
+
+        # The same requirement set, in another order, and another tag.
+        self.assertEqual(
+            image,
+            _component_builder.build_dependency_image(
+                ['numpy', 'pandas==1.2.4', 'numpy'],
+                base_image='python:3.7',
+                target_image=_TEST_TARGET_IMAGE + ':v2',
+                builder=builder))
+        self.assertEqual(
+            image,
+            _component_builder.build_dependency_image(
+                ['numpy', 'pandas==1.2.4'],
+                base_image='python:3.7',
+                builder=builder))
+        self.assertEqual(1, len(builds))
+
+        # The image is not reused in other registries.
+        other_registry_image = _component_builder.build_dependency_image(
+            ['numpy', 'pandas==1.2.4'],
+            base_image='python:3.7',
+            target_image='us-docker.pkg.dev/other-project/repo/my-image',
+            builder=builder)
+        self.assertEqual(
+            'us-docker.pkg.dev/other-project/repo/my-image@sha256:2',
+            other_registry_image)
+        self.assertEqual(2, len(builds))
+
+        _component_builder.build_dependency_image(['numpy', 'pandas==1.2.4'],
+                                                  base_image='python:3.8',
+                                                  builder=builder)
+        _component_builder.build_dependency_image(['numpy'],
+                                                  base_image='python:3.7',
+                                                  builder=builder)
+        self.assertEqual(4, len(builds))
+
+        self.assertEqual(
+            'python:3.7',
+            _component_builder.build_dependency_image([],
+                                                      base_image='python:3.7',
+                                                      builder=builder))
+        self.assertEqual(4, len(builds))
+
+    def testBuildDependencyImageIsRebuiltWhenDeleted(self):
+        from kfp.containers._cache import clear_cache
+        clear_cache('build_dependency_image')
+        builds = self._record_builds()
+        existing_images = set()
+        builder = _container_builder.ContainerBuilder(
+            default_image_name=_TEST_TARGET_IMAGE,
+            image_exists=existing_images.__contains__)
+
+        image = _component_builder.build_dependency_image(['numpy'],
+                                                          builder=builder)
+        existing_images.add(image)
+        self.assertEqual(
+            image,
+            _component_builder.build_dependency_image(['numpy'],
+                                                      builder=builder))
+        self.assertEqual(1, len(builds))
+
+        # The image was deleted from the registry.
+        existing_images.clear()
+        with warnings.catch_warnings():
+            warnings.simplefilter('error')
+            self.assertEqual(
+                _TEST_TARGET_IMAGE + '@sha256:2',
+                _component_builder.build_dependency_image(['numpy'],
+                                                          builder=builder))
+        self.assertEqual(2, len(builds))
+
+    def testBuildDependencyImageWithPlainBuilder(self):
+        from kfp.containers._cache import clear_cache
+        clear_cache('build_dependency_image')
+        builds = []
+
+        class PlainBuilder(object):
+
+            def build(self, local_dir, target_image, timeout):
+                builds.append(target_image)
+                return '{}@sha256:{}'.format(target_image, len(builds))
+
+        existing_images = set()
+        patcher = mock.patch.object(
+            _container_builder,
+            '_image_exists_in_registry',
+            side_effect=existing_images.__contains__)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        image = _component_builder.build_dependency_image(
+            ['numpy'], target_image=_TEST_TARGET_IMAGE, builder=PlainBuilder())
+        existing_images.add(image)
+        self.assertEqual(
+            image,
+            _component_builder.build_dependency_image(
+                ['numpy'],
+                target_image=_TEST_TARGET_IMAGE,
+                builder=PlainBuilder()))
+        self.assertEqual(1, len(builds))
+
+        with self.assertRaisesRegex(ValueError, 'target_image'):
+            _component_builder.build_dependency_image(['numpy'],
+                                                      builder=PlainBuilder())
+
+    def testBuildPythonComponentWithPrebuiltDependencies(self):
+        from kfp.containers._cache import clear_cache
+        clear_cache('build_dependency_image')
+        builds = self._record_builds()
+
+        def other_function(test_param: str):
+            pass
+
+        for component_func in [test_function, other_function]:
+            task_factory = _component_builder.build_python_component(
+                component_func=component_func,
+                target_image=_TEST_TARGET_IMAGE + ':v1',
+                base_image='python:3.7',
+                dependency=[
+                    _component_builder.VersionedDependency(
+                        name='pandas', version='1.2.4')
+                ],
+                staging_gcs_path=_TEST_STAGING_LOCATION,
+                prebuild_dependencies=True)
+
+        # The dependency image is built once, for both components.
+        dependency_image = _TEST_TARGET_IMAGE + '-dependencies'
+        self.assertEqual([
+            dependency_image, _TEST_TARGET_IMAGE + ':v1',
+            _TEST_TARGET_IMAGE + ':v1'
+        ], [build[0] for build in builds])
+        self.assertEqual('pandas >= 1.2.4, <= 1.2.4\n',
+                         builds[0][1]['requirements.txt'])
+        self.assertEqual(
+            {
+                'Dockerfile':
+                    'FROM {}@sha256:1\n'
+                    'ADD ml/main.py /ml/main.py\n'.format(dependency_image)
+            }, builds[2][1])
+        self.assertEqual(
+            _TEST_TARGET_IMAGE + ':v1@sha256:3',
+            task_factory.component_spec.implementation.container.image)
@@ -41,6 +41,11 @@ def sanitize_k8s_name(name, allow_capital_underscore=False):
                                         name.lower())).lstrip('-').rstrip('-')
 
 
+_PIPELINE_PARAM_PREFIX = '{{pipelineparam:'
+_PIPELINE_PARAM_REGEX = re.compile(
+    r'{{pipelineparam:op=([\w\s_-]*);name=([\w\s_-]+)}}')
+
+
 def match_serialized_pipelineparam(payload: str) -> List[PipelineParamTuple]:
     """Matches the supplied serialized pipelineparam.
 
@@ -50,8 +55,9 @@ def match_serialized_pipelineparam(payload: str) -> List[PipelineParamTuple]:
     Returns:
       The matched pipeline params we found in the supplied payload.
     """
-    matches = re.findall(r'{{pipelineparam:op=([\w\s_-]*);name=([\w\s_-]+)}}',
-                         payload)
+    if _PIPELINE_PARAM_PREFIX not in payload:
+        return []
+    matches = _PIPELINE_PARAM_REGEX.findall(payload)
     param_tuples = []
     for match in matches:
         pattern = '{{pipelineparam:op=%s;name=%s}}' % (match[0], match[1])
@@ -63,6 +69,27 @@ def match_serialized_pipelineparam(payload: str) -> List[PipelineParamTuple]:
     return param_tuples
 
 
+def replace_serialized_pipelineparams(payload: str,
+                                      replacements: Dict[str, str]) -> str:
+    """Replaces all the serialized pipelineparams in a payload in one scan.
+
+    Args:
+      payload: The string that may contain serialized pipelineparams.
+      replacements: The dict mapping serialized pipelineparams (the pattern
+        of a PipelineParamTuple) to their replacements.
+
+    Returns:
+      The payload with all the serialized pipelineparams replaced.
+
+    Raises:
+      KeyError: if the payload has a pipelineparam without a replacement.
+    """
+    if _PIPELINE_PARAM_PREFIX not in payload:
+        return payload
+    return _PIPELINE_PARAM_REGEX.sub(lambda match: replacements[match.group(0)],
+                                     payload)
+
+
 def _extract_pipelineparams(
         payloads: Union[str, List[str]]) -> List['PipelineParam']:
     """Extracts a list of PipelineParam instances from the payload string.
@@ -0,0 +1,89 @@
+# Copyright 2021 The Kubeflow Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import subprocess
+import sys
+import unittest
+
+
+def _get_imported_modules(code: str, modules):
+    """Runs code in a new interpreter and returns which of the modules it
+    imported."""
+    code += ('\nimport json, sys\n'
+             'print(json.dumps([m for m in {!r} if m in sys.modules]))'.format(
+                 list(modules)))
+    result = subprocess.run([sys.executable, '-c', code],
+                            stdout=subprocess.PIPE,
+                            check=True,
+                            universal_newlines=True)
+    return json.loads(result.stdout.splitlines()[-1])
+
+
+_HEAVY_MODULES = [
+    'kfp._client',
+    'kfp.compiler',
+    'kfp.dsl',
+    'kfp_server_api',
+    'kubernetes',
+    'requests',
+]
+
+
+class LazyImportsTest(unittest.TestCase):
+
+    def test_import_kfp_is_lazy(self):
+        self.assertEqual([], _get_imported_modules('import kfp',
+                                                   _HEAVY_MODULES))
+
+    def test_import_executor_is_lazy(self):
+        self.assertEqual([],
+                         _get_imported_modules(
+                             'import kfp.v2.components.executor',
+                             _HEAVY_MODULES))
+
+    def test_import_components_does_not_import_requests(self):
+        self.assertEqual([],
+                         _get_imported_modules('import kfp.components',
+                                               ['requests', 'kubernetes']))
+
+    def test_public_api(self):
+        import kfp
+        from kfp import components
+        self.assertIs(kfp.Client, kfp._client.Client)
+        self.assertIs(kfp.LocalClient, kfp._local_client.LocalClient)
+        self.assertTrue(callable(kfp.run_pipeline_func_on_cluster))
+        self.assertTrue(callable(kfp.dsl.pipeline))
+        self.assertTrue(callable(kfp.compiler.Compiler))
+        self.assertTrue(callable(kfp.v2.compiler.Compiler))
+        self.assertIs(components.ComponentStore,
+                      components._component_store.ComponentStore)
+        for name in kfp.__all__:
+            self.assertTrue(hasattr(kfp, name), name)
+        for name in components.__all__:
+            self.assertTrue(hasattr(components, name), name)
+        with self.assertRaises(AttributeError):
+            kfp.NotAnAttribute
+
+    def test_cli_help_does_not_import_client(self):
+        self.assertEqual([],
+                         _get_imported_modules(
+                             'import sys\nsys.argv = ["kfp", "--help"]\n'
+                             'from kfp.cli.cli import main\n'
+                             'try:\n    main()\nexcept SystemExit:\n    pass',
+                             ['kfp._client']))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -11,3 +11,23 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+
+import sys
+
+# The subpackages are imported when they are first accessed, e.g. importing
+# kfp.v2.components.executor does not import the compiler.
+_LAZY_SUBMODULES = ('compiler', 'components', 'dsl', 'google')
+
+
+def __getattr__(name):
+    if name in _LAZY_SUBMODULES:
+        import importlib
+        return importlib.import_module('.' + name, __name__)
+    raise AttributeError('module {!r} has no attribute {!r}'.format(
+        __name__, name))
+
+
+# The module __getattr__ is not supported before python 3.7.
+if sys.version_info < (3, 7):
+    from . import compiler
+    from . import components
@@ -29,6 +29,7 @@ from typing import (Any, Callable, Dict, List, Mapping, Optional, Set, Tuple,
 import kfp
 from google.protobuf import json_format
 from kfp import dsl
+from kfp.compiler._group_tree import GroupTree
 from kfp.compiler._k8s_helper import sanitize_k8s_name
 from kfp.dsl import _for_loop
 from kfp.dsl import component_spec as dsl_component_spec
@@ -64,86 +65,6 @@ class Compiler(object):
         kfp.v2.compiler.Compiler().compile(my_pipeline, 'path/to/pipeline.json')
     """
 
-    def _get_groups_for_ops(self,
-                            root_group: dsl.OpsGroup) -> Dict[str, List[str]]:
-        """Helper function to get groups that contain the specified ops.
-
-        Each pipeline has a root group. Each group has a list of operators (leaf)
-        and groups.
-        This function traverse the tree and get all ancestor groups for all
-        operators.
-
-        Args:
-         root_group: The root node of a ops tree or subtree.
-
-        Returns:
-          A dict. Key is the operator's name. Value is a list of ancestor groups
-          including the op itself. The list of a given operator is sorted in a way
-          that the farthest group is the first and operator itself is the last.
-        """
-
-        def _get_op_groups_helper(
-                current_groups: List[dsl.OpsGroup],
-                ops_to_groups: Dict[str, List[dsl.OpsGroup]]) -> None:
-            root_group = current_groups[-1]
-            for g in root_group.groups:
-                # Add recursive opsgroup in the ops_to_groups
-                # such that the i/o dependency can be propagated to the ancester opsgroups
-                if g.recursive_ref:
-                    ops_to_groups[g.name] = [x.name for x in current_groups
-                                            ] + [g.name]
-                    continue
-                current_groups.append(g)
-                _get_op_groups_helper(current_groups, ops_to_groups)
-                del current_groups[-1]
-            for op in root_group.ops:
-                ops_to_groups[op.name] = [x.name for x in current_groups
-                                         ] + [op.name]
-
-        ops_to_groups = {}
-        current_groups = [root_group]
-        _get_op_groups_helper(current_groups, ops_to_groups)
-        return ops_to_groups
-
-    #TODO: combine with the _get_groups_for_ops
-    def _get_groups_for_opsgroups(
-            self, root_group: dsl.OpsGroup) -> Dict[str, List[str]]:
-        """Helper function to get groups that contain the specified opsgroup.
-
-        Each pipeline has a root group. Each group has a list of operators (leaf)
-        and groups.
-        This function traverse the tree and get all ancestor groups for all
-        opsgroups.
-
-        Args:
-         root_group: The root node of a groups tree or subtree.
-
-        Returns:
-          A dict. Key is the opsgroup's name. Value is a list of ancestor groups
-          including the opsgroup itself. The list of a given opsgroup is sorted in a
-          way that the farthest group is the first and opsgroup itself is the last.
-        """
-
-        def _get_opsgroup_groups_helper(
-                current_groups: dsl.OpsGroup,
-                opsgroups_to_groups: Dict[str, List[dsl.OpsGroup]]) -> None:
-            root_group = current_groups[-1]
-            for g in root_group.groups:
-                # Add recursive opsgroup in the ops_to_groups
-                # such that the i/o dependency can be propagated to the ancester opsgroups
-                if g.recursive_ref:
-                    continue
-                opsgroups_to_groups[g.name] = [x.name for x in current_groups
-                                              ] + [g.name]
-                current_groups.append(g)
-                _get_opsgroup_groups_helper(current_groups, opsgroups_to_groups)
-                del current_groups[-1]
-
-        opsgroups_to_groups = {}
-        current_groups = [root_group]
-        _get_opsgroup_groups_helper(current_groups, opsgroups_to_groups)
-        return opsgroups_to_groups
-
     def _get_groups(self, root_group: dsl.OpsGroup) -> Dict[str, dsl.OpsGroup]:
         """Helper function to get all groups (not including ops) in a
         pipeline."""
@@ -159,41 +80,6 @@ class Compiler(object):
 
         return _get_groups_helper(root_group)
 
-    def _get_uncommon_ancestors(
-        self,
-        op_groups: Dict[str, List[str]],
-        opsgroup_groups: Dict[str, List[str]],
-        op1: dsl.BaseOp,
-        op2: dsl.BaseOp,
-    ) -> Tuple[List[_GroupOrOp], List[_GroupOrOp]]:
-        """Helper function to get unique ancestors between two ops.
-
-        For example, op1's ancestor groups are [root, G1, G2, G3, op1],
-        op2's ancestor groups are [root, G1, G4, op2], then it returns a
-        tuple ([G2, G3, op1], [G4, op2]).
-        """
-        #TODO: extract a function for the following two code module
-        if op1.name in op_groups:
-            op1_groups = op_groups[op1.name]
-        elif op1.name in opsgroup_groups:
-            op1_groups = opsgroup_groups[op1.name]
-        else:
-            raise ValueError(op1.name + ' does not exist.')
-
-        if op2.name in op_groups:
-            op2_groups = op_groups[op2.name]
-        elif op2.name in opsgroup_groups:
-            op2_groups = opsgroup_groups[op2.name]
-        else:
-            raise ValueError(op2.name + ' does not exist.')
-
-        both_groups = [op1_groups, op2_groups]
-        common_groups_len = sum(
-            1 for x in zip(*both_groups) if x == (x[0],) * len(x))
-        group1 = op1_groups[common_groups_len:]
-        group2 = op2_groups[common_groups_len:]
-        return (group1, group2)
-
     def _get_condition_params_for_ops(
             self, root_group: dsl.OpsGroup) -> Dict[str, dsl.PipelineParam]:
         """Get parameters referenced in conditions of ops."""
@@ -265,8 +151,7 @@ class Compiler(object):
         pipeline: dsl.Pipeline,
         args: List[dsl.PipelineParam],
         root_group: dsl.OpsGroup,
-        op_groups: Dict[str, List[str]],
-        opsgroup_groups: Dict[str, List[str]],
+        group_tree: GroupTree,
         condition_params: Dict[str, dsl.PipelineParam],
         op_name_to_for_loop_op: Dict[str, dsl.ParallelFor],
     ) -> Tuple[Dict[str, List[Tuple[dsl.PipelineParam, str]]], Dict[
@@ -277,8 +162,7 @@ class Compiler(object):
           pipeline: The instantiated pipeline object.
           args: The list of pipeline function arguments as PipelineParam.
           root_group: The root OpsGroup.
-          op_groups: The dict of op name to parent groups.
-          opsgroup_groups: The dict of opsgroup name to parent groups.
+          group_tree: The index of the ancestor groups of the ops and groups.
           condition_params: The dict of group name to pipeline params referenced in
             the conditions in that group.
           op_name_to_for_loop_op: The dict of op name to loop ops.
@@ -307,6 +191,14 @@ class Compiler(object):
                         param.pattern].param_type
                     all_params[param.pattern].param_type = param.param_type
 
+        # Params are passed along chains of ancestor groups. Once a param is
+        # known to be passed through a group, the rest of the chain above the
+        # group is known as well, so each chain is only walked once.
+        #   passed_down: (op_name, param_name, group_name) already given the param
+        #   passed_up_depths: (op_name, param_name) -> depth the output reached
+        passed_down = set()
+        passed_up_depths = {}
+
         for op in pipeline.ops.values():
             # op's inputs and all params used in conditions for that op are both
             # considered.
@@ -317,30 +209,57 @@ class Compiler(object):
                 if param.value:
                     continue
                 if param.op_name:
+                    if (param.op_name, param.full_name,
+                            group_tree.get_parent(op.name)) in passed_down:
+                        # Already passed down to the parent group, e.g. a param of a
+                        # condition shared by all the ops in it.
+                        inputs[op.name].add((param, None))
+                        continue
                     upstream_op = pipeline.ops[param.op_name]
-                    upstream_groups, downstream_groups = (
-                        self._get_uncommon_ancestors(op_groups, opsgroup_groups,
-                                                     upstream_op, op))
-                    for i, group_name in enumerate(downstream_groups):
-                        if i == 0:
-                            # If it is the first uncommon downstream group, then the input
-                            # comes from the first uncommon upstream group.
-                            inputs[group_name].add((param, upstream_groups[0]))
-                        else:
-                            # If not the first downstream group, then the input is passed down
-                            # from its ancestor groups so the upstream group is None.
-                            inputs[group_name].add((param, None))
-                    for i, group_name in enumerate(upstream_groups):
-                        if i == len(upstream_groups) - 1:
-                            # If last upstream group, it is an operator and output comes from container.
-                            outputs[group_name].add((param, None))
-                        else:
-                            # If not last upstream group, output value comes from one of its child.
-                            outputs[group_name].add(
-                                (param, upstream_groups[i + 1]))
+                    common_depth = group_tree.get_common_ancestor_depth(
+                        upstream_op.name, op.name)
+                    first_upstream_group = group_tree.get_ancestor(
+                        upstream_op.name, common_depth + 1)
+                    # The first uncommon downstream group gets the input from the
+                    # first uncommon upstream group. The groups below it get the
+                    # input passed down from their ancestor groups so the upstream
+                    # group is None.
+                    inputs[group_tree.get_ancestor(op.name,
+                                                   common_depth + 1)].add(
+                                                       (param,
+                                                        first_upstream_group))
+                    for group_name in group_tree.iter_ancestors(
+                            op.name, stop_depth=common_depth + 2):
+                        key = (param.op_name, param.full_name, group_name)
+                        if key in passed_down:
+                            break
+                        passed_down.add(key)
+                        inputs[group_name].add((param, None))
+
+                    # The operator output comes from the container. The output of the
+                    # upstream groups above it comes from one of their children.
+                    key = (param.op_name, param.full_name)
+                    depth = passed_up_depths.get(key)
+                    if depth is None:
+                        outputs[upstream_op.name].add((param, None))
+                        depth = group_tree.get_depth(upstream_op.name)
+                    if depth > common_depth + 1:
+                        upstream_groups = list(
+                            group_tree.iter_ancestors(
+                                upstream_op.name,
+                                start_depth=depth,
+                                stop_depth=common_depth + 1))
+                        for child_name, group_name in zip(
+                                upstream_groups, upstream_groups[1:]):
+                            outputs[group_name].add((param, child_name))
+                        passed_up_depths[key] = common_depth + 1
                 else:
                     if not op.is_exit_handler:
-                        for group_name in op_groups[op.name][::-1]:
+                        for group_name in group_tree.iter_ancestors(op.name):
+                            key = (None, param.full_name, group_name)
+                            if key in passed_down:
+                                break
+                            passed_down.add(key)
                             # if group is for loop group and param is that loop's param, then the param
                             # is created by that for loop ops_group and it shouldn't be an input to
                             # any of its parent groups.
@@ -368,7 +287,7 @@ class Compiler(object):
                     if param.op_name:
                         upstream_op = pipeline.ops[param.op_name]
                         upstream_groups, downstream_groups = \
-                          self._get_uncommon_ancestors(op_groups, opsgroup_groups, upstream_op, group)
+                          group_tree.get_uncommon_ancestors(upstream_op.name, group.name)
                         for i, g in enumerate(downstream_groups):
                             if i == 0:
                                 inputs[g].add((param, upstream_groups[0]))
@@ -385,7 +304,7 @@ class Compiler(object):
                             else:
                                 outputs[g].add((param, upstream_groups[i + 1]))
                     elif not is_condition_param:
-                        for g in op_groups[group.name]:
+                        for g in group_tree.get_ancestors(group.name):
                             inputs[g].add((param, None))
             for subgroup in group.groups:
                 _get_inputs_outputs_recursive_opsgroup(subgroup)
@@ -393,18 +312,13 @@ class Compiler(object):
         _get_inputs_outputs_recursive_opsgroup(root_group)
 
         # Generate the input for SubGraph along with parallelfor
-        for subgraph in opsgroup_groups:
-            if subgraph in op_name_to_for_loop_op:
-                # The opsgroup list is sorted with the farthest group as the first and the opsgroup
-                # itself as the last. To get the latest opsgroup which is not the opsgroup itself -2 is used.
-                parent = opsgroup_groups[subgraph][-2]
-                if parent and parent.startswith('subgraph'):
-                    # propagate only op's pipeline param from subgraph to parallelfor
-                    loop_op = op_name_to_for_loop_op[subgraph]
-                    pipeline_param = loop_op.loop_args.items_or_pipeline_param
-                    if loop_op.items_is_pipeline_param and pipeline_param.op_name:
-                        inputs[parent].add(
-                            (pipeline_param, pipeline_param.op_name))
+        for subgraph, loop_op in op_name_to_for_loop_op.items():
+            parent = group_tree.get_parent(subgraph)
+            if parent and parent.startswith('subgraph'):
+                # propagate only op's pipeline param from subgraph to parallelfor
+                pipeline_param = loop_op.loop_args.items_or_pipeline_param
+                if loop_op.items_is_pipeline_param and pipeline_param.op_name:
+                    inputs[parent].add((pipeline_param, pipeline_param.op_name))
 
         return inputs, outputs
 
@@ -412,8 +326,7 @@ class Compiler(object):
         self,
         pipeline: dsl.Pipeline,
         root_group: dsl.OpsGroup,
-        op_groups: Dict[str, List[str]],
-        opsgroups_groups: Dict[str, List[str]],
+        group_tree: GroupTree,
         opsgroups: Dict[str, dsl.OpsGroup],
         condition_params: Dict[str, dsl.PipelineParam],
     ) -> Dict[str, List[_GroupOrOp]]:
@@ -422,8 +335,7 @@ class Compiler(object):
         Args:
           pipeline: The instantiated pipeline object.
           root_group: The root OpsGroup.
-          op_groups: The dict of op name to parent groups.
-          opsgroup_groups: The dict of opsgroup name to parent groups.
+          group_tree: The index of the ancestor groups of the ops and groups.
           opsgroups: The dict of opsgroup name to opsgroup.
           condition_params: The dict of group name to pipeline params referenced in
             the conditions in that group.
@@ -437,6 +349,9 @@ class Compiler(object):
           sibling groups/ops can have dependencies.
         """
         dependencies = collections.defaultdict(set)
+        # (upstream_op_name, parent_group_name) -> the first uncommon ancestors,
+        # when they are the same for all the ops in the parent group.
+        sibling_dependencies = {}
         for op in pipeline.ops.values():
             upstream_op_names = set()
             for param in op.inputs + list(condition_params[op.name]):
@@ -446,17 +361,22 @@ class Compiler(object):
 
             for upstream_op_name in upstream_op_names:
                 # the dependent op could be either a BaseOp or an opsgroup
-                if upstream_op_name in pipeline.ops:
-                    upstream_op = pipeline.ops[upstream_op_name]
-                elif upstream_op_name in opsgroups:
-                    upstream_op = opsgroups[upstream_op_name]
-                else:
+                if (upstream_op_name not in pipeline.ops and
+                        upstream_op_name not in opsgroups):
                     raise ValueError('compiler cannot find the ' +
                                      upstream_op_name)
 
-                upstream_groups, downstream_groups = self._get_uncommon_ancestors(
-                    op_groups, opsgroups_groups, upstream_op, op)
-                dependencies[downstream_groups[0]].add(upstream_groups[0])
+                key = (upstream_op_name, group_tree.get_parent(op.name))
+                if key in sibling_dependencies:
+                    upstream_group, downstream_group = sibling_dependencies[key]
+                else:
+                    upstream_group, downstream_group = (
+                        group_tree.get_first_uncommon_ancestors(
+                            upstream_op_name, op.name))
+                    if downstream_group != op.name:
+                        sibling_dependencies[key] = (upstream_group,
+                                                     downstream_group)
+                dependencies[downstream_group].add(upstream_group)
 
         # Generate dependencies based on the recursive opsgroups
         #TODO: refactor the following codes with the above
@@ -471,16 +391,12 @@ class Compiler(object):
                         upstream_op_names.add(param.op_name)
 
             for op_name in upstream_op_names:
-                if op_name in pipeline.ops:
-                    upstream_op = pipeline.ops[op_name]
-                elif op_name in opsgroups:
-                    upstream_op = opsgroups[op_name]
-                else:
+                if op_name not in pipeline.ops and op_name not in opsgroups:
                     raise ValueError('compiler cannot find the ' + op_name)
-                upstream_groups, downstream_groups = (
-                    self._get_uncommon_ancestors(op_groups, opsgroups_groups,
-                                                 upstream_op, group))
-                dependencies[downstream_groups[0]].add(upstream_groups[0])
+                upstream_group, downstream_group = (
+                    group_tree.get_first_uncommon_ancestors(
+                        op_name, group.name))
+                dependencies[downstream_group].add(upstream_group)
 
             for subgroup in group.groups:
                 _get_dependency_opsgroup(subgroup, dependencies)
@@ -531,17 +447,14 @@ class Compiler(object):
     def _populate_metrics_in_dag_outputs(
         self,
         ops: List[dsl.ContainerOp],
-        op_to_parent_groups: Dict[str, List[str]],
+        group_tree: GroupTree,
         pipeline_spec: pipeline_spec_pb2.PipelineSpec,
     ) -> None:
         """Populates metrics artifacts in dag outputs.
 
         Args:
           ops: The list of ops that may produce metrics outputs.
-          op_to_parent_groups: The dict of op name to parent groups. Key is the op's
-            name. Value is a list of ancestor groups including the op itself. The
-            list of a given op is sorted in a way that the farthest group is the
-            first and the op itself is the last.
+          group_tree: The index of the ancestor groups of the ops and groups.
           pipeline_spec: The pipeline_spec to update in-place.
         """
         for op in ops:
@@ -553,7 +466,7 @@ class Compiler(object):
             # Get the tuple of (component_name, task_name) of all its parent groups.
             parent_components_and_tasks = [('_root', '')]
             # skip the op itself and the root group which cannot be retrived via name.
-            for group_name in op_to_parent_groups[op.name][1:-1]:
+            for group_name in group_tree.get_ancestors(op.name)[1:-1]:
                 parent_components_and_tasks.append(
                     (dsl_utils.sanitize_component_name(group_name),
                      dsl_utils.sanitize_task_name(group_name)))
@@ -598,7 +511,7 @@ class Compiler(object):
         pipeline_spec: pipeline_spec_pb2.PipelineSpec,
         deployment_config: pipeline_spec_pb2.PipelineDeploymentConfig,
         rootgroup_name: str,
-        op_to_parent_groups: Dict[str, List[str]],
+        group_tree: GroupTree,
     ) -> None:
         """Generate IR spec given an OpsGroup.
 
@@ -614,10 +527,7 @@ class Compiler(object):
           deployment_config: The deployment_config to hold all executors.
           rootgroup_name: The name of the group root. Used to determine whether the
             component spec for the current group should be the root dag.
-          op_to_parent_groups: The dict of op name to parent groups. Key is the op's
-            name. Value is a list of ancestor groups including the op itself. The
-            list of a given op is sorted in a way that the farthest group is the
-            first and the op itself is the last.
+          group_tree: The index of the ancestor groups of the ops and groups.
         """
         group_component_name = dsl_utils.sanitize_component_name(group.name)
 
@@ -873,7 +783,7 @@ class Compiler(object):
         # Surface metrics outputs to the top.
         self._populate_metrics_in_dag_outputs(
             group.ops,
-            op_to_parent_groups,
+            group_tree,
             pipeline_spec,
         )
 
@@ -911,9 +821,7 @@ class Compiler(object):
 
         root_group = pipeline.groups[0]
         opsgroups = self._get_groups(root_group)
-        op_name_to_parent_groups = self._get_groups_for_ops(root_group)
-        opgroup_name_to_parent_groups = self._get_groups_for_opsgroups(
-            root_group)
+        group_tree = GroupTree(root_group)
 
         condition_params = self._get_condition_params_for_ops(root_group)
         op_name_to_for_loop_op = self._get_for_loop_ops(root_group)
@@ -921,16 +829,14 @@ class Compiler(object):
             pipeline,
             args,
             root_group,
-            op_name_to_parent_groups,
-            opgroup_name_to_parent_groups,
+            group_tree,
             condition_params,
             op_name_to_for_loop_op,
         )
         dependencies = self._get_dependencies(
             pipeline,
             root_group,
-            op_name_to_parent_groups,
-            opgroup_name_to_parent_groups,
+            group_tree,
             opsgroups,
             condition_params,
         )
@@ -944,7 +850,7 @@ class Compiler(object):
                 pipeline_spec,
                 deployment_config,
                 root_group.name,
-                op_name_to_parent_groups,
+                group_tree,
             )
 
         # Exit Handler
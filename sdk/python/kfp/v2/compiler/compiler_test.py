@@ -17,13 +17,13 @@ import os
 import shutil
 import tempfile
 import unittest
+from typing import List
 
 from kfp import components
 from kfp.v2 import compiler
 from kfp.v2 import dsl
 from kfp.dsl import types
 
-
 VALID_PRODUCER_COMPONENT_SAMPLE = components.load_component_from_text("""
     name: producer
     inputs:
@@ -40,6 +40,7 @@ VALID_PRODUCER_COMPONENT_SAMPLE = components.load_component_from_text("""
         - {outputPath: output_value}
     """)
 
+
 class CompilerTest(unittest.TestCase):
 
     def test_compile_simple_pipeline(self):
@@ -177,10 +178,10 @@ class CompilerTest(unittest.TestCase):
         def my_pipeline(text: str):
             pass
 
-        with self.assertRaisesRegex(
-                ValueError,'Task is missing from pipeline.'):
+        with self.assertRaisesRegex(ValueError,
+                                    'Task is missing from pipeline.'):
             compiler.Compiler().compile(
-                  pipeline_func=my_pipeline, package_path='output.json')
+                pipeline_func=my_pipeline, package_path='output.json')
 
     def test_compile_pipeline_with_misused_inputuri_should_raise_error(self):
 
@@ -353,6 +354,42 @@ class CompilerTest(unittest.TestCase):
         finally:
             shutil.rmtree(tmpdir)
 
+    def test_compile_component_with_list_of_input_artifacts(self):
+
+        @dsl.component
+        def producer_op(output: dsl.Output[dsl.Dataset]):
+            pass
+
+        @dsl.component
+        def consumer_op(datasets: List[dsl.Input[dsl.Dataset]]):
+            pass
+
+        @dsl.pipeline(name='test-pipeline')
+        def my_pipeline():
+            consumer_op(producer_op().output)
+
+        try:
+            tmpdir = tempfile.mkdtemp()
+            target_json_file = os.path.join(tmpdir, 'result.json')
+            compiler.Compiler().compile(
+                pipeline_func=my_pipeline, package_path=target_json_file)
+
+            with open(target_json_file, 'r') as f:
+                job_spec = json.load(f)
+            input_definitions = job_spec['pipelineSpec']['components'][
+                'comp-consumer-op']['inputDefinitions']
+            self.assertEqual(
+                {
+                    'datasets': {
+                        'artifactType': {
+                            'schemaTitle': 'system.Dataset',
+                            'schemaVersion': '0.0.1'
+                        }
+                    }
+                }, input_definitions['artifacts'])
+        finally:
+            shutil.rmtree(tmpdir)
+
     def test_passing_arbitrary_artifact_to_input_expecting_concrete_artifact(
             self):
 
@@ -0,0 +1,673 @@
+# Copyright 2021 The Kubeflow Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Reads and writes the artifacts of v2 components in the object stores.
+
+The artifacts are read and written directly in the object store of their URI
+scheme. Large objects are downloaded in parts, concurrently, and objects are
+uploaded while they are written. When the local mount path of the URI
+(`/gcs/`, `/minio/` or `/s3/`) is present, or when there is no store for the
+URI scheme, the artifacts are read and written through the mount path.
+"""
+
+import abc
+import concurrent.futures
+import importlib.util
+import io
+import os
+import threading
+import warnings
+from typing import BinaryIO, Dict, Iterable, Iterator, Optional, Tuple
+
+from kfp.v2.components.types import artifact_types
+
+_MINIO_DEFAULT_ENDPOINT = 'minio-service.kubeflow:9000'
+_MINIO_REGION = 'minio'
+
+_DEFAULT_PART_SIZE = 8 * 1024 * 1024
+_DEFAULT_MAX_CONCURRENCY = 8
+
+
+class ArtifactStore(abc.ABC):
+    """An object store the artifacts of a URI scheme are read from and
+    written to.
+
+    Stores implement the object primitives (`_get_size`, `_list`,
+    `_read_range` and `_upload_stream`), on top of which the artifacts are
+    downloaded, uploaded and opened.
+
+    Args:
+      part_size: The size of the parts large objects are downloaded in, and of
+        the reads of opened objects.
+      max_concurrency: The maximum number of parts or files of an artifact
+        transferred concurrently.
+    """
+
+    def __init__(self,
+                 part_size: int = _DEFAULT_PART_SIZE,
+                 max_concurrency: int = _DEFAULT_MAX_CONCURRENCY):
+        self.part_size = part_size
+        self.max_concurrency = max_concurrency
+
+    @abc.abstractmethod
+    def _get_size(self, bucket: str, key: str) -> Optional[int]:
+        """Returns the size of an object, or None if it does not exist."""
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    def _list(self, bucket: str, prefix: str) -> Iterable[Tuple[str, int]]:
+        """Lists the keys and sizes of the objects under a prefix."""
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    def _read_range(self, bucket: str, key: str, start: int, end: int) -> bytes:
+        """Reads the bytes of an object from start to end (exclusive)."""
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    def _upload_stream(self, stream: BinaryIO, bucket: str, key: str) -> None:
+        """Writes an object with the content read from a stream until EOF."""
+        raise NotImplementedError()
+
+    def _upload_file(self, local_path: str, bucket: str, key: str) -> None:
+        with io.open(local_path, 'rb') as f:
+            self._upload_stream(f, bucket, key)
+
+    def open(self, uri: str, mode: str = 'rb') -> BinaryIO:
+        """Opens an object for reading or writing bytes.
+
+        Objects opened for reading are read in ranges of `part_size` bytes.
+        Objects opened for writing are uploaded while they are written, and
+        the upload completes when they are closed.
+
+        Args:
+          uri: The object URI.
+          mode: 'rb' or 'wb'.
+
+        Raises:
+          FileNotFoundError: The object to read does not exist.
+        """
+        bucket, key = _split_uri(uri)
+        if mode == 'rb':
+            size = self._get_size(bucket, key)
+            if size is None:
+                raise FileNotFoundError('Artifact {} not found.'.format(uri))
+            return io.BufferedReader(
+                _ObjectReader(self, bucket, key, size),
+                buffer_size=self.part_size)
+        if mode == 'wb':
+            return _ObjectWriter(self, bucket, key)
+        raise ValueError(
+            'Unsupported mode "{}". Use "rb" or "wb".'.format(mode))
+
+    def read_bytes(self, uri: str) -> bytes:
+        """Reads an object, in parts read concurrently if it is large."""
+        bucket, key = _split_uri(uri)
+        size = self._get_size(bucket, key)
+        if size is None:
+            raise FileNotFoundError('Artifact {} not found.'.format(uri))
+        return b''.join(
+            self._map(lambda part: self._read_range(bucket, key, *part),
+                      self._get_parts(size)))
+
+    def download(self, uri: str, local_path: str) -> None:
+        """Downloads an artifact to a local path.
+
+        An artifact is either a single object or all the objects under the
+        URI prefix, which are downloaded to a directory.
+
+        Args:
+          uri: The artifact URI, for example `gs://bucket/path/to/artifact`.
+          local_path: The local path to download the artifact to.
+
+        Raises:
+          FileNotFoundError: No object exists at or under the URI.
+        """
+        bucket, key = _split_uri(uri)
+        size = self._get_size(bucket, key)
+        if size is not None:
+            self._download_object(bucket, key, size, local_path)
+            return
+
+        prefix = key.rstrip('/') + '/'
+        objects = [(object_key, object_size)
+                   for object_key, object_size in self._list(bucket, prefix)
+                   if not object_key.endswith('/')]
+        if not objects:
+            raise FileNotFoundError('Artifact {} not found.'.format(uri))
+        self._map(
+            lambda item: self._download_object(
+                bucket, item[0], item[1],
+                os.path.join(local_path, *item[0][len(prefix):].split('/'))),
+            objects)
+
+    def upload(self, local_path: str, uri: str) -> None:
+        """Uploads a local file, or the files of a local directory, to the
+        artifact URI."""
+        bucket, key = _split_uri(uri)
+        if not os.path.isdir(local_path):
+            self._upload_file(local_path, bucket, key)
+            return
+
+        files = []
+        for dir_path, _, file_names in os.walk(local_path):
+            for file_name in file_names:
+                file_path = os.path.join(dir_path, file_name)
+                relative_path = os.path.relpath(file_path, local_path)
+                files.append((file_path, key.rstrip('/') + '/' +
+                              relative_path.replace(os.sep, '/')))
+        self._map(lambda item: self._upload_file(item[0], bucket, item[1]),
+                  files)
+
+    def _download_object(self, bucket: str, key: str, size: int,
+                         local_path: str) -> None:
+        _make_parent_dirs(local_path)
+        parts = self._get_parts(size)
+        if len(parts) <= 1:
+            with io.open(local_path, 'wb') as f:
+                if parts:
+                    f.write(self._read_range(bucket, key, *parts[0]))
+            return
+
+        with io.open(local_path, 'wb') as f:
+            f.truncate(size)
+
+        def download_part(part: Tuple[int, int]):
+            data = self._read_range(bucket, key, *part)
+            with io.open(local_path, 'r+b') as f:
+                f.seek(part[0])
+                f.write(data)
+
+        self._map(download_part, parts)
+
+    def _get_parts(self, size: int):
+        return [(start, min(start + self.part_size, size))
+                for start in range(0, size, self.part_size)]
+
+    def _map(self, function, items):
+        items = list(items)
+        if len(items) <= 1:
+            return [function(item) for item in items]
+        with concurrent.futures.ThreadPoolExecutor(
+                min(self.max_concurrency, len(items))) as executor:
+            return list(executor.map(function, items))
+
+
+class _ObjectReader(io.RawIOBase):
+    """Reads an object of an ArtifactStore with ranged reads."""
+
+    def __init__(self, store: ArtifactStore, bucket: str, key: str, size: int):
+        self._store = store
+        self._bucket = bucket
+        self._key = key
+        self._size = size
+        self._position = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self._position
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            offset += self._position
+        elif whence == io.SEEK_END:
+            offset += self._size
+        self._position = max(offset, 0)
+        return self._position
+
+    def readinto(self, buffer):
+        end = min(self._position + len(buffer), self._size)
+        if end <= self._position:
+            return 0
+        data = self._store._read_range(self._bucket, self._key, self._position,
+                                       end)
+        buffer[:len(data)] = data
+        self._position += len(data)
+        return len(data)
+
+
+class _PipeReader(io.RawIOBase):
+    """Reads the read end of a pipe, filling the buffers until EOF.
+
+    Unlike the reads of a pipe file, which return what is available, the
+    reads only return less than requested at EOF, as the uploads expect. The
+    stream also tells its position.
+    """
+
+    def __init__(self, fd: int):
+        self._file = io.FileIO(fd, 'rb')
+        self._position = 0
+
+    def readable(self):
+        return True
+
+    def tell(self):
+        return self._position
+
+    def readinto(self, buffer):
+        view = memoryview(buffer).cast('B')
+        num_read = 0
+        while num_read < len(view):
+            n = self._file.readinto(view[num_read:])
+            if not n:
+                break
+            num_read += n
+        self._position += num_read
+        return num_read
+
+    def close(self):
+        self._file.close()
+        super().close()
+
+
+class _ObjectWriter(io.RawIOBase):
+    """Uploads an object of an ArtifactStore while it is written.
+
+    The written bytes go through a pipe to a thread uploading them.
+    """
+
+    def __init__(self, store: ArtifactStore, bucket: str, key: str):
+        read_fd, write_fd = os.pipe()
+        self._pipe = io.FileIO(write_fd, 'wb')
+        self._error = None
+
+        def upload():
+            try:
+                with _PipeReader(read_fd) as stream:
+                    store._upload_stream(stream, bucket, key)
+            except BaseException as e:
+                self._error = e
+
+        self._thread = threading.Thread(target=upload, daemon=True)
+        self._thread.start()
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        data = memoryview(data).cast('B')
+        try:
+            num_written = 0
+            while num_written < len(data):
+                num_written += self._pipe.write(data[num_written:])
+        except BrokenPipeError:
+            # The upload stopped reading, because it failed.
+            self._thread.join()
+            self._raise_upload_error()
+            raise
+        return len(data)
+
+    def close(self):
+        if self.closed:
+            return
+        try:
+            self._pipe.close()
+        except BrokenPipeError:
+            pass
+        self._thread.join()
+        super().close()
+        self._raise_upload_error()
+
+    def _raise_upload_error(self):
+        if self._error is not None:
+            raise IOError('Failed to upload the artifact: {}'.format(
+                self._error)) from self._error
+
+
+class LocalDirectoryStore(ArtifactStore):
+    """Stand-in of an object store, for tests and local runs.
+
+    The object `<scheme>://<bucket>/<key>` is kept in `<root>/<bucket>/<key>`.
+    """
+
+    def __init__(self, root: str, **kwargs):
+        super().__init__(**kwargs)
+        self.root = root
+
+    def _get_local_path(self, bucket: str, key: str) -> str:
+        return os.path.join(self.root, bucket, *key.split('/'))
+
+    def _get_size(self, bucket: str, key: str) -> Optional[int]:
+        path = self._get_local_path(bucket, key)
+        return os.path.getsize(path) if os.path.isfile(path) else None
+
+    def _list(self, bucket: str, prefix: str) -> Iterator[Tuple[str, int]]:
+        bucket_path = os.path.join(self.root, bucket)
+        for dir_path, _, file_names in os.walk(
+                self._get_local_path(bucket, prefix)):
+            for file_name in file_names:
+                path = os.path.join(dir_path, file_name)
+                key = os.path.relpath(path, bucket_path).replace(os.sep, '/')
+                yield key, os.path.getsize(path)
+
+    def _read_range(self, bucket: str, key: str, start: int, end: int) -> bytes:
+        with io.open(self._get_local_path(bucket, key), 'rb') as f:
+            f.seek(start)
+            return f.read(end - start)
+
+    def _upload_stream(self, stream: BinaryIO, bucket: str, key: str) -> None:
+        path = self._get_local_path(bucket, key)
+        _make_parent_dirs(path)
+        with io.open(path, 'wb') as f:
+            while True:
+                data = stream.read(self.part_size)
+                if not data:
+                    break
+                f.write(data)
+
+
+class GcsStore(ArtifactStore):
+    """Reads and writes the `gs://` artifacts with the Google Cloud Storage
+    client."""
+
+    # The chunks of the resumable uploads are multiples of 256 KiB.
+    _UPLOAD_CHUNK_ALIGNMENT = 256 * 1024
+
+    def __init__(self, client=None, **kwargs):
+        super().__init__(**kwargs)
+        self._client = client
+        self._lock = threading.Lock()
+
+    def _get_client(self):
+        with self._lock:
+            if self._client is None:
+                from google.cloud import storage
+                self._client = storage.Client()
+            return self._client
+
+    def _get_size(self, bucket: str, key: str) -> Optional[int]:
+        blob = self._get_client().bucket(bucket).get_blob(key)
+        return blob.size if blob is not None else None
+
+    def _list(self, bucket: str, prefix: str) -> Iterator[Tuple[str, int]]:
+        for blob in self._get_client().list_blobs(bucket, prefix=prefix):
+            yield blob.name, blob.size
+
+    def _read_range(self, bucket: str, key: str, start: int, end: int) -> bytes:
+        blob = self._get_client().bucket(bucket).blob(key)
+        # The end of the range is inclusive.
+        return blob.download_as_string(start=start, end=end - 1)
+
+    def _upload_stream(self, stream: BinaryIO, bucket: str, key: str) -> None:
+        alignment = self._UPLOAD_CHUNK_ALIGNMENT
+        blob = self._get_client().bucket(bucket).blob(
+            key, chunk_size=max(1, -(-self.part_size // alignment)) * alignment)
+        blob.upload_from_file(stream)
+
+    def _upload_file(self, local_path: str, bucket: str, key: str) -> None:
+        self._get_client().bucket(bucket).blob(key).upload_from_filename(
+            local_path)
+
+
+class S3Store(ArtifactStore):
+    """Reads and writes the `s3://` and `minio://` artifacts with boto3.
+
+    The credentials are looked up by boto3, for example in the
+    `AWS_ACCESS_KEY_ID` and `AWS_SECRET_ACCESS_KEY` environment variables.
+    """
+
+    def __init__(self,
+                 endpoint_url: Optional[str] = None,
+                 region_name: Optional[str] = None,
+                 client=None,
+                 **kwargs):
+        super().__init__(**kwargs)
+        self.endpoint_url = endpoint_url
+        self.region_name = region_name
+        self._client = client
+        self._lock = threading.Lock()
+
+    def _get_client(self):
+        with self._lock:
+            if self._client is None:
+                import boto3
+                self._client = boto3.session.Session().client(
+                    's3',
+                    endpoint_url=self.endpoint_url,
+                    region_name=self.region_name)
+            return self._client
+
+    def _get_transfer_config(self):
+        from boto3.s3.transfer import TransferConfig
+        return TransferConfig(
+            multipart_chunksize=self.part_size,
+            max_concurrency=self.max_concurrency)
+
+    def _get_size(self, bucket: str, key: str) -> Optional[int]:
+        from botocore.exceptions import ClientError
+        try:
+            response = self._get_client().head_object(Bucket=bucket, Key=key)
+        except ClientError as e:
+            if e.response.get('Error', {}).get('Code') in ('404', 'NoSuchKey'):
+                return None
+            raise
+        return response['ContentLength']
+
+    def _list(self, bucket: str, prefix: str) -> Iterator[Tuple[str, int]]:
+        paginator = self._get_client().get_paginator('list_objects_v2')
+        for page in paginator.paginate(Bucket=bucket, Prefix=prefix):
+            for obj in page.get('Contents', []):
+                yield obj['Key'], obj['Size']
+
+    def _read_range(self, bucket: str, key: str, start: int, end: int) -> bytes:
+        response = self._get_client().get_object(
+            Bucket=bucket, Key=key, Range='bytes={}-{}'.format(start, end - 1))
+        return response['Body'].read()
+
+    def _upload_stream(self, stream: BinaryIO, bucket: str, key: str) -> None:
+        self._get_client().upload_fileobj(
+            stream, bucket, key, Config=self._get_transfer_config())
+
+    def _upload_file(self, local_path: str, bucket: str, key: str) -> None:
+        self._get_client().upload_file(
+            local_path, bucket, key, Config=self._get_transfer_config())
+
+
+_stores: Dict[str, Optional[ArtifactStore]] = {}
+_stores_lock = threading.Lock()
+
+
+def register_store(scheme: str, store: Optional[ArtifactStore]) -> None:
+    """Registers the store the artifacts of a URI scheme are read from and
+    written to.
+
+    Args:
+      scheme: The URI scheme, for example `gs`, `s3` or `minio`.
+      store: The store, or None to read and write the artifacts through their
+        local mount paths.
+    """
+    with _stores_lock:
+        _stores[scheme] = store
+
+
+def get_store(uri: str) -> Optional[ArtifactStore]:
+    """Returns the store of the URI scheme, or None if there is none.
+
+    By default, the `gs://` artifacts are read with google-cloud-storage
+    and the `s3://` and `minio://` ones with boto3, when these are
+    installed. The MinIO endpoint is read from the `MINIO_SERVICE_SERVICE_HOST`
+    and `MINIO_SERVICE_SERVICE_PORT` environment variables.
+    """
+    if '://' not in uri:
+        return None
+    scheme = uri.split('://', 1)[0]
+    with _stores_lock:
+        if scheme not in _stores:
+            _stores[scheme] = _make_default_store(scheme)
+        return _stores[scheme]
+
+
+def _make_default_store(scheme: str) -> Optional[ArtifactStore]:
+    if scheme == 'gs' and _is_importable('google.cloud.storage'):
+        return GcsStore()
+    if scheme == 's3' and _is_importable('boto3'):
+        return S3Store()
+    if scheme == 'minio' and _is_importable('boto3'):
+        host = os.environ.get('MINIO_SERVICE_SERVICE_HOST')
+        port = os.environ.get('MINIO_SERVICE_SERVICE_PORT')
+        endpoint = _MINIO_DEFAULT_ENDPOINT
+        if host and port:
+            endpoint = '{}:{}'.format(host, port)
+        return S3Store(
+            endpoint_url='http://' + endpoint, region_name=_MINIO_REGION)
+    return None
+
+
+def uses_mount_path(uri: str, mode: str = 'rb') -> bool:
+    """Returns whether an artifact is read or written through its local mount
+    path rather than in its object store.
+
+    An artifact is read through its mount path when the path exists, and
+    written through it when the mount directory of its URI scheme exists. The
+    mount path is also used when there is no store for the URI scheme.
+
+    Args:
+      uri: The artifact URI.
+      mode: 'rb' to read the artifact, 'wb' to write it.
+    """
+    mount_path = artifact_types.Artifact(uri=uri).path
+    if mount_path is None or get_store(uri) is None:
+        return True
+    if mode == 'rb':
+        return os.path.exists(mount_path)
+    mount_dir = mount_path[:-len(uri.split('://', 1)[1])]
+    return os.path.isdir(mount_dir)
+
+
+def open(uri: str, mode: str = 'rb') -> BinaryIO:
+    """Opens an artifact object for reading or writing bytes.
+
+    See `ArtifactStore.open`. The object is opened at its local mount path
+    instead when `uses_mount_path` is True.
+
+    Args:
+      uri: The artifact URI.
+      mode: 'rb' or 'wb'.
+    """
+    if uses_mount_path(uri, mode):
+        mount_path = artifact_types.Artifact(uri=uri).path or uri
+        if mode == 'wb':
+            _make_parent_dirs(mount_path)
+        return io.open(mount_path, mode)
+    return get_store(uri).open(uri, mode)
+
+
+def read_bytes(uri: str) -> bytes:
+    """Reads an artifact object.
+
+    The object is read from its local mount path instead when
+    `uses_mount_path` is True.
+    """
+    if uses_mount_path(uri):
+        with io.open(artifact_types.Artifact(uri=uri).path or uri, 'rb') as f:
+            return f.read()
+    return get_store(uri).read_bytes(uri)
+
+
+def get_local_path(scratch_dir: str, uri: str) -> str:
+    """Returns the path of the local copy of an artifact in a scratch
+    directory: `<scratch_dir>/<scheme>/<bucket>/<key>`."""
+    scheme, path = uri.split('://', 1)
+    return os.path.join(scratch_dir, scheme, *path.split('/'))
+
+
+def fetch_artifacts(artifacts: Iterable[artifact_types.Artifact],
+                    scratch_dir: str,
+                    max_workers: Optional[int] = None) -> None:
+    """Downloads the artifacts concurrently to a local scratch directory.
+
+    The artifacts are downloaded to `get_local_path(scratch_dir, uri)`, which
+    their `path` then returns. Artifacts read through their local mount path
+    (see `uses_mount_path`) or which fail to download are left on their local
+    mount path.
+
+    Args:
+      artifacts: The artifacts to download.
+      scratch_dir: The local directory to download the artifacts to, which
+        the caller removes once it no longer reads the artifacts.
+      max_workers: The maximum number of concurrent downloads.
+    """
+    downloads = {}
+    for artifact in artifacts:
+        if not uses_mount_path(artifact.uri):
+            downloads.setdefault(artifact.uri, []).append(artifact)
+    if not downloads:
+        return
+
+    def download(uri: str) -> str:
+        local_path = get_local_path(scratch_dir, uri)
+        get_store(uri).download(uri, local_path)
+        return local_path
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers) as executor:
+        futures = {uri: executor.submit(download, uri) for uri in downloads}
+        for uri, future in futures.items():
+            try:
+                local_path = future.result()
+            except Exception as e:
+                warnings.warn(
+                    'Could not download the artifact {}, reading it from its'
+                    ' local mount path instead. {}'.format(uri, e))
+                continue
+            for artifact in downloads[uri]:
+                artifact._local_path = local_path
+
+
+def upload_artifacts(artifacts: Iterable[artifact_types.Artifact],
+                     max_workers: Optional[int] = None) -> None:
+    """Uploads the local copies of the artifacts concurrently.
+
+    The artifacts written through their local mount path, which have no local
+    copy, and the artifacts which were not written are skipped.
+
+    Args:
+      artifacts: The artifacts to upload.
+      max_workers: The maximum number of concurrent uploads.
+    """
+    uploads = [
+        artifact for artifact in artifacts
+        if artifact._local_path is not None and
+        os.path.exists(artifact._local_path)
+    ]
+    if not uploads:
+        return
+    with concurrent.futures.ThreadPoolExecutor(max_workers) as executor:
+        futures = [
+            executor.submit(
+                get_store(artifact.uri).upload, artifact._local_path,
+                artifact.uri) for artifact in uploads
+        ]
+        for future in futures:
+            future.result()
+
+
+def _split_uri(uri: str) -> Tuple[str, str]:
+    path = uri.split('://', 1)[1]
+    bucket, _, key = path.partition('/')
+    return bucket, key
+
+
+def _make_parent_dirs(path: str) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+
+def _is_importable(module_name: str) -> bool:
+    try:
+        return importlib.util.find_spec(module_name) is not None
+    except ImportError:
+        return False
@@ -0,0 +1,221 @@
+# Copyright 2021 The Kubeflow Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for kfp.v2.components.artifact_io."""
+
+import os
+import tempfile
+import threading
+import unittest
+
+from kfp.v2.components import artifact_io
+from kfp.v2.components.types import artifact_types
+
+
+class _RecordingStore(artifact_io.LocalDirectoryStore):
+    """Records the ranges read and the threads reading them."""
+
+    def __init__(self, root: str, **kwargs):
+        super().__init__(root, **kwargs)
+        self.ranges = []
+        self.threads = set()
+        self._lock = threading.Lock()
+
+    def _read_range(self, bucket, key, start, end):
+        with self._lock:
+            self.ranges.append((key, start, end))
+            self.threads.add(threading.get_ident())
+        return super()._read_range(bucket, key, start, end)
+
+
+class _FailingUploadStore(artifact_io.LocalDirectoryStore):
+
+    def _upload_stream(self, stream, bucket, key):
+        stream.read(1)
+        raise RuntimeError('Upload failed.')
+
+
+class ArtifactStoreTest(unittest.TestCase):
+
+    def setUp(self):
+        self._store_dir = tempfile.mkdtemp()
+        self._local_dir = tempfile.mkdtemp()
+        self._store = _RecordingStore(
+            self._store_dir, part_size=4, max_concurrency=4)
+
+    def _write_object(self, key: str, data: bytes):
+        path = os.path.join(self._store_dir, 'bucket', key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(data)
+
+    def _read_object(self, key: str) -> bytes:
+        with open(os.path.join(self._store_dir, 'bucket', key), 'rb') as f:
+            return f.read()
+
+    def test_incomplete_store_cannot_be_created(self):
+
+        class IncompleteStore(artifact_io.ArtifactStore):
+
+            def _get_size(self, bucket, key):
+                return None
+
+        with self.assertRaisesRegex(TypeError, '_upload_stream'):
+            IncompleteStore()
+
+    def test_download_object_in_parts(self):
+        self._write_object('model', b'0123456789')
+        local_path = os.path.join(self._local_dir, 'model')
+
+        self._store.download('gs://bucket/model', local_path)
+
+        with open(local_path, 'rb') as f:
+            self.assertEqual(b'0123456789', f.read())
+        self.assertEqual([('model', 0, 4), ('model', 4, 8), ('model', 8, 10)],
+                         sorted(self._store.ranges))
+
+    def test_download_empty_object(self):
+        self._write_object('empty', b'')
+        local_path = os.path.join(self._local_dir, 'empty')
+
+        self._store.download('gs://bucket/empty', local_path)
+
+        with open(local_path, 'rb') as f:
+            self.assertEqual(b'', f.read())
+
+    def test_download_and_upload_directory(self):
+        self._write_object('dataset/part-0', b'a' * 10)
+        self._write_object('dataset/nested/part-1', b'b')
+        local_path = os.path.join(self._local_dir, 'dataset')
+
+        self._store.download('gs://bucket/dataset', local_path)
+        self._store.upload(local_path, 'gs://bucket/copy')
+
+        self.assertEqual(b'a' * 10, self._read_object('copy/part-0'))
+        self.assertEqual(b'b', self._read_object('copy/nested/part-1'))
+
+    def test_download_missing_artifact(self):
+        with self.assertRaises(FileNotFoundError):
+            self._store.download('gs://bucket/missing',
+                                 os.path.join(self._local_dir, 'missing'))
+
+    def test_read_bytes_in_parallel_parts(self):
+        data = bytes(range(256)) * 4
+        self._write_object('data', data)
+        self._store.part_size = 64
+
+        self.assertEqual(data, self._store.read_bytes('gs://bucket/data'))
+        self.assertEqual(16, len(self._store.ranges))
+
+    def test_open_for_reading(self):
+        self._write_object('data', b'0123456789')
+
+        with self._store.open('gs://bucket/data') as f:
+            self.assertEqual(b'01', f.read(2))
+            f.seek(7)
+            self.assertEqual(b'789', f.read())
+        with self.assertRaises(FileNotFoundError):
+            self._store.open('gs://bucket/missing')
+
+    def test_open_for_writing_streams_the_upload(self):
+        # More than the pipe buffer, which requires the object to be uploaded
+        # while it is written.
+        chunk = b'x' * 100000
+        with self._store.open('gs://bucket/data', 'wb') as f:
+            for _ in range(20):
+                f.write(chunk)
+
+        self.assertEqual(chunk * 20, self._read_object('data'))
+
+    def test_open_for_writing_raises_upload_errors(self):
+        store = _FailingUploadStore(self._store_dir)
+
+        with self.assertRaisesRegex(IOError, 'Upload failed.'):
+            with store.open('gs://bucket/data', 'wb') as f:
+                for _ in range(100):
+                    f.write(b'x' * 100000)
+
+
+class ArtifactIoTest(unittest.TestCase):
+
+    def setUp(self):
+        self._stores = dict(artifact_io._stores)
+        self._store_dir = tempfile.mkdtemp()
+        self._mount_dir = tempfile.mkdtemp()
+        self._gcs_mount_prefix = artifact_types._GCS_LOCAL_MOUNT_PREFIX
+        artifact_types._GCS_LOCAL_MOUNT_PREFIX = os.path.join(
+            self._mount_dir, 'gcs', '')
+        artifact_io.register_store(
+            'gs', artifact_io.LocalDirectoryStore(self._store_dir))
+        artifact_io.register_store('s3', None)
+
+    def tearDown(self):
+        artifact_types._GCS_LOCAL_MOUNT_PREFIX = self._gcs_mount_prefix
+        artifact_io._stores.clear()
+        artifact_io._stores.update(self._stores)
+
+    def test_uses_mount_path(self):
+        self.assertFalse(artifact_io.uses_mount_path('gs://bucket/data', 'rb'))
+        self.assertFalse(artifact_io.uses_mount_path('gs://bucket/data', 'wb'))
+        # No store for the scheme.
+        self.assertTrue(artifact_io.uses_mount_path('s3://bucket/data', 'rb'))
+        self.assertTrue(artifact_io.uses_mount_path('/local/data', 'rb'))
+
+        os.makedirs(os.path.join(self._mount_dir, 'gcs', 'bucket'))
+        self.assertTrue(artifact_io.uses_mount_path('gs://bucket/data', 'wb'))
+        self.assertFalse(artifact_io.uses_mount_path('gs://bucket/data', 'rb'))
+        with open(os.path.join(self._mount_dir, 'gcs', 'bucket', 'data'),
+                  'w') as f:
+            f.write('mounted')
+        self.assertTrue(artifact_io.uses_mount_path('gs://bucket/data', 'rb'))
+
+    def test_open_and_read_bytes_in_store(self):
+        with artifact_io.open('gs://bucket/data', 'wb') as f:
+            f.write(b'stored')
+
+        self.assertEqual(b'stored', artifact_io.read_bytes('gs://bucket/data'))
+        with artifact_io.open('gs://bucket/data') as f:
+            self.assertEqual(b'stored', f.read())
+        self.assertTrue(
+            os.path.exists(os.path.join(self._store_dir, 'bucket', 'data')))
+
+    def test_open_and_read_bytes_through_mount_path(self):
+        os.makedirs(os.path.join(self._mount_dir, 'gcs'))
+
+        with artifact_io.open('gs://bucket/data', 'wb') as f:
+            f.write(b'mounted')
+
+        self.assertEqual(b'mounted', artifact_io.read_bytes('gs://bucket/data'))
+        self.assertTrue(
+            os.path.exists(
+                os.path.join(self._mount_dir, 'gcs', 'bucket', 'data')))
+        self.assertFalse(
+            os.path.exists(os.path.join(self._store_dir, 'bucket', 'data')))
+
+    def test_upload_artifacts(self):
+        local_dir = tempfile.mkdtemp()
+        written = artifact_types.Model(uri='gs://bucket/model')
+        written._local_path = os.path.join(local_dir, 'model')
+        with open(written._local_path, 'w') as f:
+            f.write('model')
+        not_written = artifact_types.Model(uri='gs://bucket/other_model')
+        not_written._local_path = os.path.join(local_dir, 'other_model')
+
+        artifact_io.upload_artifacts([written, not_written], max_workers=2)
+
+        self.assertEqual(['model'],
+                         os.listdir(os.path.join(self._store_dir, 'bucket')))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -207,6 +207,11 @@ def extract_component_interface(func: Callable) -> structures.ComponentSpec:
         passing_style = None
         io_name = parameter.name
 
+        # A List[Input[T]] input receives all the artifacts passed to it, for
+        # example the outputs of the iterations of a ParallelFor.
+        parameter_type = type_annotations.get_input_artifact_list_item(
+            parameter_type) or parameter_type
+
         if type_annotations.is_artifact_annotation(parameter_type):
             # passing_style is either type_annotations.InputAnnotation or
             # type_annotations.OutputAnnotation.
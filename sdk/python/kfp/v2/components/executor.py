@@ -15,24 +15,60 @@ import inspect
 import json
 from typing import Any, Callable, Dict, List, Optional, Union
 
+from kfp.v2.components import artifact_io
 from kfp.v2.components.types import artifact_types, type_annotations
 
 
 class Executor():
-    """Executor executes v2-based Python function components."""
-
-    def __init__(self, executor_input: Dict, function_to_execute: Callable):
+    """Executor executes v2-based Python function components.
+
+    Before the function is called, the input artifacts are downloaded
+    concurrently to a local scratch directory (see
+    `artifact_io.fetch_artifacts`). The output artifacts are written to the
+    scratch directory and uploaded concurrently once the function returns,
+    unless their local mount path is present (see
+    `artifact_io.uses_mount_path`).
+
+    Args:
+      executor_input: The executor input, as a dict.
+      function_to_execute: The component function.
+      max_fetch_workers: The maximum number of input artifacts downloaded
+        concurrently.
+      scratch_dir: The local directory to download the input artifacts to and
+        to write the output artifacts to. Defaults to a new temporary
+        directory, which is removed once the output artifacts are uploaded.
+      max_upload_workers: The maximum number of output artifacts uploaded
+        concurrently.
+    """
+
+    def __init__(self,
+                 executor_input: Dict,
+                 function_to_execute: Callable,
+                 max_fetch_workers: Optional[int] = None,
+                 scratch_dir: Optional[str] = None,
+                 max_upload_workers: Optional[int] = None):
         self._func = function_to_execute
         self._input = executor_input
+        self._max_fetch_workers = max_fetch_workers
+        self._max_upload_workers = max_upload_workers
+        self._scratch_dir = scratch_dir
+        # The temporary scratch directory, created when scratch_dir is None.
+        self._temp_dir = None
         self._input_artifacts: Dict[str, artifact_types.Artifact] = {}
+        self._input_artifact_lists: Dict[str,
+                                         List[artifact_types.Artifact]] = {}
         self._output_artifacts: Dict[str, artifact_types.Artifact] = {}
 
         for name, artifacts in self._input.get('inputs',
                                                {}).get('artifacts', {}).items():
             artifacts_list = artifacts.get('artifacts')
             if artifacts_list:
-                self._input_artifacts[name] = self._make_input_artifact(
-                    artifacts_list[0])
+                self._input_artifact_lists[name] = [
+                    self._make_input_artifact(runtime_artifact)
+                    for runtime_artifact in artifacts_list
+                ]
+                self._input_artifacts[name] = self._input_artifact_lists[name][
+                    0]
 
         for name, artifacts in self._input.get('outputs',
                                                {}).get('artifacts', {}).items():
@@ -49,16 +85,52 @@ class Executor():
     def _make_input_artifact(cls, runtime_artifact: Dict):
         return artifact_types.create_runtime_artifact(runtime_artifact)
 
-    @classmethod
-    def _make_output_artifact(cls, runtime_artifact: Dict):
+    def _make_output_artifact(self, runtime_artifact: Dict):
         import os
         artifact = artifact_types.create_runtime_artifact(runtime_artifact)
+        if not artifact_io.uses_mount_path(artifact.uri, 'wb'):
+            # The artifact is written to a local copy, uploaded once the
+            # function returns.
+            artifact._local_path = artifact_io.get_local_path(
+                os.path.join(self._get_scratch_dir(), 'outputs'), artifact.uri)
         os.makedirs(os.path.dirname(artifact.path), exist_ok=True)
         return artifact
 
+    def _get_scratch_dir(self) -> str:
+        if self._scratch_dir is None:
+            import tempfile
+            self._temp_dir = tempfile.TemporaryDirectory(
+                prefix='kfp-artifacts-')
+            self._scratch_dir = self._temp_dir.name
+        return self._scratch_dir
+
+    def _cleanup_scratch_dir(self):
+        if self._temp_dir is not None:
+            self._temp_dir.cleanup()
+            self._temp_dir = None
+            self._scratch_dir = None
+
     def _get_input_artifact(self, name: str):
         return self._input_artifacts.get(name)
 
+    def _get_input_artifact_list(self, name: str):
+        return self._input_artifact_lists.get(name, [])
+
+    def _fetch_input_artifacts(self):
+        input_artifacts = [
+            artifact for artifacts in self._input_artifact_lists.values()
+            for artifact in artifacts
+        ]
+        artifact_io.fetch_artifacts(
+            input_artifacts,
+            scratch_dir=self._get_scratch_dir(),
+            max_workers=self._max_fetch_workers)
+
+    def _upload_output_artifacts(self):
+        artifact_io.upload_artifacts(
+            self._output_artifacts.values(),
+            max_workers=self._max_upload_workers)
+
     def _get_output_artifact(self, name: str):
         return self._output_artifacts.get(name)
 
@@ -189,7 +261,8 @@ class Executor():
     def _handle_single_return_value(self, output_name: str,
                                     annotation_type: Any, return_value: Any):
         if self._is_parameter(annotation_type):
-            origin_type = getattr(annotation_type, '__origin__', None) or annotation_type
+            origin_type = getattr(annotation_type, '__origin__',
+                                  None) or annotation_type
             if not isinstance(return_value, origin_type):
                 raise ValueError(
                     'Function `{}` returned value of type {}; want type {}'
@@ -246,6 +319,8 @@ class Executor():
                     ' subclass of `Artifact`, or a NamedTuple collection of these types.'
                     .format(self._return_annotation))
 
+        self._upload_output_artifacts()
+
         import os
         os.makedirs(
             os.path.dirname(self._input['outputs']['outputFile']),
@@ -254,6 +329,13 @@ class Executor():
             f.write(json.dumps(self._executor_output))
 
     def execute(self):
+        try:
+            self._execute()
+        finally:
+            self._cleanup_scratch_dir()
+
+    def _execute(self):
+        self._fetch_input_artifacts()
         annotations = inspect.getfullargspec(self._func).annotations
 
         # Function arguments.
@@ -268,6 +350,10 @@ class Executor():
             # `Optional[]` to get the actual parameter type.
             v = type_annotations.maybe_strip_optional_from_annotation(v)
 
+            if type_annotations.get_input_artifact_list_item(v) is not None:
+                func_kwargs[k] = self._get_input_artifact_list(k)
+                continue
+
             if self._is_parameter(v):
                 func_kwargs[k] = self._get_input_parameter_value(k, v)
 
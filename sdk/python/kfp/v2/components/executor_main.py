@@ -60,6 +60,16 @@ def executor_main():
         type=str,
         help='JSON-serialized ExecutorInput from the orchestrator. '
         'This should contain inputs and placeholders for outputs.')
+    parser.add_argument(
+        '--max_fetch_workers',
+        type=int,
+        default=None,
+        help='The maximum number of input artifacts downloaded concurrently.')
+    parser.add_argument(
+        '--max_upload_workers',
+        type=int,
+        default=None,
+        help='The maximum number of output artifacts uploaded concurrently.')
 
     args, _ = parser.parse_known_args()
 
@@ -75,7 +85,10 @@ def executor_main():
     function_to_execute = getattr(module, args.function_to_execute)
 
     executor = component_executor.Executor(
-        executor_input=executor_input, function_to_execute=function_to_execute)
+        executor_input=executor_input,
+        function_to_execute=function_to_execute,
+        max_fetch_workers=args.max_fetch_workers,
+        max_upload_workers=args.max_upload_workers)
 
     executor.execute()
 
@@ -16,10 +16,11 @@
 import json
 import os
 import tempfile
+import threading
 import unittest
 from typing import Callable, Dict, List, NamedTuple, Optional
 
-from kfp.v2.components import executor
+from kfp.v2.components import artifact_io, executor
 from kfp.v2.components.types import artifact_types
 from kfp.v2.components.types.artifact_types import (Artifact, Dataset, Metrics,
                                                     Model)
@@ -95,19 +96,58 @@ class ExecutorTest(unittest.TestCase):
         artifact_types._GCS_LOCAL_MOUNT_PREFIX = self._test_dir + '/'
         artifact_types._MINIO_LOCAL_MOUNT_PREFIX = self._test_dir + '/minio/'
         artifact_types._S3_LOCAL_MOUNT_PREFIX = self._test_dir + '/s3/'
+        # The artifacts are read through the local mount paths unless a test
+        # registers a store.
+        self._stores = dict(artifact_io._stores)
+        for scheme in ['gs', 'minio', 's3']:
+            artifact_io.register_store(scheme, None)
         return super().setUp()
 
-    def _get_executor(
-            self,
-            func: Callable,
-            executor_input: Optional[str] = None) -> executor.Executor:
+    def tearDown(self):
+        artifact_io._stores.clear()
+        artifact_io._stores.update(self._stores)
+        return super().tearDown()
+
+    def _get_executor(self,
+                      func: Callable,
+                      executor_input: Optional[str] = None,
+                      **kwargs) -> executor.Executor:
         if executor_input is None:
             executor_input = _EXECUTOR_INPUT
 
         executor_input_dict = json.loads(executor_input % self._test_dir)
 
         return executor.Executor(
-            executor_input=executor_input_dict, function_to_execute=func)
+            executor_input=executor_input_dict,
+            function_to_execute=func,
+            **kwargs)
+
+    def _get_list_executor_input(self, uris: List[str]) -> str:
+        return json.dumps({
+            'inputs': {
+                'artifacts': {
+                    'datasets': {
+                        'artifacts': [{
+                            'metadata': {},
+                            'name': 'dataset_{}'.format(i),
+                            'type': {
+                                'schemaTitle': 'system.Dataset'
+                            },
+                            'uri': uri
+                        } for i, uri in enumerate(uris)]
+                    }
+                }
+            },
+            'outputs': {
+                'outputFile': '%s/output_metadata.json'
+            }
+        })
+
+    def _write_store_object(self, store_dir: str, key: str, contents: str):
+        path = os.path.join(store_dir, key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as f:
+            f.write(contents)
 
     def test_input_parameter(self):
 
@@ -128,6 +168,144 @@ class ExecutorTest(unittest.TestCase):
 
         self._get_executor(test_func).execute()
 
+    def test_list_of_input_artifacts(self):
+        store_dir = tempfile.mkdtemp()
+        artifact_io.register_store('gs',
+                                   artifact_io.LocalDirectoryStore(store_dir))
+        for i in range(3):
+            self._write_store_object(store_dir,
+                                     'some-bucket/dataset_{}'.format(i),
+                                     'Dataset {}'.format(i))
+        scratch_dir = os.path.join(self._test_dir, 'scratch')
+        fetched = []
+
+        def test_func(datasets: List[Input[Dataset]]):
+            for dataset in datasets:
+                with open(dataset.path, 'r') as f:
+                    contents = f.read()
+                fetched.append(
+                    (dataset.name, dataset.uri, dataset.path, contents))
+
+        self._get_executor(
+            test_func,
+            self._get_list_executor_input(
+                ['gs://some-bucket/dataset_{}'.format(i) for i in range(3)]),
+            scratch_dir=scratch_dir).execute()
+        self.assertEqual(
+            [('dataset_{}'.format(i), 'gs://some-bucket/dataset_{}'.format(i),
+              os.path.join(scratch_dir, 'gs', 'some-bucket',
+                           'dataset_{}'.format(i)), 'Dataset {}'.format(i))
+             for i in range(3)], fetched)
+
+    def test_default_scratch_dir_is_removed(self):
+        artifact_types._GCS_LOCAL_MOUNT_PREFIX = os.path.join(
+            self._test_dir, 'no-mount', '')
+        store_dir = tempfile.mkdtemp()
+        artifact_io.register_store('gs',
+                                   artifact_io.LocalDirectoryStore(store_dir))
+        self._write_store_object(store_dir, 'some-bucket/input_artifact_one',
+                                 'Dataset')
+        local_paths = []
+
+        def test_func(input_artifact_one_path: Input[Dataset],
+                      output_artifact_one_path: Output[Model]):
+            local_paths.extend(
+                [input_artifact_one_path.path, output_artifact_one_path.path])
+            with open(output_artifact_one_path.path, 'w') as f:
+                f.write('Model')
+
+        self._get_executor(test_func).execute()
+
+        self.assertEqual(2, len(local_paths))
+        for local_path in local_paths:
+            self.assertFalse(local_path.startswith(self._test_dir))
+            self.assertFalse(os.path.exists(local_path))
+        # The output artifact was uploaded before the removal.
+        with open(
+                os.path.join(store_dir, 'some-bucket/output_artifact_one'),
+                'r') as f:
+            self.assertEqual('Model', f.read())
+
+        def failing_func(input_artifact_one_path: Input[Dataset]):
+            local_paths.append(input_artifact_one_path.path)
+            raise RuntimeError('Function failed.')
+
+        with self.assertRaisesRegex(RuntimeError, 'Function failed.'):
+            self._get_executor(failing_func).execute()
+        self.assertFalse(os.path.exists(local_paths[-1]))
+
+    def test_input_artifacts_are_fetched_concurrently(self):
+        barrier = threading.Barrier(3, timeout=10)
+
+        class BarrierStore(artifact_io.LocalDirectoryStore):
+
+            def download(self, uri: str, local_path: str) -> None:
+                # Only returns when the 3 artifacts are downloaded at once.
+                barrier.wait()
+                os.makedirs(os.path.dirname(local_path), exist_ok=True)
+                with open(local_path, 'w') as f:
+                    f.write(uri)
+
+        artifact_io.register_store('s3', BarrierStore(tempfile.mkdtemp()))
+
+        def test_func(datasets: List[Input[Dataset]]):
+            self.assertEqual(
+                ['s3://some-bucket/dataset_{}'.format(i) for i in range(3)],
+                [open(dataset.path).read() for dataset in datasets])
+
+        self._get_executor(
+            test_func,
+            self._get_list_executor_input(
+                ['s3://some-bucket/dataset_{}'.format(i) for i in range(3)]),
+            max_fetch_workers=3).execute()
+
+    def test_input_artifact_directory_is_fetched(self):
+        store_dir = tempfile.mkdtemp()
+        artifact_io.register_store('minio',
+                                   artifact_io.LocalDirectoryStore(store_dir))
+        self._write_store_object(store_dir, 'some-bucket/dataset/part-0', 'a')
+        self._write_store_object(store_dir, 'some-bucket/dataset/part-1', 'b')
+
+        def test_func(datasets: List[Input[Dataset]]):
+            [dataset] = datasets
+            self.assertEqual(['part-0', 'part-1'],
+                             sorted(os.listdir(dataset.path)))
+
+        self._get_executor(
+            test_func,
+            self._get_list_executor_input(['minio://some-bucket/dataset'
+                                          ])).execute()
+
+    def test_input_artifact_on_mount_path_is_not_fetched(self):
+        artifact_io.register_store(
+            'gs', artifact_io.LocalDirectoryStore(tempfile.mkdtemp()))
+        mount_path = os.path.join(self._test_dir, 'some-bucket/dataset')
+        self._write_store_object(self._test_dir, 'some-bucket/dataset',
+                                 'Mounted')
+
+        def test_func(datasets: List[Input[Dataset]]):
+            self.assertEqual([mount_path],
+                             [dataset.path for dataset in datasets])
+
+        self._get_executor(
+            test_func,
+            self._get_list_executor_input(['gs://some-bucket/dataset'
+                                          ])).execute()
+
+    def test_input_artifact_falls_back_to_mount_path_when_fetch_fails(self):
+        artifact_io.register_store(
+            'gs', artifact_io.LocalDirectoryStore(tempfile.mkdtemp()))
+
+        def test_func(input_artifact_one_path: Input[Dataset]):
+            self.assertEqual(
+                input_artifact_one_path.path,
+                os.path.join(self._test_dir, 'some-bucket/input_artifact_one'))
+
+        with self.assertWarnsRegex(
+                UserWarning, 'Could not download the artifact '
+                'gs://some-bucket/input_artifact_one'):
+            self._get_executor(test_func).execute()
+
     def test_output_artifact(self):
 
         def test_func(output_artifact_one_path: Output[Model]):
@@ -142,20 +320,54 @@ class ExecutorTest(unittest.TestCase):
 
         self._get_executor(test_func).execute()
 
+    def test_output_artifact_is_uploaded_without_mount(self):
+        artifact_types._GCS_LOCAL_MOUNT_PREFIX = os.path.join(
+            self._test_dir, 'no-mount', '')
+        store_dir = tempfile.mkdtemp()
+        artifact_io.register_store('gs',
+                                   artifact_io.LocalDirectoryStore(store_dir))
+        scratch_dir = os.path.join(self._test_dir, 'scratch')
+
+        def test_func(output_artifact_one_path: Output[Model]):
+            self.assertEqual(
+                output_artifact_one_path.path,
+                os.path.join(scratch_dir, 'outputs', 'gs', 'some-bucket',
+                             'output_artifact_one'))
+            with open(output_artifact_one_path.path, 'w') as f:
+                f.write('Model')
+
+        self._get_executor(test_func, scratch_dir=scratch_dir).execute()
+
+        # The metrics artifact is not written, so not uploaded.
+        self.assertEqual(['output_artifact_one'],
+                         os.listdir(os.path.join(store_dir, 'some-bucket')))
+        with open(
+                os.path.join(store_dir, 'some-bucket/output_artifact_one'),
+                'r') as f:
+            self.assertEqual('Model', f.read())
+        with open(os.path.join(self._test_dir, 'output_metadata.json'),
+                  'r') as f:
+            output_metadata = json.loads(f.read())
+        artifacts = output_metadata['artifacts']['output_artifact_one_path']
+        self.assertEqual('gs://some-bucket/output_artifact_one',
+                         artifacts['artifacts'][0]['uri'])
+
     def test_output_parameter(self):
+        output_file = os.path.join(self._test_dir, 'some_task', 'nested',
+                                   'output_parameter')
+        executor_input = _EXECUTOR_INPUT.replace(
+            'gs://some-bucket/some_task/nested/output_parameter', output_file)
 
         def test_func(output_parameter_path: OutputPath(str)):
             # Test that output parameters just use the passed in filename.
-            self.assertEqual(
-                output_parameter_path,
-                'gs://some-bucket/some_task/nested/output_parameter')
+            self.assertEqual(output_parameter_path, output_file)
 
             # Test writing to the path succeeds. This fails if parent directories
             # don't exist.
             with open(output_parameter_path, 'w') as f:
                 f.write('Hello, World!')
 
-        self._get_executor(test_func).execute()
+        self._get_executor(test_func, executor_input).execute()
 
     def test_input_path_artifact(self):
 
@@ -368,13 +580,14 @@ class ExecutorTest(unittest.TestCase):
         with open(os.path.join(self._test_dir, 'output_metadata.json'),
                   'r') as f:
             output_metadata = json.loads(f.read())
-        self.assertDictEqual(output_metadata, {
-            "parameters": {
-                "Output": {
-                    "stringValue": "{\"first\": 40, \"second\": 2}"
-                }
-            },
-        })
+        self.assertDictEqual(
+            output_metadata, {
+                "parameters": {
+                    "Output": {
+                        "stringValue": "{\"first\": 40, \"second\": 2}"
+                    }
+                },
+            })
 
     def test_function_with_typed_list_output(self):
         executor_input = """\
@@ -446,13 +659,14 @@ class ExecutorTest(unittest.TestCase):
         with open(os.path.join(self._test_dir, 'output_metadata.json'),
                   'r') as f:
             output_metadata = json.loads(f.read())
-        self.assertDictEqual(output_metadata, {
-            "parameters": {
-                "Output": {
-                    "stringValue": "{\"first\": 40, \"second\": 2}"
-                }
-            },
-        })
+        self.assertDictEqual(
+            output_metadata, {
+                "parameters": {
+                    "Output": {
+                        "stringValue": "{\"first\": 40, \"second\": 2}"
+                    }
+                },
+            })
 
     def test_artifact_output(self):
         executor_input = """\
@@ -37,6 +37,9 @@ class Artifact(object):
     """
     TYPE_NAME = 'system.Artifact'
     VERSION = '0.0.1'
+    # The local copy of the artifact, when it was downloaded from the object
+    # store instead of being read through the local mount path.
+    _local_path: Optional[str] = None
 
     def __init__(self,
                  name: Optional[str] = None,
@@ -56,6 +59,8 @@ class Artifact(object):
         self._set_path(path)
 
     def _get_path(self) -> Optional[str]:
+        if self._local_path is not None:
+            return self._local_path
         if self.uri.startswith('gs://'):
             return _GCS_LOCAL_MOUNT_PREFIX + self.uri[len('gs://'):]
         elif self.uri.startswith('minio://'):
@@ -17,7 +17,7 @@ These are only compatible with v2 Pipelines.
 """
 
 import re
-from typing import TypeVar, Union
+from typing import List, TypeVar, Union
 
 try:
     from typing import Annotated
@@ -110,6 +110,22 @@ def get_io_artifact_annotation(typ):
     return typ.__metadata__[0]
 
 
+def get_input_artifact_list_item(typ):
+    """Returns Input[T] if typ is of type List[Input[T]], otherwise None.
+
+    For example::
+      List[Input[Dataset]] -> Input[Dataset]
+      Input[Dataset] -> None
+      List[str] -> None
+    """
+    if getattr(typ, '__origin__', None) not in (list, List):
+        return None
+    args = getattr(typ, '__args__', None)
+    if not args or not is_input_artifact(args[0]):
+        return None
+    return args[0]
+
+
 def maybe_strip_optional_from_annotation(annotation: T) -> T:
     """Strips 'Optional' from 'Optional[<type>]' if applicable.
 
@@ -79,6 +79,19 @@ class AnnotationsTest(parameterized.TestCase):
             type_annotations.get_io_artifact_annotation(Model), None)
         self.assertEqual(type_annotations.get_io_artifact_annotation(str), None)
 
+    def test_get_input_artifact_list_item(self):
+        self.assertEqual(
+            type_annotations.get_input_artifact_list_item(List[Input[Model]]),
+            Input[Model])
+
+        self.assertIsNone(
+            type_annotations.get_input_artifact_list_item(List[Output[Model]]))
+        self.assertIsNone(
+            type_annotations.get_input_artifact_list_item(Input[Model]))
+        self.assertIsNone(type_annotations.get_input_artifact_list_item(List))
+        self.assertIsNone(
+            type_annotations.get_input_artifact_list_item(List[str]))
+
     @parameterized.parameters(
         {
             'original_annotation': str,
@@ -57,9 +57,15 @@ REQUIRES = [
 ]
 
 TESTS_REQUIRE = [
+    'aiohttp>=3.7,<4',
     'frozendict',
 ]
 
+EXTRAS_REQUIRE = {
+    # kfp.AsyncClient
+    'async': ['aiohttp>=3.7,<4'],
+}
+
 
 def find_version(*file_path_parts):
     here = os.path.abspath(os.path.dirname(__file__))
@@ -84,13 +90,18 @@ setup(
     author='The Kubeflow Authors',
     url="https://github.com/kubeflow/pipelines",
     project_urls={
-        "Documentation": "https://kubeflow-pipelines.readthedocs.io/en/stable/",
-        "Bug Tracker": "https://github.com/kubeflow/pipelines/issues",
-        "Source": "https://github.com/kubeflow/pipelines/tree/master/sdk",
-        "Changelog": "https://github.com/kubeflow/pipelines/blob/master/sdk/RELEASE.md",
+        "Documentation":
+            "https://kubeflow-pipelines.readthedocs.io/en/stable/",
+        "Bug Tracker":
+            "https://github.com/kubeflow/pipelines/issues",
+        "Source":
+            "https://github.com/kubeflow/pipelines/tree/master/sdk",
+        "Changelog":
+            "https://github.com/kubeflow/pipelines/blob/master/sdk/RELEASE.md",
     },
     install_requires=REQUIRES,
     tests_require=TESTS_REQUIRE,
+    extras_require=EXTRAS_REQUIRE,
     packages=[
         'kfp',
         'kfp.auth',
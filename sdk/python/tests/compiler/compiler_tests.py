@@ -17,6 +17,7 @@ import unittest
 import kfp
 import kfp.compiler as compiler
 import kfp.dsl as dsl
+import io
 import json
 import os
 import shutil
@@ -213,6 +214,114 @@ class TestCompiler(parameterized.TestCase):
             shutil.rmtree(tmpdir)
             # print(tmpdir)
 
+    def test_compile_many(self):
+        """Test compiling several workflows sharing the template cache."""
+        test_data_dir = os.path.join(os.path.dirname(__file__), 'testdata')
+        sys.path.append(test_data_dir)
+        import basic
+        from kfp.compiler._template_cache import TemplateCache
+        tmpdir = tempfile.mkdtemp()
+        package_paths = [
+            os.path.join(tmpdir, 'workflow1.yaml'),
+            os.path.join(tmpdir, 'workflow2.yaml'),
+        ]
+        try:
+            template_cache = TemplateCache()
+            timings = compiler.Compiler().compile_many(
+                [(basic.save_most_frequent_word, package_path)
+                 for package_path in package_paths],
+                template_cache=template_cache)
+            self.assertEqual(2, len(timings))
+            for pipeline_timings in timings:
+                self.assertEqual(
+                    {
+                        'trace', 'templates', 'data_passing', 'write',
+                        'validate', 'total'
+                    }, set(pipeline_timings))
+            # All the ops of the second pipeline are cache hits.
+            self.assertEqual(template_cache.misses, template_cache.hits)
+
+            workflows = []
+            for package_path in package_paths:
+                with open(package_path, 'r') as f:
+                    workflow = yaml.safe_load(f)
+                del workflow['metadata']
+                workflows.append(workflow)
+            self.assertEqual(workflows[0], workflows[1])
+        finally:
+            shutil.rmtree(tmpdir)
+
+    def test_compile_does_not_cache_templates(self):
+        """Test the ops compiled by compile are always processed."""
+        test_data_dir = os.path.join(os.path.dirname(__file__), 'testdata')
+        sys.path.append(test_data_dir)
+        import basic
+        from kfp.compiler._op_to_template import _op_to_template
+        with mock.patch(
+                'kfp.compiler.compiler._op_to_template',
+                wraps=_op_to_template) as op_to_template:
+            compiler.Compiler()._create_workflow(basic.save_most_frequent_word)
+            op_count = op_to_template.call_count
+            compiler.Compiler()._create_workflow(basic.save_most_frequent_word)
+        self.assertGreater(op_count, 0)
+        self.assertEqual(2 * op_count, op_to_template.call_count)
+
+    def test_compile_with_libyaml_is_opt_in(self):
+        """Test the workflows are written with the pure Python emitter by
+        default."""
+        test_data_dir = os.path.join(os.path.dirname(__file__), 'testdata')
+        sys.path.append(test_data_dir)
+        import basic
+        from kfp.components._yaml_utils import dump_yaml
+        for pipeline_compiler, use_libyaml in [
+            (compiler.Compiler(argo_lint=False), False),
+            (compiler.Compiler(argo_lint=False, use_libyaml=True), True),
+        ]:
+            with mock.patch(
+                    'kfp.compiler.compiler.dump_yaml',
+                    wraps=dump_yaml) as mock_dump_yaml:
+                pipeline_compiler._create_and_write_workflow(
+                    basic.save_most_frequent_word)
+            self.assertEqual(use_libyaml,
+                             mock_dump_yaml.call_args[1]['use_libyaml'])
+
+    def test_validate_workflow(self):
+        """Test detecting unresolved pipeline params without linting."""
+        from kfp.compiler.compiler import _validate_workflow
+        workflow = {
+            'spec': {
+                'arguments': {
+                    'parameters': [{
+                        'name': 'param'
+                    }]
+                },
+                'templates': [{
+                    'name': 'template',
+                    'container': {
+                        'args': ['echo', 'value']
+                    }
+                }]
+            }
+        }
+        with mock.patch('kfp.compiler.compiler._run_argo_lint') as lint, \
+                mock.patch('kfp.compiler.compiler._has_working_argo_lint',
+                           return_value=True):
+            _validate_workflow(workflow)
+            self.assertIn('value: \'\'', lint.call_args[0][0])
+            # The argo lint workaround does not modify the workflow.
+            self.assertEqual([{
+                'name': 'param'
+            }], workflow['spec']['arguments']['parameters'])
+
+            lint.reset_mock()
+            _validate_workflow(workflow, argo_lint=False)
+            lint.assert_not_called()
+
+        workflow['spec']['templates'][0]['container']['args'].append(
+            '{{pipelineparam:op=;name=param}}')
+        with self.assertRaisesRegex(RuntimeError, 'unresolved PipelineParam'):
+            _validate_workflow(workflow, argo_lint=False)
+
     def test_basic_workflow_without_decorator(self):
         """Test compiling a workflow and appending pipeline params."""
         test_data_dir = os.path.join(os.path.dirname(__file__), 'testdata')
@@ -289,6 +398,27 @@ class TestCompiler(parameterized.TestCase):
             shutil.rmtree(tmpdir)
             # print(tmpdir)
 
+    def test_compile_to_file_object(self):
+        """Test compiling a workflow to a binary file object."""
+
+        test_data_dir = os.path.join(os.path.dirname(__file__), 'testdata')
+        sys.path.append(test_data_dir)
+        import basic
+        package = io.BytesIO()
+        compiler.Compiler().compile(basic.save_most_frequent_word, package)
+        self.assertFalse(package.closed)
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            package_path = os.path.join(tmpdir, 'workflow.tar.gz')
+            compiler.Compiler().compile(basic.save_most_frequent_word,
+                                        package_path)
+            compiled = self._get_yaml_from_tar(package_path)
+        streamed = yaml.safe_load(package.getvalue())
+        for workflow in compiled, streamed:
+            del workflow['metadata']['annotations'][
+                'pipelines.kubeflow.org/pipeline_compilation_time']
+        self.assertEqual(compiled, streamed)
+
     def _test_py_compile_zip(self, file_base_name):
         test_data_dir = os.path.join(os.path.dirname(__file__), 'testdata')
         py_file = os.path.join(test_data_dir, file_base_name + '.py')
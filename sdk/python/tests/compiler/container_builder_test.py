@@ -14,14 +14,34 @@
 
 import os
 import tarfile
+import types
 import unittest
 import yaml
 import tempfile
 from unittest import mock
 from kfp.containers._component_builder import ContainerBuilder
+from kfp.containers._container_builder import (ContextStore, LocalContextStore,
+                                               _image_exists_in_registry)
 
 GCS_BASE = 'gs://kfp-testing/'
 DEFAULT_IMAGE_NAME = 'gcr.io/kfp-testing/image'
+IMAGE_DIGEST = 'sha256:' + '0' * 64
+
+
+class FakeJobRunner(object):
+    """Records the Kaniko pods instead of running them."""
+
+    def __init__(self):
+        self.specs = []
+
+    def run_job(self, yaml_spec, timeout):
+        self.specs.append(yaml_spec)
+        kaniko_status = types.SimpleNamespace(
+            name='kaniko',
+            state=types.SimpleNamespace(
+                terminated=types.SimpleNamespace(message=IMAGE_DIGEST)))
+        return types.SimpleNamespace(
+            status=types.SimpleNamespace(container_statuses=[kaniko_status]))
 
 
 @mock.patch('kfp.containers._gcs_helper.GCSHelper')
@@ -100,3 +120,160 @@ class TestContainerBuild(unittest.TestCase):
             golden = yaml.safe_load(f)
 
         self.assertEqual(golden, generated_yaml)
+
+    def test_wrap_dir_in_tarball_is_reproducible(self, mock_gcshelper):
+        """Test the tarball only depends on the content of the files."""
+        builder = ContainerBuilder(
+            gcs_staging=GCS_BASE,
+            default_image_name=DEFAULT_IMAGE_NAME,
+            namespace='')
+        tarballs = []
+        with tempfile.TemporaryDirectory() as temp_dir:
+            for mtime in [1000000000, 1600000000]:
+                test_data_dir = os.path.join(temp_dir, str(mtime))
+                os.makedirs(os.path.join(test_data_dir, 'nested'))
+                for name in ['b.txt', 'a.txt', os.path.join('nested', 'c.txt')]:
+                    path = os.path.join(test_data_dir, name)
+                    with open(path, 'w') as f:
+                        f.write(name)
+                    os.utime(path, (mtime, mtime))
+                tarball_path = os.path.join(temp_dir, str(mtime) + '.tar.gz')
+                builder._wrap_dir_in_tarball(tarball_path, test_data_dir)
+                with open(tarball_path, 'rb') as f:
+                    tarballs.append(f.read())
+                with tarfile.open(tarball_path) as tarball:
+                    names = tarball.getnames()
+
+        self.assertEqual(tarballs[0], tarballs[1])
+        self.assertEqual(['a.txt', 'b.txt', 'nested', 'nested/c.txt'], names)
+
+    def test_build_skips_upload_and_build_of_same_context(self, mock_gcshelper):
+        """Test a build context is uploaded and built once."""
+        job_runner = FakeJobRunner()
+        with tempfile.TemporaryDirectory() as temp_dir:
+            staging_dir = os.path.join(temp_dir, 'staging')
+            context_dir = os.path.join(temp_dir, 'context')
+            os.makedirs(context_dir)
+            with open(os.path.join(context_dir, 'Dockerfile'), 'w') as f:
+                f.write('FROM python:3.7')
+            builder = ContainerBuilder(
+                gcs_staging=staging_dir,
+                default_image_name=DEFAULT_IMAGE_NAME,
+                namespace='default',
+                context_store=LocalContextStore(),
+                job_runner=job_runner,
+                image_exists=lambda image_name: True)
+
+            image_name = builder.build(context_dir)
+            self.assertEqual(DEFAULT_IMAGE_NAME + '@' + IMAGE_DIGEST,
+                             image_name)
+            self.assertEqual(image_name, builder.build(context_dir))
+            self.assertEqual(1, len(job_runner.specs))
+
+            # Another target image reuses the uploaded context.
+            builder.build(context_dir, target_image='gcr.io/kfp-testing/other')
+            self.assertEqual(2, len(job_runner.specs))
+            contexts = [
+                name for name in os.listdir(staging_dir)
+                if name.endswith('.tar.gz')
+            ]
+            self.assertEqual(1, len(contexts))
+            self.assertIn('--context=' + os.path.join(staging_dir, contexts[0]),
+                          job_runner.specs[1]['spec']['containers'][0]['args'])
+        mock_gcshelper.upload_gcs_file.assert_not_called()
+
+    def test_build_rebuilds_missing_image(self, mock_gcshelper):
+        """Test a recorded image is rebuilt when it no longer exists."""
+        job_runner = FakeJobRunner()
+        checked_images = []
+
+        def image_exists(image_name):
+            checked_images.append(image_name)
+            return False
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            context_dir = os.path.join(temp_dir, 'context')
+            os.makedirs(context_dir)
+            with open(os.path.join(context_dir, 'Dockerfile'), 'w') as f:
+                f.write('FROM python:3.7')
+            builder = ContainerBuilder(
+                gcs_staging=os.path.join(temp_dir, 'staging'),
+                default_image_name=DEFAULT_IMAGE_NAME,
+                namespace='default',
+                context_store=LocalContextStore(),
+                job_runner=job_runner,
+                image_exists=image_exists)
+
+            builder.build(context_dir)
+            builder.build(context_dir)
+
+        self.assertEqual(2, len(job_runner.specs))
+        self.assertEqual([DEFAULT_IMAGE_NAME + '@' + IMAGE_DIGEST],
+                         checked_images)
+
+    def test_image_exists_in_registry(self, mock_gcshelper):
+        """Test checking an image with the registry API token flow."""
+        image_name = 'registry.example.com/project/image@' + IMAGE_DIGEST
+        manifest_url = ('https://registry.example.com/v2/project/image/'
+                        'manifests/' + IMAGE_DIGEST)
+
+        def head(url, headers, timeout):
+            self.assertEqual(manifest_url, url)
+            if headers.get('Authorization') != 'Bearer token':
+                return mock.Mock(
+                    status_code=401,
+                    headers={
+                        'WWW-Authenticate':
+                            'Bearer realm="https://auth.example.com/token",'
+                            'service="registry.example.com",'
+                            'scope="repository:project/image:pull"'
+                    })
+            return mock.Mock(status_code=head.status_code)
+
+        token_response = mock.Mock()
+        token_response.json.return_value = {'token': 'token'}
+        get_patcher = mock.patch('requests.get', return_value=token_response)
+        with mock.patch('requests.head', side_effect=head), get_patcher as get:
+            head.status_code = 200
+            self.assertTrue(_image_exists_in_registry(image_name))
+            head.status_code = 404
+            self.assertFalse(_image_exists_in_registry(image_name))
+
+        get.assert_called_with(
+            'https://auth.example.com/token',
+            params={
+                'service': 'registry.example.com',
+                'scope': 'repository:project/image:pull'
+            },
+            auth=None,
+            timeout=mock.ANY)
+
+    def test_incomplete_context_store_cannot_be_created(self, mock_gcshelper):
+        """Test that context stores implement all the store methods."""
+
+        class IncompleteContextStore(ContextStore):
+
+            def exists(self, uri):
+                return False
+
+        with self.assertRaisesRegex(TypeError, 'upload_file'):
+            IncompleteContextStore()
+
+    def test_generate_kaniko_yaml_with_layer_cache(self, mock_gcshelper):
+        """Test configuring the Kaniko layer cache."""
+        builder = ContainerBuilder(
+            gcs_staging=GCS_BASE,
+            default_image_name=DEFAULT_IMAGE_NAME,
+            namespace='default',
+            cache_repo='gcr.io/mlpipeline/cache',
+            cache_ttl='168h')
+        generated_yaml = builder._generate_kaniko_spec(
+            docker_filename='dockerfile',
+            context='gs://mlpipeline/kaniko_build.tar.gz',
+            target_image='gcr.io/mlpipeline/kaniko_image:latest')
+
+        args = generated_yaml['spec']['containers'][0]['args']
+        self.assertEqual([
+            '--cache=true', '--cache-repo=gcr.io/mlpipeline/cache',
+            '--cache-ttl=168h', '--dockerfile=dockerfile'
+        ], args[:4])
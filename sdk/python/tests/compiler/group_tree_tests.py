@@ -0,0 +1,113 @@
+# Copyright 2021 The Kubeflow Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+from kfp import dsl
+from kfp.compiler._group_tree import GroupTree
+
+
+def _op(name):
+    return dsl.ContainerOp(name=name, image='busybox', command=['true'])
+
+
+class TestGroupTree(unittest.TestCase):
+
+    def _build_tree(self):
+        # root
+        # |- op1
+        # |- condition-a
+        #    |- for-loop
+        #    |  |- op2
+        #    |  |- condition-b
+        #    |     |- op3
+        #    |- op4
+        with dsl.Pipeline('tree') as p:
+            param = dsl.PipelineParam('param')
+            _op('op1')
+            condition_a = dsl.Condition(param == 'a')
+            for_loop = dsl.ParallelFor([1, 2])
+            with condition_a:
+                with for_loop:
+                    _op('op2')
+                    with dsl.Condition(param == 'b') as condition_b:
+                        _op('op3')
+                _op('op4')
+        self.root = p.groups[0].name
+        self.condition_a = condition_a.name
+        self.for_loop = for_loop.name
+        self.condition_b = condition_b.name
+        return GroupTree(p.groups[0])
+
+    def test_ancestors(self):
+        tree = self._build_tree()
+        self.assertEqual([
+            self.root, self.condition_a, self.for_loop, self.condition_b, 'op3'
+        ], tree.get_ancestors('op3'))
+        self.assertEqual(['op3', self.condition_b, self.for_loop],
+                         list(tree.iter_ancestors('op3', stop_depth=2)))
+        self.assertEqual(
+            [self.for_loop, self.condition_a],
+            list(tree.iter_ancestors('op3', start_depth=2, stop_depth=1)))
+        self.assertEqual(4, tree.get_depth('op3'))
+        self.assertEqual(self.for_loop, tree.get_ancestor('op3', 2))
+        self.assertEqual(self.condition_a, tree.get_parent('op4'))
+        self.assertIsNone(tree.get_parent(self.root))
+
+    def test_uncommon_ancestors(self):
+        tree = self._build_tree()
+        self.assertEqual(1, tree.get_common_ancestor_depth('op3', 'op4'))
+        self.assertEqual(0, tree.get_common_ancestor_depth('op1', 'op2'))
+        self.assertEqual((self.for_loop, 'op4'),
+                         tree.get_first_uncommon_ancestors('op3', 'op4'))
+        self.assertEqual(('op1', self.condition_a),
+                         tree.get_first_uncommon_ancestors('op1', 'op3'))
+        uncommon_ancestors = [
+            self.condition_a, self.for_loop, self.condition_b, 'op3'
+        ]
+        self.assertEqual((['op1'], uncommon_ancestors),
+                         tree.get_uncommon_ancestors('op1', 'op3'))
+        self.assertEqual((['op2'], [self.condition_b, 'op3']),
+                         tree.get_uncommon_ancestors('op2', 'op3'))
+
+    def test_invalid_nodes(self):
+        tree = self._build_tree()
+        with self.assertRaisesRegex(ValueError, 'op5 does not exist'):
+            tree.get_ancestors('op5')
+        with self.assertRaisesRegex(ValueError,
+                                    self.for_loop + ' is an ancestor of op3'):
+            tree.get_first_uncommon_ancestors('op3', self.for_loop)
+
+    def test_deep_nesting(self):
+        with dsl.Pipeline('deep') as p:
+            param = dsl.PipelineParam('param')
+            conditions = [dsl.Condition(param == str(i)) for i in range(300)]
+            for condition in conditions:
+                condition.__enter__()
+            _op('inner')
+            conditions[-1].__exit__(None, None, None)
+            _op('sibling')
+            for condition in reversed(conditions[:-1]):
+                condition.__exit__(None, None, None)
+            _op('outer')
+        tree = GroupTree(p.groups[0])
+        self.assertEqual(301, tree.get_depth('inner'))
+        self.assertEqual(299,
+                         tree.get_common_ancestor_depth('inner', 'sibling'))
+        self.assertEqual((conditions[0].name, 'outer'),
+                         tree.get_first_uncommon_ancestors('inner', 'outer'))
+
+
+if __name__ == '__main__':
+    unittest.main()
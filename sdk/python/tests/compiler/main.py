@@ -18,6 +18,7 @@ import unittest
 import compiler_tests
 import component_builder_test
 import container_builder_test
+import group_tree_tests
 import k8s_helper_tests
 
 if __name__ == '__main__':
@@ -28,6 +29,8 @@ if __name__ == '__main__':
         unittest.defaultTestLoader.loadTestsFromModule(component_builder_test))
     suite.addTests(
         unittest.defaultTestLoader.loadTestsFromModule(container_builder_test))
+    suite.addTests(
+        unittest.defaultTestLoader.loadTestsFromModule(group_tree_tests))
     suite.addTests(
         unittest.defaultTestLoader.loadTestsFromModule(k8s_helper_tests))
     runner = unittest.TextTestRunner()
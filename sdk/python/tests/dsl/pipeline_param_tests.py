@@ -14,7 +14,7 @@
 
 from kubernetes.client.models import V1ConfigMap, V1Container, V1EnvVar
 from kfp.dsl import PipelineParam
-from kfp.dsl._pipeline_param import _extract_pipelineparams, extract_pipelineparams_from_any
+from kfp.dsl._pipeline_param import _extract_pipelineparams, extract_pipelineparams_from_any, replace_serialized_pipelineparams
 import unittest
 
 
@@ -54,6 +54,20 @@ class TestPipelineParam(unittest.TestCase):
         params = _extract_pipelineparams(payload)
         self.assertListEqual([p1, p2, p3], params)
 
+    def test_replace_serialized_pipelineparams(self):
+        """Test replace_serialized_pipelineparams."""
+        p1 = PipelineParam(name='param1', op_name='op1')
+        p2 = PipelineParam(name='param2')
+        payload = str(p1) + ' between ' + str(p2) + ' and ' + str(p1)
+        replacements = {str(p1): '{{p1}}', str(p2): '{{p2}}'}
+        self.assertEqual(
+            '{{p1}} between {{p2}} and {{p1}}',
+            replace_serialized_pipelineparams(payload, replacements))
+        self.assertEqual('no params',
+                         replace_serialized_pipelineparams('no params', {}))
+        with self.assertRaises(KeyError):
+            replace_serialized_pipelineparams(payload, {str(p1): '{{p1}}'})
+
     def test_extract_pipelineparams_from_any(self):
         """Test extract_pipeleineparams."""
         p1 = PipelineParam(name='param1', op_name='op1')
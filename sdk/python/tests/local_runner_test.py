@@ -12,8 +12,13 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import os
+import tempfile
+import threading
+import time
 import unittest
 from typing import Callable
+from unittest import mock
 
 import kfp
 from kfp import LocalClient, run_pipeline_func_locally
@@ -85,11 +90,43 @@ def component_connect_demo(src: kfp.components.InputPath(),
             fw.write(f"{line} copied")
 
 
+@light_component()
+def wait_for_peers(sync_dir: str, name: str, peers: int, dst: OutputPath):
+    """Waits until `peers` ops started, recording how many ops were running
+    when this one started."""
+    import os
+    import time
+
+    def count(prefix):
+        return len([f for f in os.listdir(sync_dir) if f.startswith(prefix)])
+
+    with open(os.path.join(sync_dir, "start-" + name), "w"):
+        pass
+    running = count("start-") - count("end-")
+    deadline = time.time() + 60
+    while count("start-") < peers:
+        if time.time() > deadline:
+            raise TimeoutError("Only {} ops started.".format(count("start-")))
+        time.sleep(0.05)
+    with open(
+            os.path.join(sync_dir, "running-{}-{}".format(name, running)), "w"):
+        pass
+    with open(dst, "w") as f:
+        f.write(name)
+    with open(os.path.join(sync_dir, "end-" + name), "w"):
+        pass
+
+
+def _get_max_running_ops(sync_dir: str) -> int:
+    return max(
+        int(f.rpartition("-")[2])
+        for f in os.listdir(sync_dir)
+        if f.startswith("running-"))
+
+
 class LocalRunnerTest(unittest.TestCase):
 
     def setUp(self):
-        import tempfile
-
         with tempfile.NamedTemporaryFile('w', delete=False) as f:
             self.temp_file_path = f.name
             f.write("hello world")
@@ -148,6 +185,53 @@ class LocalRunnerTest(unittest.TestCase):
         run_pipeline_func_locally(
             _pipeline, {}, execution_mode=LocalClient.ExecutionMode("local"))
 
+    def test_for_static_items(self):
+
+        @light_component()
+        def concat(a, b, dst: OutputPath):
+            with open(dst, "w") as f:
+                f.write(a + b)
+
+        def _pipeline():
+            with kfp.dsl.ParallelFor([{
+                    "a": "x",
+                    "b": 1
+            }, {
+                    "a": "y",
+                    "b": True
+            }, {
+                    "a": "z",
+                    "b": None
+            }]) as item:
+                concat(item.a, item.b)
+
+        run_result = run_pipeline_func_locally(
+            _pipeline, {}, execution_mode=LocalClient.ExecutionMode("local"))
+        assert run_result.success()
+
+        output_file_path = run_result.get_output_file("concat")
+        for index, expected in enumerate(["x1", "ytrue", "znull"]):
+            iteration_output_file_path = output_file_path.replace(
+                run_result.run_id, "{}/{}".format(run_result.run_id, index))
+            with open(iteration_output_file_path, "r") as f:
+                assert f.read() == expected
+
+    def test_for_parallelism(self):
+
+        def _pipeline(sync_dir: str):
+            with kfp.dsl.ParallelFor([1, 2, 3, 4], parallelism=2) as item:
+                wait_for_peers(sync_dir, item, 2)
+
+        with tempfile.TemporaryDirectory() as sync_dir:
+            run_result = run_pipeline_func_locally(
+                _pipeline, {"sync_dir": sync_dir},
+                execution_mode=LocalClient.ExecutionMode(
+                    "local", max_parallelism=4))
+
+            assert run_result.success()
+            # The first two iterations waited for each other.
+            assert _get_max_running_ops(sync_dir) == 2
+
     def test_connect(self):
 
         def _pipeline():
@@ -182,6 +266,192 @@ class LocalRunnerTest(unittest.TestCase):
         run_pipeline_func_locally(
             _pipeline, {}, execution_mode=LocalClient.ExecutionMode("local"))
 
+    def test_parallel_execution(self):
+
+        def _pipeline(sync_dir: str):
+            wait_for_peers(sync_dir, "a", 3)
+            wait_for_peers(sync_dir, "b", 3)
+            wait_for_peers(sync_dir, "c", 3)
+
+        with tempfile.TemporaryDirectory() as sync_dir:
+            run_result = run_pipeline_func_locally(
+                _pipeline, {"sync_dir": sync_dir},
+                execution_mode=LocalClient.ExecutionMode(
+                    "local", max_parallelism=3))
+
+            # Each op waited for the three ops to be running.
+            assert run_result.success()
+            end_files = [
+                f for f in os.listdir(sync_dir) if f.startswith("end-")
+            ]
+            assert sorted(end_files) == ["end-a", "end-b", "end-c"]
+        for op_name in [
+                "wait-for-peers", "wait-for-peers 2", "wait-for-peers 3"
+        ]:
+            assert os.path.exists(run_result.get_output_file(op_name))
+
+    def test_fail_fast(self):
+
+        @light_component()
+        def fail():
+            raise ValueError("failed")
+
+        def _pipeline():
+            _fail = fail()
+            hello("unreachable").after(_fail)
+
+        run_result = run_pipeline_func_locally(
+            _pipeline, {},
+            execution_mode=LocalClient.ExecutionMode(
+                "local", max_parallelism=2))
+
+        assert not run_result.success()
+
+    def test_fail_fast_on_exception(self):
+        started_ops = []
+        first_started = threading.Event()
+
+        def run_op(client, run_name, pipeline, op, stack, execution_mode,
+                   run_context):
+            started_ops.append(op.name)
+            if op.name == "fail":
+                # Fails once the other branch is running.
+                first_started.wait(timeout=10)
+                raise OSError("docker not found")
+            if op.name == "first":
+                first_started.set()
+                # Completes after the failure of the other branch.
+                for _ in range(200):
+                    if run_context.failed:
+                        break
+                    time.sleep(0.05)
+            return True
+
+        def echo(name):
+            return kfp.dsl.ContainerOp(
+                name=name, image=BASE_IMAGE, command=["echo", name])
+
+        def _pipeline():
+            # The failure leaves the group of the failed op first.
+            with kfp.dsl.ParallelFor([1]):
+                echo("fail")
+            with kfp.dsl.ParallelFor([1]):
+                echo("second").after(echo("first"))
+
+        with mock.patch.object(LocalClient, "_run_op", run_op):
+            with self.assertRaisesRegex(OSError, "docker not found"):
+                run_pipeline_func_locally(
+                    _pipeline, {},
+                    execution_mode=LocalClient.ExecutionMode(
+                        "local", max_parallelism=2))
+
+        assert sorted(started_ops) == ["fail", "first"]
+
+    def test_invalid_max_parallelism(self):
+        with self.assertRaises(ValueError):
+            LocalClient.ExecutionMode("local", max_parallelism=0)
+
+    def test_caching(self):
+
+        @light_component()
+        def random_number(seed_file: InputPath, dst: OutputPath):
+            import random
+            with open(dst, "w") as f:
+                f.write(str(random.random()))
+
+        def _pipeline(file_path: str):
+            _local_loader = local_loader(file_path)
+            random_number(_local_loader.output)
+
+        def _run_and_read_output(pipeline_root: str, file_path: str) -> str:
+            run_result = run_pipeline_func_locally(
+                _pipeline, {"file_path": file_path},
+                pipeline_root=pipeline_root,
+                execution_mode=LocalClient.ExecutionMode("local"),
+                enable_caching=True)
+            assert run_result.success()
+            with open(run_result.get_output_file("random-number"), "r") as f:
+                return f.read()
+
+        with tempfile.TemporaryDirectory() as pipeline_root:
+            first_output = _run_and_read_output(pipeline_root,
+                                                self.temp_file_path)
+            assert _run_and_read_output(pipeline_root,
+                                        self.temp_file_path) == first_output
+
+            with tempfile.NamedTemporaryFile('w', delete=False) as f:
+                f.write("hello changed world")
+            assert _run_and_read_output(pipeline_root, f.name) != first_output
+
+            # Input files edited in place are not served from the cache.
+            with open(self.temp_file_path, "w") as f:
+                f.write("hello edited world")
+            assert _run_and_read_output(pipeline_root,
+                                        self.temp_file_path) != first_output
+
+    def test_caching_key_only_fingerprints_inputs(self):
+        from kfp._local_client import _StepCache
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            input_root = os.path.join(temp_dir, "pipeline") + "/"
+            os.makedirs(os.path.join(temp_dir, "pipeline2"))
+            sibling_file = os.path.join(temp_dir, "pipeline2", "x")
+            with open(sibling_file, "w") as f:
+                f.write("x")
+            cache = _StepCache(os.path.join(temp_dir, "cache"))
+            cmd = ["ls", "/", ".", sibling_file]
+            with mock.patch(
+                    "kfp._local_client.calculate_recursive_dir_hash"
+            ) as dir_hash, mock.patch(
+                    "kfp._local_client.calculate_file_hash") as file_hash:
+                key = cache.get_key("image", cmd, input_root, {})
+            dir_hash.assert_not_called()
+            file_hash.assert_not_called()
+
+            # The items are opaque strings.
+            with open(sibling_file, "w") as f:
+                f.write("y")
+            assert cache.get_key("image", cmd, input_root, {}) == key
+
+    def _run_twice_with_max_cache_staleness(self, max_cache_staleness: str):
+
+        @light_component()
+        def random_number(dst: OutputPath):
+            import random
+            with open(dst, "w") as f:
+                f.write(str(random.random()))
+
+        def _pipeline():
+            strategy = random_number().execution_options.caching_strategy
+            strategy.max_cache_staleness = max_cache_staleness
+
+        outputs = []
+        with tempfile.TemporaryDirectory() as pipeline_root:
+            for _ in range(2):
+                run_result = run_pipeline_func_locally(
+                    _pipeline, {},
+                    pipeline_root=pipeline_root,
+                    execution_mode=LocalClient.ExecutionMode("local"),
+                    enable_caching=True)
+                assert run_result.success()
+                with open(run_result.get_output_file("random-number"),
+                          "r") as f:
+                    outputs.append(f.read())
+        return outputs
+
+    def test_caching_max_cache_staleness(self):
+        outputs = self._run_twice_with_max_cache_staleness("P0D")
+        assert outputs[0] != outputs[1]
+
+        outputs = self._run_twice_with_max_cache_staleness("P1D")
+        assert outputs[0] == outputs[1]
+
+    def test_caching_unsupported_max_cache_staleness(self):
+        with self.assertLogs(level="WARNING") as logs:
+            outputs = self._run_twice_with_max_cache_staleness("P1M")
+        assert outputs[0] != outputs[1]
+        assert "Unsupported max_cache_staleness P1M" in logs.output[0]
+
     @unittest.skip('docker is not installed in CI environment.')
     def test_execution_mode_exclude_op(self):
 
@@ -226,16 +496,14 @@ class LocalRunnerTest(unittest.TestCase):
 
         def _pipeline():
             check_option()
-        
+
         run_result = run_pipeline_func_locally(
-            _pipeline,
-            {},
-            execution_mode=LocalClient.ExecutionMode(mode="docker",
-                                                    docker_options=["-e", "foo=bar"])
-        )
+            _pipeline, {},
+            execution_mode=LocalClient.ExecutionMode(
+                mode="docker", docker_options=["-e", "foo=bar"]))
         assert run_result.success
         output_file_path = run_result.get_output_file("check-option")
-    
+
         with open(output_file_path, "r") as f:
             line = f.readline()
-            assert "bar" in line
\ No newline at end of file
+            assert "bar" in line
@@ -0,0 +1,120 @@
+# Copyright 2021 The Kubeflow Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""This benchmark measures the deserialization of the API server responses.
+
+It generates list_runs responses with runs carrying workflow manifests,
+and times their deserialization by the reflective deserializer of
+kfp_server_api and by the compiled deserializer of kfp.Client, next to the
+time spent decoding the JSON alone.
+
+Usage:
+  python api_response_deserialization.py --runs 200 --manifest-kb 16
+"""
+
+import argparse
+import json
+import time
+from collections import namedtuple
+
+import kfp_server_api
+from kfp._api_client import FastApiClient
+
+_Response = namedtuple('_Response', ['data'])
+
+
+def _make_list_runs_response(num_runs: int, manifest_kb: int) -> str:
+    template = {
+        'name': 'template',
+        'container': {
+            'image': 'busybox',
+            'command': ['sh', '-c', 'echo "{{inputs.parameters.message}}"'],
+        },
+    }
+    manifest = json.dumps({
+        'kind': 'Workflow',
+        'spec': {
+            'templates': [template] * (manifest_kb * 1024 //
+                                       len(json.dumps(template)))
+        },
+    })
+    runs = [{
+        'id': 'run-{}'.format(i),
+        'name': 'Run {}'.format(i),
+        'created_at': '2021-06-01T12:34:56Z',
+        'scheduled_at': '1970-01-01T00:00:00Z',
+        'finished_at': '2021-06-01T12:40:00.123456789Z',
+        'status': 'Succeeded',
+        'pipeline_spec': {
+            'workflow_manifest': manifest,
+            'parameters': [{
+                'name': 'message',
+                'value': str(i)
+            }],
+        },
+        'resource_references': [{
+            'key': {
+                'type': 'EXPERIMENT',
+                'id': 'experiment'
+            },
+            'relationship': 'OWNER',
+        }],
+        'metrics': [{
+            'name': 'accuracy',
+            'node_id': 'node',
+            'number_value': 0.5,
+            'format': 'RAW',
+        }],
+    } for i in range(num_runs)]
+    return json.dumps({
+        'runs': runs,
+        'total_size': num_runs,
+        'next_page_token': 'token'
+    })
+
+
+def _time(function, repeats: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeats):
+        function()
+    return (time.perf_counter() - start) / repeats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        '--runs', type=int, default=200, help='Number of runs per response.')
+    parser.add_argument(
+        '--manifest-kb',
+        type=int,
+        default=16,
+        help='Size of the workflow manifest of each run, in KB.')
+    parser.add_argument('--repeats', type=int, default=10)
+    args = parser.parse_args()
+
+    response = _Response(_make_list_runs_response(args.runs, args.manifest_kb))
+    reflective_client = kfp_server_api.ApiClient()
+    fast_client = FastApiClient()
+    print('Response size: {:.1f} MB'.format(len(response.data) / 2**20))
+    for name, function in [
+        ('json.loads', lambda: json.loads(response.data)),
+        ('reflective', lambda: reflective_client.deserialize(
+            response, 'ApiListRunsResponse')),
+        ('compiled', lambda: fast_client.deserialize(
+            response, 'ApiListRunsResponse')),
+    ]:
+        print('{:>12}: {:.4f} s'.format(name, _time(function, args.repeats)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,132 @@
+# Copyright 2021 The Kubeflow Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""This benchmark measures kfp.Client requests made concurrently by threads.
+
+It starts a local stub of the API server, which answers get_run requests
+after a fixed latency, and shares a client between threads, with several
+connection pool settings. It reports the request throughput and the
+number of connections opened to the stub.
+
+With fewer pooled connections than threads and without blocking, the
+connections which do not fit in the pool are opened for a single request
+and discarded, which urllib3 reports with "Connection pool is full"
+warnings.
+
+Usage:
+  python client_concurrency.py --threads 32 --requests 50 --latency-ms 5
+"""
+
+import argparse
+import concurrent.futures
+import http.server
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from unittest import mock
+
+import kfp
+
+
+class _StubApiServerHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.num_connections += 1
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        if self.path.startswith('/apis/v1beta1/healthz'):
+            body = {'multi_user': False}
+        else:
+            time.sleep(self.server.latency)
+            body = {'run': {'id': self.path.rsplit('/', 1)[-1], 'status': 'Running'}}
+        data = json.dumps(body).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+def _run(host: str, server, num_threads: int, num_requests: int,
+         client_kwargs: dict):
+    client = kfp.Client(host=host, **client_kwargs)
+    num_connections = server.num_connections
+
+    def get_runs(thread_index: int):
+        for i in range(num_requests):
+            client.get_run('run-{}-{}'.format(thread_index, i))
+
+    start = time.perf_counter()
+    with concurrent.futures.ThreadPoolExecutor(num_threads) as executor:
+        list(executor.map(get_runs, range(num_threads)))
+    seconds = time.perf_counter() - start
+    return (num_threads * num_requests / seconds,
+            server.num_connections - num_connections)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--threads', type=int, default=32)
+    parser.add_argument(
+        '--requests', type=int, default=50, help='Requests per thread.')
+    parser.add_argument(
+        '--latency-ms',
+        type=float,
+        default=5,
+        help='Latency of the stub API server.')
+    args = parser.parse_args()
+
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0),
+                                             _StubApiServerHandler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.num_connections = 0
+    server.latency = args.latency_ms / 1000
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host = 'http://127.0.0.1:{}'.format(server.server_address[1])
+
+    # Silences the "Connection pool is full" warnings.
+    logging.getLogger('urllib3.connectionpool').setLevel(logging.ERROR)
+    settings = [
+        ('maxsize=4', dict(connection_pool_maxsize=4)),
+        ('maxsize=4, block',
+         dict(connection_pool_maxsize=4, connection_pool_block=True)),
+        ('maxsize=threads', dict(connection_pool_maxsize=args.threads)),
+        ('maxsize=threads, keep-alive',
+         dict(connection_pool_maxsize=args.threads, tcp_keepalive=True)),
+    ]
+    with tempfile.TemporaryDirectory() as temp_dir, mock.patch.object(
+            kfp.Client, 'LOCAL_KFP_CONTEXT',
+            os.path.join(temp_dir, 'context.json')):
+        print('{:>30} {:>14} {:>12}'.format('pool', 'requests/s',
+                                            'connections'))
+        for name, client_kwargs in settings:
+            throughput, num_connections = _run(host, server, args.threads,
+                                               args.requests, client_kwargs)
+            print('{:>30} {:>14.0f} {:>12}'.format(name, throughput,
+                                                   num_connections))
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,154 @@
+# Copyright 2021 The Kubeflow Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""This benchmark measures how the dependency resolution of the KFP compilers
+scales with the size of a pipeline.
+
+It generates synthetic pipelines with increasing numbers of ops, nested in
+alternating Condition and ParallelFor groups, and times the resolution of
+the inputs, outputs and dependencies of every group by the v1 and the v2
+compilers.
+
+The ops inherit the params of all their enclosing conditions, so the
+number of resolved inputs and outputs grows with both the number of ops
+and the depth of the pipeline. The time per resolved entry should stay
+roughly flat as the pipelines grow.
+
+Usage:
+  python compiler_large_pipeline.py --sizes 1000 2000 4000 --ops-per-group 10
+"""
+
+import argparse
+import random
+import time
+import warnings
+from typing import List, Tuple
+
+from kfp import compiler, dsl
+from kfp.compiler._group_tree import GroupTree
+from kfp.v2 import compiler as v2_compiler
+
+
+def _build_pipeline(num_ops: int, ops_per_group: int,
+                    seed: int) -> Tuple[dsl.Pipeline, List[dsl.PipelineParam]]:
+    """Builds a pipeline of ops consuming the outputs of random upstream ops.
+
+    Every `ops_per_group` ops, a new Condition or ParallelFor group is
+    opened, or the innermost group is closed, so the depth of the pipeline
+    grows with its size.
+    """
+    rnd = random.Random(seed)
+    with dsl.Pipeline('large-pipeline') as pipeline:
+        flag = dsl.PipelineParam('flag')
+        ops = []
+        groups = []
+        for i in range(num_ops):
+            if i % ops_per_group == 0 and ops:
+                if groups and rnd.random() < 0.3:
+                    groups.pop().__exit__(None, None, None)
+                else:
+                    if len(groups) % 2:
+                        group = dsl.Condition(
+                            rnd.choice(ops).outputs['out'] == 'true')
+                    else:
+                        group = dsl.ParallelFor([1, 2])
+                    group.__enter__()
+                    groups.append(group)
+            argument = rnd.choice(ops).outputs['out'] if ops else flag
+            ops.append(
+                dsl.ContainerOp(
+                    name='op-%d' % i,
+                    image='busybox',
+                    command=['echo', argument],
+                    file_outputs={'out': '/tmp/out'}))
+        for group in reversed(groups):
+            group.__exit__(None, None, None)
+    return pipeline, [flag]
+
+
+def _count_entries(inputs, outputs, dependencies) -> int:
+    return sum(
+        len(entries) for resolved in (inputs, outputs, dependencies)
+        for entries in resolved.values())
+
+
+def _time_v1(pipeline: dsl.Pipeline) -> Tuple[float, int]:
+    c = compiler.Compiler()
+    root_group = pipeline.groups[0]
+    start = time.perf_counter()
+    opsgroups = c._get_groups(root_group)
+    group_tree = GroupTree(root_group)
+    condition_params = c._get_condition_params_for_ops(root_group)
+    op_name_to_for_loop_op = c._get_for_loop_ops(root_group)
+    inputs, outputs = c._get_inputs_outputs(pipeline, root_group, group_tree,
+                                            condition_params,
+                                            op_name_to_for_loop_op)
+    dependencies = c._get_dependencies(pipeline, root_group, group_tree,
+                                       opsgroups, condition_params)
+    return (time.perf_counter() - start,
+            _count_entries(inputs, outputs, dependencies))
+
+
+def _time_v2(pipeline: dsl.Pipeline, args) -> Tuple[float, int]:
+    c = v2_compiler.Compiler()
+    root_group = pipeline.groups[0]
+    start = time.perf_counter()
+    opsgroups = c._get_groups(root_group)
+    group_tree = GroupTree(root_group)
+    condition_params = c._get_condition_params_for_ops(root_group)
+    op_name_to_for_loop_op = c._get_for_loop_ops(root_group)
+    inputs, outputs = c._get_inputs_outputs(pipeline, args, root_group,
+                                            group_tree, condition_params,
+                                            op_name_to_for_loop_op)
+    dependencies = c._get_dependencies(pipeline, root_group, group_tree,
+                                       opsgroups, condition_params)
+    return (time.perf_counter() - start,
+            _count_entries(inputs, outputs, dependencies))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        '--sizes',
+        type=int,
+        nargs='+',
+        default=[500, 1000, 2000, 4000],
+        help='Numbers of ops of the generated pipelines.')
+    parser.add_argument(
+        '--ops-per-group',
+        type=int,
+        default=10,
+        help='Number of ops between two changes of nesting.')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    # ContainerOp warns about being constructed directly.
+    warnings.simplefilter('ignore')
+    print('{:>8} {:>8} {:>10} {:>10} {:>16} {:>10} {:>16}'.format(
+        'ops', 'depth', 'entries', 'v1 (s)', 'v1 per entry (us)', 'v2 (s)',
+        'v2 per entry (us)'))
+    for size in args.sizes:
+        pipeline, pipeline_args = _build_pipeline(size, args.ops_per_group,
+                                                  args.seed)
+        group_tree = GroupTree(pipeline.groups[0])
+        depth = max(group_tree.get_depth(op_name) for op_name in pipeline.ops)
+        v1_seconds, entries = _time_v1(pipeline)
+        v2_seconds, _ = _time_v2(pipeline, pipeline_args)
+        print('{:>8} {:>8} {:>10} {:>10.3f} {:>16.2f} {:>10.3f} {:>16.2f}'
+              .format(size, depth, entries, v1_seconds,
+                      1e6 * v1_seconds / entries, v2_seconds,
+                      1e6 * v2_seconds / entries))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+# Copyright 2021 The Kubeflow Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""This benchmark measures how fast component specs are constructed from
+their structures.
+
+It loads the component.yaml files of the components/ directory of the
+repository once, then times the conversion of the loaded structures to
+ComponentSpec objects, with and without validation, and back to
+structures. YAML parsing is not part of the timings.
+
+Usage:
+  python component_spec_loading.py --repeat 5
+"""
+
+import argparse
+import glob
+import os
+import time
+
+import yaml
+from kfp.components._structures import ComponentSpec
+
+_COMPONENTS_DIR = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), '..', '..', 'components')
+
+
+def _time(func, repeat: int) -> float:
+    """Returns the best time of several runs of a function."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        '--components-dir',
+        default=_COMPONENTS_DIR,
+        help='Directory to search for component.yaml files.')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    structs = []
+    for path in sorted(
+            glob.glob(
+                os.path.join(args.components_dir, '**', 'component.yaml'),
+                recursive=True)):
+        with open(path) as f:
+            structs.append(yaml.safe_load(f))
+    specs = [ComponentSpec.from_dict(struct) for struct in structs]
+
+    print('Component specs: {}'.format(len(structs)))
+    for name, func in [
+        ('from_dict', lambda: [ComponentSpec.from_dict(s) for s in structs]),
+        ('from_dict(validate=False)', lambda: [
+            ComponentSpec.from_dict(s, validate=False) for s in structs
+        ]),
+        ('to_dict', lambda: [spec.to_dict() for spec in specs]),
+    ]:
+        seconds = _time(func, args.repeat)
+        print('{:<28} {:>8.3f} s {:>10.1f} us/spec'.format(
+            name, seconds, 1e6 * seconds / len(structs)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+# Copyright 2021 The Kubeflow Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""This benchmark measures the import time of the kfp modules.
+
+Each module is imported in a new interpreter with `python -X importtime`,
+several times, and the median of the cumulative import times reported by
+the interpreter is compared with the budget of the module. The kfp CLI
+entry point is measured by importing kfp.__main__.
+
+The budgets are generous upper bounds, meant to catch the regressions
+which make a lightweight module import the kubernetes client, the API
+client or the compiler again, e.g. kfp.v2.components.executor, which runs
+in every component container.
+
+Usage:
+  python import_time.py --repeats 5 [--check]
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+
+# Modules and their import time budgets, in milliseconds.
+_BUDGETS_MS = {
+    'kfp': 50,
+    'kfp.__main__': 150,
+    'kfp.components': 250,
+    'kfp.dsl': 1000,
+    'kfp.v2.dsl': 1000,
+    'kfp.v2.components.executor': 100,
+}
+
+
+def _measure_import_ms(module: str) -> float:
+    """Imports a module in a new interpreter and returns its cumulative import
+    time, in milliseconds."""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import ' + module],
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+        check=True)
+    # The lines are "import time: self [us] | cumulative | imported package",
+    # and the module is imported last.
+    for line in reversed(result.stderr.splitlines()):
+        if line.startswith('import time:'):
+            _, cumulative_us, name = line.split('|')
+            if name.strip() == module:
+                return int(cumulative_us) / 1000
+    raise ValueError('No import time was reported for ' + module)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument(
+        '--check',
+        action='store_true',
+        help='Exit with an error when a module exceeds its budget.')
+    args = parser.parse_args()
+
+    print('{:>30} {:>12} {:>12}'.format('module', 'median ms', 'budget ms'))
+    over_budget = []
+    for module, budget_ms in _BUDGETS_MS.items():
+        import_ms = statistics.median(
+            _measure_import_ms(module) for _ in range(args.repeats))
+        print('{:>30} {:>12.1f} {:>12}'.format(module, import_ms, budget_ms))
+        if import_ms > budget_ms:
+            over_budget.append(module)
+    if args.check and over_budget:
+        sys.exit('Over the import time budget: ' + ', '.join(over_budget))
+
+
+if __name__ == '__main__':
+    main()